@@ -134,7 +134,9 @@ install_requirements = [
     "zope.interface==4.4.2",
 ]
 
-extras_requirements = {}
+extras_requirements = {
+    "accelerated": ["orjson"],
+}
 
 
 #
@@ -20,8 +20,9 @@ Incident Management System JSON API endpoints.
 
 from datetime import datetime as DateTime, timezone as TimeZone
 from enum import Enum
+from itertools import chain
 from typing import (
-    Any, Awaitable, Callable, Iterable, Mapping, Optional, Tuple, cast
+    Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, Tuple, Union,
 )
 
 from attr import attrib, attrs
@@ -39,8 +40,12 @@ from twisted.web.iweb import IRequest
 from ims.auth import Authorization, NotAuthorizedError
 from ims.config import Configuration, URLs
 from ims.dms import DMSError
-from ims.ext.json import jsonTextFromObject, objectFromJSONBytesIO
-from ims.ext.klein import ContentType, HeaderName, KleinRenderable, static
+from ims.ext.json import (
+    jsonTextFromObject, objectFromJSONBytesIO, rfc3339TextAsDateTime
+)
+from ims.ext.klein import (
+    ContentType, HeaderName, KleinRenderable, static, uncompressed,
+)
 from ims.model import (
     Event, Incident, IncidentPriority, IncidentReport, IncidentState,
     ReportEntry,
@@ -48,16 +53,19 @@ from ims.model import (
 from ims.model.json import (
     IncidentJSONKey, IncidentPriorityJSONValue, IncidentReportJSONKey,
     IncidentStateJSONValue, JSONCodecError, LocationJSONKey,
-    ReportEntryJSONKey, RodGarettAddressJSONKey,
-    jsonObjectFromModelObject, modelObjectFromJSONObject
+    ReportEntryJSONKey, RodGarettAddressJSONKey, jsonBytesFromModelObject,
+    jsonObjectFromModelObject, modelObjectFromJSONObject,
 )
-from ims.store import NoSuchIncidentError
+from ims.store import NoSuchIncidentError, SearchResult
 
 from ._klein import (
     Router, badRequestResponse, invalidQueryResponse, noContentResponse,
-    notFoundResponse, queryValue
+    notFoundResponse, queryValue, queryValues
+)
+from ._static import (
+    JSONStream, buildAsyncJSONArray, buildJSONArray, jsonBytes, notModified,
+    revisionETag, weakETag, writeJSONStream,
 )
-from ._static import buildJSONArray, jsonBytes, writeJSONStream
 
 
 __all__ = (
@@ -71,6 +79,13 @@ def _unprefix(url: URL) -> URL:
     return url.replace(path=url.path[len(prefix):])
 
 
+def _searchResultsJSON(results: Iterable[SearchResult]) -> bytes:
+    return jsonTextFromObject([
+        dict(number=result.number, snippet=result.snippet)
+        for result in results
+    ]).encode("utf-8")
+
+
 
 @attrs(frozen=True)
 class APIApplication(object):
@@ -93,7 +108,7 @@ class APIApplication(object):
         Ping (health check) endpoint.
         """
         ack = b'"ack"'
-        return jsonBytes(request, ack, str(hash(ack)))
+        return jsonBytes(request, ack, weakETag(str(hash(ack))))
 
 
     @router.route(_unprefix(URLs.personnel), methods=("HEAD", "GET"))
@@ -106,7 +121,7 @@ class APIApplication(object):
         )
 
         stream, etag = await self.personnelData()
-        writeJSONStream(request, stream, etag)
+        await writeJSONStream(request, stream, etag)
         return None
 
 
@@ -114,20 +129,25 @@ class APIApplication(object):
         """
         Data for personnel endpoint.
         """
+        dms = self.config.dms
+
         try:
-            personnel = await self.config.dms.personnel()
+            personnel = await dms.personnel()
         except DMSError as e:
             self._log.error("Unable to vend personnel: {failure}", failure=e)
             personnel = ()
+            etag = revisionETag()
+        else:
+            etag = revisionETag(dms.personnelRevision)
 
+        # The stream is lazy, so nothing is serialized if the client's copy
+        # is current.
         return (
             buildJSONArray(
-                jsonTextFromObject(
-                    jsonObjectFromModelObject(ranger)
-                ).encode("utf-8")
+                jsonBytesFromModelObject(ranger)
                 for ranger in personnel
             ),
-            str(hash(personnel)),
+            etag,
         )
 
 
@@ -142,16 +162,20 @@ class APIApplication(object):
 
         hidden = queryValue(request, "hidden") == "true"
 
-        incidentTypes = tuple(
-            await self.config.store.incidentTypes(includeHidden=hidden)
-        )
+        store = self.config.store
+
+        etag = revisionETag(await store.incidentTypesRevision())
+        if notModified(request, etag):
+            return None
+
+        incidentTypes = tuple(await store.incidentTypes(includeHidden=hidden))
 
         stream = buildJSONArray(
             jsonTextFromObject(incidentType).encode("utf-8")
             for incidentType in incidentTypes
         )
 
-        writeJSONStream(request, stream, None)
+        await writeJSONStream(request, stream, etag)
 
 
     @router.route(_unprefix(URLs.incidentTypes), methods=("POST",))
@@ -217,15 +241,30 @@ class APIApplication(object):
         )
 
         data = self.config.locationsJSONBytes
-        return jsonBytes(request, data, str(hash(data)))
+        return jsonBytes(request, data, weakETag(str(hash(data))))
 
 
     @router.route(_unprefix(URLs.incidents), methods=("HEAD", "GET"))
     async def listIncidentsResource(
         self, request: IRequest, eventID: str
-    ) -> None:
+    ) -> KleinRenderable:
         """
         Incident list endpoint.
+
+        The incidents may be filtered with the query parameters ``state`` and
+        ``priority`` (which may be repeated to match any of the given values),
+        ``type``, ``ranger``, ``created_after``, ``created_before`` (RFC 3339
+        times) and ``text``.
+
+        Alternatively, if a ``since`` query parameter is given, respond with
+        an object containing the current revision of the event (``revision``)
+        and the incidents changed after the given revision (``incidents``), so
+        that clients can fetch only what has changed since their last request.
+
+        If a ``fields`` query parameter with the value ``summary`` is given,
+        respond with incident summaries, which omit the report entries of each
+        incident, rather than with full incidents.
+        This may be combined with ``since`` but not with filters.
         """
         event = Event(id=eventID)
 
@@ -233,14 +272,148 @@ class APIApplication(object):
             request, event, Authorization.readIncidents
         )
 
-        stream = buildJSONArray(
-            jsonTextFromObject(
-                jsonObjectFromModelObject(incident)
-            ).encode("utf-8")
-            for incident in await self.config.store.incidents(event)
-        )
+        store = self.config.store
+
+        filters = self._incidentFilters(request)
+        if isinstance(filters, tuple):
+            return invalidQueryResponse(request, *filters)
+
+        fields = queryValue(request, "fields")
+
+        if fields is not None:
+            if fields != "summary":
+                return invalidQueryResponse(request, "fields", fields)
+            if filters:
+                return badRequestResponse(
+                    request,
+                    "Invalid query: fields may not be combined with filters",
+                )
+
+        sinceText = queryValue(request, "since")
+
+        if sinceText is not None:
+            if filters:
+                return badRequestResponse(
+                    request,
+                    "Invalid query: since may not be combined with filters",
+                )
+            try:
+                since = int(sinceText)
+            except ValueError:
+                return invalidQueryResponse(request, "since", sinceText)
+            if since < 0:
+                return invalidQueryResponse(request, "since", sinceText)
+
+        # Look up the revision first, so that changes made while we fetch the
+        # incidents are fetched again on the next request.
+        revision = await store.eventRevision(event)
+
+        etag = revisionETag(revision)
+        if notModified(request, etag):
+            return None
+
+        stream: JSONStream
+
+        if fields is not None:
+            summaries = await store.incidentSummaries(
+                event, None if sinceText is None else since
+            )
+            stream = buildJSONArray(
+                jsonBytesFromModelObject(summary) for summary in summaries
+            )
+            if sinceText is not None:
+                stream = chain(
+                    (f'{{"revision":{revision},"incidents":'.encode("ascii"),),
+                    stream,
+                    (b"}",),
+                )
+        elif sinceText is not None:
+            incidents = await store.incidentsChangedSince(event, since)
+            stream = chain(
+                (f'{{"revision":{revision},"incidents":'.encode("ascii"),),
+                buildJSONArray(
+                    store.jsonBytes(incident)
+                    for incident in incidents
+                ),
+                (b"}",),
+            )
+        elif filters:
+            incidents = await store.incidentsMatching(event, **filters)
+            stream = buildJSONArray(
+                store.jsonBytes(incident)
+                for incident in incidents
+            )
+        else:
+            # Read incidents lazily, as the response is written, rather than
+            # loading them all up front.
+            stream = buildAsyncJSONArray(
+                store.jsonBytes(incident)
+                async for incident in store.iterIncidents(event)
+            )
+
+        await writeJSONStream(request, stream, etag)
+        return None
+
+
+    def _incidentFilters(
+        self, request: IRequest
+    ) -> Union[Dict[str, Any], Tuple[str, str]]:
+        """
+        Look up incident filter criteria in the query parameters of the given
+        request, as keyword arguments for
+        :meth:`IMSDataStore.incidentsMatching`.
+        Returns the name and value of the offending query parameter if a value
+        is invalid.
+        """
+        filters: Dict[str, Any] = {}
+
+        states = []
+        for value in queryValues(request, "state"):
+            try:
+                states.append(modelObjectFromJSONObject(value, IncidentState))
+            except (JSONCodecError, ValueError):
+                return ("state", value)
+        if states:
+            filters["states"] = frozenset(states)
+
+        priorities = []
+        for value in queryValues(request, "priority"):
+            try:
+                priorities.append(
+                    modelObjectFromJSONObject(int(value), IncidentPriority)
+                )
+            except (JSONCodecError, ValueError):
+                return ("priority", value)
+        if priorities:
+            filters["priorities"] = frozenset(priorities)
+
+        for name, key in (
+            ("type", "incidentType"),
+            ("ranger", "rangerHandle"),
+        ):
+            filterText = queryValue(request, name)
+            if filterText:
+                filters[key] = filterText
+
+        for name, key in (
+            ("created_after", "createdAfter"),
+            ("created_before", "createdBefore"),
+        ):
+            dateText = queryValue(request, name)
+            if dateText:
+                try:
+                    dateTime = rfc3339TextAsDateTime(dateText)
+                except (ValueError, RuntimeError):
+                    return (name, dateText)
+                if dateTime.tzinfo is None:
+                    dateTime = dateTime.replace(tzinfo=TimeZone.utc)
+                filters[key] = dateTime
 
-        writeJSONStream(request, stream, None)
+        text = queryValue(request, "text")
+        if text:
+            filters["text"] = text
+
+        return filters
 
 
     @router.route(_unprefix(URLs.incidents), methods=("POST",))
@@ -359,6 +532,46 @@ class APIApplication(object):
         return noContentResponse(request)
 
 
+    @router.route(_unprefix(URLs.incidentSearch), methods=("HEAD", "GET"))
+    async def searchIncidentsResource(
+        self, request: IRequest, eventID: str
+    ) -> KleinRenderable:
+        """
+        Incident search endpoint.
+
+        Responds with the numbers of the incidents matching the words in the
+        ``q`` query parameter, best match first, with snippets of matching
+        text.
+        At most 100 results are returned, unless the ``limit`` query parameter
+        gives another number.
+        """
+        event = Event(id=eventID)
+
+        await self.config.authProvider.authorizeRequest(
+            request, event, Authorization.readIncidents
+        )
+
+        query = queryValue(request, "q")
+        if query is None:
+            return invalidQueryResponse(request, "q")
+
+        limit = 100
+        limitText = queryValue(request, "limit")
+        if limitText is not None:
+            try:
+                limit = int(limitText)
+            except ValueError:
+                return invalidQueryResponse(request, "limit", limitText)
+            if limit < 1:
+                return invalidQueryResponse(request, "limit", limitText)
+
+        results = await self.config.store.searchIncidents(
+            event, query, limit=limit
+        )
+
+        return jsonBytes(request, _searchResultsJSON(results))
+
+
     @router.route(_unprefix(URLs.incidentNumber), methods=("HEAD", "GET"))
     async def readIncidentResource(
         self, request: IRequest, eventID: str, number: int
@@ -377,19 +590,22 @@ class APIApplication(object):
         except ValueError:
             return notFoundResponse(request)
 
+        store = self.config.store
+
+        # Look up the revision first, so that the incident is at least as new
+        # as the revision.
         try:
-            incident = await self.config.store.incidentWithNumber(
-                event, number
-            )
+            etag = revisionETag(await store.incidentRevision(event, number))
+            if notModified(request, etag):
+                return b""
+
+            incident = await store.incidentWithNumber(event, number)
         except NoSuchIncidentError:
             return notFoundResponse(request)
 
-        data = (
-            jsonTextFromObject(jsonObjectFromModelObject(incident))
-            .encode("utf-8")
-        )
+        data = store.jsonBytes(incident)
 
-        return jsonBytes(request, data)
+        return jsonBytes(request, data, etag)
 
 
     @router.route(_unprefix(URLs.incidentNumber), methods=("POST",))
@@ -435,91 +651,69 @@ class APIApplication(object):
                 request, "Incident created time may not be modified"
             )
 
-        IncidentAttributeSetter = (
-            Callable[[Event, int, Any, str], Awaitable[None]]
-        )
+        incidentEdits: Dict[str, Any] = {}
 
-        async def applyEdit(
-            json: Mapping[str, Any], key: Enum,
-            setter: IncidentAttributeSetter,
+        def addEdit(
+            json: Mapping[str, Any], key: Enum, name: str,
             cast: Optional[Callable[[Any], Any]] = None
         ) -> None:
-            _cast: Callable[[Any], Any]
-            if cast is None:
-                def _cast(obj: Any) -> Any:
-                    return obj
-            else:
-                _cast = cast
             value = json.get(key.value, UNSET)
             if value is not UNSET:
-                await setter(event, number, _cast(value), author)
-
-        store = self.config.store
+                if cast is not None:
+                    value = cast(value)
+                incidentEdits[name] = value
 
         try:
-            await applyEdit(
-                edits, IncidentJSONKey.priority, store.setIncident_priority,
+            addEdit(
+                edits, IncidentJSONKey.priority, "priority",
                 lambda json: modelObjectFromJSONObject(json, IncidentPriority),
             )
-            await applyEdit(
-                edits, IncidentJSONKey.state,
-                store.setIncident_state,
+            addEdit(
+                edits, IncidentJSONKey.state, "state",
                 lambda json: modelObjectFromJSONObject(json, IncidentState),
             )
         except JSONCodecError as e:
             return badRequestResponse(request, str(e))
 
-        await applyEdit(
-            edits, IncidentJSONKey.summary, store.setIncident_summary
-        )
-        await applyEdit(
-            edits, IncidentJSONKey.rangerHandles, store.setIncident_rangers
-        )
-        await applyEdit(
-            edits, IncidentJSONKey.incidentTypes,
-            store.setIncident_incidentTypes,
-        )
+        addEdit(edits, IncidentJSONKey.summary, "summary")
+        addEdit(edits, IncidentJSONKey.rangerHandles, "rangers")
+        addEdit(edits, IncidentJSONKey.incidentTypes, "incidentTypes")
 
         location = edits.get(IncidentJSONKey.location.value, UNSET)
         if location is not UNSET:
             if location is None:
-                for setter in (
-                    store.setIncident_locationName,
-                    store.setIncident_locationConcentricStreet,
-                    store.setIncident_locationRadialHour,
-                    store.setIncident_locationRadialMinute,
-                    store.setIncident_locationDescription,
+                for name in (
+                    "locationName",
+                    "locationConcentricStreet",
+                    "locationRadialHour",
+                    "locationRadialMinute",
+                    "locationDescription",
                 ):
-                    cast(IncidentAttributeSetter, setter)(
-                        event, number, None, author
-                    )
+                    incidentEdits[name] = None
             else:
-                await applyEdit(
-                    location, LocationJSONKey.name,
-                    store.setIncident_locationName
-                )
-                await applyEdit(
+                addEdit(location, LocationJSONKey.name, "locationName")
+                addEdit(
                     location, RodGarettAddressJSONKey.concentric,
-                    store.setIncident_locationConcentricStreet
+                    "locationConcentricStreet",
                 )
-                await applyEdit(
+                addEdit(
                     location, RodGarettAddressJSONKey.radialHour,
-                    store.setIncident_locationRadialHour
+                    "locationRadialHour",
                 )
-                await applyEdit(
+                addEdit(
                     location, RodGarettAddressJSONKey.radialMinute,
-                    store.setIncident_locationRadialMinute
+                    "locationRadialMinute",
                 )
-                await applyEdit(
+                addEdit(
                     location, RodGarettAddressJSONKey.description,
-                    store.setIncident_locationDescription
+                    "locationDescription",
                 )
 
         jsonEntries = edits.get(IncidentJSONKey.reportEntries.value, UNSET)
         if jsonEntries is not UNSET:
             now = DateTime.now(TimeZone.utc)
 
-            entries = (
+            incidentEdits["reportEntries"] = tuple(
                 ReportEntry(
                     author=author,
                     text=jsonEntry[ReportEntryJSONKey.text.value],
@@ -529,9 +723,11 @@ class APIApplication(object):
                 for jsonEntry in jsonEntries
             )
 
-            await store.addReportEntriesToIncident(
-                event, number, entries, author
-            )
+        # Apply all of the edits at once, so that they are written in a
+        # single transaction with a single automatic report entry.
+        await self.config.store.applyIncidentEdits(
+            event, number, incidentEdits, author
+        )
 
         return noContentResponse(request)
 
@@ -558,7 +754,9 @@ class APIApplication(object):
             await self.config.authProvider.authorizeRequest(
                 request, None, Authorization.readIncidentReports
             )
-            incidentReports = await store.detachedIncidentReports()
+            loadIncidentReports: Callable[
+                [], Awaitable[Iterable[IncidentReport]]
+            ] = store.detachedIncidentReports
 
         else:
             try:
@@ -578,18 +776,24 @@ class APIApplication(object):
             await self.config.authProvider.authorizeRequest(
                 request, event, Authorization.readIncidents
             )
-            incidentReports = await store.incidentReportsAttachedToIncident(
-                event=event, incidentNumber=incidentNumber
+            loadIncidentReports = (
+                lambda: store.incidentReportsAttachedToIncident(
+                    event=event, incidentNumber=incidentNumber
+                )
             )
 
+        etag = revisionETag(await store.incidentReportsRevision())
+        if notModified(request, etag):
+            return None
+
+        incidentReports = await loadIncidentReports()
+
         stream = buildJSONArray(
-            jsonTextFromObject(
-                jsonObjectFromModelObject(incidentReport)
-            ).encode("utf-8")
+            store.jsonBytes(incidentReport)
             for incidentReport in incidentReports
         )
 
-        writeJSONStream(request, stream, None)
+        await writeJSONStream(request, stream, etag)
         return None
 
 
@@ -683,6 +887,32 @@ class APIApplication(object):
         return noContentResponse(request)
 
 
+    @router.route(
+        _unprefix(URLs.incidentReportSearch), methods=("HEAD", "GET")
+    )
+    async def searchIncidentReportsResource(
+        self, request: IRequest
+    ) -> KleinRenderable:
+        """
+        Incident report search endpoint.
+
+        Responds with the numbers of the incident reports matching the words
+        in the ``q`` query parameter, best match first, with snippets of
+        matching text.
+        """
+        await self.config.authProvider.authorizeRequest(
+            request, None, Authorization.readIncidentReports
+        )
+
+        query = queryValue(request, "q")
+        if query is None:
+            return invalidQueryResponse(request, "q")
+
+        results = await self.config.store.searchIncidentReports(query)
+
+        return jsonBytes(request, _searchResultsJSON(results))
+
+
     @router.route(_unprefix(URLs.incidentReport), methods=("HEAD", "GET"))
     async def readIncidentReportResource(
         self, request: IRequest, number: int
@@ -704,9 +934,15 @@ class APIApplication(object):
             request, incidentReport
         )
 
-        text = jsonTextFromObject(jsonObjectFromModelObject(incidentReport))
+        store = self.config.store
+
+        etag = revisionETag(await store.incidentReportsRevision())
+        if notModified(request, etag):
+            return b""
 
-        return jsonBytes(request, text.encode("utf-8"))
+        data = store.jsonBytes(incidentReport)
+
+        return jsonBytes(request, data, etag)
 
 
     @router.route(_unprefix(URLs.incidentReport), methods=("POST",))
@@ -931,17 +1167,76 @@ class APIApplication(object):
 
 
     @router.route(_unprefix(URLs.eventSource), methods=("GET",))
-    def eventSourceResource(self, request: IRequest) -> KleinRenderable:
+    @uncompressed
+    async def eventSourceResource(
+        self, request: IRequest
+    ) -> KleinRenderable:
         """
         HTML5 EventSource endpoint.
+
+        Listeners may subscribe to the events for one IMS event with the query
+        parameter ``event``, and to those for one incident in that event with
+        the additional query parameter ``incident``; this requires
+        authorization to read incidents in that IMS event.
+        Otherwise, listeners are sent all events.
+
+        If the query parameter ``payload`` has the value ``incident``, incident
+        events carry the updated incident and the event revision it was read
+        at, so that clients need not fetch it.
+        This requires the ``event`` query parameter.
+
+        Reconnecting listeners that send a ``Last-Event-ID`` header are sent
+        the events they missed, or a ``Reset`` event if those are no longer
+        available.
         """
+        eventID = queryValue(request, "event")
+        incidentNumberText = queryValue(request, "incident")
+        payload = queryValue(request, "payload")
+
+        if payload not in (None, "incident"):
+            return invalidQueryResponse(request, "payload", payload)
+
+        if payload is not None and eventID is None:
+            return badRequestResponse(
+                request, "Invalid query: payload requires event"
+            )
+
+        if incidentNumberText is None:
+            incidentNumber = None
+        else:
+            if eventID is None:
+                return badRequestResponse(
+                    request, "Invalid query: incident requires event"
+                )
+            try:
+                incidentNumber = int(incidentNumberText)
+            except ValueError:
+                return invalidQueryResponse(
+                    request, "incident", incidentNumberText
+                )
+
+        if eventID is not None:
+            try:
+                event = Event(id=eventID)
+            except ValueError:
+                return invalidQueryResponse(request, "event", eventID)
+
+            await self.config.authProvider.authorizeRequest(
+                request, event, Authorization.readIncidents
+            )
+
         self._log.debug("Event source connected: {id}", id=id(request))
 
         request.setHeader(
             HeaderName.contentType.value, ContentType.eventStream.value
         )
 
-        self.storeObserver.addListener(request)
+        self.storeObserver.addListener(
+            request,
+            lastEventID=request.getHeader(HeaderName.lastEventID.value),
+            eventID=eventID, incidentNumber=incidentNumber,
+            withIncident=(payload == "incident"),
+        )
 
         def disconnected(f: Failure) -> None:
             f.trap(ConnectionDone)
@@ -957,6 +1252,6 @@ class APIApplication(object):
         # Handle disconnect
         request.notifyFinish().addCallbacks(finished, disconnected)
 
-        # Return an unfired deferred, so the connection doesn't close on this
+        # Wait on an unfired deferred, so the connection doesn't close on this
         # end...
-        return Deferred()
+        return await Deferred()
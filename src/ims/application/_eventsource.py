@@ -18,22 +18,25 @@
 HTML5 EventSource support.
 """
 
-from collections import deque
 from time import time
-from typing import Deque, List, Mapping, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 from attr import attrib, attrs
 from attr.validators import instance_of, optional
 
+from twisted.internet.defer import ensureDeferred
 from twisted.logger import ILogObserver, Logger
+from twisted.python import threadable
+from twisted.python.failure import Failure
 from twisted.web.iweb import IRequest
 
 from zope.interface import implementer
 
 from ims.ext.json import jsonTextFromObject
-from ims.model import Incident
+from ims.model import Event as IMSEvent, Incident
+from ims.store import ChangeNotification, IMSDataStore, StorageError
 
-Deque, List, Set, Tuple  # silence linter
+Dict, List, Tuple  # silence linter
 
 
 __all__ = (
@@ -41,6 +44,16 @@ __all__ = (
 )
 
 
+# A topic that EventSource listeners subscribe to: an IMS event ID and an
+# incident number within that event, either of which may be None to subscribe
+# to everything.
+Topic = Tuple[Optional[str], Optional[int]]
+
+# Listeners are indexed by topic and by whether they are sent the updated
+# incident with each message.
+Subscription = Tuple[Topic, bool]
+
+
 
 @attrs(frozen=True)
 class Event(object):
@@ -88,43 +101,174 @@ class DataStoreEventSourceLogObserver(object):
     log = Logger()
 
 
-    def __init__(self) -> None:
+    def __init__(
+        self, store: Optional[IMSDataStore] = None, persist: bool = False,
+        bufferSize: int = 1000,
+    ) -> None:
         """
         Initialize.
+
+        :param store: The data store to read updated incidents from, for
+            listeners that are sent them; without one, listeners are only
+            notified of updates.
+        :param persist: Whether to keep the events buffered for playback in
+            the data store, so that they can be played back after a restart.
+        :param bufferSize: The number of events buffered for playback.
         """
-        self._listeners: List[IRequest] = []
-        self._events: Deque[Tuple[int, Event]] = deque(maxlen=1000)
+        if persist and store is None:
+            raise ValueError("No data store to keep events in")
+
+        self._store = store
+        self._persist = persist
+        self._bufferSize = bufferSize
+
+        # Listeners are indexed by subscription, so that publishing an event
+        # only visits the listeners subscribed to it.
+        # Requests aren't necessarily hashable, so listeners are keyed by
+        # their id().
+        self._listeners: Dict[int, Tuple[IRequest, Subscription]] = {}
+        self._subscriptions: Dict[Subscription, Dict[int, IRequest]] = {}
+
+        # Events buffered for playback, keyed by event ID.
+        # Event IDs are consecutive, so the events after a given ID are found
+        # by counting up from it.
+        self._events: Dict[int, Tuple[Topic, Event]] = {}
         self._start = time()
-        self._counter = 0
+
+        # Start from the current time in milliseconds, so that event IDs from
+        # an earlier process are lower than those from this one; if events
+        # are persisted, :meth:`load` continues from the events kept in the
+        # store instead.
+        self._counter = int(self._start * 1000)
+
+        # Incidents to send to listeners that are sent updated incidents,
+        # mapped to the counter of the latest store event for each.
+        self._pendingIncidents: Dict[Topic, int] = {}
+        self._sendingIncidents = False
+
+
+    async def load(self) -> None:
+        """
+        Load the events kept in the data store, if events are persisted, so
+        that they can be played back and new events are numbered after them.
+
+        This should be called at startup, before any events are published or
+        listeners are added.
+        """
+        if not self._persist:
+            return
+
+        store = self._store
+        assert store is not None
+
+        for notification in await store.changeNotifications(self._bufferSize):
+            self._events[notification.number] = (
+                (notification.eventID, notification.incidentNumber),
+                Event(
+                    eventID=notification.number,
+                    eventClass=notification.eventClass,
+                    message=notification.message,
+                ),
+            )
+            self._counter = notification.number
 
 
     def addListener(
-        self, listener: IRequest, lastEventID: Optional[str] = None
+        self, listener: IRequest, lastEventID: Optional[str] = None,
+        eventID: Optional[str] = None, incidentNumber: Optional[int] = None,
+        withIncident: bool = False,
     ) -> None:
         """
         Add a listener.
+
+        The listener is sent events for the given IMS event and incident
+        number; if no incident number is given, it is sent events for all
+        incidents in the given IMS event, and if no IMS event is given, it is
+        sent all events.
+
+        If ``withIncident`` is true, each incident event sent to the listener
+        carries the updated incident and its revision, so that the listener
+        need not fetch it.
         """
-        self.log.debug("Adding listener: {listener}", listener=listener)
+        if eventID is None and incidentNumber is not None:
+            raise ValueError("Incident number given without an event")
+
+        if withIncident and self._store is None:
+            raise ValueError("No data store to read incidents from")
 
-        self._playback(listener, lastEventID)
+        topic = (eventID, incidentNumber)
+        subscription = (topic, withIncident)
+
+        self.log.debug(
+            "Adding listener for {subscription}: {listener}",
+            listener=listener, subscription=subscription,
+        )
 
-        self._listeners.append(listener)
+        self._playback(listener, topic, lastEventID)
+
+        key = id(listener)
+        self._listeners[key] = (listener, subscription)
+        self._subscriptions.setdefault(subscription, {})[key] = listener
 
 
     def removeListener(self, listener: IRequest) -> None:
         """
         Remove a listener.
         """
-        self.log.debug("Removing listener: {listener}", listener=listener)
+        key = id(listener)
+        entry = self._listeners.pop(key, None)
+        if entry is None:
+            # Already removed
+            return
+
+        subscription = entry[1]
+
+        self.log.debug(
+            "Removing listener for {subscription}: {listener}",
+            listener=listener, subscription=subscription,
+        )
+
+        listeners = self._subscriptions[subscription]
+        del listeners[key]
+        if not listeners:
+            del self._subscriptions[subscription]
+
+
+    @staticmethod
+    def _subscribedTopics(topic: Topic) -> Iterable[Topic]:
+        """
+        Look up the topics with listeners subscribed to an event with the given
+        topic.
+        """
+        eventID, incidentNumber = topic
 
-        self._listeners.remove(listener)
+        yield (None, None)
+
+        if eventID is not None:
+            yield (eventID, None)
+
+            if incidentNumber is not None:
+                yield topic
+
+
+    def _subscribers(self, topic: Topic, withIncident: bool) -> List[IRequest]:
+        """
+        Look up the listeners subscribed to an event with the given topic.
+        """
+        return [
+            listener
+            for subscribedTopic in self._subscribedTopics(topic)
+            for listener in self._subscriptions.get(
+                (subscribedTopic, withIncident), {}
+            ).values()
+        ]
 
 
     def _transmogrify(
         self, loggerEvent: Mapping, eventID: int
-    ) -> Optional[Event]:
+    ) -> Optional[Tuple[Topic, Event]]:
         """
-        Convert a logger event into an EventSource event.
+        Convert a logger event into an EventSource event and its topic.
         """
         eventClass = loggerEvent.get("storeWriteClass", None)
 
@@ -136,19 +280,22 @@ class DataStoreEventSourceLogObserver(object):
             incident = loggerEvent.get("incident", None)
 
             if incident is None:
+                imsEvent = loggerEvent.get("event", None)
                 incidentNumber = loggerEvent.get("incidentNumber", None)
             else:
+                imsEvent = incident.event
                 incidentNumber = incident.number
 
-            if incidentNumber is None:
+            if imsEvent is None or incidentNumber is None:
                 self.log.critical(
-                    "Unable to determine incident number from store event: "
-                    "{event}",
+                    "Unable to determine event and incident number from store "
+                    "event: {event}",
                     event=loggerEvent,
                 )
                 return None
 
-            message = dict(incident_number=incidentNumber)
+            topic: Topic = (imsEvent.id, incidentNumber)
+            message = dict(event=imsEvent.id, incident_number=incidentNumber)
 
         else:
             self.log.debug(
@@ -162,32 +309,59 @@ class DataStoreEventSourceLogObserver(object):
             eventClass=eventClass.__name__,
             message=jsonTextFromObject(message),
         )
-        return eventSourceEvent
+        return (topic, eventSourceEvent)
 
 
     def _playback(
-        self, listener: IRequest, lastEventID: Optional[str]
+        self, listener: IRequest, topic: Topic, lastEventID: Optional[str]
     ) -> None:
+        """
+        Send the buffered events after the one with the given ID to the given
+        listener.
+        If the events after the given ID are no longer buffered, send a
+        ``Reset`` event instead, telling the listener to fetch what it needs
+        again.
+        """
         if lastEventID is None:
             return
 
-        observerID, counterString = lastEventID.split(":")
+        try:
+            last: Optional[int] = int(lastEventID)
+        except ValueError:
+            last = None
 
-        if observerID == str(id(self)):
-            counter = int(counterString)
-        else:
-            # lastEventID came from a different observer
-            counter = 0
+        first = next(iter(self._events), None)
 
-        for eventCounter, event in self._events:
-            if eventCounter >= counter:
-                listener.write(event.render().encode("utf-8"))
+        if (
+            last is None or last > self._counter or (
+                last < self._counter and (first is None or last < first - 1)
+            )
+        ):
+            self.log.debug(
+                "Unable to play back events after {lastEventID} for "
+                "{listener}",
+                lastEventID=lastEventID, listener=listener,
+            )
+            reset = Event(
+                eventID=self._counter, eventClass="Reset", message="{}"
+            )
+            listener.write(reset.render().encode("utf-8"))
+            return
 
+        # Played back events don't carry incidents, which may have changed
+        # since; listeners that are sent incidents fetch them as usual.
+        for eventID in range(last + 1, self._counter + 1):
+            buffered = self._events.get(eventID)
+            if buffered is None:
+                # Not kept, as the store was unable to keep it
+                continue
+            eventTopic, event = buffered
+            if topic in self._subscribedTopics(eventTopic):
+                listener.write(event.render().encode("utf-8"))
 
-    def _publish(self, eventSourceEvent: Event, eventID: int) -> None:
-        eventText = eventSourceEvent.render().encode("utf-8")
 
-        for listener in tuple(self._listeners):
+    def _write(self, listeners: Iterable[IRequest], eventText: bytes) -> None:
+        for listener in listeners:
             try:
                 listener.write(eventText)
             except Exception as e:
@@ -198,17 +372,162 @@ class DataStoreEventSourceLogObserver(object):
                 )
                 self.removeListener(listener)
 
-        self._events.append((self._counter, eventSourceEvent))
+
+    def _publish(
+        self, topic: Topic, eventSourceEvent: Event, eventID: int
+    ) -> None:
+        self._write(
+            self._subscribers(topic, False),
+            eventSourceEvent.render().encode("utf-8"),
+        )
+
+        self._buffer(topic, eventSourceEvent, eventID)
+
+        if self._subscribers(topic, True):
+            self._publishIncident(topic, eventID)
+
+
+    def _buffer(
+        self, topic: Topic, eventSourceEvent: Event, eventID: int
+    ) -> None:
+        """
+        Buffer the given event for playback, and keep it in the store if
+        events are persisted.
+        """
+        self._events[eventID] = (topic, eventSourceEvent)
+
+        while len(self._events) > self._bufferSize:
+            del self._events[next(iter(self._events))]
+
+        if not self._persist:
+            return
+
+        store = self._store
+        assert store is not None
+
+        eventClass = eventSourceEvent.eventClass
+        assert eventClass is not None
+
+        def storeFailed(f: Failure) -> None:
+            self.log.failure("Unable to keep EventSource event", f)
+
+        d = ensureDeferred(store.addChangeNotification(
+            ChangeNotification(
+                number=eventID,
+                eventID=topic[0],
+                incidentNumber=topic[1],
+                eventClass=eventClass,
+                message=eventSourceEvent.message,
+            ),
+            keep=self._bufferSize,
+        ))
+        d.addErrback(storeFailed)
+
+
+    def _publishIncident(self, topic: Topic, eventID: int) -> None:
+        """
+        Send the incident with the given topic to the listeners that are sent
+        updated incidents.
+
+        Incidents are read and sent one at a time, in the order of the store
+        events, so that listeners see them in order; further store events for
+        an incident that is waiting to be sent are sent with it, as it is read
+        when it is sent.
+        """
+        # Move the incident to the end, so that incidents are sent in the
+        # order of their latest store events.
+        self._pendingIncidents.pop(topic, None)
+        self._pendingIncidents[topic] = eventID
+
+        if self._sendingIncidents:
+            return
+
+        self._sendingIncidents = True
+
+        def sendFailed(f: Failure) -> None:
+            self.log.failure("Unable to send updated incidents", f)
+
+        d = ensureDeferred(self._sendPendingIncidents())
+        d.addErrback(sendFailed)
+
+
+    async def _sendPendingIncidents(self) -> None:
+        store = self._store
+        assert store is not None
+
+        try:
+            while self._pendingIncidents:
+                topic = next(iter(self._pendingIncidents))
+                eventID = self._pendingIncidents.pop(topic)
+
+                if not self._subscribers(topic, True):
+                    continue
+
+                imsEventID, incidentNumber = topic
+                assert imsEventID is not None
+                assert incidentNumber is not None
+                imsEvent = IMSEvent(id=imsEventID)
+
+                # Look up the revision first, so that the incident is at least
+                # as new as the revision.
+                try:
+                    revision = await store.incidentRevision(
+                        imsEvent, incidentNumber
+                    )
+                    incident = await store.incidentWithNumber(
+                        imsEvent, incidentNumber
+                    )
+                except StorageError as e:
+                    self.log.error(
+                        "Unable to read incident {event}#{incidentNumber} "
+                        "for EventSource listeners: {error}",
+                        event=imsEvent, incidentNumber=incidentNumber,
+                        error=e,
+                    )
+                    continue
+
+                # The incident JSON is spliced in as is, so that the
+                # serialized JSON cached by the store is reused.
+                message = (
+                    f'{{"event":{jsonTextFromObject(imsEventID)},'
+                    f'"incident_number":{incidentNumber},'
+                    f'"revision":{revision},'
+                    f'"incident":{store.jsonBytes(incident).decode("utf-8")}}}'
+                )
+                eventSourceEvent = Event(
+                    eventID=eventID,
+                    eventClass=Incident.__name__,
+                    message=message,
+                )
+
+                # Listeners may have gone away while the incident was read
+                self._write(
+                    self._subscribers(topic, True),
+                    eventSourceEvent.render().encode("utf-8"),
+                )
+        finally:
+            self._sendingIncidents = False
 
 
     def __call__(self, event: Mapping) -> None:
         """
         See L{ILogObserver.__call__}.
         """
-        self._counter += 1
+        if threadable.ioThread is not None and not threadable.isInIOThread():
+            # Data store events may be emitted from data store worker threads;
+            # listeners may only be written to from the reactor thread.
+            from twisted.internet import reactor
+            reactor.callFromThread(self, event)
+            return
 
-        eventSourceEvent = self._transmogrify(event, self._counter)
-        if eventSourceEvent is None:
+        # Only count data store events, so that event IDs are consecutive
+        eventID = self._counter + 1
+
+        transmogrified = self._transmogrify(event, eventID)
+        if transmogrified is None:
             return
 
-        self._publish(eventSourceEvent, self._counter)
+        self._counter = eventID
+
+        topic, eventSourceEvent = transmogrified
+        self._publish(topic, eventSourceEvent, eventID)
@@ -37,6 +37,7 @@ from ims.config import Configuration, URLs
 from ims.ext.klein import ContentType, HeaderName, KleinRenderable, static
 
 from ._klein import Router, internalErrorResponse, notFoundResponse
+from ._static import staticContentCache
 
 
 __all__ = (
@@ -241,13 +242,15 @@ class ExternalApplication(object):
         path = await self.cacheFromURL(url, name)
 
         try:
-            return path.read_bytes()
+            data = path.read_bytes()
         except (OSError, IOError) as e:
             self._log.error(
                 "Unable to open file {path}: {error}", path=path, error=e
             )
             return notFoundResponse(request)
 
+        return staticContentCache.encoded(request, name, data)
+
 
     async def cachedZippedResource(
         self, request: IRequest, url: URL, archiveName: str, name: str,
@@ -287,10 +290,12 @@ class ExternalApplication(object):
             filePath = filePath.child(name)
 
         try:
-            return filePath.getContent()
+            data = filePath.getContent()
         except KeyError:
             self._log.error(
                 "File not found in ZIP archive: {filePath.path}",
                 filePath=filePath, archive=archivePath,
             )
             return notFoundResponse(request)
+
+        return staticContentCache.encoded(request, filePath.path, data)
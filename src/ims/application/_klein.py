@@ -263,7 +263,7 @@ def queryValues(
     @return: The values of the query parameter specified by C{name}, or
         C{default} if there no such query parameter.
     """
-    values = request.args.get(name)
+    values = request.args.get(name.encode("utf-8"))
 
     if values is None:
         return default
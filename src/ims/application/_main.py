@@ -21,10 +21,9 @@ Incident Management System web service.
 from attr import Factory, attrib, attrs
 from attr.validators import instance_of
 
-from twisted.logger import ILogObserver, Logger, globalLogPublisher
+from twisted.logger import Logger, globalLogPublisher
 from twisted.python.filepath import FilePath
 from twisted.web.iweb import IRequest
-from twisted.web.static import File
 
 import ims.element
 from ims.config import Configuration, URLs
@@ -36,6 +35,7 @@ from ._auth import AuthApplication
 from ._eventsource import DataStoreEventSourceLogObserver
 from ._external import ExternalApplication
 from ._klein import redirect, router
+from ._static import StaticFile
 from ._web import WebApplication
 
 
@@ -60,8 +60,15 @@ class MainApplication(object):
 
     config: Configuration = attrib(validator=instance_of(Configuration))
 
-    storeObserver: ILogObserver = attrib(
-        default=Factory(DataStoreEventSourceLogObserver), init=False
+    storeObserver: DataStoreEventSourceLogObserver = attrib(
+        default=Factory(
+            lambda self: DataStoreEventSourceLogObserver(
+                store=self.config.store,
+                persist=self.config.StorePersistNotifications,
+            ),
+            takes_self=True,
+        ),
+        init=False,
     )
 
     apiApplication: APIApplication = attrib(
@@ -129,7 +136,7 @@ class MainApplication(object):
 
     @router.route(URLs.static, branch=True)
     def static(self, request: IRequest) -> KleinRenderable:
-        return File(resourcesDirectory.path)
+        return StaticFile(resourcesDirectory.path)
 
 
     #
@@ -19,13 +19,24 @@ Incident Management System web application authentication endpoints.
 """
 
 from hashlib import sha1
-from typing import Any, Iterable, Optional
+from io import BytesIO
+from typing import (
+    Any, AsyncIterator, Iterable, List, Optional, Union,
+)
 from typing.io import BinaryIO
+from uuid import uuid4
 
+from twisted.internet.defer import Deferred
+from twisted.internet.interfaces import IPushProducer
 from twisted.logger import Logger
+from twisted.python.failure import Failure
+from twisted.web import http
 from twisted.web.iweb import IRequest
+from twisted.web.static import File, NoRangeStaticProducer, StaticProducer
 
-from ims.ext.klein import ContentType, HeaderName
+from zope.interface import implementer
+
+from ims.ext.klein import CompressedContentCache, ContentType, HeaderName
 
 
 __all__ = ()
@@ -34,6 +45,66 @@ __all__ = ()
 log = Logger()
 
 
+#
+# Conditional requests
+#
+
+# Revisions are only meaningful within a single run of the server, so ETags
+# made from them include a token that is unique to this run.
+_runToken = uuid4().hex[:12]
+
+
+def weakETag(value: str) -> str:
+    """
+    Compose a weak ETag with the given opaque value.
+
+    Response bodies may be sent with any of several content codings, which
+    a strong ETag would have to tell apart, so we only vend weak ETags.
+    """
+    return f'W/"{value}"'
+
+
+def revisionETag(*revision: Any) -> str:
+    """
+    Compose an ETag for a resource from the given revision information.
+    """
+    return weakETag("-".join(str(r) for r in (_runToken,) + revision))
+
+
+def _opaqueTag(etag: str) -> str:
+    """
+    Strip the weakness indicator, if any, from the given ETag.
+    """
+    if etag.startswith("W/"):
+        return etag[2:]
+    return etag
+
+
+def notModified(request: IRequest, etag: str) -> bool:
+    """
+    If the given request is a GET or HEAD with an If-None-Match header that
+    matches the given ETag, set the response code to NOT MODIFIED.
+    ETags are compared using the weak comparison function.
+
+    :return: Whether the response is NOT MODIFIED, in which case the caller
+        should respond with no content.
+    """
+    ifNoneMatch = request.getHeader(HeaderName.ifNoneMatch.value)
+    if ifNoneMatch is None or request.method not in (b"GET", b"HEAD"):
+        return False
+
+    opaqueTag = _opaqueTag(etag)
+
+    for tag in ifNoneMatch.split(","):
+        tag = tag.strip()
+        if tag == "*" or _opaqueTag(tag) == opaqueTag:
+            request.setResponseCode(http.NOT_MODIFIED)
+            request.setHeader(HeaderName.etag.value, etag)
+            return True
+
+    return False
+
+
 #
 # MIME type wrappers
 #
@@ -46,23 +117,118 @@ def jsonBytes(
     """
     request.setHeader(HeaderName.contentType.value, ContentType.json.value)
     if etag is None:
-        etag = sha1(data).hexdigest()
+        etag = weakETag(sha1(data).hexdigest())
+    if notModified(request, etag):
+        return b""
     request.setHeader(HeaderName.etag.value, etag)
+    request.setHeader(HeaderName.contentLength.value, str(len(data)))
     return data
 
 
-def writeJSONStream(
-    request: IRequest, jsonStream: BinaryIO,
+JSONStream = Union[Iterable[bytes], AsyncIterator[bytes]]
+
+
+
+@implementer(IPushProducer)
+class _JSONStreamProducer(object):
+    """
+    Push producer which writes a stream of JSON data to a request, and stops
+    reading from the stream while the transport's write buffer is full.
+    """
+
+    # Fragments are written in chunks of about this many bytes
+    chunkSize = 64 * 1024
+
+
+    def __init__(self, request: IRequest, jsonStream: JSONStream) -> None:
+        self._request = request
+        self._stream = jsonStream
+        self._paused: Optional[Deferred] = None
+        self._stopped = False
+        self._disconnected = False
+
+
+    def pauseProducing(self) -> None:
+        if self._paused is None:
+            self._paused = Deferred()
+
+
+    def resumeProducing(self) -> None:
+        paused, self._paused = self._paused, None
+        if paused is not None:
+            paused.callback(None)
+
+
+    def stopProducing(self) -> None:
+        self._stopped = True
+        self.resumeProducing()
+
+
+    async def _fragments(self) -> AsyncIterator[bytes]:
+        if isinstance(self._stream, AsyncIterator):
+            async for fragment in self._stream:
+                yield fragment
+        else:
+            for fragment in self._stream:
+                yield fragment
+
+
+    async def produce(self) -> None:
+        """
+        Write the stream to the request.
+        """
+        request = self._request
+
+        def disconnected(f: Failure) -> None:
+            self._disconnected = True
+            self.stopProducing()
+
+        request.notifyFinish().addErrback(disconnected)
+        request.registerProducer(self, True)
+
+        chunk: List[bytes] = []
+        size = 0
+
+        try:
+            async for fragment in self._fragments():
+                if self._stopped:
+                    return
+
+                chunk.append(fragment)
+                size += len(fragment)
+
+                if size >= self.chunkSize:
+                    request.write(b"".join(chunk))
+                    chunk = []
+                    size = 0
+
+                    if self._paused is not None:
+                        await self._paused
+
+            if chunk and not self._stopped:
+                request.write(b"".join(chunk))
+        finally:
+            # The request can't unregister the producer once it has lost its
+            # connection.
+            if not self._disconnected:
+                request.unregisterProducer()
+
+
+async def writeJSONStream(
+    request: IRequest, jsonStream: JSONStream,
     etag: Optional[str] = None,
 ) -> None:
     """
     Respond with a stream of JSON data.
+    The stream is read only as fast as the client receives it.
     """
     request.setHeader(HeaderName.contentType.value, ContentType.json.value)
     if etag is not None:
+        if notModified(request, etag):
+            return
         request.setHeader(HeaderName.etag.value, etag)
-    for line in jsonStream:
-        request.write(line)
+
+    await _JSONStreamProducer(request, jsonStream).produce()
 
 
 def buildJSONArray(items: Iterable[Any]) -> Iterable[bytes]:
@@ -82,3 +248,56 @@ def buildJSONArray(items: Iterable[Any]) -> Iterable[bytes]:
         yield item
 
     yield b']'
+
+
+async def buildAsyncJSONArray(
+    items: AsyncIterator[Any]
+) -> AsyncIterator[bytes]:
+    """
+    Generate a JSON array from an asynchronous iterable of JSON objects.
+    """
+    first = True
+
+    yield b'['
+
+    async for item in items:
+        if first:
+            first = False
+        else:
+            yield b","
+
+        yield item
+
+    yield b']'
+
+
+
+#
+# Static files
+#
+
+staticContentCache = CompressedContentCache()
+
+
+
+class StaticFile(File):
+    """
+    Static file resource which serves compressed content from
+    :obj:`staticContentCache` to clients that accept it.
+    """
+
+    def makeProducer(
+        self, request: IRequest, fileForReading: BinaryIO
+    ) -> StaticProducer:
+        if request.getHeader(HeaderName.range.value) is not None:
+            return super().makeProducer(request, fileForReading)
+
+        self._setContentHeaders(request)
+
+        with fileForReading:
+            data = staticContentCache.encodedFrom(
+                request, self.path, self.getModificationTime(),
+                self.getFileSize(), fileForReading.read,
+            )
+
+        return NoRangeStaticProducer(request, BytesIO(data))
@@ -0,0 +1,99 @@
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+Test support for :mod:`ranger-ims-server.application`
+"""
+
+from pathlib import Path
+from typing import Any, Mapping, Optional
+
+from twisted.web.test.requesthelper import DummyRequest
+
+from ims.auth._provider import User
+from ims.config import Configuration
+from ims.model.test.rangers import rangerHubcap
+
+
+__all__ = ()
+
+
+# An on-site user, so that authorization doesn't depend on RequireActive
+userHubcap = User(ranger=rangerHubcap.replace(onSite=True), groups=())
+
+
+
+class TestRequest(DummyRequest):
+    """
+    Fake request.
+
+    Unlike :class:`DummyRequest`, which pulls from producers registered with
+    it, this keeps the registered producer so that tests can drive it.
+    """
+
+    def __init__(
+        self, method: bytes = b"GET",
+        args: Optional[Mapping[str, str]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        user: Optional[User] = None,
+    ) -> None:
+        super().__init__([])
+
+        self.method = method
+
+        if args is not None:
+            for name, value in args.items():
+                self.addArg(name.encode("utf-8"), value.encode("utf-8"))
+
+        if headers is not None:
+            for name, value in headers.items():
+                self.requestHeaders.setRawHeaders(name, [value])
+
+        if user is not None:
+            self.getSession().user = user
+
+        self.producer: Any = None
+        self.producerUnregistered = False
+
+
+    def registerProducer(self, producer: Any, streaming: bool) -> None:
+        self.producer = producer
+
+
+    def unregisterProducer(self) -> None:
+        self.producer = None
+        self.producerUnregistered = True
+
+
+    def getWrittenData(self) -> bytes:
+        """
+        Return the data written to this request so far.
+        """
+        return b"".join(self.written)
+
+
+
+def testConfiguration(root: Path) -> Configuration:
+    """
+    Create a configuration with its server root (and therefore its data
+    store) in the given directory.
+    """
+    (root / "data").mkdir(parents=True)
+
+    configFile = root / "imsd.conf"
+    configFile.write_text(f"[Core]\nServerRoot = {root.absolute()}\n")
+
+    return Configuration(configFile)
@@ -0,0 +1,366 @@
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+Tests for :mod:`ranger-ims-server.application._api`
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Mapping, Optional, Tuple
+
+from twisted.internet.defer import CancelledError, Deferred, ensureDeferred
+from twisted.web import http
+
+from ims.auth import NotAuthenticatedError, NotAuthorizedError
+from ims.auth._provider import User
+from ims.ext.klein import KleinRouteMethod
+from ims.ext.trial import TestCase
+from ims.model import Event, Incident
+from ims.store.sqlite.test.test_store_incident import anEvent, anIncident
+from ims.store.sqlite.test.test_store_report import anIncidentReport
+
+from .base import TestRequest, testConfiguration, userHubcap
+from .._api import APIApplication
+from .._eventsource import DataStoreEventSourceLogObserver
+
+
+__all__ = ()
+
+
+anotherEvent = Event(id="bar")
+
+
+
+class ConditionalRequestTests(TestCase):
+    """
+    Tests for conditional requests to :class:`APIApplication` endpoints.
+    """
+
+    def setUp(self) -> None:
+        config = testConfiguration(Path(self.mktemp()))
+        self.app = APIApplication(
+            config=config, storeObserver=DataStoreEventSourceLogObserver()
+        )
+        self.store = config.store
+
+        self.successResultOf(self.store.createEvent(anEvent))
+        self.successResultOf(self.store.setReaders(anEvent, ("*",)))
+        self.successResultOf(self.store.createIncident(
+            anIncident.replace(number=0), "Hubcap"
+        ))
+
+
+    def get(
+        self, resource: KleinRouteMethod, *args: Any,
+        etag: Optional[str] = None, query: Optional[Mapping[str, str]] = None,
+    ) -> TestRequest:
+        if etag is None:
+            headers = None
+        else:
+            headers = {"If-None-Match": etag}
+
+        request = TestRequest(args=query, headers=headers, user=userHubcap)
+        # Some resources write their content, others return it
+        body = self.successResultOf(resource(request, *args))
+        if body is not None:
+            request.write(body)
+
+        return request
+
+
+    def assertConditional(
+        self, resource: KleinRouteMethod, *args: Any,
+        change: Callable[[], Awaitable[Any]],
+        query: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """
+        Assert that the given resource sets an ETag, responds with NOT
+        MODIFIED and no content to a request with that ETag in the
+        If-None-Match header, and sets a different ETag after the given
+        change.
+        """
+        request = self.get(resource, *args, query=query)
+        self.assertIn(request.responseCode, (None, http.OK))
+        self.assertTrue(request.getWrittenData())
+        etag = self._headerValue(request, "ETag")
+        assert etag is not None
+        self.assertStartsWith(etag, 'W/"')
+
+        request = self.get(resource, *args, etag=etag, query=query)
+        self.assertEqual(request.responseCode, http.NOT_MODIFIED)
+        self.assertEqual(request.getWrittenData(), b"")
+
+        self.successResultOf(change())
+
+        request = self.get(resource, *args, etag=etag, query=query)
+        self.assertIn(request.responseCode, (None, http.OK))
+        self.assertTrue(request.getWrittenData())
+        self.assertNotEqual(self._headerValue(request, "ETag"), etag)
+
+
+    def test_incidentTypes(self) -> None:
+        """
+        The incident types endpoint responds to conditional requests.
+        """
+        self.assertConditional(
+            self.app.incidentTypesResource,
+            change=lambda: self.store.createIncidentType("Cat"),
+        )
+
+
+    def test_listIncidents(self) -> None:
+        """
+        The incident list endpoint responds to conditional requests.
+        """
+        self.assertConditional(
+            self.app.listIncidentsResource, anEvent.id,
+            change=lambda: self.store.setIncident_summary(
+                anEvent, 1, "Changed", "Hubcap"
+            ),
+        )
+
+
+    def test_readIncident(self) -> None:
+        """
+        The incident endpoint responds to conditional requests.
+        """
+        self.assertConditional(
+            self.app.readIncidentResource, anEvent.id, "1",
+            change=lambda: self.store.setIncident_summary(
+                anEvent, 1, "Changed", "Hubcap"
+            ),
+        )
+
+
+    def test_readIncident_otherIncident(self) -> None:
+        """
+        Changes to other incidents in the event don't change the incident
+        endpoint's ETag.
+        """
+        request = self.get(self.app.readIncidentResource, anEvent.id, "1")
+        etag = self._headerValue(request, "ETag")
+        assert etag is not None
+
+        self.successResultOf(self.store.createIncident(
+            anIncident.replace(number=0), "Hubcap"
+        ))
+
+        request = self.get(
+            self.app.readIncidentResource, anEvent.id, "1", etag=etag
+        )
+        self.assertEqual(request.responseCode, http.NOT_MODIFIED)
+
+
+    def test_listIncidentReports(self) -> None:
+        """
+        The incident reports endpoint responds to conditional requests.
+        """
+        self.assertConditional(
+            self.app.listIncidentReportsResource,
+            query=dict(event="", incident=""),
+            change=lambda: self.store.createIncidentReport(
+                anIncidentReport, "Hubcap"
+            ),
+        )
+
+
+    def test_post(self) -> None:
+        """
+        A matching If-None-Match header doesn't prevent a POST.
+        """
+        request = self.get(self.app.incidentTypesResource)
+        etag = self._headerValue(request, "ETag")
+        assert etag is not None
+
+        request = TestRequest(
+            method=b"POST", headers={"If-None-Match": etag}, user=userHubcap
+        )
+        self.successResultOf(self.app.incidentTypesResource(request))
+        self.assertIdentical(request.responseCode, None)
+        self.assertTrue(request.getWrittenData())
+
+
+
+class EventSourceTests(TestCase):
+    """
+    Tests for :meth:`APIApplication.eventSourceResource`
+    """
+
+    def setUp(self) -> None:
+        config = testConfiguration(Path(self.mktemp()))
+        self.observer = DataStoreEventSourceLogObserver(store=config.store)
+        self.app = APIApplication(config=config, storeObserver=self.observer)
+        self.store = config.store
+
+        self.successResultOf(self.store.createEvent(anEvent))
+        self.successResultOf(self.store.setReaders(anEvent, ("*",)))
+        self.successResultOf(self.store.createIncident(
+            anIncident.replace(number=0), "Hubcap"
+        ))
+        self.successResultOf(self.store.createEvent(anotherEvent))
+
+
+    def connect(
+        self, query: Mapping[str, str], user: Optional[User] = userHubcap
+    ) -> Tuple[TestRequest, Deferred]:
+        request = TestRequest(args=query, user=user)
+        return request, ensureDeferred(self.app.eventSourceResource(request))
+
+
+    def assertListening(self, request: TestRequest, d: Deferred) -> None:
+        """
+        Assert that the given request is connected to the event source, then
+        disconnect it.
+        """
+        self.assertNoResult(d)
+
+        self.observer(dict(
+            storeWriteClass=Incident, event=anEvent, incidentNumber=1
+        ))
+        self.assertIn(b"event: Incident", request.getWrittenData())
+
+        d.cancel()
+        self.failureResultOf(d, CancelledError)
+
+
+    def assertNotListening(self, request: TestRequest) -> None:
+        self.observer(dict(
+            storeWriteClass=Incident, event=anEvent, incidentNumber=1
+        ))
+        self.assertNotIn(b"event: Incident", request.getWrittenData())
+
+
+    def test_unscoped(self) -> None:
+        """
+        Listeners that don't subscribe to an IMS event need not be
+        authenticated.
+        """
+        self.assertListening(*self.connect({}, user=None))
+
+
+    def test_event_authorized(self) -> None:
+        """
+        Listeners authorized to read incidents in an IMS event may subscribe
+        to its events, with or without the updated incidents.
+        """
+        for query in (
+            dict(event=anEvent.id),
+            dict(event=anEvent.id, incident="1"),
+            dict(event=anEvent.id, payload="incident"),
+        ):
+            self.assertListening(*self.connect(query))
+
+
+    def test_event_notAuthenticated(self) -> None:
+        """
+        Listeners that subscribe to an IMS event must be authenticated.
+        """
+        for query in (
+            dict(event=anEvent.id),
+            dict(event=anEvent.id, incident="1"),
+            dict(event=anEvent.id, payload="incident"),
+        ):
+            request, d = self.connect(query, user=None)
+            self.failureResultOf(d, NotAuthenticatedError)
+            self.assertNotListening(request)
+
+
+    def test_event_notAuthorized(self) -> None:
+        """
+        Listeners that subscribe to an IMS event must be authorized to read
+        incidents in that IMS event.
+        """
+        for query in (
+            dict(event=anotherEvent.id),
+            dict(event=anotherEvent.id, incident="1"),
+            dict(event=anotherEvent.id, payload="incident"),
+        ):
+            request, d = self.connect(query)
+            self.failureResultOf(d, NotAuthorizedError)
+            self.assertNotListening(request)
+
+
+    def test_payload_noEvent(self) -> None:
+        """
+        Listeners may not be sent updated incidents without subscribing to an
+        IMS event.
+        """
+        request, d = self.connect(dict(payload="incident"))
+
+        self.successResultOf(d)
+        self.assertEqual(request.responseCode, http.BAD_REQUEST)
+        self.assertNotListening(request)
+
+
+
+class SearchIncidentsTests(TestCase):
+    """
+    Tests for :meth:`APIApplication.searchIncidentsResource`
+    """
+
+    def setUp(self) -> None:
+        config = testConfiguration(Path(self.mktemp()))
+        self.app = APIApplication(
+            config=config, storeObserver=DataStoreEventSourceLogObserver()
+        )
+        self.store = config.store
+
+        self.successResultOf(self.store.createEvent(anEvent))
+        self.successResultOf(self.store.setReaders(anEvent, ("*",)))
+        for number in range(3):
+            self.successResultOf(self.store.createIncident(
+                anIncident.replace(summary=f"Lost dog #{number}"), "Hubcap"
+            ))
+
+
+    def search(self, query: Mapping[str, str]) -> TestRequest:
+        request = TestRequest(args=query, user=userHubcap)
+        body = self.successResultOf(
+            self.app.searchIncidentsResource(request, anEvent.id)
+        )
+        request.write(body)
+        return request
+
+
+    def test_search(self) -> None:
+        """
+        The incident search endpoint responds with matching incidents.
+        """
+        request = self.search(dict(q="dog"))
+
+        results = json.loads(request.getWrittenData())
+        self.assertEqual(sorted(r["number"] for r in results), [1, 2, 3])
+
+
+    def test_limit(self) -> None:
+        """
+        The incident search endpoint responds with at most the number of
+        results given by the ``limit`` query parameter.
+        """
+        request = self.search(dict(q="dog", limit="2"))
+
+        self.assertEqual(len(json.loads(request.getWrittenData())), 2)
+
+
+    def test_limit_invalid(self) -> None:
+        """
+        The incident search endpoint rejects a ``limit`` query parameter that
+        isn't a positive number.
+        """
+        for limit in ("x", "0", "-1"):
+            request = self.search(dict(q="dog", limit=limit))
+            self.assertEqual(request.responseCode, http.BAD_REQUEST)
@@ -0,0 +1,819 @@
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+Tests for :mod:`ranger-ims-server.application._eventsource`
+"""
+
+from json import loads
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, cast
+
+from twisted.internet.defer import Deferred
+from twisted.web.server import Request
+from twisted.web.test.requesthelper import DummyChannel
+
+from ims.ext.trial import TestCase
+from ims.model import Event, Incident
+from ims.model.json import jsonBytesFromModelObject
+from ims.store import IMSDataStore, StorageError
+from ims.store.sqlite import DataStore
+from ims.store.sqlite.test.base import TestDataStore
+from ims.store.sqlite.test.test_store_incident import anEvent, anIncident
+
+from .base import TestRequest
+from .._eventsource import DataStoreEventSourceLogObserver
+
+
+__all__ = ()
+
+
+anotherEvent = Event(id="bar")
+
+
+def incidentStoreEvent(event: Event, number: int) -> Dict[str, Any]:
+    """
+    Create a logger event like the data store emits when writing the given
+    incident.
+    """
+    return dict(
+        storeWriteClass=Incident,
+        incident=anIncident.replace(event=event, number=number),
+    )
+
+
+def messages(
+    listener: TestRequest
+) -> List[Tuple[Optional[str], Optional[str], Any]]:
+    """
+    Parse the EventSource events written to the given listener into tuples
+    of event ID, event class and JSON data.
+    """
+    result = []
+
+    for text in listener.getWrittenData().decode("utf-8").split("\r\n\r\n"):
+        if not text:
+            continue
+
+        fields: Dict[str, str] = {}
+        for line in text.split("\r\n"):
+            name, _, value = line.partition(": ")
+            fields[name] = value
+
+        result.append(
+            (fields.get("id"), fields.get("event"), loads(fields["data"]))
+        )
+
+    return result
+
+
+def incidentKeys(
+    listener: TestRequest
+) -> List[Tuple[Optional[str], Optional[int]]]:
+    """
+    Look up the IMS event ID and incident number of each message written to
+    the given listener.
+    """
+    return [
+        (data.get("event"), data.get("incident_number"))
+        for eventID, eventClass, data in messages(listener)
+    ]
+
+
+
+class TopicTests(TestCase):
+    """
+    Tests for routing of events by :class:`DataStoreEventSourceLogObserver`
+    to listeners by topic.
+    """
+
+    def publishAll(self, observer: DataStoreEventSourceLogObserver) -> None:
+        for event, number in (
+            (anEvent, 1), (anEvent, 2), (anotherEvent, 1), (anotherEvent, 2),
+        ):
+            observer(incidentStoreEvent(event, number))
+
+
+    def test_unscoped(self) -> None:
+        """
+        Listeners added without an IMS event are sent all events.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        listener = TestRequest()
+        observer.addListener(listener)
+
+        self.publishAll(observer)
+
+        self.assertEqual(
+            incidentKeys(listener),
+            [("foo", 1), ("foo", 2), ("bar", 1), ("bar", 2)],
+        )
+
+
+    def test_event(self) -> None:
+        """
+        Listeners added with an IMS event are sent only the events for that
+        IMS event.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        listener = TestRequest()
+        observer.addListener(listener, eventID=anotherEvent.id)
+
+        self.publishAll(observer)
+
+        self.assertEqual(incidentKeys(listener), [("bar", 1), ("bar", 2)])
+
+
+    def test_incident(self) -> None:
+        """
+        Listeners added with an IMS event and an incident number are sent only
+        the events for that incident.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        listener = TestRequest()
+        observer.addListener(listener, eventID=anEvent.id, incidentNumber=2)
+
+        self.publishAll(observer)
+
+        self.assertEqual(incidentKeys(listener), [("foo", 2)])
+
+
+    def test_mixed(self) -> None:
+        """
+        Listeners with different topics are each sent the events for their
+        topic.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        everything = TestRequest()
+        foo = TestRequest()
+        bar1 = TestRequest()
+        observer.addListener(everything)
+        observer.addListener(foo, eventID=anEvent.id)
+        observer.addListener(bar1, eventID=anotherEvent.id, incidentNumber=1)
+
+        self.publishAll(observer)
+
+        self.assertEqual(len(messages(everything)), 4)
+        self.assertEqual(incidentKeys(foo), [("foo", 1), ("foo", 2)])
+        self.assertEqual(incidentKeys(bar1), [("bar", 1)])
+
+
+    def test_incidentWithoutEvent(self) -> None:
+        """
+        :meth:`DataStoreEventSourceLogObserver.addListener` raises
+        :exc:`ValueError` if given an incident number without an IMS event.
+        """
+        observer = DataStoreEventSourceLogObserver()
+
+        self.assertRaises(
+            ValueError, observer.addListener, TestRequest(), incidentNumber=1
+        )
+
+
+    def test_removeListener(self) -> None:
+        """
+        Removed listeners are sent no further events, and other listeners for
+        the same topic still are.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        removed = TestRequest()
+        kept = TestRequest()
+        observer.addListener(removed, eventID=anEvent.id)
+        observer.addListener(kept, eventID=anEvent.id)
+
+        observer.removeListener(removed)
+        observer.removeListener(removed)  # No-op
+
+        self.publishAll(observer)
+
+        self.assertEqual(messages(removed), [])
+        self.assertEqual(incidentKeys(kept), [("foo", 1), ("foo", 2)])
+
+
+    def test_serverRequest(self) -> None:
+        """
+        Listeners may be server requests, which aren't hashable.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        channel = DummyChannel()
+        listener = Request(channel, False)
+        observer.addListener(listener, eventID=anEvent.id)
+
+        self.publishAll(observer)
+        observer.removeListener(listener)
+        observer(incidentStoreEvent(anEvent, 3))
+
+        written = channel.transport.written.getvalue()
+        self.assertEqual(written.count(b"event: Incident"), 2)
+
+
+    def test_notStoreEvent(self) -> None:
+        """
+        Log events that aren't data store events are not sent to listeners.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        listener = TestRequest()
+        observer.addListener(listener)
+
+        observer(dict(log_format="Hello"))
+
+        self.assertEqual(messages(listener), [])
+
+
+    def test_message(self) -> None:
+        """
+        Incident events carry the class ``Incident`` and the IMS event ID and
+        incident number of the incident.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        listener = TestRequest()
+        observer.addListener(listener)
+
+        observer(dict(
+            storeWriteClass=Incident, event=anEvent, incidentNumber=3
+        ))
+
+        ((eventID, eventClass, data),) = messages(listener)
+        self.assertEqual(eventClass, "Incident")
+        self.assertEqual(data, dict(event="foo", incident_number=3))
+
+
+
+class FakeDataStore(object):
+    """
+    Fake data store with the methods used to send updated incidents, whose
+    reads may be held until released.
+    """
+
+    def __init__(self) -> None:
+        self.incidents: Dict[Tuple[str, int], Incident] = {}
+        self.revisions: Dict[Tuple[str, int], int] = {}
+        self.broken: Set[int] = set()
+        self.reads: List[int] = []
+        self.holding = False
+        self.held: List[Deferred] = []
+
+
+    def addIncident(
+        self, event: Event, number: int, revision: int = 1
+    ) -> Incident:
+        incident = anIncident.replace(event=event, number=number)
+        self.incidents[(event.id, number)] = incident
+        self.revisions[(event.id, number)] = revision
+        return incident
+
+
+    def release(self) -> None:
+        """
+        Release the reads held so far.
+        """
+        held, self.held = self.held, []
+        for d in held:
+            d.callback(None)
+
+
+    async def incidentRevision(self, event: Event, number: int) -> int:
+        if self.holding:
+            d = Deferred()
+            self.held.append(d)
+            await d
+        return self.revisions[(event.id, number)]
+
+
+    async def incidentWithNumber(self, event: Event, number: int) -> Incident:
+        self.reads.append(number)
+        if number in self.broken:
+            raise StorageError("I'm broken, yo")
+        return self.incidents[(event.id, number)]
+
+
+    def jsonBytes(self, obj: Any) -> bytes:
+        return jsonBytesFromModelObject(obj)
+
+
+
+class BrokenListener(TestRequest):
+    """
+    Listener which has lost its connection.
+    """
+
+    def write(self, data: bytes) -> None:
+        raise RuntimeError("Connection lost")
+
+
+
+class IncidentPayloadTests(TestCase):
+    """
+    Tests for sending updated incidents to listeners of
+    :class:`DataStoreEventSourceLogObserver`.
+    """
+
+    def setUp(self) -> None:
+        self.store = FakeDataStore()
+        self.observer = DataStoreEventSourceLogObserver(
+            store=cast(IMSDataStore, self.store)
+        )
+
+
+    def listener(self, withIncident: bool = True) -> TestRequest:
+        listener = TestRequest()
+        self.observer.addListener(
+            listener, eventID=anEvent.id, withIncident=withIncident
+        )
+        return listener
+
+
+    def publish(self, number: int) -> None:
+        self.observer(incidentStoreEvent(anEvent, number))
+
+
+    def test_message(self) -> None:
+        """
+        Listeners that are sent updated incidents are sent the IMS event ID,
+        incident number, the incident's revision and the incident.
+        """
+        incident = self.store.addIncident(anEvent, 1, revision=7)
+        self.store.addIncident(anEvent, 2, revision=8)
+        listener = self.listener()
+
+        self.publish(1)
+
+        ((eventID, eventClass, data),) = messages(listener)
+        self.assertEqual(eventClass, "Incident")
+        self.assertEqual(
+            data,
+            dict(
+                event="foo",
+                incident_number=1,
+                revision=7,
+                incident=loads(jsonBytesFromModelObject(incident)),
+            ),
+        )
+
+
+    def test_notRequested(self) -> None:
+        """
+        Listeners that are not sent updated incidents are sent only the IMS
+        event ID and incident number, and incidents are not read for them.
+        """
+        self.store.addIncident(anEvent, 1)
+        withIncident = self.listener()
+        withoutIncident = self.listener(withIncident=False)
+
+        self.publish(1)
+
+        ((eventID, eventClass, data),) = messages(withoutIncident)
+        self.assertEqual(data, dict(event="foo", incident_number=1))
+        self.assertEqual(len(messages(withIncident)), 1)
+
+        self.observer.removeListener(withIncident)
+        self.publish(1)
+
+        self.assertEqual(self.store.reads, [1])
+        self.assertEqual(len(messages(withoutIncident)), 2)
+
+
+    def test_folded(self) -> None:
+        """
+        Store events for an incident that is waiting to be sent are sent with
+        it, as the incident is read when it is sent, with the ID of the latest
+        of those store events.
+        Incidents are sent in the order of their store events.
+        """
+        self.store.addIncident(anEvent, 1)
+        self.store.addIncident(anEvent, 2)
+        listener = self.listener()
+
+        self.store.holding = True
+        self.publish(1)  # Read held
+        self.publish(2)
+        self.publish(1)
+        self.publish(1)
+
+        while self.store.held:
+            self.store.release()
+
+        sent = messages(listener)
+        self.assertEqual(self.store.reads, [1, 2, 1])
+        self.assertEqual(
+            [data["incident_number"] for eventID, eventClass, data in sent],
+            [1, 2, 1],
+        )
+
+        ids = [int(cast(str, eventID)) for eventID, eventClass, data in sent]
+        self.assertEqual(ids, [ids[0], ids[0] + 1, ids[0] + 3])
+
+
+    def test_foldedOrder(self) -> None:
+        """
+        Incidents waiting to be sent are sent in the order of their latest
+        store events, so that event IDs sent to listeners increase.
+        """
+        self.store.addIncident(anEvent, 1)
+        self.store.addIncident(anEvent, 2)
+        self.store.addIncident(anEvent, 3)
+        listener = self.listener()
+
+        self.store.holding = True
+        self.publish(3)  # Read held
+        self.publish(1)
+        self.publish(2)
+        self.publish(1)
+
+        while self.store.held:
+            self.store.release()
+
+        sent = messages(listener)
+        self.assertEqual(
+            [data["incident_number"] for eventID, eventClass, data in sent],
+            [3, 2, 1],
+        )
+
+        ids = [int(cast(str, eventID)) for eventID, eventClass, data in sent]
+        self.assertEqual(ids, sorted(ids))
+
+
+    def test_storageError(self) -> None:
+        """
+        Incidents that can't be read are skipped, and later incidents are
+        still sent.
+        """
+        self.store.addIncident(anEvent, 1)
+        self.store.addIncident(anEvent, 2)
+        self.store.broken.add(1)
+        listener = self.listener()
+
+        self.store.holding = True
+        self.publish(1)  # Read held
+        self.publish(2)
+
+        while self.store.held:
+            self.store.release()
+
+        self.assertEqual(incidentKeys(listener), [("foo", 2)])
+
+        self.store.holding = False
+        self.store.broken.clear()
+        self.publish(1)
+
+        self.assertEqual(incidentKeys(listener), [("foo", 2), ("foo", 1)])
+
+
+    def test_removedWhileReading(self) -> None:
+        """
+        Listeners removed while an incident is read are not sent it, and
+        incidents with no remaining listeners are not read.
+        """
+        self.store.addIncident(anEvent, 1)
+        self.store.addIncident(anEvent, 2)
+        removed = self.listener()
+        kept = TestRequest()
+        self.observer.addListener(
+            kept, eventID=anEvent.id, incidentNumber=1, withIncident=True
+        )
+
+        self.store.holding = True
+        self.publish(1)  # Read held
+        self.publish(2)
+
+        self.observer.removeListener(removed)
+
+        while self.store.held:
+            self.store.release()
+
+        self.assertEqual(messages(removed), [])
+        self.assertEqual(incidentKeys(kept), [("foo", 1)])
+        self.assertEqual(self.store.reads, [1])
+
+
+    def test_writeFailed(self) -> None:
+        """
+        Listeners that can't be written to are removed, and other listeners
+        are still sent the incident.
+        """
+        self.store.addIncident(anEvent, 1)
+        broken = BrokenListener()
+        self.observer.addListener(
+            broken, eventID=anEvent.id, withIncident=True
+        )
+        listener = self.listener()
+
+        self.publish(1)
+        self.publish(1)
+
+        self.assertEqual(incidentKeys(listener), [("foo", 1), ("foo", 1)])
+        self.assertEqual(self.store.reads, [1, 1])
+
+
+
+def publish(
+    observer: DataStoreEventSourceLogObserver,
+    numbers: Sequence[int], event: Event = anEvent,
+) -> List[int]:
+    """
+    Publish events for the given incident numbers to the given observer, and
+    return their IDs.
+    """
+    recorder = TestRequest()
+    observer.addListener(recorder)
+
+    for number in numbers:
+        observer(incidentStoreEvent(event, number))
+
+    observer.removeListener(recorder)
+
+    return [
+        int(cast(str, eventID))
+        for eventID, eventClass, data in messages(recorder)
+    ]
+
+
+
+class PlaybackTests(TestCase):
+    """
+    Tests for playback of missed events to listeners of
+    :class:`DataStoreEventSourceLogObserver` that send a ``Last-Event-ID``.
+    """
+
+    def resume(
+        self, observer: DataStoreEventSourceLogObserver,
+        lastEventID: Optional[str], **kwargs: Any
+    ) -> TestRequest:
+        listener = TestRequest()
+        observer.addListener(listener, lastEventID=lastEventID, **kwargs)
+        return listener
+
+
+    def assertReset(self, listener: TestRequest, eventID: int) -> None:
+        """
+        Assert that the given listener was sent only a ``Reset`` event with
+        the given ID.
+        """
+        self.assertEqual(messages(listener), [(str(eventID), "Reset", {})])
+
+
+    def test_consecutive(self) -> None:
+        """
+        Events are numbered consecutively.
+        """
+        observer = DataStoreEventSourceLogObserver()
+
+        ids = publish(observer, (1, 2, 3))
+
+        self.assertEqual(ids, [ids[0], ids[0] + 1, ids[0] + 2])
+
+
+    def test_noLastEventID(self) -> None:
+        """
+        Listeners that don't send a ``Last-Event-ID`` are not sent earlier
+        events.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        publish(observer, (1, 2, 3))
+
+        self.assertEqual(messages(self.resume(observer, None)), [])
+
+
+    def test_current(self) -> None:
+        """
+        Listeners whose ``Last-Event-ID`` is the latest event are not sent
+        earlier events.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        ids = publish(observer, (1, 2, 3))
+
+        self.assertEqual(messages(self.resume(observer, str(ids[-1]))), [])
+
+
+    def test_missed(self) -> None:
+        """
+        Listeners are sent the events after their ``Last-Event-ID``.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        ids = publish(observer, (1, 2, 3))
+
+        listener = self.resume(observer, str(ids[0]))
+
+        self.assertEqual(
+            [
+                (eventID, data)
+                for eventID, eventClass, data in messages(listener)
+            ],
+            [
+                (str(ids[1]), dict(event="foo", incident_number=2)),
+                (str(ids[2]), dict(event="foo", incident_number=3)),
+            ],
+        )
+
+
+    def test_missed_topic(self) -> None:
+        """
+        Listeners are sent only the events after their ``Last-Event-ID`` for
+        the topic they subscribe to.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        ids = publish(observer, (1,))
+        publish(observer, (1, 2), event=anotherEvent)
+        publish(observer, (2,))
+
+        listener = self.resume(
+            observer, str(ids[0]), eventID=anEvent.id, incidentNumber=2
+        )
+
+        self.assertEqual(incidentKeys(listener), [("foo", 2)])
+
+
+    def test_missed_buffered(self) -> None:
+        """
+        Listeners whose ``Last-Event-ID`` is just before the earliest buffered
+        event are sent all buffered events.
+        """
+        observer = DataStoreEventSourceLogObserver(bufferSize=3)
+        ids = publish(observer, (1, 2, 3, 4, 5))
+
+        listener = self.resume(observer, str(ids[1]))
+
+        self.assertEqual(
+            incidentKeys(listener), [("foo", 3), ("foo", 4), ("foo", 5)]
+        )
+
+
+    def test_reset_tooOld(self) -> None:
+        """
+        Listeners whose ``Last-Event-ID`` is earlier than the events kept in
+        the buffer are sent a ``Reset`` event with the latest event ID.
+        """
+        observer = DataStoreEventSourceLogObserver(bufferSize=3)
+        ids = publish(observer, (1, 2, 3, 4, 5))
+
+        self.assertReset(self.resume(observer, str(ids[0])), ids[-1])
+
+
+    def test_reset_noneBuffered(self) -> None:
+        """
+        Listeners whose ``Last-Event-ID`` is earlier than the latest event
+        are sent a ``Reset`` event if no events are buffered.
+        """
+        observer = DataStoreEventSourceLogObserver(bufferSize=0)
+        ids = publish(observer, (1, 2))
+
+        self.assertReset(self.resume(observer, str(ids[0])), ids[-1])
+
+
+    def test_reset_future(self) -> None:
+        """
+        Listeners whose ``Last-Event-ID`` is later than the latest event, as
+        when the ID is from another server process, are sent a ``Reset``
+        event.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        ids = publish(observer, (1, 2))
+
+        self.assertReset(self.resume(observer, str(ids[-1] + 1)), ids[-1])
+
+
+    def test_reset_notInteger(self) -> None:
+        """
+        Listeners whose ``Last-Event-ID`` isn't an integer, such as an ID in
+        the ``observerID:counter`` form used by earlier versions, are sent a
+        ``Reset`` event.
+        """
+        observer = DataStoreEventSourceLogObserver()
+        ids = publish(observer, (1, 2))
+
+        for lastEventID in ("4242424242:17", "xyzzy", ""):
+            self.assertReset(self.resume(observer, lastEventID), ids[-1])
+
+
+
+class PersistenceTests(TestCase):
+    """
+    Tests for persistence of events by
+    :class:`DataStoreEventSourceLogObserver`.
+    """
+
+    def store(self) -> DataStore:
+        return DataStore(dbPath=Path(self.mktemp()))
+
+
+    def test_noStore(self) -> None:
+        """
+        :class:`DataStoreEventSourceLogObserver` raises :exc:`ValueError` if
+        asked to persist events without a data store.
+        """
+        self.assertRaises(
+            ValueError, DataStoreEventSourceLogObserver, persist=True
+        )
+
+
+    def test_kept(self) -> None:
+        """
+        Events are kept in the data store, up to the buffer size.
+        """
+        store = self.store()
+        observer = DataStoreEventSourceLogObserver(
+            store=store, persist=True, bufferSize=3
+        )
+
+        ids = publish(observer, (1, 2, 3, 4))
+
+        notifications = self.successResultOf(store.changeNotifications(10))
+        self.assertEqual(
+            [
+                (n.number, n.eventID, n.incidentNumber, n.eventClass)
+                for n in notifications
+            ],
+            [(ids[i], "foo", i + 1, "Incident") for i in (1, 2, 3)],
+        )
+
+
+    def test_notKept(self) -> None:
+        """
+        Events are not kept in the data store unless asked.
+        """
+        store = self.store()
+        observer = DataStoreEventSourceLogObserver(store=store)
+
+        publish(observer, (1, 2))
+
+        self.assertEqual(
+            self.successResultOf(store.changeNotifications(10)), ()
+        )
+
+
+    def test_reloaded(self) -> None:
+        """
+        A new observer with the same data store continues numbering events
+        from the latest kept event, and plays back the kept events.
+        """
+        store = self.store()
+        observer = DataStoreEventSourceLogObserver(
+            store=store, persist=True, bufferSize=3
+        )
+        ids = publish(observer, (1, 2, 3, 4))
+
+        observer = DataStoreEventSourceLogObserver(
+            store=store, persist=True, bufferSize=3
+        )
+        self.successResultOf(observer.load())
+
+        listener = TestRequest()
+        observer.addListener(listener, lastEventID=str(ids[1]))
+        self.assertEqual(
+            [
+                (int(cast(str, eventID)), eventClass, data)
+                for eventID, eventClass, data in messages(listener)
+            ],
+            [
+                (ids[2], "Incident", dict(event="foo", incident_number=3)),
+                (ids[3], "Incident", dict(event="foo", incident_number=4)),
+            ],
+        )
+
+        newIDs = publish(observer, (5,))
+        self.assertEqual(newIDs, [ids[-1] + 1])
+
+        listener = TestRequest()
+        observer.addListener(listener, lastEventID=str(ids[0]))
+        self.assertEqual(
+            messages(listener), [(str(newIDs[0]), "Reset", {})]
+        )
+
+
+    def test_loadNotPersisted(self) -> None:
+        """
+        Observers that don't persist events don't read the data store when
+        loading.
+        """
+        store = TestDataStore(dbPath=Path(self.mktemp()))
+        observer = DataStoreEventSourceLogObserver(store=store)
+        store.bringThePain()
+
+        self.successResultOf(observer.load())
+
+
+    def test_keepFailed(self) -> None:
+        """
+        Events are still sent if they can't be kept in the data store.
+        """
+        store = TestDataStore(dbPath=Path(self.mktemp()))
+        observer = DataStoreEventSourceLogObserver(store=store, persist=True)
+        store.bringThePain()
+
+        ids = publish(observer, (1, 2))
+
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(len(self.flushLoggedErrors(StorageError)), 2)
@@ -0,0 +1,451 @@
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+Tests for :mod:`ranger-ims-server.application._static`
+"""
+
+from gzip import decompress
+from os import utime
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional, Tuple
+
+from klein.test.test_resource import requestMock
+
+from twisted.internet.defer import Deferred, ensureDeferred
+from twisted.internet.error import ConnectionDone
+from twisted.python.failure import Failure
+from twisted.web import http
+
+from ims.ext.klein import CompressedContentCache
+from ims.ext.trial import TestCase
+
+from .base import TestRequest
+from .. import _static
+from .._static import (
+    StaticFile, _JSONStreamProducer, buildJSONArray, jsonBytes, notModified,
+    revisionETag, weakETag, writeJSONStream,
+)
+
+
+__all__ = ()
+
+
+
+class ETagTests(TestCase):
+    """
+    Tests for :func:`weakETag` and :func:`revisionETag`
+    """
+
+    def test_weakETag(self) -> None:
+        """
+        :func:`weakETag` composes a weak ETag with the given value.
+        """
+        self.assertEqual(weakETag("abc"), 'W/"abc"')
+
+
+    def test_revisionETag_weak(self) -> None:
+        """
+        :func:`revisionETag` composes a weak ETag, as the same revision is sent
+        with different content codings.
+        """
+        self.assertStartsWith(revisionETag(1), 'W/"')
+        self.assertEndsWith(revisionETag(1), '"')
+
+
+    def test_revisionETag_revision(self) -> None:
+        """
+        :func:`revisionETag` composes the same ETag for the same revision, and
+        different ETags for different revisions.
+        """
+        self.assertEqual(revisionETag(1, "a"), revisionETag(1, "a"))
+        self.assertNotEqual(revisionETag(1, "a"), revisionETag(2, "a"))
+        self.assertNotEqual(revisionETag(1, "a"), revisionETag(1, "b"))
+
+
+
+class NotModifiedTests(TestCase):
+    """
+    Tests for :func:`notModified`
+    """
+
+    etag = revisionETag(1)
+
+
+    def request(
+        self, ifNoneMatch: Optional[str], method: bytes = b"GET"
+    ) -> TestRequest:
+        if ifNoneMatch is None:
+            return TestRequest(method=method)
+        else:
+            return TestRequest(
+                method=method, headers={"If-None-Match": ifNoneMatch}
+            )
+
+
+    def assertNotModified(self, request: TestRequest) -> None:
+        self.assertTrue(notModified(request, self.etag))
+        self.assertEqual(request.responseCode, http.NOT_MODIFIED)
+        self.assertEqual(self._headerValue(request, "ETag"), self.etag)
+
+
+    def assertModified(self, request: TestRequest) -> None:
+        self.assertFalse(notModified(request, self.etag))
+        self.assertIdentical(request.responseCode, None)
+
+
+    def test_noHeader(self) -> None:
+        """
+        :func:`notModified` returns false if the request has no If-None-Match
+        header.
+        """
+        self.assertModified(self.request(None))
+
+
+    def test_match(self) -> None:
+        """
+        :func:`notModified` returns true and sets the response code to NOT
+        MODIFIED if the If-None-Match header matches the ETag.
+        """
+        self.assertNotModified(self.request(self.etag))
+
+
+    def test_noMatch(self) -> None:
+        """
+        :func:`notModified` returns false if the If-None-Match header doesn't
+        match the ETag.
+        """
+        self.assertModified(self.request(revisionETag(2)))
+
+
+    def test_weakComparison(self) -> None:
+        """
+        :func:`notModified` compares ETags using the weak comparison function,
+        so a strong tag in the If-None-Match header matches a weak ETag with
+        the same value, and vice versa.
+        """
+        self.assertNotModified(self.request(self.etag[2:]))
+
+        strongETag = '"abc"'
+        request = self.request(weakETag("abc"))
+        self.assertTrue(notModified(request, strongETag))
+        self.assertEqual(request.responseCode, http.NOT_MODIFIED)
+
+
+    def test_list(self) -> None:
+        """
+        :func:`notModified` returns true if any of the ETags in the
+        If-None-Match header's list matches the ETag.
+        """
+        self.assertNotModified(self.request(
+            f'{revisionETag(2)}, {self.etag} ,"xyzzy"'
+        ))
+        self.assertModified(self.request(f'{revisionETag(2)},"xyzzy"'))
+
+
+    def test_wildcard(self) -> None:
+        """
+        :func:`notModified` returns true if the If-None-Match header is
+        ``*``.
+        """
+        self.assertNotModified(self.request("*"))
+
+
+    def test_head(self) -> None:
+        """
+        :func:`notModified` applies to HEAD requests.
+        """
+        self.assertNotModified(self.request(self.etag, method=b"HEAD"))
+
+
+    def test_notGET(self) -> None:
+        """
+        :func:`notModified` returns false for methods other than GET and HEAD,
+        even if the If-None-Match header matches.
+        """
+        for method in (b"POST", b"PUT", b"DELETE"):
+            self.assertModified(self.request(self.etag, method=method))
+            self.assertModified(self.request("*", method=method))
+
+
+
+class JSONBytesTests(TestCase):
+    """
+    Tests for :func:`jsonBytes`
+    """
+
+    def test_etag(self) -> None:
+        """
+        :func:`jsonBytes` sets a weak ETag computed from the data if none is
+        given, and returns the data.
+        """
+        request = TestRequest()
+
+        data = jsonBytes(request, b"[]")
+
+        self.assertEqual(data, b"[]")
+        etag = self._headerValue(request, "ETag")
+        assert etag is not None
+        self.assertStartsWith(etag, 'W/"')
+        self.assertEqual(self._headerValue(request, "Content-Length"), "2")
+
+
+    def test_notModified(self) -> None:
+        """
+        :func:`jsonBytes` returns no data if the request's If-None-Match header
+        matches the ETag.
+        """
+        request = TestRequest()
+        jsonBytes(request, b"[]")
+        etag = self._headerValue(request, "ETag")
+        assert etag is not None
+
+        request = TestRequest(headers={"If-None-Match": etag})
+
+        self.assertEqual(jsonBytes(request, b"[]"), b"")
+        self.assertEqual(request.responseCode, http.NOT_MODIFIED)
+
+
+
+class PausingRequest(TestRequest):
+    """
+    Request whose transport's write buffer fills up with every write, so that
+    it pauses its producer.
+    """
+
+    def write(self, data: bytes) -> None:
+        super().write(data)
+        self.producer.pauseProducing()
+
+
+
+class JSONStreamProducerTests(TestCase):
+    """
+    Tests for :class:`_JSONStreamProducer`
+    """
+
+    def fragments(self, count: int) -> Iterator[bytes]:
+        """
+        Generate fragments, counting those pulled from the stream.
+        """
+        self.pulled = 0
+        for _ in range(count):
+            self.pulled += 1
+            yield b"xy"
+
+
+    def produce(
+        self, request: TestRequest, count: int = 10
+    ) -> Tuple[_JSONStreamProducer, Deferred]:
+        producer = _JSONStreamProducer(request, self.fragments(count))
+        # Write each fragment separately
+        producer.chunkSize = 1
+        return producer, ensureDeferred(producer.produce())
+
+
+    def test_produce(self) -> None:
+        """
+        :meth:`_JSONStreamProducer.produce` writes the stream to the request,
+        and unregisters itself from the request when done.
+        """
+        request = TestRequest()
+        producer, d = self.produce(request)
+
+        self.successResultOf(d)
+
+        self.assertEqual(request.getWrittenData(), b"xy" * 10)
+        self.assertTrue(request.producerUnregistered)
+
+
+    def test_pause(self) -> None:
+        """
+        :meth:`_JSONStreamProducer.produce` stops pulling from the stream
+        while paused.
+        """
+        request = PausingRequest()
+        producer, d = self.produce(request)
+
+        self.assertNoResult(d)
+        self.assertEqual(self.pulled, 1)
+        self.assertEqual(request.getWrittenData(), b"xy")
+        self.assertFalse(request.producerUnregistered)
+
+
+    def test_resume(self) -> None:
+        """
+        :meth:`_JSONStreamProducer.produce` continues pulling from the stream
+        when resumed.
+        """
+        request = PausingRequest()
+        producer, d = self.produce(request, count=3)
+
+        producer.resumeProducing()
+
+        self.assertNoResult(d)
+        self.assertEqual(self.pulled, 2)
+        self.assertEqual(request.getWrittenData(), b"xy" * 2)
+
+        producer.resumeProducing()
+        producer.resumeProducing()
+
+        self.successResultOf(d)
+        self.assertEqual(self.pulled, 3)
+        self.assertEqual(request.getWrittenData(), b"xy" * 3)
+        self.assertTrue(request.producerUnregistered)
+
+
+    def test_stopProducing(self) -> None:
+        """
+        :meth:`_JSONStreamProducer.produce` stops writing when the producer is
+        stopped.
+        """
+        request = PausingRequest()
+        producer, d = self.produce(request)
+
+        producer.stopProducing()
+
+        self.successResultOf(d)
+        self.assertEqual(request.getWrittenData(), b"xy")
+        self.assertLess(self.pulled, 10)
+        self.assertTrue(request.producerUnregistered)
+
+
+    def test_disconnected(self) -> None:
+        """
+        :meth:`_JSONStreamProducer.produce` stops writing when the request's
+        connection is lost, and doesn't unregister itself from the request,
+        which is unable to do so.
+        """
+        request = PausingRequest()
+        producer, d = self.produce(request)
+
+        request.processingFailed(Failure(ConnectionDone()))
+
+        self.successResultOf(d)
+        self.assertEqual(request.getWrittenData(), b"xy")
+        self.assertLess(self.pulled, 10)
+        self.assertFalse(request.producerUnregistered)
+
+
+    def test_asyncStream(self) -> None:
+        """
+        :meth:`_JSONStreamProducer.produce` writes asynchronous streams.
+        """
+        async def fragments() -> AsyncIterator[bytes]:
+            for fragment in self.fragments(3):
+                yield fragment
+
+        request = TestRequest()
+        producer = _JSONStreamProducer(request, fragments())
+
+        self.successResultOf(producer.produce())
+
+        self.assertEqual(request.getWrittenData(), b"xy" * 3)
+        self.assertTrue(request.producerUnregistered)
+
+
+
+class WriteJSONStreamTests(TestCase):
+    """
+    Tests for :func:`writeJSONStream`
+    """
+
+    def test_notModified(self) -> None:
+        """
+        :func:`writeJSONStream` writes nothing, and doesn't read the stream,
+        if the request's If-None-Match header matches the ETag.
+        """
+        def stream() -> Iterator[bytes]:
+            self.fail("Stream read")
+            yield b"[]"
+
+        etag = revisionETag(1)
+        request = TestRequest(headers={"If-None-Match": etag})
+
+        self.successResultOf(writeJSONStream(request, stream(), etag))
+
+        self.assertEqual(request.responseCode, http.NOT_MODIFIED)
+        self.assertEqual(request.getWrittenData(), b"")
+        self.assertIdentical(request.producer, None)
+
+
+    def test_array(self) -> None:
+        """
+        :func:`writeJSONStream` writes a JSON array built by
+        :func:`buildJSONArray`.
+        """
+        request = TestRequest()
+
+        self.successResultOf(writeJSONStream(
+            request, buildJSONArray([b"1", b"2", b"3"])
+        ))
+
+        self.assertEqual(request.getWrittenData(), b"[1,2,3]")
+
+
+
+class StaticFileTests(TestCase):
+    """
+    Tests for :class:`StaticFile`
+    """
+
+    def setUp(self) -> None:
+        self.cache = CompressedContentCache()
+        self.patch(_static, "staticContentCache", self.cache)
+
+        self.path = Path(self.mktemp()) / "style.css"
+        self.path.parent.mkdir(parents=True)
+
+
+    def body(self) -> bytes:
+        """
+        Serve the file at :attr:`path` to a client that accepts gzip, and
+        return the decompressed body.
+        """
+        request = requestMock(b"/", headers={b"Accept-Encoding": [b"gzip"]})
+        StaticFile(str(self.path)).render(request)
+
+        return decompress(request.getWrittenData())
+
+
+    def test_compressed(self) -> None:
+        """
+        :class:`StaticFile` serves compressed content, compressing each
+        version of a file once.
+        """
+        data = b"body { color: black; }\n" * 100
+        self.path.write_bytes(data)
+
+        self.assertEqual(self.body(), data)
+        self.assertEqual(self.body(), data)
+        self.assertEqual(len(self.cache._state.entries), 1)
+
+
+    def test_modified(self) -> None:
+        """
+        :class:`StaticFile` serves the new content of a modified file, which
+        replaces the old content in the cache.
+        """
+        self.path.write_bytes(b"body { color: black; }\n" * 100)
+        self.body()
+
+        data = b"body { color: white; }\n" * 100
+        self.path.write_bytes(data)
+        mtime = self.path.stat().st_mtime + 10
+        utime(str(self.path), (mtime, mtime))
+
+        self.assertEqual(self.body(), data)
+        self.assertEqual(len(self.cache._state.entries), 1)
@@ -30,7 +30,7 @@ from twisted.logger import Logger
 from ims.auth import AuthProvider
 from ims.dms import DutyManagementSystem
 from ims.ext.json import jsonTextFromObject, objectFromJSONBytesIO
-from ims.store import IMSDataStore
+from ims.store import CachingDataStore, IMSDataStore
 from ims.store.sqlite import DataStore
 
 from ._urls import URLs
@@ -78,6 +78,11 @@ class Configuration(object):
             f"Core.LogFile: {self.LogFilePath}\n"
             f"Core.LogFormat: {self.LogFormat}\n"
             f"\n"
+            f"Store.ReaderThreads: {self.StoreReaderThreads}\n"
+            f"Store.QueueDepth: {self.StoreQueueDepth}\n"
+            f"Store.CacheSize: {self.StoreCacheSize}\n"
+            f"Store.PersistNotifications: {self.StorePersistNotifications}\n"
+            f"\n"
             f"DMS.Hostname: {self.DMSHost}\n"
             f"DMS.Database: {self.DMSDatabase}\n"
             f"DMS.Username: {self.DMSUsername}\n"
@@ -211,6 +216,39 @@ class Configuration(object):
             "RequireActive: {active}", active=self.RequireActive
         )
 
+        self.StoreReaderThreads = int(
+            cast(str, valueFromConfig("Store", "ReaderThreads", "0"))
+        )
+        self._log.info(
+            "Store reader threads: {threads}", threads=self.StoreReaderThreads
+        )
+
+        self.StoreQueueDepth = int(
+            cast(str, valueFromConfig("Store", "QueueDepth", "100"))
+        )
+        self._log.info(
+            "Store queue depth: {depth}", depth=self.StoreQueueDepth
+        )
+
+        self.StoreCacheSize = int(
+            cast(str, valueFromConfig("Store", "CacheSize", "0"))
+        )
+        self._log.info(
+            "Store cache size: {size}MiB", size=self.StoreCacheSize
+        )
+
+        persist = cast(
+            str, valueFromConfig("Store", "PersistNotifications", "false")
+        ).lower()
+        if persist in ("true", "yes", "1"):
+            self.StorePersistNotifications = True
+        else:
+            self.StorePersistNotifications = False
+        self._log.info(
+            "Store persist notifications: {persist}",
+            persist=self.StorePersistNotifications,
+        )
+
         self.DMSHost     = valueFromConfig("DMS", "Hostname", None)
         self.DMSDatabase = valueFromConfig("DMS", "Database", None)
         self.DMSUsername = valueFromConfig("DMS", "Username", None)
@@ -234,7 +272,16 @@ class Configuration(object):
             password=self.DMSPassword,
         )
 
-        self.store: IMSDataStore = DataStore(dbPath=self.DatabasePath)
+        self.store: IMSDataStore = DataStore(
+            dbPath=self.DatabasePath,
+            readerThreads=self.StoreReaderThreads,
+            queueDepth=self.StoreQueueDepth,
+        )
+
+        if self.StoreCacheSize > 0:
+            self.store = CachingDataStore(
+                store=self.store, maxSize=self.StoreCacheSize * 1024 * 1024
+            )
 
         self.authProvider = AuthProvider(
             store=self.store,
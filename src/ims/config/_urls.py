@@ -87,11 +87,13 @@ class URLs(object):
     incidentTypes    = api.child("incident_types").child("")
     incidentReports  = api.child("incident_reports").child("")
     incidentReport   = incidentReports.child("<number>")
+    incidentReportSearch = incidentReports.child("search").child("")
     events           = api.child("events").child("")
     event            = events.child("<eventID>").child("")
     locations        = event.child("locations").child("")
     incidents        = event.child("incidents").child("")
     incidentNumber   = incidents.child("<number>")
+    incidentSearch   = event.child("search").child("")
 
     eventSource      = api.child("eventsource")
 
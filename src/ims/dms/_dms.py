@@ -20,6 +20,7 @@ Duty Management System.
 
 from hashlib import sha1
 from os import urandom
+from sys import intern
 from time import time
 from typing import Iterable, Mapping, Optional, Sequence, Set, Tuple
 
@@ -105,6 +106,7 @@ class DutyManagementSystem(object):
         self.password = password
 
         self._personnel: Sequence[Ranger] = ()
+        self._personnelRevision = hash(self._personnel)
         self._personnelLastUpdated = 0.0
         self._dbpool: Optional[adbapi.ConnectionPool] = None
         self._busy = False
@@ -142,6 +144,16 @@ class DutyManagementSystem(object):
         return self._dbpool
 
 
+    @property
+    def personnelRevision(self) -> int:
+        """
+        Revision of the personnel data last loaded by :meth:`personnel`.
+        The revision changes when the loaded data differs from the data that
+        was loaded previously.
+        """
+        return self._personnelRevision
+
+
     async def _queryPositionsByID(self) -> Mapping[str, Position]:
         self._log.info(
             "Retrieving positions from Duty Management System..."
@@ -175,7 +187,7 @@ class DutyManagementSystem(object):
             (
                 dmsID,
                 Ranger(
-                    handle=handle,
+                    handle=intern(handle),
                     name=fullName(first, middle, last),
                     status=statusFromID(status),
                     email=(email,),
@@ -239,6 +251,7 @@ class DutyManagementSystem(object):
                         position.members.add(ranger)
 
                     self._personnel = tuple(rangersByID.values())
+                    self._personnelRevision = hash(self._personnel)
                     self._positions = tuple(positionsByID.values())
                     self._personnelLastUpdated = time()
 
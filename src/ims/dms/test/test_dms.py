@@ -108,6 +108,20 @@ class DutyManagementSystemTests(TestCase):
         )
 
 
+    def test_personnelRevision(self) -> None:
+        """
+        L{DutyManagementSystem.personnelRevision} changes when personnel data
+        is loaded.
+        """
+        dms = self.dms()
+        initial = dms.personnelRevision
+
+        personnel = self.successResultOf(dms.personnel())
+
+        self.assertNotEqual(dms.personnelRevision, initial)
+        self.assertEqual(dms.personnelRevision, hash(tuple(personnel)))
+
+
 
 class UtilTests(TestCase):
     """
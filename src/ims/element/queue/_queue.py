@@ -75,6 +75,17 @@ class DispatchQueuePage(Page):
         )
 
 
+    @renderer
+    def search_url(self, request: IRequest, tag: Tag) -> KleinRenderable:
+        """
+        JSON string: URL for incident search endpoint for the event.
+        """
+        return jsonTextFromObject(
+            self.config.urls.incidentSearch.asText()
+            .replace("<eventID>", self.event.id)
+        )
+
+
     @renderer
     def view_incidents_url(
         self, request: IRequest, tag: Tag
@@ -386,6 +386,11 @@ function summarizeIncident(incident) {
     var summary = incident.summary;
     var reportEntries = incident.report_entries;
 
+    // Incident summaries carry the summary derived from the report entries.
+    if (incident.summary_from_report != undefined) {
+        return incident.summary_from_report;
+    }
+
     if (summary == undefined || summary == "") {
         if (reportEntries == undefined) {
             return "";
@@ -423,6 +428,9 @@ function reportTextFromIncident(incident) {
     if (incident.summary != undefined) {
         texts.push(incident.summary);
     }
+    else if (incident.summary_from_report != undefined) {
+        texts.push(incident.summary_from_report);
+    }
 
     var reportEntries = incident.report_entries;
 
@@ -746,10 +754,30 @@ function editFromElement(element, jsonKey, transform) {
 
 var eventSource = null;
 
-function subscribeToUpdates() {
-    eventSource = new EventSource(
-        eventSourceURL, { withCredentials: true }
-    );
+// Subscribe to updates for the given event and incident number, if given.
+// If payload is "incident", incident updates carry the updated incident.
+function subscribeToUpdates(event, number, payload) {
+    var query = [];
+
+    if (event != undefined) {
+        query.push("event=" + encodeURIComponent(event));
+
+        if (number != undefined) {
+            query.push("incident=" + number);
+        }
+    }
+
+    if (payload != undefined) {
+        query.push("payload=" + payload);
+    }
+
+    var url = eventSourceURL;
+
+    if (query.length > 0) {
+        url += "?" + query.join("&");
+    }
+
+    eventSource = new EventSource(url, { withCredentials: true });
 
     eventSource.addEventListener("open", function(e) {
         console.log("Event listener opened");
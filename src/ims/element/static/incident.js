@@ -39,7 +39,9 @@ function initIncidentPage() {
 
         // Updates
 
-        subscribeToUpdates();
+        // New incidents don't have a number yet, so they subscribe to updates
+        // for the whole event, and pick out those for this incident below.
+        subscribeToUpdates(eventID, incidentNumber, "incident");
 
         eventSource.addEventListener("Incident", function(e) {
             var jsonText = e.data;
@@ -48,6 +50,22 @@ function initIncidentPage() {
 
             if (number == incidentNumber) {
                 console.log("Got incident update");
+
+                // Updates carry the updated incident, except when played back
+                if (json.incident == undefined) {
+                    loadAndDisplayIncident();
+                } else {
+                    incident = json.incident;
+                    drawIncidentFields();
+                }
+                loadAndDisplayIncidentReports();
+            }
+        }, true);
+
+        // Sent when updates we missed while disconnected can't be played back
+        eventSource.addEventListener("Reset", function(e) {
+            if (incidentNumber != null) {
+                console.log("Reloading incident after missed updates");
                 loadAndDisplayIncident();
                 loadAndDisplayIncidentReports();
             }
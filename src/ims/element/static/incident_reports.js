@@ -85,6 +85,12 @@ function initIncidentReportsTable() {
         console.log("Got incident report update: " + number);
         incidentReportsTable.ajax.reload();
     }, true);
+
+    // Sent when updates we missed while disconnected can't be played back
+    eventSource.addEventListener("Reset", function(e) {
+        console.log("Reloading incident reports after missed updates");
+        incidentReportsTable.ajax.reload();
+    }, true);
 }
 
 
@@ -75,7 +75,7 @@ function initDispatchQueueTable() {
         enableEditing();
     }
 
-    subscribeToUpdates();
+    subscribeToUpdates(eventID, null, "incident");
 
     eventSource.addEventListener("Incident", function(e) {
         var jsonText = e.data;
@@ -83,18 +83,110 @@ function initDispatchQueueTable() {
         var number = json["incident_number"];
 
         console.log("Got incident update: " + number);
-        dispatchQueueTable.ajax.reload();
+
+        // Updates carry the updated incident, except when played back
+        if (json.incident == undefined) {
+            loadChangedIncidents();
+        } else {
+            // Don't advance incidentsRevision: json.revision is this
+            // incident's revision, and other incidents changed before it may
+            // not have been sent to us yet.
+            updateIncidentRow(incidentSummaryFromIncident(json.incident));
+            dispatchQueueTable.draw(false);
+        }
+    }, true);
+
+    // Sent when updates we missed while disconnected can't be played back
+    eventSource.addEventListener("Reset", function(e) {
+        console.log("Reloading incidents after missed updates");
+        loadChangedIncidents();
     }, true);
 }
 
 
+//
+// Incremental updates
+//
+
+// Revision of the event as of the last incidents we loaded
+var incidentsRevision = 0;
+
+function updateIncidentsRevision(revision) {
+    if (revision > incidentsRevision) {
+        incidentsRevision = revision;
+    }
+}
+
+// The table holds incident summaries; project a full incident onto one.
+function incidentSummaryFromIncident(incident) {
+    var lastModified = moment(incident.created);
+
+    for (var i in incident.report_entries) {
+        var created = moment(incident.report_entries[i].created);
+        if (created.isAfter(lastModified)) {
+            lastModified = created;
+        }
+    }
+
+    return {
+        "event": incident.event,
+        "number": incident.number,
+        "created": incident.created,
+        "last_modified": lastModified.toISOString(),
+        "state": incident.state,
+        "priority": incident.priority,
+        "summary": incident.summary,
+        "location": incident.location,
+        "ranger_handles": incident.ranger_handles,
+        "incident_types": incident.incident_types,
+        "summary_from_report": summarizeIncident(incident),
+    };
+}
+
+function updateIncidentRow(incident) {
+    var row = dispatchQueueTable.row(function (index, data, node) {
+        return data.number == incident.number;
+    });
+
+    if (row.any()) {
+        row.data(incident);
+    } else {
+        dispatchQueueTable.row.add(incident);
+    }
+}
+
+function loadChangedIncidents() {
+    function ok(json, status, xhr) {
+        updateIncidentsRevision(json.revision);
+
+        for (var i in json.incidents) {
+            updateIncidentRow(json.incidents[i]);
+        }
+
+        dispatchQueueTable.draw(false);
+    }
+
+    function fail(error, status, xhr) {
+        var message = "Failed to load changed incidents:\n" + error;
+        console.error(message);
+        dispatchQueueTable.ajax.reload();
+    }
+
+    jsonRequest(
+        dataURL + "?fields=summary&since=" + incidentsRevision,
+        null, ok, fail
+    );
+}
+
+
 //
 // Initialize DataTables
 //
 
 function initDataTables() {
-    function dataHandler(incidents) {
-        return incidents;
+    function dataHandler(json) {
+        updateIncidentsRevision(json.revision);
+        return json.incidents;
     }
 
     dispatchQueueTable = $("#queue_table").DataTable({
@@ -105,7 +197,7 @@ function initDataTables() {
         "processing": true,
         "scrollX": false, "scrollY": false,
         "ajax": {
-            "url": dataURL,
+            "url": dataURL + "?fields=summary&since=0",
             "dataSrc": dataHandler,
         },
         "columns": [
@@ -224,18 +316,104 @@ function initSearchField() {
     // Search field handling
 
     $("#search_input").on("keyup", function () {
-        dispatchQueueTable.search(this.value);
-        dispatchQueueTable.draw();
+        searchIncidents(this.value.trim());
     });
 }
 
 
+//
+// Search handling
+//
+
+// The incident summaries loaded into the table don't include report text, so
+// report text is searched on the server, and incidents it matches are shown
+// along with those matching the search text in the table's own columns.
+
+var _searchText = "";
+var _searchMatches = {};
+var _searchTimer = null;
+
+function searchIncidents(text) {
+    if (text == _searchText) {
+        return;
+    }
+
+    _searchText = text;
+    _searchMatches = {};
+
+    if (_searchTimer != null) {
+        clearTimeout(_searchTimer);
+        _searchTimer = null;
+    }
+
+    dispatchQueueTable.draw();
+
+    if (text == "") {
+        return;
+    }
+
+    function ok(results, status, xhr) {
+        // Ignore responses to searches that have since been replaced
+        if (text != _searchText) {
+            return;
+        }
+
+        var matches = {};
+        for (var i in results) {
+            matches[results[i].number] = true;
+        }
+        _searchMatches = matches;
+
+        dispatchQueueTable.draw();
+    }
+
+    function fail(error, status, xhr) {
+        var message = "Failed to search incidents:\n" + error;
+        console.error(message);
+    }
+
+    _searchTimer = setTimeout(function () {
+        _searchTimer = null;
+        var url = (
+            searchURL + "?q=" + encodeURIComponent(text) + "&limit=1000"
+        );
+        jsonRequest(url, null, ok, fail);
+    }, 250);
+}
+
+function matchesSearchText(incident, rowData) {
+    if (_searchText == "") {
+        return true;
+    }
+
+    if (_searchMatches[incident.number]) {
+        return true;
+    }
+
+    var rowText = rowData.join(" ").toLowerCase();
+    var words = _searchText.toLowerCase().split(/\s+/);
+
+    for (var i in words) {
+        if (rowText.indexOf(words[i]) == -1) {
+            return false;
+        }
+    }
+
+    return true;
+}
+
+
 //
 // Initialize search plug-in
 //
 
 function initSearch() {
     function modifiedAfter(incident, timestamp) {
+        // Incident summaries carry the last modified time.
+        if (incident.last_modified != undefined) {
+            return timestamp.isBefore(incident.last_modified);
+        }
+
         if (timestamp.isBefore(incident.created)) {
             return true;
         }
@@ -277,6 +455,10 @@ function initSearch() {
                 return false
             }
 
+            if (! matchesSearchText(incident, rowData)) {
+                return false;
+            }
+
             return true;
         }
     );
@@ -3,7 +3,7 @@
 Extensions to :mod:`attr`
 """
 
-from typing import Any, Callable, Iterable, Tuple, TypeVar
+from typing import Any, Callable, Iterable, Tuple, Type, TypeVar
 
 from attr import Attribute
 
@@ -13,6 +13,7 @@ __all__ = (
     "required",
     "sorted_tuple",
     "true",
+    "trusted",
 )
 
 
@@ -47,3 +48,22 @@ def sorted_tuple(iterable: Iterable[T]) -> Tuple[T, ...]:
     Sort and convert an iterable into a tuple.
     """
     return tuple(sorted(iterable))
+
+
+def trusted(cls: Type[T], **values: Any) -> T:
+    """
+    Create an instance of the given :mod:`attr` class from trusted values,
+    without running its initializer, and therefore without running validators
+    or converters.
+
+    The caller is responsible for providing a value for every attribute, in
+    the form that the converters would have produced, such as data that was
+    created by a valid instance and read back from storage.
+    """
+    instance = _new(cls)
+    for name, value in values.items():
+        _setattr(instance, name, value)
+    return instance
+
+_new = object.__new__
+_setattr = object.__setattr__
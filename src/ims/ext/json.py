@@ -5,18 +5,26 @@ Extensions to :mod:`json`
 
 from datetime import date as Date, datetime as DateTime
 from io import TextIOWrapper
-from json import JSONDecodeError, JSONEncoder, dumps, load, loads
-from typing import Any, Optional
+from json import JSONDecodeError, JSONDecoder, JSONEncoder, dumps, load, loads
+from typing import Any, Iterator, Optional
 from typing.io import BinaryIO
 
 from arrow.parser import DateTimeParser
 
+try:
+    from orjson import dumps as orjsonDumps
+except ImportError:  # pragma: no cover
+    orjsonDumps = None
+
 
 __all__ = (
     "dateAsRFC3339Text",
     "dateTimeAsRFC3339Text",
+    "jsonBytesFromObject",
     "jsonTextFromObject",
+    "objectFromJSONBytesIO",
     "objectFromJSONText",
+    "objectsFromJSONArrayBytesIO",
     "rfc3339TextAsDate",
     "rfc3339TextAsDateTime",
 )
@@ -74,6 +82,31 @@ def jsonTextFromObject(obj: Any, pretty: bool = False) -> str:
 
 
 
+_compactEncoder = Encoder(ensure_ascii=False, separators=(",", ":"))
+
+
+
+def jsonBytesFromObject(obj: Any) -> bytes:
+    """
+    Convert an object into compact UTF-8 encoded JSON text.
+
+    This produces the same JSON as :func:`jsonTextFromObject`, but uses
+    :mod:`orjson` to do so if it is installed.
+    Objects that :mod:`orjson` cannot encode (for example, integers larger
+    than 64 bits) are encoded with :mod:`json` instead.
+
+    :param obj: An object that is serializable to JSON.
+    """
+    if orjsonDumps is not None:
+        try:
+            return orjsonDumps(obj, default=_compactEncoder.default)
+        except TypeError:
+            pass
+
+    return _compactEncoder.encode(obj).encode("utf-8")
+
+
+
 def objectFromJSONText(text: str) -> Any:
     """
     Convert JSON text into an object.
@@ -98,6 +131,92 @@ def objectFromJSONBytesIO(io: BinaryIO, encoding: str = "utf-8") -> Any:
 
 
 
+def objectsFromJSONArrayBytesIO(
+    io: BinaryIO, encoding: str = "utf-8", bufferSize: int = 64 * 1024
+) -> Iterator[Any]:
+    """
+    Covert JSON text containing an array from a byte stream into the objects
+    in the array.
+
+    The stream is read incrementally, so that the array as a whole need not
+    be held in memory.
+    """
+    textIO = TextIOWrapper(io, encoding=encoding, newline="")
+    decoder = JSONDecoder()
+
+    buffer = ""
+    position = 0
+    eof = False
+
+    def read() -> None:
+        nonlocal buffer, position, eof
+
+        text = textIO.read(bufferSize)
+        if text:
+            buffer = buffer[position:] + text
+            position = 0
+        else:
+            eof = True
+
+    def nextCharacter() -> str:
+        nonlocal position
+
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\n\r":
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if eof:
+                return ""
+            read()
+
+    def error(expected: str) -> JSONDecodeError:
+        return JSONDecodeError(
+            msg=f"Expecting {expected}", doc=buffer, pos=position
+        )
+
+    if nextCharacter() != "[":
+        raise error("'['")
+    position += 1
+
+    if nextCharacter() == "]":
+        position += 1
+    else:
+        while True:
+            nextCharacter()
+            while True:
+                try:
+                    obj, end = decoder.raw_decode(buffer, position)
+                except JSONDecodeError:
+                    if eof:
+                        raise
+                    read()
+                    continue
+
+                # A value at the end of the buffer (eg. a number) may
+                # continue in text we have not read yet.
+                if end == len(buffer) and not eof:
+                    read()
+                    continue
+
+                position = end
+                break
+
+            yield obj
+
+            character = nextCharacter()
+            position += 1
+            if character == "]":
+                break
+            if character != ",":
+                position -= 1
+                raise error("',' or ']'")
+
+    if nextCharacter() != "":
+        raise error("end of data")
+
+
+
 def dateAsRFC3339Text(date: Date) -> str:
     """
     Convert a :class:`Date` into an RFC 3339 formatted date string.
@@ -5,21 +5,37 @@ Extensions to :mod:`klein`
 
 from enum import Enum
 from functools import wraps
-from typing import Any, Awaitable, Callable, Union
+from typing import (
+    Any, Awaitable, Callable, Dict, Optional, Tuple, Union,
+)
+from zlib import DEFLATED, MAX_WBITS, compressobj
+
+from attr import Factory, attrib, attrs
+from attr.validators import instance_of
 
-from twisted.web.iweb import IRenderable, IRequest
+from twisted.web.http import NOT_MODIFIED, NO_CONTENT
+from twisted.web.iweb import (
+    IRenderable, IRequest, _IRequestEncoder, _IRequestEncoderFactory,
+)
 from twisted.web.resource import IResource
 
+from zope.interface import implementer
+
 from .. import __version__ as version
 
 
 __all__ = (
+    "CompressedContentCache",
+    "ContentEncoderFactory",
+    "ContentEncoding",
     "ContentType",
     "HeaderName",
     "KleinRenderable",
     "KleinRouteMethod",
     "Method",
+    "acceptedEncoding",
     "static",
+    "uncompressed",
 )
 
 
@@ -78,26 +94,43 @@ class ContentType(Enum):
 
 
 
+class ContentEncoding(Enum):
+    """
+    HTTP content codings, in order of preference.
+    """
+
+    gzip = "gzip"
+    deflate = "deflate"
+
+
+
 class HeaderName(Enum):
     """
     HTTP header names.
     """
 
     server = "Server"
+    acceptEncoding = "Accept-Encoding"
     cacheControl = "Cache-Control"
+    contentEncoding = "Content-Encoding"
+    contentLength = "Content-Length"
     contentType = "Content-Type"
     etag = "ETag"
+    ifNoneMatch = "If-None-Match"
+    lastEventID = "Last-Event-ID"
     location = "Location"
+    range = "Range"
+    vary = "Vary"
 
 
 
 if True:
-    _staticETag = version
+    _staticETag = f'W/"{version}"'
     _maxAge = 60 * 5  # 5 minutes
 else:
     # For debugging, change the ETag on app launch
     from uuid import uuid4
-    _staticETag = uuid4().hex
+    _staticETag = f'W/"{uuid4().hex}"'
     _maxAge = 0
 
 _cacheControl = "max-age={}".format(_maxAge)
@@ -121,3 +154,299 @@ def static(f: KleinRouteMethod) -> KleinRouteMethod:
         return f(self, request, *args, **kwargs)
 
     return wrapper
+
+
+
+#
+# Content encoding
+#
+
+# Requests which must not be encoded by ContentEncoderFactory, either because
+# the route opted out or because the body is already encoded, are marked with
+# this attribute.
+# The request is marked directly, rather than kept in a (weak) set, as
+# requests aren't hashable in all versions of Twisted.
+_unencodedAttribute = "_imsUnencoded"
+
+
+def _markUnencoded(request: IRequest) -> None:
+    setattr(request, _unencodedAttribute, True)
+
+
+def _isUnencoded(request: IRequest) -> bool:
+    return getattr(request, _unencodedAttribute, False)
+
+_compressibleContentTypes = frozenset(
+    contentType.value for contentType in (
+        ContentType.css,
+        ContentType.html,
+        ContentType.javascript,
+        ContentType.json,
+        ContentType.text,
+        ContentType.xhtml,
+    )
+)
+
+
+def _isCompressible(contentType: str) -> bool:
+    mimeType = contentType.partition(";")[0].strip().lower()
+
+    if mimeType == ContentType.eventStream.value:
+        return False
+
+    return (
+        mimeType.startswith("text/") or mimeType in _compressibleContentTypes
+    )
+
+
+def uncompressed(f: KleinRouteMethod) -> KleinRouteMethod:
+    """
+    Decorate a route handler to opt its responses out of content encoding.
+    """
+    @wraps(f)
+    def wrapper(
+        self: Any, request: IRequest, *args: Any, **kwargs: Any
+    ) -> KleinRenderable:
+        _markUnencoded(request)
+
+        return f(self, request, *args, **kwargs)
+
+    return wrapper
+
+
+def acceptedEncoding(request: IRequest) -> Optional[ContentEncoding]:
+    """
+    Choose the preferred content encoding from those acceptable to the client
+    that sent the given request, per its ``Accept-Encoding`` header.
+    """
+    acceptEncoding = request.getHeader(HeaderName.acceptEncoding.value)
+    if not acceptEncoding:
+        return None
+
+    qualities: Dict[str, float] = {}
+    for coding in acceptEncoding.split(","):
+        name, *parameters = coding.split(";")
+        quality = 1.0
+        for parameter in parameters:
+            key, _, value = parameter.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+
+    best: Optional[ContentEncoding] = None
+    bestQuality = 0.0
+    for encoding in ContentEncoding:
+        quality = qualities.get(encoding.value, wildcard)
+        if quality > bestQuality:
+            best, bestQuality = encoding, quality
+
+    return best
+
+
+def _compressor(encoding: ContentEncoding, level: int) -> Any:
+    if encoding is ContentEncoding.gzip:
+        return compressobj(level, DEFLATED, 16 + MAX_WBITS)
+    else:
+        return compressobj(level, DEFLATED, MAX_WBITS)
+
+
+def _negotiateEncoding(
+    request: IRequest, length: Optional[int], minimumSize: int
+) -> Optional[ContentEncoding]:
+    """
+    Decide which content encoding, if any, to apply to the response to the
+    given request, based on the response headers set so far.
+    """
+    if _isUnencoded(request):
+        return None
+
+    if request.code in (NO_CONTENT, NOT_MODIFIED):
+        return None
+
+    headers = request.responseHeaders
+
+    if headers.hasHeader(HeaderName.contentEncoding.value):
+        return None
+
+    contentType = headers.getRawHeaders(HeaderName.contentType.value, [""])[0]
+    if not _isCompressible(contentType):
+        return None
+
+    # From here on, the response depends on Accept-Encoding
+    vary = headers.getRawHeaders(HeaderName.vary.value, [])
+    if HeaderName.acceptEncoding.value not in vary:
+        headers.addRawHeader(
+            HeaderName.vary.value, HeaderName.acceptEncoding.value
+        )
+
+    if length is not None and length < minimumSize:
+        return None
+
+    return acceptedEncoding(request)
+
+
+
+@implementer(_IRequestEncoder)
+class _ContentEncoder(object):
+    """
+    Request encoder which decides whether to compress the response when the
+    first data is written, at which point the response headers are known.
+    """
+
+    def __init__(
+        self, request: IRequest, minimumSize: int, compressLevel: int
+    ) -> None:
+        self._request = request
+        self._minimumSize = minimumSize
+        self._compressLevel = compressLevel
+        self._started = False
+        self._compressor: Any = None
+
+
+    def _start(self) -> None:
+        self._started = True
+
+        request = self._request
+        headers = request.responseHeaders
+
+        contentLength = headers.getRawHeaders(HeaderName.contentLength.value)
+        if contentLength:
+            length: Optional[int] = int(contentLength[0])
+        else:
+            length = None
+
+        encoding = _negotiateEncoding(request, length, self._minimumSize)
+        if encoding is None:
+            return
+
+        headers.setRawHeaders(
+            HeaderName.contentEncoding.value, [encoding.value]
+        )
+        headers.removeHeader(HeaderName.contentLength.value)
+
+        self._compressor = _compressor(encoding, self._compressLevel)
+
+
+    def encode(self, data: bytes) -> bytes:
+        if not self._started:
+            self._start()
+
+        if self._compressor is None:
+            return data
+
+        return self._compressor.compress(data)
+
+
+    def finish(self) -> bytes:
+        if self._compressor is None:
+            return b""
+
+        data = self._compressor.flush()
+        self._compressor = None
+        return data
+
+
+
+@implementer(_IRequestEncoderFactory)
+@attrs(frozen=True)
+class ContentEncoderFactory(object):
+    """
+    Request encoder factory for use with
+    :class:`twisted.web.resource.EncodingResourceWrapper` which compresses
+    responses with an encoding negotiated from the request's
+    ``Accept-Encoding`` header.
+
+    Only textual content types are compressed; event streams are not, as
+    compressing them would delay delivery of events.
+    Responses with a ``Content-Length`` under ``minimumSize`` bytes, responses
+    that already have a ``Content-Encoding`` and responses from routes
+    decorated with :func:`uncompressed` are sent as-is.
+    """
+
+    minimumSize: int = attrib(validator=instance_of(int), default=1024)
+    compressLevel: int = attrib(validator=instance_of(int), default=6)
+
+
+    def encoderForRequest(self, request: IRequest) -> _ContentEncoder:
+        return _ContentEncoder(request, self.minimumSize, self.compressLevel)
+
+
+
+@attrs(frozen=True)
+class CompressedContentCache(object):
+    """
+    Cache of compressed static content.
+
+    Each representation is compressed once, at the highest compression level,
+    and then served from memory.
+    Only the latest version of the content for each key is kept.
+    """
+
+    @attrs(frozen=False)
+    class _State(object):
+        """
+        Internal mutable state for :class:`CompressedContentCache`.
+        """
+
+        entries: Dict[
+            Tuple[str, ContentEncoding], Tuple[Optional[float], bytes]
+        ] = attrib(default=Factory(dict), init=False)
+
+    minimumSize: int = attrib(validator=instance_of(int), default=1024)
+    compressLevel: int = attrib(validator=instance_of(int), default=9)
+    _state: _State = attrib(default=Factory(_State), init=False)
+
+
+    def encoded(
+        self, request: IRequest, key: str, data: bytes,
+        version: Optional[float] = None,
+    ) -> bytes:
+        """
+        Set the ``Content-Encoding`` and ``Content-Length`` headers for a
+        response to the given request and return the body to send for the
+        given data, which is a representation compressed with an encoding
+        acceptable to the client, if appropriate.
+        The response's ``Content-Type`` must already be set.
+
+        ``key`` identifies the content, and ``version`` identifies the
+        version of it in ``data``, which replaces any other cached version.
+        """
+        return self.encodedFrom(request, key, version, len(data), lambda: data)
+
+
+    def encodedFrom(
+        self, request: IRequest, key: str, version: Optional[float],
+        size: int, read: Callable[[], bytes],
+    ) -> bytes:
+        """
+        As :meth:`encoded`, but the data, of the given size, is obtained by
+        calling ``read``, which is only done if the response needs it.
+        """
+        encoding = _negotiateEncoding(request, size, self.minimumSize)
+
+        if encoding is None:
+            data = read()
+        else:
+            entries = self._state.entries
+            entryKey = (key, encoding)
+            entry = entries.get(entryKey)
+            if entry is not None and entry[0] == version:
+                data = entry[1]
+            else:
+                compressor = _compressor(encoding, self.compressLevel)
+                data = compressor.compress(read()) + compressor.flush()
+                entries[entryKey] = (version, data)
+
+            request.setHeader(
+                HeaderName.contentEncoding.value, encoding.value
+            )
+
+        request.setHeader(HeaderName.contentLength.value, str(len(data)))
+        _markUnencoded(request)
+
+        return data
@@ -4,12 +4,14 @@ SQLite utilities
 """
 
 from pathlib import Path
+from re import compile as re_compile
 from sqlite3 import (
     Connection as BaseConnection, Cursor as BaseCursor, Error as SQLiteError,
     IntegrityError, Row as BaseRow, connect as sqliteConnect,
 )
 from typing import (
-    Any, Callable, Iterable, Mapping, Optional, Tuple, TypeVar, Union, cast
+    Any, Callable, Dict, Iterable, Mapping, Optional, Tuple, TypeVar, Union,
+    cast,
 )
 from typing.io import TextIO
 
@@ -21,6 +23,7 @@ from twisted.logger import Logger
 
 __all__ = (
     "Connection",
+    "IntegrityError",
     "ParameterValue",
     "Parameters",
     "QueryPlanExplanation",
@@ -30,6 +33,7 @@ __all__ = (
     "explainQueryPlans",
     "openDB",
     "printSchema",
+    "setDebugLogging",
 )
 
 
@@ -55,9 +59,9 @@ class Row(BaseRow):
     def get(
         self, key: str, default: Optional[ParameterValue] = None
     ) -> ParameterValue:
-        if key in self.keys():
+        try:
             return self[key]
-        else:
+        except IndexError:
             return default
 
 
@@ -69,13 +73,15 @@ class Cursor(BaseCursor):
     """
 
     _log = Logger()
+    _debugLogging = True
 
 
     def executescript(self, sql_script: str) -> TCursor:
         """
         See :meth:`sqlite3.Cursor.executescript`.
         """
-        self._log.debug("EXECUTE SCRIPT:\n{script}", script=sql_script)
+        if self._debugLogging:
+            self._log.debug("EXECUTE SCRIPT:\n{script}", script=sql_script)
         return cast(TCursor, super().executescript(sql_script))
 
 
@@ -87,9 +93,11 @@ class Cursor(BaseCursor):
         """
         if parameters is None:
             parameters = {}
-        self._log.debug(
-            "EXECUTE: {sql} <- {parameters}", sql=sql, parameters=parameters
-        )
+        if self._debugLogging:
+            self._log.debug(
+                "EXECUTE: {sql} <- {parameters}",
+                sql=sql, parameters=parameters,
+            )
         return cast(TCursor, super().execute(sql, parameters))
 
 
@@ -101,6 +109,7 @@ class Connection(BaseConnection):
     """
 
     _log = Logger()
+    _debugLogging = True
 
 
     def cursor(
@@ -137,20 +146,45 @@ class Connection(BaseConnection):
         """
         See :meth:`sqlite3.Cursor.commit`.
         """
-        self._log.debug("COMMIT")
+        if self._debugLogging:
+            self._log.debug("COMMIT")
         super().commit()
 
 
+    def isHealthy(self) -> bool:
+        """
+        Determine whether this connection is usable by running a trivial
+        query.
+        """
+        try:
+            self.execute("select 1").fetchone()
+        except SQLiteError as e:
+            self._log.error(
+                "SQLite connection health check failed: {error}", error=e
+            )
+            return False
+
+        return True
+
+
     def validateConstraints(self) -> None:
         self.validateForeignKeys()
 
 
-    def validateForeignKeys(self) -> None:
+    def validateForeignKeys(self, table: Optional[str] = None) -> None:
+        """
+        Check foreign key constraints, raising :exc:`IntegrityError` if any
+        are violated.
+        If ``table`` is given, only rows in that table are checked.
+        """
         valid = True
 
-        for referent, rowid, referred, constraint in (
-            self.execute("pragma foreign_key_check")
-        ):
+        if table is None:
+            pragma = "pragma foreign_key_check"
+        else:
+            pragma = "pragma foreign_key_check({})".format(table)
+
+        for referent, rowid, referred, constraint in self.execute(pragma):
             row = self.execute(
                 "select * from {} where ROWID=:rowid".format(referent),
                 dict(rowid=rowid)
@@ -173,7 +207,8 @@ class Connection(BaseConnection):
 
 
     def __enter__(self: TConnection) -> TConnection:
-        self._log.debug("---------- ENTER ----------")
+        if self._debugLogging:
+            self._log.debug("---------- ENTER ----------")
         super().__enter__()
         return self
 
@@ -181,32 +216,110 @@ class Connection(BaseConnection):
     def __exit__(
         self, exc_type: type, exc_val: BaseException, exc_tb: Any
     ) -> bool:
-        self._log.debug("---------- EXIT ----------")
+        if self._debugLogging:
+            self._log.debug("---------- EXIT ----------")
         return super().__exit__(exc_type, exc_val, exc_tb)
 
 
 
-def connect(path: Optional[Path]) -> Connection:
+JOURNAL_MODES = frozenset(
+    ("delete", "truncate", "persist", "memory", "wal", "off")
+)
+SYNCHRONOUS_MODES = frozenset(("off", "normal", "full", "extra"))
+
+
+def setDebugLogging(enabled: bool) -> None:
+    """
+    Enable or disable debug logging of SQL statements, transactions and
+    commits for all connections.
+    When disabled, no log events are emitted for them at all, so callers
+    should disable it if debug messages are going to be filtered out anyway.
+    """
+    Connection._debugLogging = enabled
+    Cursor._debugLogging = enabled
+
+
+def connect(
+    path: Optional[Path],
+    readOnly: bool = False,
+    journalMode: Optional[str] = None,
+    synchronous: Optional[str] = None,
+    busyTimeout: Optional[int] = None,
+    cacheSize: Optional[int] = None,
+    mmapSize: Optional[int] = None,
+    cachedStatements: Optional[int] = None,
+) -> Connection:
     """
     Open the database at the given path and configure it.
+
+    :param readOnly: Whether to open the database in read-only mode.
+    :param journalMode: Value for the ``journal_mode`` pragma.
+    :param synchronous: Value for the ``synchronous`` pragma.
+    :param busyTimeout: Value for the ``busy_timeout`` pragma, in
+        milliseconds.
+    :param cacheSize: Value for the ``cache_size`` pragma; negative values are
+        in kibibytes, positive values are in pages.
+    :param mmapSize: Value for the ``mmap_size`` pragma, in bytes.
+    :param cachedStatements: The number of prepared statements to cache.
+        This should be at least the number of distinct statements in regular
+        use, so that they are not parsed again on every execution.
+
+    Pragmas and options that are not specified retain SQLite's defaults.
     """
+    pragmas = ["foreign_keys = true"]
+
+    if journalMode is not None:
+        if journalMode.lower() not in JOURNAL_MODES:
+            raise ValueError(f"Invalid journal mode: {journalMode!r}")
+        pragmas.append(f"journal_mode = {journalMode.lower()}")
+
+    if synchronous is not None:
+        if synchronous.lower() not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Invalid synchronous mode: {synchronous!r}")
+        pragmas.append(f"synchronous = {synchronous.lower()}")
+
+    for name, value in (
+        ("busy_timeout", busyTimeout),
+        ("cache_size", cacheSize),
+        ("mmap_size", mmapSize),
+    ):
+        if value is not None:
+            pragmas.append(f"{name} = {int(value)}")
+
     if path is None:
+        if readOnly:
+            raise ValueError("In-memory databases may not be read-only")
         endpoint = ":memory:"
+        uri = False
+    elif readOnly:
+        endpoint = f"{path.resolve().as_uri()}?mode=ro"
+        uri = True
     else:
         endpoint = str(path)
+        uri = False
+
+    connectOptions: Dict[str, Any] = dict(factory=Connection)
+    if uri:
+        connectOptions["uri"] = True
+    if cachedStatements is not None:
+        connectOptions["cached_statements"] = cachedStatements
 
-    db = cast(Connection, sqliteConnect(endpoint, factory=Connection))
+    db = cast(Connection, sqliteConnect(endpoint, **connectOptions))
     db.row_factory = Row
-    db.execute("pragma foreign_keys = true")
+
+    for pragma in pragmas:
+        db.execute(f"pragma {pragma}")
 
     return db
 
 
-def createDB(path: Optional[Path], schema: str) -> Connection:
+def createDB(path: Optional[Path], schema: str, **options: Any) -> Connection:
     """
     Create a new database at the given path.
+
+    Additional keyword arguments are passed to :func:`connect`.
     """
-    db = connect(path)
+    db = connect(path, **options)
 
     db.executescript(schema)
     db.commit()
@@ -214,15 +327,19 @@ def createDB(path: Optional[Path], schema: str) -> Connection:
     return db
 
 
-def openDB(path: Path, schema: Optional[str] = None) -> Connection:
+def openDB(
+    path: Path, schema: Optional[str] = None, **options: Any
+) -> Connection:
     """
     Open an SQLite DB with the schema for this application.
+
+    Additional keyword arguments are passed to :func:`connect`.
     """
     if path.exists():
-        return connect(path)
+        return connect(path, **options)
 
     if schema is not None:
-        return createDB(path, schema)
+        return createDB(path, schema, **options)
 
     raise SQLiteError("Database does not exist: {}".format(path))
 
@@ -301,6 +418,9 @@ class QueryPlanExplanation(object):
 
 
 
+_namedParameter = re_compile(r":(\w+)")
+
+
 def explainQueryPlans(
     db: Connection, queries: Iterable[Tuple[str, str]]
 ) -> Iterable[QueryPlanExplanation]:
@@ -308,7 +428,8 @@ def explainQueryPlans(
     Explain query plans for the given queries.
     """
     for query, name in queries:
-        params = dict((x, x) for x in range(query.count(":")))  # Dummy params
+        # Bind null to each named parameter
+        params = dict.fromkeys(_namedParameter.findall(query))
         try:
             lines: Iterable[QueryPlanExplanation.Line] = tuple(
                 QueryPlanExplanation.Line(
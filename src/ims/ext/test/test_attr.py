@@ -5,7 +5,7 @@ Tests for :mod:`ranger-ims-server.ext.attr`
 from attr import attrib, attrs
 from attr.validators import instance_of
 
-from ..attr import required, true
+from ..attr import required, sorted_tuple, true, trusted
 from ..trial import TestCase
 
 
@@ -33,6 +33,28 @@ class MustBeNiceClass(object):
 
 
 
+@attrs(frozen=True)
+class SortedClass(object):
+    """
+    Class for testing :func:`trusted`.
+    """
+
+    name: str = attrib(validator=true(instance_of(str)))
+    values: tuple = attrib(convert=sorted_tuple)
+
+
+
+@attrs(frozen=True, slots=True)
+class SlottedSortedClass(object):
+    """
+    Slotted class for testing :func:`trusted`.
+    """
+
+    name: str = attrib(validator=true(instance_of(str)))
+    values: tuple = attrib(convert=sorted_tuple)
+
+
+
 class ValidatorTests(TestCase):
     """
     Tests for :mod:`config_service.util.validators`
@@ -74,3 +96,40 @@ class ValidatorTests(TestCase):
         false.
         """
         self.assertRaises(ValueError, MustBeNiceClass, nice="")
+
+
+
+class TrustedTests(TestCase):
+    """
+    Tests for :func:`trusted`
+    """
+
+    def test_trusted_equal(self) -> None:
+        """
+        :func:`trusted` creates an instance equal to one created by the
+        initializer from the same converted values.
+        """
+        self.assertEqual(
+            trusted(SortedClass, name="foo", values=(1, 2, 3)),
+            SortedClass(name="foo", values=(3, 1, 2)),
+        )
+
+
+    def test_trusted_noValidation(self) -> None:
+        """
+        :func:`trusted` does not run validators or converters.
+        """
+        instance = trusted(SortedClass, name="", values=(3, 1, 2))
+
+        self.assertEqual(instance.name, "")
+        self.assertEqual(instance.values, (3, 1, 2))
+
+
+    def test_trusted_slots(self) -> None:
+        """
+        :func:`trusted` creates instances of slotted classes.
+        """
+        self.assertEqual(
+            trusted(SlottedSortedClass, name="foo", values=(1, 2, 3)),
+            SlottedSortedClass(name="foo", values=(3, 1, 2)),
+        )
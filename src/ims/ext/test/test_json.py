@@ -6,18 +6,20 @@ from datetime import (
     date as Date, datetime as DateTime,
     timedelta as TimeDelta, timezone as TimeZone,
 )
+from io import BytesIO
 from json import JSONDecodeError
 from textwrap import dedent
-from typing import Callable, cast
+from typing import Any, Callable, cast
 
 from hypothesis import given
 from hypothesis.strategies import (
     composite, dates, datetimes as _datetimes, integers
 )
 
+from .. import json as jsonExt
 from ..json import (
-    dateAsRFC3339Text, dateTimeAsRFC3339Text,
-    jsonTextFromObject, objectFromJSONText,
+    dateAsRFC3339Text, dateTimeAsRFC3339Text, jsonBytesFromObject,
+    jsonTextFromObject, objectFromJSONText, objectsFromJSONArrayBytesIO,
     rfc3339TextAsDate, rfc3339TextAsDateTime,
 )
 from ..trial import TestCase
@@ -105,6 +107,60 @@ class JSONEncodingTests(TestCase):
         )
 
 
+    def test_jsonBytesFromObject(self) -> None:
+        """
+        :func:`jsonBytesFromObject` encodes the same JSON as
+        :func:`jsonTextFromObject` as UTF-8 bytes.
+        """
+        obj = dict(
+            x="Hello \u2603", y=("one", "two"), z=frozenset((1,)),
+            big=2 ** 70, none=None,
+        )
+
+        self.assertEqual(
+            jsonBytesFromObject(obj), jsonTextFromObject(obj).encode("utf-8")
+        )
+
+
+    def test_jsonBytesFromObject_stdlib(self) -> None:
+        """
+        :func:`jsonBytesFromObject` encodes JSON using :mod:`json` if
+        :mod:`orjson` is not available.
+        """
+        self.patch(jsonExt, "orjsonDumps", None)
+
+        obj = dict(x="Hello \u2603", y=(n for n in (1, 2)))
+
+        self.assertEqual(
+            jsonBytesFromObject(obj), b'{"x":"Hello \xe2\x98\x83","y":[1,2]}'
+        )
+
+
+    def test_jsonBytesFromObject_orjsonTypeError(self) -> None:
+        """
+        :func:`jsonBytesFromObject` encodes JSON using :mod:`json` if
+        :mod:`orjson` raises :exc:`TypeError` for the given object.
+        """
+        def orjsonDumps(obj: Any, default: Callable[[Any], Any]) -> bytes:
+            raise TypeError("Integer exceeds 64-bit range")
+
+        self.patch(jsonExt, "orjsonDumps", orjsonDumps)
+
+        obj = dict(big=2 ** 70)
+
+        self.assertEqual(
+            jsonBytesFromObject(obj), b'{"big":1180591620717411303424}'
+        )
+
+
+    def test_jsonBytesFromObject_unknown(self) -> None:
+        """
+        :func:`jsonBytesFromObject` raises :exc:`TypeError` when given an
+        unknown object type.
+        """
+        self.assertRaises(TypeError, jsonBytesFromObject, object())
+
+
 
 class JSONDecodingTests(TestCase):
     """
@@ -144,6 +200,49 @@ class JSONDecodingTests(TestCase):
         self.assertIn(" in {!r}".format(jsonText), e.msg)
 
 
+    def test_objectsFromJSONArrayBytesIO(self) -> None:
+        """
+        :func:`objectsFromJSONArrayBytesIO` decodes the objects in a JSON
+        array, including values which span reads from the stream.
+        """
+        jsonBytes = (
+            b' [ {"x": "Hello", "y": [1, 2]},\n 12345 ,"\xc3\xa9t\xc3\xa9", '
+            b'null ] '
+        )
+
+        for bufferSize in (1, 3, 64 * 1024):
+            self.assertEqual(
+                list(
+                    objectsFromJSONArrayBytesIO(
+                        BytesIO(jsonBytes), bufferSize=bufferSize
+                    )
+                ),
+                [dict(x="Hello", y=[1, 2]), 12345, "\xe9t\xe9", None],
+            )
+
+
+    def test_objectsFromJSONArrayBytesIO_empty(self) -> None:
+        """
+        :func:`objectsFromJSONArrayBytesIO` decodes an empty JSON array.
+        """
+        self.assertEqual(
+            list(objectsFromJSONArrayBytesIO(BytesIO(b"[ ]"), bufferSize=1)),
+            [],
+        )
+
+
+    def test_objectsFromJSONArrayBytesIO_badInput(self) -> None:
+        """
+        :func:`objectsFromJSONArrayBytesIO` raises :exc:`JSONDecodeError`
+        when given JSON text which is not a valid array.
+        """
+        for jsonBytes in (b"{}", b"[1 2]", b"[1,]", b"[1", b"[1] 2"):
+            self.assertRaises(
+                JSONDecodeError,
+                list, objectsFromJSONArrayBytesIO(BytesIO(jsonBytes)),
+            )
+
+
 
 class DateTimeTests(TestCase):
     """
@@ -2,11 +2,18 @@
 Tests for :mod:`ranger-ims-server.ext.klein`
 """
 
+from gzip import decompress
+from typing import Optional
+
 from klein.test.test_resource import Klein, requestMock
 
 from twisted.web.iweb import IRequest
 
-from ..klein import KleinRenderable, static
+from ..klein import (
+    CompressedContentCache, ContentEncoderFactory, ContentEncoding,
+    ContentType, HeaderName, KleinRenderable, acceptedEncoding, static,
+    uncompressed,
+)
 from ..trial import TestCase
 
 
@@ -70,3 +77,326 @@ class StaticDecoratorTests(TestCase):
         self.assertTrue(len(etags) == 1, etags)
         etag = etags[0]
         self.assertTrue(etag)
+
+
+
+def encodingRequest(
+    acceptEncoding: Optional[str], contentType: str = ContentType.json.value
+) -> IRequest:
+    """
+    Create a request with the given ``Accept-Encoding`` header and a response
+    with the given ``Content-Type``.
+    """
+    request = requestMock(b"/")
+    if acceptEncoding is not None:
+        request.requestHeaders.setRawHeaders(
+            HeaderName.acceptEncoding.value, [acceptEncoding]
+        )
+    request.setHeader(HeaderName.contentType.value, contentType)
+    return request
+
+
+
+class AcceptedEncodingTests(TestCase):
+    """
+    Tests for :func:`acceptedEncoding`
+    """
+
+    def assertAccepted(
+        self, acceptEncoding: Optional[str],
+        expected: Optional[ContentEncoding],
+    ) -> None:
+        request = encodingRequest(acceptEncoding)
+        self.assertIdentical(acceptedEncoding(request), expected)
+
+
+    def test_none(self) -> None:
+        """
+        :func:`acceptedEncoding` returns :obj:`None` if the request has no
+        ``Accept-Encoding`` header.
+        """
+        self.assertAccepted(None, None)
+
+
+    def test_unknown(self) -> None:
+        """
+        :func:`acceptedEncoding` returns :obj:`None` if the request only
+        accepts unknown encodings.
+        """
+        self.assertAccepted("identity, br", None)
+
+
+    def test_preferred(self) -> None:
+        """
+        :func:`acceptedEncoding` prefers gzip to deflate when both are equally
+        acceptable.
+        """
+        self.assertAccepted("deflate, gzip", ContentEncoding.gzip)
+
+
+    def test_quality(self) -> None:
+        """
+        :func:`acceptedEncoding` prefers the encoding with the highest
+        quality value and ignores encodings with a quality value of zero.
+        """
+        self.assertAccepted("gzip;q=0.5, deflate", ContentEncoding.deflate)
+        self.assertAccepted("gzip;q=0, deflate;q=0", None)
+
+
+    def test_wildcard(self) -> None:
+        """
+        :func:`acceptedEncoding` applies a wildcard to encodings that are not
+        otherwise listed.
+        """
+        self.assertAccepted("*", ContentEncoding.gzip)
+        self.assertAccepted("gzip;q=0, *", ContentEncoding.deflate)
+
+
+
+class ContentEncoderFactoryTests(TestCase):
+    """
+    Tests for :class:`ContentEncoderFactory`
+    """
+
+    data = b'{"text": "' + (b"Hello, World! " * 200) + b'"}'
+
+
+    def encode(self, request: IRequest) -> bytes:
+        encoder = ContentEncoderFactory().encoderForRequest(request)
+        return encoder.encode(self.data) + encoder.finish()
+
+
+    def test_compressed(self) -> None:
+        """
+        The encoder compresses JSON with the accepted encoding, and sets the
+        ``Content-Encoding`` and ``Vary`` headers.
+        """
+        request = encodingRequest("gzip")
+        request.setHeader(HeaderName.contentLength.value, str(len(self.data)))
+
+        body = self.encode(request)
+
+        self.assertEqual(decompress(body), self.data)
+        self.assertEqual(
+            request.responseHeaders.getRawHeaders(
+                HeaderName.contentEncoding.value
+            ),
+            ["gzip"],
+        )
+        self.assertEqual(
+            request.responseHeaders.getRawHeaders(HeaderName.vary.value),
+            [HeaderName.acceptEncoding.value],
+        )
+        self.assertFalse(
+            request.responseHeaders.hasHeader(HeaderName.contentLength.value)
+        )
+
+
+    def test_notAccepted(self) -> None:
+        """
+        The encoder does not compress if the client accepts no known encoding,
+        but still sets the ``Vary`` header.
+        """
+        request = encodingRequest(None)
+
+        self.assertEqual(self.encode(request), self.data)
+        self.assertFalse(
+            request.responseHeaders.hasHeader(HeaderName.contentEncoding.value)
+        )
+        self.assertEqual(
+            request.responseHeaders.getRawHeaders(HeaderName.vary.value),
+            [HeaderName.acceptEncoding.value],
+        )
+
+
+    def test_small(self) -> None:
+        """
+        The encoder does not compress responses with a ``Content-Length``
+        under the minimum size.
+        """
+        request = encodingRequest("gzip")
+        request.setHeader(HeaderName.contentLength.value, "10")
+
+        self.assertEqual(self.encode(request), self.data)
+
+
+    def test_eventStream(self) -> None:
+        """
+        The encoder does not compress event streams.
+        """
+        request = encodingRequest("gzip", ContentType.eventStream.value)
+
+        self.assertEqual(self.encode(request), self.data)
+
+
+    def test_uncompressed(self) -> None:
+        """
+        The encoder does not compress responses from routes decorated with
+        :func:`uncompressed`.
+        """
+        class Application(object):
+            router = Klein()
+
+            @router.route("/")
+            @uncompressed
+            def root(self, request: IRequest) -> KleinRenderable:
+                return "Hello"
+
+        request = encodingRequest("gzip")
+        Application().root(request)
+
+        self.assertEqual(self.encode(request), self.data)
+
+
+    def test_uncompressed_unhashable(self) -> None:
+        """
+        :func:`uncompressed` does not require requests to be hashable, as
+        :class:`twisted.web.server.Request` is not in all versions of Twisted.
+        """
+        class Application(object):
+            router = Klein()
+
+            @router.route("/")
+            @uncompressed
+            def root(self, request: IRequest) -> KleinRenderable:
+                return "Hello"
+
+        request = encodingRequest("gzip")
+        request.__class__ = type(
+            "UnhashableRequest", (request.__class__,), dict(__hash__=None)
+        )
+        self.assertRaises(TypeError, hash, request)
+
+        Application().root(request)
+
+        self.assertEqual(self.encode(request), self.data)
+
+
+
+class CompressedContentCacheTests(TestCase):
+    """
+    Tests for :class:`CompressedContentCache`
+    """
+
+    data = ContentEncoderFactoryTests.data
+
+
+    def test_encoded(self) -> None:
+        """
+        :meth:`CompressedContentCache.encoded` returns the data compressed with
+        the accepted encoding and sets the ``Content-Encoding`` and
+        ``Content-Length`` headers.
+        """
+        request = encodingRequest("gzip")
+
+        body = CompressedContentCache().encoded(request, "key", self.data)
+
+        self.assertEqual(decompress(body), self.data)
+        self.assertEqual(
+            request.responseHeaders.getRawHeaders(
+                HeaderName.contentEncoding.value
+            ),
+            ["gzip"],
+        )
+        self.assertEqual(
+            request.responseHeaders.getRawHeaders(
+                HeaderName.contentLength.value
+            ),
+            [str(len(body))],
+        )
+
+
+    def test_cached(self) -> None:
+        """
+        :meth:`CompressedContentCache.encoded` compresses data with a given
+        key only once.
+        """
+        cache = CompressedContentCache()
+
+        body1 = cache.encoded(encodingRequest("gzip"), "key", self.data)
+        body2 = cache.encoded(
+            encodingRequest("gzip"), "key", self.data.upper()
+        )
+
+        self.assertIdentical(body1, body2)
+
+
+    def test_newVersion(self) -> None:
+        """
+        :meth:`CompressedContentCache.encoded` compresses a new version of the
+        data with a given key, and replaces the old version.
+        """
+        cache = CompressedContentCache()
+        newData = self.data.upper()
+
+        cache.encoded(encodingRequest("gzip"), "key", self.data, version=1)
+        body = cache.encoded(
+            encodingRequest("gzip"), "key", newData, version=2
+        )
+
+        self.assertEqual(decompress(body), newData)
+        self.assertEqual(len(cache._state.entries), 1)
+
+
+    def test_encodedFrom_cached(self) -> None:
+        """
+        :meth:`CompressedContentCache.encodedFrom` does not read data which is
+        already cached.
+        """
+        cache = CompressedContentCache()
+        reads = []
+
+        def read() -> bytes:
+            reads.append(True)
+            return self.data
+
+        for _ in range(2):
+            body = cache.encodedFrom(
+                encodingRequest("gzip"), "key", 1, len(self.data), read
+            )
+            self.assertEqual(decompress(body), self.data)
+
+        self.assertEqual(len(reads), 1)
+
+
+    def test_encodedFrom_unencoded(self) -> None:
+        """
+        :meth:`CompressedContentCache.encodedFrom` reads and returns the data
+        for clients that don't accept any encoding, and caches nothing.
+        """
+        cache = CompressedContentCache()
+
+        body = cache.encodedFrom(
+            encodingRequest(None), "key", 1, len(self.data), lambda: self.data
+        )
+
+        self.assertEqual(body, self.data)
+        self.assertEqual(cache._state.entries, {})
+
+
+    def test_small(self) -> None:
+        """
+        :meth:`CompressedContentCache.encoded` does not compress data under
+        the minimum size.
+        """
+        request = encodingRequest("gzip")
+
+        body = CompressedContentCache().encoded(request, "key", b"{}")
+
+        self.assertEqual(body, b"{}")
+        self.assertFalse(
+            request.responseHeaders.hasHeader(HeaderName.contentEncoding.value)
+        )
+
+
+    def test_notEncodedAgain(self) -> None:
+        """
+        Responses from :meth:`CompressedContentCache.encoded` are not encoded
+        again by :class:`ContentEncoderFactory`.
+        """
+        request = encodingRequest("gzip")
+
+        body = CompressedContentCache().encoded(request, "key", self.data)
+
+        encoder = ContentEncoderFactory().encoderForRequest(request)
+        self.assertEqual(encoder.encode(body) + encoder.finish(), body)
@@ -9,10 +9,13 @@ from sqlite3 import Error as SQLiteError
 from textwrap import dedent
 from typing import Any, Generator, List, Mapping, cast
 
+from twisted.logger import Logger
+
 from .. import sqlite
 from ..sqlite import (
-    BaseCursor, Connection, QueryPlanExplanation,
-    connect, createDB, explainQueryPlans, openDB, printSchema,
+    BaseCursor, Connection, Cursor, IntegrityError,
+    QueryPlanExplanation, connect, createDB, explainQueryPlans, openDB,
+    printSchema, setDebugLogging,
 )
 from ..trial import TestCase
 
@@ -66,6 +69,45 @@ class ConnectionTests(TestCase):
             self.fail("No rows found")
 
 
+    def test_connect_cachedStatements(self) -> None:
+        """
+        :func:`connect` passes the statement cache size to
+        :func:`sqlite3.connect`.
+        """
+        options = []
+
+        def _connect(database: Any, **kwargs: Any) -> Connection:
+            options.append(kwargs)
+            return Connection(":memory:")
+
+        self.patch(sqlite, "sqliteConnect", _connect)
+
+        connect(None, cachedStatements=512)
+
+        self.assertEqual(options[0]["cached_statements"], 512)
+
+
+    def test_setDebugLogging(self) -> None:
+        """
+        :func:`setDebugLogging` turns logging of SQL statements on and off.
+        """
+        cursor = connect(None).cursor()
+
+        events: List[Mapping[str, Any]] = []
+        self.patch(Cursor, "_log", Logger(observer=events.append))
+        self.addCleanup(setDebugLogging, True)
+
+        setDebugLogging(False)
+        cursor.execute("select 1")
+        self.assertEqual(events, [])
+
+        setDebugLogging(True)
+        cursor.execute("select 2")
+        self.assertEqual(
+            [event["sql"] for event in events], ["select 2"]
+        )
+
+
     def test_connect_none(self) -> None:
         """
         :func:`connect` with :obj:`None` argument connects to `:memory:`.
@@ -89,6 +131,128 @@ class ConnectionTests(TestCase):
         self.assertEqual(self.connections, [str(path)])
 
 
+    def test_connect_pragmas(self) -> None:
+        """
+        :func:`connect` sets the requested pragmas on the connection.
+        """
+        path = Path(self.mktemp())
+
+        db = connect(
+            path,
+            journalMode="WAL",
+            synchronous="normal",
+            busyTimeout=1234,
+            cacheSize=-2000,
+            mmapSize=0,
+        )
+
+        def pragma(name: str) -> Any:
+            return db.execute(f"pragma {name}").fetchone()[0]
+
+        self.assertEqual(pragma("journal_mode"), "wal")
+        self.assertEqual(pragma("synchronous"), 1)
+        self.assertEqual(pragma("busy_timeout"), 1234)
+        self.assertEqual(pragma("cache_size"), -2000)
+        self.assertEqual(pragma("mmap_size"), 0)
+        self.assertEqual(pragma("foreign_keys"), 1)
+
+
+    def test_connect_invalidJournalMode(self) -> None:
+        """
+        :func:`connect` raises :exc:`ValueError` when given an unknown journal
+        mode.
+        """
+        self.assertRaises(
+            ValueError, connect, None, journalMode="xyzzy; drop table X"
+        )
+
+
+    def test_connect_invalidSynchronous(self) -> None:
+        """
+        :func:`connect` raises :exc:`ValueError` when given an unknown
+        synchronous mode.
+        """
+        self.assertRaises(ValueError, connect, None, synchronous="xyzzy")
+
+
+    def test_connect_readOnly(self) -> None:
+        """
+        :func:`connect` with ``readOnly=True`` opens a connection which can
+        read but not write to the database.
+        """
+        path = Path(self.mktemp())
+
+        createDB(
+            path, schema="create table PERSON (NAME text not null);"
+        ).close()
+
+        db = connect(path, readOnly=True)
+
+        self.assertEqual(db.execute("select * from PERSON").fetchall(), [])
+        self.assertRaises(
+            SQLiteError,
+            db.execute, "insert into PERSON (NAME) values ('John Doe')",
+        )
+
+
+    def test_connect_readOnlyMemory(self) -> None:
+        """
+        :func:`connect` with :obj:`None` argument and ``readOnly=True`` raises
+        :exc:`ValueError`.
+        """
+        self.assertRaises(ValueError, connect, None, readOnly=True)
+
+
+    def test_isHealthy(self) -> None:
+        """
+        :meth:`Connection.isHealthy` returns :obj:`True` for an open
+        connection.
+        """
+        db = connect(None)
+
+        self.assertTrue(db.isHealthy())
+
+
+    def test_isHealthy_closed(self) -> None:
+        """
+        :meth:`Connection.isHealthy` returns :obj:`False` for a closed
+        connection.
+        """
+        db = connect(None)
+        db.close()
+
+        self.assertFalse(db.isHealthy())
+
+
+    def test_validateForeignKeys_table(self) -> None:
+        """
+        :meth:`Connection.validateForeignKeys` checks only the given table,
+        if any.
+        """
+        db = createDB(
+            None,
+            dedent(
+                """
+                create table PARENT (ID integer not null primary key);
+                create table CHILD (
+                    PARENT integer not null references PARENT(ID)
+                );
+                create table OTHER (
+                    PARENT integer not null references PARENT(ID)
+                );
+                """
+            )
+        )
+        db.execute("pragma foreign_keys = off")
+        with db:
+            db.execute("insert into CHILD (PARENT) values (1)")
+        db.execute("pragma foreign_keys = on")
+
+        db.validateForeignKeys("OTHER")
+        self.assertRaises(IntegrityError, db.validateForeignKeys, "CHILD")
+        self.assertRaises(IntegrityError, db.validateForeignKeys)
+
+
     def test_createDB_schema(self) -> None:
         """
         :func:`createDB` creates a DB with the expected schema.
@@ -177,11 +341,36 @@ class DebugToolsTests(TestCase):
 
     def test_explainQueryPlans(self) -> None:
         """
-        :func:`explainQueryPlans` ...
+        :func:`explainQueryPlans` explains the query plans for the given
+        queries, binding null to any named parameters.
         """
-        raise NotImplementedError()
+        schema = dedent(
+            """
+            create table PERSON (
+                ID   integer not null,
+                NAME text    not null,
 
-    test_explainQueryPlans.todo = "unimplemented"
+                primary key (ID),
+                unique (NAME)
+            );
+            """
+        )
+
+        db = createDB(None, schema=schema)
+
+        explanations = tuple(
+            explainQueryPlans(
+                db, (("select ID from PERSON where NAME = :name", "Person"),)
+            )
+        )
+
+        self.assertEqual(len(explanations), 1)
+        explanation = explanations[0]
+        self.assertEqual(explanation.name, "Person")
+        self.assertEqual(len(explanation.lines), 1)
+        self.assertIn(
+            "PERSON USING COVERING INDEX", explanation.lines[0].details
+        )
 
 
     def test_QueryPlanExplanation_Lines_str(self) -> None:
@@ -317,7 +506,7 @@ def patchConnect_errors(testCase: TestCase) -> None:
     """
     Patch :func:`connect` to create :class:`ErrneousSQLiteConnection`s.
     """
-    def connect(database: str) -> Connection:
+    def connect(database: str, **options: Any) -> Connection:
         if database is None:
             database = ":memory:"
         db = ErrneousSQLiteConnection(database)
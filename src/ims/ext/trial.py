@@ -3,7 +3,7 @@
 Extensions to :mod:`twisted.trial`
 """
 
-from typing import Any, Optional, Sequence
+from typing import Any, Optional, Sequence, Type
 
 from twisted.internet.defer import Deferred, ensureDeferred
 from twisted.python.failure import Failure
@@ -40,7 +40,7 @@ class TestCase(SynchronousTestCase):
 
 
     def failureResultOf(
-        self, deferred: Deferred, *expectedExceptionTypes: BaseException
+        self, deferred: Deferred, *expectedExceptionTypes: Type[BaseException]
     ) -> Failure:
         """
         Override :meth:`SynchronousTestCase.failureResultOf` to enable handling
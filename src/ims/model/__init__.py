@@ -27,6 +27,7 @@ from ._priority import IncidentPriority
 from ._ranger import Ranger, RangerStatus
 from ._report import IncidentReport
 from ._state import IncidentState
+from ._summary import IncidentSummary
 from ._type import KnownIncidentType
 
 
@@ -37,6 +38,7 @@ __all__ = (
     "IncidentPriority",
     "IncidentReport",
     "IncidentState",
+    "IncidentSummary",
     "KnownIncidentType",
     "Location",
     "Ranger",
@@ -20,8 +20,8 @@
 Address
 """
 
-from abc import ABC
-from typing import Any, Optional, TypeVar
+from abc import ABCMeta
+from typing import Any, Callable, Optional, TypeVar
 
 from attr import attrib, attrs
 from attr.validators import instance_of, optional
@@ -39,16 +39,18 @@ TRodGarettAddress = TypeVar("TRodGarettAddress", bound="RodGarettAddress")
 
 
 
-class Address(ABC):
+class Address(metaclass=ABCMeta):
     """
     Location address
     """
 
+    __slots__ = ()
+
     description: Optional[str]
 
 
 
-@attrs(frozen=True, cmp=False)
+@attrs(frozen=True, cmp=False, slots=True)
 class TextOnlyAddress(Address, ComparisonMixIn):
     """
     Address
@@ -65,15 +67,15 @@ class TextOnlyAddress(Address, ComparisonMixIn):
         return self.description
 
 
-    def _cmp(self, other: Any, methodName: str) -> bool:
+    def _cmp(self, other: Any, op: Callable[[Any, Any], bool]) -> bool:
         if other is None:
             return self.description is None
 
-        return ComparisonMixIn._cmp(self, other, methodName)
+        return ComparisonMixIn._cmp(self, other, op)
 
 
 
-@attrs(frozen=True, cmp=False)
+@attrs(frozen=True, cmp=False, slots=True)
 class RodGarettAddress(Address, ComparisonMixIn, ReplaceMixIn):
     """
     Rod Garett Address
@@ -111,15 +113,15 @@ class RodGarettAddress(Address, ComparisonMixIn, ReplaceMixIn):
         )
 
 
-    def _cmp(self, other: Any, methodName: str) -> bool:
+    def _cmp(self, other: Any, op: Callable[[Any, Any], bool]) -> bool:
         if other is None:
             return self._allNone()
 
         if other.__class__ is TextOnlyAddress:
             if self._allNone():
-                return getattr(self.description, methodName)(other.description)
+                return op(self.description, other.description)
 
-        return ComparisonMixIn._cmp(self, other, methodName)
+        return ComparisonMixIn._cmp(self, other, op)
 
 
     def __hash__(self) -> int:
@@ -20,19 +20,22 @@
 Comparison mix-in
 """
 
-from abc import ABC, abstractmethod
-from typing import Any
+from abc import ABCMeta, abstractmethod
+from operator import eq, ge, gt, le, lt, ne
+from typing import Any, Callable
 
 
 __all__ = ()
 
 
 
-class ComparisonMixIn(ABC):
+class ComparisonMixIn(metaclass=ABCMeta):
     """
     Mix-in class with support for comparison operators.
     """
 
+    __slots__ = ()
+
 
     @abstractmethod
     def _cmpValue(self) -> Any:
@@ -41,12 +44,9 @@ class ComparisonMixIn(ABC):
         """
 
 
-    def _cmp(self, other: Any, methodName: str) -> bool:
+    def _cmp(self, other: Any, op: Callable[[Any, Any], bool]) -> bool:
         if other.__class__ is self.__class__:
-            selfValue = self._cmpValue()
-            otherValue = other._cmpValue()
-            selfValueCmp = getattr(selfValue, methodName)
-            return selfValueCmp(otherValue)
+            return op(self._cmpValue(), other._cmpValue())
         else:
             return NotImplemented
 
@@ -56,24 +56,24 @@ class ComparisonMixIn(ABC):
 
 
     def __eq__(self, other: Any) -> bool:
-        return self._cmp(other, "__eq__")
+        return self._cmp(other, eq)
 
 
     def __ne__(self, other: Any) -> bool:
-        return self._cmp(other, "__ne__")
+        return self._cmp(other, ne)
 
 
     def __lt__(self, other: Any) -> bool:
-        return self._cmp(other, "__lt__")
+        return self._cmp(other, lt)
 
 
     def __le__(self, other: Any) -> bool:
-        return self._cmp(other, "__le__")
+        return self._cmp(other, le)
 
 
     def __gt__(self, other: Any) -> bool:
-        return self._cmp(other, "__gt__")
+        return self._cmp(other, gt)
 
 
     def __ge__(self, other: Any) -> bool:
-        return self._cmp(other, "__ge__")
+        return self._cmp(other, ge)
@@ -36,7 +36,7 @@ __all__ = ()
 
 
 
-@attrs(frozen=True, cmp=False)
+@attrs(frozen=True, cmp=False, slots=True)
 class ReportEntry(ComparisonMixIn, ReplaceMixIn):
     """
     Report entry
@@ -30,7 +30,7 @@ __all__ = ()
 
 
 
-@attrs(frozen=True)
+@attrs(frozen=True, slots=True)
 class Event(object):
     """
     Event
@@ -22,6 +22,7 @@ Incident
 
 from collections.abc import Iterable as IterableABC
 from datetime import datetime as DateTime
+from itertools import chain
 from typing import AbstractSet, Iterable, Optional, Sequence
 
 from attr import attrib, attrs
@@ -43,7 +44,7 @@ __all__ = ()
 
 
 
-@attrs(frozen=True)
+@attrs(frozen=True, slots=True)
 class Incident(ReplaceMixIn):
     """
     Incident
@@ -96,6 +97,16 @@ class Incident(ReplaceMixIn):
         return summaryFromReport(self.summary, self.reportEntries)
 
 
+    def lastModified(self) -> DateTime:
+        """
+        Generate a last modified time: the latest of the created time and the
+        created times of the report entries.
+        """
+        return max(
+            chain((self.created,), (e.created for e in self.reportEntries))
+        )
+
+
 
 def summaryFromReport(
     summary: Optional[str], reportEntries: Iterable[ReportEntry]
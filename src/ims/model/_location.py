@@ -37,7 +37,7 @@ def convertAddress(address: Optional[Address]) -> Address:
 
 
 
-@attrs(frozen=True)
+@attrs(frozen=True, slots=True)
 class Location(Address, ReplaceMixIn):
     """
     Location
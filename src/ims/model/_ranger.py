@@ -82,7 +82,7 @@ class RangerStatus(Enum):
 
 
 
-@attrs(frozen=True)
+@attrs(frozen=True, slots=True)
 class Ranger(ReplaceMixIn):
     """
     Ranger
@@ -35,6 +35,8 @@ class ReplaceMixIn():
     Mix-in class with replace method for :mod:`attr` classes.
     """
 
+    __slots__ = ()
+
     def replace(self: TAttrsObject, **kwargs: Any) -> TAttrsObject:
         """
         Return a new address with the same values, except those specified by
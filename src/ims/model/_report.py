@@ -39,7 +39,7 @@ __all__ = ()
 
 
 
-@attrs(frozen=True)
+@attrs(frozen=True, slots=True)
 class IncidentReport(ReplaceMixIn):
     """
     Incident
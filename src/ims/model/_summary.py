@@ -0,0 +1,111 @@
+# -*- test-case-name: ranger-ims-server.model.test.test_summary -*-
+
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+Incident Summary
+"""
+
+from collections.abc import Iterable as IterableABC
+from datetime import datetime as DateTime
+from typing import AbstractSet, Optional
+
+from attr import attrib, attrs
+from attr.validators import instance_of, optional
+
+from ._event import Event
+from ._incident import Incident
+from ._location import Location
+from ._priority import IncidentPriority
+from ._replace import ReplaceMixIn
+from ._state import IncidentState
+
+AbstractSet  # silence linter
+
+
+__all__ = ()
+
+
+
+@attrs(frozen=True, slots=True)
+class IncidentSummary(ReplaceMixIn):
+    """
+    Incident summary
+
+    An incident summary has the attributes of an incident that are shown in
+    incident lists; it omits report entries, but carries the summary and last
+    modified time derived from them.
+    """
+
+    event: Event = attrib(
+        validator=instance_of(Event)
+    )
+    number: int = attrib(
+        validator=instance_of(int)
+    )
+    created: DateTime = attrib(
+        validator=instance_of(DateTime)
+    )
+    lastModified: DateTime = attrib(
+        validator=instance_of(DateTime)
+    )
+    state: IncidentState = attrib(
+        validator=instance_of(IncidentState)
+    )
+    priority: IncidentPriority = attrib(
+        validator=instance_of(IncidentPriority)
+    )
+    summary: Optional[str] = attrib(
+        validator=optional(instance_of(str))
+    )
+    location: Location = attrib(
+        validator=instance_of(Location)
+    )
+
+    rangerHandles: AbstractSet[str] = attrib(
+        validator=instance_of(IterableABC), convert=frozenset
+    )
+    incidentTypes: AbstractSet[str] = attrib(
+        validator=instance_of(IterableABC), convert=frozenset
+    )
+    summaryFromReport: str = attrib(
+        validator=instance_of(str)
+    )
+
+
+    @classmethod
+    def fromIncident(cls, incident: Incident) -> "IncidentSummary":
+        """
+        Create a summary of the given incident.
+        """
+        return cls(
+            event=incident.event,
+            number=incident.number,
+            created=incident.created,
+            lastModified=incident.lastModified(),
+            state=incident.state,
+            priority=incident.priority,
+            summary=incident.summary,
+            location=incident.location,
+            rangerHandles=incident.rangerHandles,
+            incidentTypes=incident.incidentTypes,
+            summaryFromReport=incident.summaryFromReport(),
+        )
+
+
+    def __str__(self) -> str:
+        return f"{self.event} #{self.number}: {self.summaryFromReport}"
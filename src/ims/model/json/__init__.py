@@ -26,12 +26,14 @@ from ._address import RodGarettAddressJSONKey, TextOnlyAddressJSONKey
 from ._entry import ReportEntryJSONKey
 from ._incident import IncidentJSONKey
 from ._json import (
-    JSONCodecError, jsonObjectFromModelObject, modelObjectFromJSONObject
+    JSONCodecError, jsonBytesFromModelObject, jsonObjectFromModelObject,
+    modelObjectFromJSONObject,
 )
 from ._location import LocationJSONKey
 from ._priority import IncidentPriorityJSONValue
 from ._report import IncidentReportJSONKey
 from ._state import IncidentStateJSONValue
+from ._summary import IncidentSummaryJSONKey
 
 del _event
 del _ranger
@@ -43,11 +45,13 @@ __all__ = (
     "IncidentPriorityJSONValue",
     "IncidentReportJSONKey",
     "IncidentStateJSONValue",
+    "IncidentSummaryJSONKey",
     "JSONCodecError",
     "LocationJSONKey",
     "ReportEntryJSONKey",
     "RodGarettAddressJSONKey",
     "TextOnlyAddressJSONKey",
+    "jsonBytesFromModelObject",
     "jsonObjectFromModelObject",
     "modelObjectFromJSONObject",
 )
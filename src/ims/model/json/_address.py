@@ -22,7 +22,8 @@ from enum import Enum, unique
 from typing import Any, Dict, Optional, Type
 
 from ._json import (
-    deserialize, jsonSerialize, registerDeserializer, registerSerializer
+    compileSerializer, deserialize, jsonSerialize, registerDeserializer,
+    registerSerializer,
 )
 from .._address import Address, RodGarettAddress, TextOnlyAddress
 
@@ -133,6 +134,11 @@ def serializeTextOnlyAddress(address: TextOnlyAddress) -> Dict[str, Any]:
 
 registerSerializer(TextOnlyAddress, serializeTextOnlyAddress)
 
+compileSerializer(
+    TextOnlyAddress, TextOnlyAddressJSONKey,
+    constants={AddressJSONKey.addressType.value: "text"},
+)
+
 
 def serializeRodGarettAddress(address: RodGarettAddress) -> Dict[str, Any]:
     # Map RodGarettAddress attribute names to JSON dict key names
@@ -145,6 +151,11 @@ def serializeRodGarettAddress(address: RodGarettAddress) -> Dict[str, Any]:
 
 registerSerializer(RodGarettAddress, serializeRodGarettAddress)
 
+compileSerializer(
+    RodGarettAddress, RodGarettAddressJSONKey,
+    constants={AddressJSONKey.addressType.value: "garett"},
+)
+
 
 
 def deserializeTextOnlyAddress(
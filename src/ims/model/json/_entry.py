@@ -22,8 +22,11 @@ from datetime import datetime as DateTime
 from enum import Enum, unique
 from typing import Any, Dict, Type
 
+from ims.ext.json import dateTimeAsRFC3339Text
+
 from ._json import (
-    deserialize, jsonSerialize, registerDeserializer, registerSerializer
+    compileSerializer, deserialize, jsonSerialize, registerDeserializer,
+    registerSerializer,
 )
 from .._entry import ReportEntry
 
@@ -66,6 +69,11 @@ def serializeReportEntry(reportEntry: ReportEntry) -> Dict[str, Any]:
 
 registerSerializer(ReportEntry, serializeReportEntry)
 
+compiledReportEntrySerializer = compileSerializer(
+    ReportEntry, ReportEntryJSONKey,
+    converters=dict(created=dateTimeAsRFC3339Text),
+)
+
 
 def deserializeReportEntry(obj: Dict[str, Any], cl: Type) -> ReportEntry:
     assert cl is ReportEntry, (cl, obj)
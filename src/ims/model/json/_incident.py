@@ -139,9 +139,17 @@ from datetime import datetime as DateTime
 from enum import Enum, unique
 from typing import Any, Dict, List, Optional, Set, Type
 
+from ims.ext.json import dateTimeAsRFC3339Text
+
+from ._entry import compiledReportEntrySerializer
+from ._event import serializeEvent
 from ._json import (
-    deserialize, jsonSerialize, registerDeserializer, registerSerializer
+    compileSerializer, compiledListSerializer, deserialize, jsonSerialize,
+    registerDeserializer, registerSerializer,
 )
+from ._location import compiledLocationSerializer
+from ._priority import incidentPriorityJSONValues
+from ._state import incidentStateJSONValues
 from .._entry import ReportEntry
 from .._event import Event
 from .._incident import Incident
@@ -200,6 +208,20 @@ def serializeIncident(incident: Incident) -> Dict[str, Any]:
 
 registerSerializer(Incident, serializeIncident)
 
+compileSerializer(
+    Incident, IncidentJSONKey,
+    converters=dict(
+        event=serializeEvent,
+        created=dateTimeAsRFC3339Text,
+        state=incidentStateJSONValues.__getitem__,
+        priority=incidentPriorityJSONValues.__getitem__,
+        location=compiledLocationSerializer,
+        rangerHandles=sorted,
+        incidentTypes=sorted,
+        reportEntries=compiledListSerializer(compiledReportEntrySerializer),
+    ),
+)
+
 
 def deserializeIncident(obj: Dict[str, Any], cl: Type) -> Incident:
     assert cl is Incident, (cl, obj)
@@ -20,13 +20,15 @@ Incident Management System data model JSON serialization/deserialization
 
 from datetime import datetime as DateTime
 from enum import Enum
-from typing import Any, Dict, Iterable, Type, cast
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Type, cast
 
 from cattr import Converter
 
 from twisted.logger import Logger
 
-from ims.ext.json import dateTimeAsRFC3339Text, rfc3339TextAsDateTime
+from ims.ext.json import (
+    dateTimeAsRFC3339Text, jsonBytesFromObject, rfc3339TextAsDateTime
+)
 
 
 __all__ = ()
@@ -71,6 +73,16 @@ def jsonObjectFromModelObject(model: Any) -> Any:
     return jsonSerialize(model)
 
 
+def jsonBytesFromModelObject(model: Any) -> bytes:
+    """
+    Convert a model object into UTF-8 encoded JSON text.
+    """
+    serializer = compiledSerializers.get(type(model))
+    if serializer is None:
+        return jsonBytesFromObject(jsonSerialize(model))
+    return jsonBytesFromObject(serializer(model))
+
+
 def modelObjectFromJSONObject(json: Any, modelClass: type) -> Any:
     try:
         return jsonDeserialize(json, modelClass)
@@ -78,6 +90,81 @@ def modelObjectFromJSONObject(json: Any, modelClass: type) -> Any:
         raise JSONCodecError(f"Invalid JSON for {modelClass.__name__}: {json}")
 
 
+# Compiled serializers
+#
+# Serializing via the converter dispatches on the type of every value, and
+# the result (which may contain sets) then takes the JSON encoder's slow
+# fallback path.
+# For the model classes that we vend in bulk, we instead generate a function
+# per class which maps attribute names to JSON keys and returns only JSON
+# primitives (dicts, lists, strings, numbers, booleans and None).
+# Sets are serialized as sorted lists, so that the JSON for a given object is
+# always the same.
+
+compiledSerializers: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def compileSerializer(
+    cls: Type, keyEnum: Type,
+    converters: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+    constants: Optional[Mapping[str, Any]] = None,
+) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Generate and register a function that serializes instances of ``cls``.
+
+    :param keyEnum: Enum mapping the names of attributes to serialize to
+        their JSON keys.
+
+    :param converters: Functions that convert attribute values to JSON
+        primitives, by attribute name.
+        Attributes without a converter must already be JSON primitives.
+
+    :param constants: Additional JSON keys and their (constant) values.
+    """
+    if converters is None:
+        converters = {}
+    if constants is None:
+        constants = {}
+
+    name = f"serialize{cls.__name__}"
+    namespace: Dict[str, Any] = {}
+    items = []
+
+    for key in cast(Iterable, keyEnum):
+        value = f"obj.{key.name}"
+        if key.name in converters:
+            namespace[f"convert_{key.name}"] = converters[key.name]
+            value = f"convert_{key.name}({value})"
+        items.append(f"{key.value!r}: {value}")
+
+    for index, (jsonKey, constant) in enumerate(constants.items()):
+        namespace[f"constant_{index}"] = constant
+        items.append(f"{jsonKey!r}: constant_{index}")
+
+    source = (
+        f"def {name}(obj):\n"
+        f"    return {{{', '.join(items)}}}\n"
+    )
+    exec(compile(source, f"<compiled {name}>", "exec"), namespace)
+
+    serializer = namespace[name]
+    compiledSerializers[cls] = serializer
+    return serializer
+
+
+def compiledListSerializer(
+    serializer: Callable[[Any], Any]
+) -> Callable[[Iterable[Any]], Any]:
+    """
+    Return a function that serializes a list of values using the given
+    compiled serializer.
+    """
+    def serializeList(values: Iterable[Any]) -> Any:
+        return [serializer(value) for value in values]
+
+    return serializeList
+
+
 # Utilities
 
 def deserialize(
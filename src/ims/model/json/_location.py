@@ -23,7 +23,8 @@ from typing import Any, Dict, Type
 
 from ._address import AddressJSONKey, AddressTypeJSONValue, serializeAddress
 from ._json import (
-    jsonDeserialize, jsonSerialize, registerDeserializer, registerSerializer
+    compiledSerializers, jsonDeserialize, jsonSerialize,
+    registerDeserializer, registerSerializer,
 )
 from .._address import RodGarettAddress, TextOnlyAddress
 from .._location import Location
@@ -57,6 +58,16 @@ def serializeLocation(location: Location) -> Dict[str, Any]:
 registerSerializer(Location, serializeLocation)
 
 
+def compiledLocationSerializer(location: Location) -> Dict[str, Any]:
+    # The address is flattened into the location JSON (see above)
+    address = location.address
+    locationJSON = {LocationJSONKey.name.value: location.name}
+    locationJSON.update(compiledSerializers[type(address)](address))
+    return locationJSON
+
+compiledSerializers[Location] = compiledLocationSerializer
+
+
 def deserializeLocation(obj: Dict[str, Any], cl: Type) -> Location:
     assert cl is Location, (cl, obj)
 
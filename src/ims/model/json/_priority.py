@@ -46,6 +46,12 @@ def serializeIncidentPriority(incidentPriority: IncidentPriority) -> str:
 registerSerializer(IncidentPriority, serializeIncidentPriority)
 
 
+incidentPriorityJSONValues = {
+    incidentPriority: serializeIncidentPriority(incidentPriority)
+    for incidentPriority in IncidentPriority
+}
+
+
 def deserializeIncidentPriority(obj: int, cl: Type) -> IncidentPriority:
     assert cl is IncidentPriority, (cl, obj)
 
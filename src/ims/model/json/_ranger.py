@@ -22,7 +22,8 @@ from enum import Enum, unique
 from typing import Any, Dict, List, Optional, Type
 
 from ._json import (
-    deserialize, jsonSerialize, registerDeserializer, registerSerializer
+    compileSerializer, deserialize, jsonSerialize, registerDeserializer,
+    registerSerializer,
 )
 from .._ranger import Ranger, RangerStatus
 
@@ -105,6 +106,20 @@ def serializeRangerStatus(rangerStatus: RangerStatus) -> str:
 registerSerializer(RangerStatus, serializeRangerStatus)
 
 
+rangerStatusJSONValues = {
+    rangerStatus: serializeRangerStatus(rangerStatus)
+    for rangerStatus in RangerStatus
+}
+
+compileSerializer(
+    Ranger, RangerJSONKey,
+    converters=dict(
+        status=rangerStatusJSONValues.__getitem__,
+        email=sorted,
+    ),
+)
+
+
 def deserializeRangerStatus(obj: int, cl: Type) -> RangerStatus:
     assert cl is RangerStatus, (cl, obj)
 
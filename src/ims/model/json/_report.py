@@ -22,8 +22,12 @@ from datetime import datetime as DateTime
 from enum import Enum, unique
 from typing import Any, Dict, List, Optional, Type
 
+from ims.ext.json import dateTimeAsRFC3339Text
+
+from ._entry import compiledReportEntrySerializer
 from ._json import (
-    deserialize, jsonSerialize, registerDeserializer, registerSerializer
+    compileSerializer, compiledListSerializer, deserialize, jsonSerialize,
+    registerDeserializer, registerSerializer,
 )
 from .._entry import ReportEntry
 from .._report import IncidentReport
@@ -67,6 +71,14 @@ def serializeIncidentReport(incidentReport: IncidentReport) -> Dict[str, Any]:
 
 registerSerializer(IncidentReport, serializeIncidentReport)
 
+compileSerializer(
+    IncidentReport, IncidentReportJSONKey,
+    converters=dict(
+        created=dateTimeAsRFC3339Text,
+        reportEntries=compiledListSerializer(compiledReportEntrySerializer),
+    ),
+)
+
 
 def deserializeIncidentReport(obj: Dict[str, Any], cl: Type) -> IncidentReport:
     assert cl is IncidentReport, (cl, obj)
@@ -49,6 +49,12 @@ def serializeIncidentState(incidentState: IncidentState) -> str:
 registerSerializer(IncidentState, serializeIncidentState)
 
 
+incidentStateJSONValues = {
+    incidentState: serializeIncidentState(incidentState)
+    for incidentState in IncidentState
+}
+
+
 def deserializeIncidentState(obj: str, cl: Type) -> IncidentState:
     assert cl is IncidentState, (cl, obj)
 
@@ -0,0 +1,128 @@
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+JSON serialization/deserialization for incident summaries
+
+An incident summary has the same keys as an incident, except that it has no
+report entries and instead has the summary and last modified time derived
+from them:
+    {
+        "number": 101,                              // int >= 0
+        ...
+        "last_modified": "2017-08-17T19:12:00Z",    // RFC 3339
+        "summary_from_report": "Need diapers",      // one line
+    }
+"""
+
+from datetime import datetime as DateTime
+from enum import Enum, unique
+from typing import Any, Dict, Optional, Set, Type
+
+from ims.ext.json import dateTimeAsRFC3339Text
+
+from ._event import serializeEvent
+from ._json import (
+    compileSerializer, deserialize, jsonSerialize, registerDeserializer,
+    registerSerializer,
+)
+from ._location import compiledLocationSerializer
+from ._priority import incidentPriorityJSONValues
+from ._state import incidentStateJSONValues
+from .._event import Event
+from .._location import Location
+from .._priority import IncidentPriority
+from .._state import IncidentState
+from .._summary import IncidentSummary
+
+
+__all__ = ()
+
+
+
+@unique
+class IncidentSummaryJSONKey(Enum):
+    """
+    Incident summary JSON keys
+    """
+
+    event             = "event"
+    number            = "number"
+    created           = "created"
+    lastModified      = "last_modified"
+    state             = "state"
+    priority          = "priority"
+    summary           = "summary"
+    location          = "location"
+    rangerHandles     = "ranger_handles"
+    incidentTypes     = "incident_types"
+    summaryFromReport = "summary_from_report"
+
+
+
+class IncidentSummaryJSONType(Enum):
+    """
+    Incident summary attribute types
+    """
+
+    event             = Event
+    number            = int
+    created           = DateTime
+    lastModified      = DateTime
+    state             = IncidentState
+    priority          = IncidentPriority
+    summary           = Optional[str]
+    location          = Location
+    rangerHandles     = Set[str]
+    incidentTypes     = Set[str]
+    summaryFromReport = str
+
+
+
+def serializeIncidentSummary(summary: IncidentSummary) -> Dict[str, Any]:
+    # Map IncidentSummary attribute names to JSON dict key names
+    return dict(
+        (key.value, jsonSerialize(getattr(summary, key.name)))
+        for key in IncidentSummaryJSONKey
+    )
+
+registerSerializer(IncidentSummary, serializeIncidentSummary)
+
+compileSerializer(
+    IncidentSummary, IncidentSummaryJSONKey,
+    converters=dict(
+        event=serializeEvent,
+        created=dateTimeAsRFC3339Text,
+        lastModified=dateTimeAsRFC3339Text,
+        state=incidentStateJSONValues.__getitem__,
+        priority=incidentPriorityJSONValues.__getitem__,
+        location=compiledLocationSerializer,
+        rangerHandles=sorted,
+        incidentTypes=sorted,
+    ),
+)
+
+
+def deserializeIncidentSummary(
+    obj: Dict[str, Any], cl: Type
+) -> IncidentSummary:
+    assert cl is IncidentSummary, (cl, obj)
+
+    return deserialize(
+        obj, IncidentSummary, IncidentSummaryJSONType, IncidentSummaryJSONKey,
+    )
+
+registerDeserializer(IncidentSummary, deserializeIncidentSummary)
@@ -30,6 +30,7 @@ from ..._priority import IncidentPriority
 from ..._ranger import Ranger, RangerStatus
 from ..._report import IncidentReport
 from ..._state import IncidentState
+from ..._summary import IncidentSummary
 from ..._type import KnownIncidentType
 
 
@@ -111,6 +112,26 @@ def jsonFromIncident(incident: Incident) -> Dict[str, Any]:
     )
 
 
+def jsonFromIncidentSummary(summary: IncidentSummary) -> Dict[str, Any]:
+    return dict(
+        event=jsonSerialize(summary.event),
+        number=jsonSerialize(summary.number),
+        created=jsonSerialize(summary.created),
+        last_modified=jsonSerialize(summary.lastModified),
+        state=jsonSerialize(summary.state),
+        priority=jsonSerialize(summary.priority),
+        summary=jsonSerialize(summary.summary),
+        location=jsonSerialize(summary.location),
+        ranger_handles=frozenset(
+            jsonSerialize(r) for r in summary.rangerHandles
+        ),
+        incident_types=frozenset(
+            jsonSerialize(t) for t in summary.incidentTypes
+        ),
+        summary_from_report=jsonSerialize(summary.summaryFromReport),
+    )
+
+
 ##
 # Location
 ##
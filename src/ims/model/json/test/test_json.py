@@ -24,15 +24,19 @@ from typing import Any
 from hypothesis import given
 from hypothesis.strategies import datetimes, floats, integers, text
 
-from ims.ext.json import dateTimeAsRFC3339Text
+from ims.ext.json import dateTimeAsRFC3339Text, jsonTextFromObject
 from ims.ext.trial import TestCase
 
 from .._json import (
-    jsonDeserialize, jsonObjectFromModelObject, jsonSerialize,
-    modelObjectFromJSONObject,
+    jsonBytesFromModelObject, jsonDeserialize, jsonObjectFromModelObject,
+    jsonSerialize, modelObjectFromJSONObject,
 )
+from ..._event import Event
 from ..._incident import Incident
-from ...strategies import incidents
+from ..._ranger import Ranger
+from ..._report import IncidentReport
+from ..._summary import IncidentSummary
+from ...strategies import events, incidentReports, incidents, rangers
 
 
 __all__ = ()
@@ -205,6 +209,75 @@ class ModelSerializationTests(TestCase):
         )
 
 
+
+class ModelBytesSerializationTests(TestCase):
+    """
+    Tests for serialization of model objects to JSON bytes
+    """
+
+    def _test_bytes(self, model: Any) -> None:
+        """
+        :func:`jsonBytesFromModelObject` serializes the given model object to
+        the same JSON text as :func:`jsonSerialize`, with sets sorted, encoded
+        as UTF-8.
+        """
+        def sortSets(json: Any) -> Any:
+            if isinstance(json, dict):
+                return {key: sortSets(value) for key, value in json.items()}
+            if isinstance(json, (set, frozenset)):
+                return sorted(json)
+            if isinstance(json, (list, tuple)):
+                return [sortSets(value) for value in json]
+            return json
+
+        self.assertEqual(
+            jsonBytesFromModelObject(model),
+            jsonTextFromObject(sortSets(jsonSerialize(model))).encode("utf-8"),
+        )
+
+
+    @given(incidents())
+    def test_incident(self, incident: Incident) -> None:
+        """
+        :func:`jsonBytesFromModelObject` serializes an incident.
+        """
+        self._test_bytes(incident)
+
+
+    @given(incidentReports())
+    def test_incidentReport(self, incidentReport: IncidentReport) -> None:
+        """
+        :func:`jsonBytesFromModelObject` serializes an incident report.
+        """
+        self._test_bytes(incidentReport)
+
+
+    @given(incidents())
+    def test_incidentSummary(self, incident: Incident) -> None:
+        """
+        :func:`jsonBytesFromModelObject` serializes an incident summary.
+        """
+        self._test_bytes(IncidentSummary.fromIncident(incident))
+
+
+    @given(rangers())
+    def test_ranger(self, ranger: Ranger) -> None:
+        """
+        :func:`jsonBytesFromModelObject` serializes a Ranger.
+        """
+        self._test_bytes(ranger)
+
+
+    @given(events())
+    def test_notCompiled(self, event: Event) -> None:
+        """
+        :func:`jsonBytesFromModelObject` serializes model objects without a
+        compiled serializer via :func:`jsonSerialize`.
+        """
+        self._test_bytes(event)
+
+
+
 class ModelDeserializationTests(TestCase):
     """
     Tests for deserialization of model objects
@@ -77,6 +77,22 @@ class IncidentTests(TestCase):
         )
 
 
+    @given(incidents())
+    def test_lastModified(self, incident: Incident) -> None:
+        """
+        :meth:`Incident.lastModified` is the latest of the incident's created
+        time and the created times of its report entries.
+        """
+        times = [incident.created] + [
+            entry.created for entry in incident.reportEntries
+        ]
+        lastModified = incident.lastModified()
+
+        self.assertIn(lastModified, times)
+        for time in times:
+            self.assertLessEqual(time, lastModified)
+
+
     def _test_replace(self, incident: Incident, name: str, value: Any) -> None:
         mod = {name: value}
         new = incident.replace(**mod)
@@ -192,6 +208,19 @@ class IncidentTests(TestCase):
         )
 
 
+    @given(incidents())
+    def test_slots(self, incident: Incident) -> None:
+        """
+        Incidents and the model objects they contain have no instance
+        dictionary.
+        """
+        for obj in (
+            incident, incident.event, incident.location,
+            incident.location.address, *incident.reportEntries,
+        ):
+            self.assertFalse(hasattr(obj, "__dict__"), obj)
+
+
 
 class SummaryFromReportTests(TestCase):
     """
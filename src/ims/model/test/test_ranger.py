@@ -69,3 +69,11 @@ class RangerTests(TestCase):
             str(ranger),
             f"{ranger.status} {ranger.handle} ({ranger.name})"
         )
+
+
+    @given(rangers())
+    def test_slots(self, ranger: Ranger) -> None:
+        """
+        Rangers have no instance dictionary.
+        """
+        self.assertFalse(hasattr(ranger, "__dict__"))
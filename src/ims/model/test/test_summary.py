@@ -0,0 +1,78 @@
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+Tests for :mod:`ranger-ims-server.model._summary`
+"""
+
+from hypothesis import given
+
+from ims.ext.trial import TestCase
+
+from .._incident import Incident
+from .._summary import IncidentSummary
+from ..strategies import incidents
+
+__all__ = ()
+
+
+
+class IncidentSummaryTests(TestCase):
+    """
+    Tests for :class:`IncidentSummary`
+    """
+
+    @given(incidents())
+    def test_fromIncident(self, incident: Incident) -> None:
+        """
+        :meth:`IncidentSummary.fromIncident` copies the incident's attributes
+        other than its report entries, and the summary and last modified time
+        derived from them.
+        """
+        summary = IncidentSummary.fromIncident(incident)
+
+        for name in (
+            "event", "number", "created", "state", "priority", "summary",
+            "location", "rangerHandles", "incidentTypes",
+        ):
+            self.assertEqual(
+                getattr(summary, name), getattr(incident, name), name
+            )
+
+        self.assertEqual(
+            summary.summaryFromReport, incident.summaryFromReport()
+        )
+        self.assertEqual(summary.lastModified, incident.lastModified())
+
+
+    @given(incidents())
+    def test_str(self, incident: Incident) -> None:
+        """
+        :meth:`IncidentSummary.__str__` renders a summary the same way as
+        :meth:`Incident.__str__` renders the incident.
+        """
+        self.assertEqual(
+            str(IncidentSummary.fromIncident(incident)), str(incident)
+        )
+
+
+    @given(incidents())
+    def test_slots(self, incident: Incident) -> None:
+        """
+        :class:`IncidentSummary` instances have no instance dictionary.
+        """
+        summary = IncidentSummary.fromIncident(incident)
+        self.assertFalse(hasattr(summary, "__dict__"))
@@ -24,12 +24,17 @@ from typing import Sequence
 
 from twisted.application.runner._exit import ExitStatus, exit
 from twisted.application.runner._runner import Runner
-from twisted.logger import Logger
+from twisted.internet.defer import ensureDeferred
+from twisted.logger import LogLevel, Logger
+from twisted.python.failure import Failure
 from twisted.python.usage import UsageError
+from twisted.web.resource import EncodingResourceWrapper
 from twisted.web.server import Session, Site
 
 from ims.application import Application
 from ims.config import Configuration
+from ims.ext.klein import ContentEncoderFactory
+from ims.ext.sqlite import setDebugLogging
 
 from ._log import patchCombinedLogFormatter
 from ._options import ServerOptions
@@ -71,13 +76,42 @@ class Server(object):
         """
         Called after the reactor has started.
         """
-        config.store.validate()
+        from twisted.internet import reactor
+
+        def startFailed(f: Failure) -> None:
+            cls.log.failure("Unable to start web service", f)
+            reactor.stop()
+
+        d = ensureDeferred(cls.startWebService(config))
+        d.addErrback(startFailed)
+
+
+    @classmethod
+    async def startWebService(cls, config: Configuration) -> None:
+        """
+        Set up the application and listen for requests.
+        """
+        from twisted.internet import reactor
+
+        store = config.store
+
+        # The data store is read from worker threads below, which must be
+        # stopped on shutdown even if setting up fails.
+        reactor.addSystemEventTrigger("before", "shutdown", store.shutdown)
+
+        # Only check what changed since the last clean shutdown before
+        # listening; the full sweep is run once we are serving requests.
+        store.validate(incremental=True)
 
         host = config.HostName
         port = config.Port
 
         application = Application(config=config)
 
+        # EventSource events kept from an earlier run must be loaded before
+        # any listeners are added.
+        await application.storeObserver.load()
+
         cls.log.info(
             "Setting up web service at http://{host}:{port}/",
             host=host, port=port,
@@ -85,12 +119,21 @@ class Server(object):
 
         patchCombinedLogFormatter()
 
-        factory = Site(application.router.resource())
+        factory = Site(
+            EncodingResourceWrapper(
+                application.router.resource(), [ContentEncoderFactory()]
+            )
+        )
         factory.sessionFactory = IMSSession
 
-        from twisted.internet import reactor
         reactor.listenTCP(port, factory, interface=host)
 
+        def validationFailed(f: Failure) -> None:
+            cls.log.failure("Background data store validation failed", f)
+
+        d = ensureDeferred(store.validateInBackground())
+        d.addErrback(validationFailed)
+
 
     @classmethod
     def run(cls, options: ServerOptions) -> None:
@@ -98,12 +141,16 @@ class Server(object):
         Run the application service.
         """
         config = options["configuration"]
+        logLevel = options.get("logLevel", options.defaultLogLevel)
+
+        # Don't pay for SQL debug log events that would be filtered out
+        setDebugLogging(logLevel is LogLevel.debug)
 
         from twisted.internet import reactor
 
         runner = Runner(
             reactor=reactor,
-            defaultLogLevel=options.get("logLevel", options.defaultLogLevel),
+            defaultLogLevel=logLevel,
             logFile=options.get("logFile", stdout),
             fileLogObserverFactory=options["fileLogObserverFactory"],
             whenRunning=cls.whenRunning,
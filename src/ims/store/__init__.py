@@ -19,12 +19,20 @@ Incident Management System data store.
 """
 
 from ._abc import IMSDataStore
-from ._exceptions import NoSuchIncidentError, StorageError
+from ._cache import CachingDataStore
+from ._exceptions import (
+    NoSuchIncidentError, NoSuchIncidentReportError, StorageError
+)
+from ._notification import ChangeNotification
+from ._search import SearchResult
 
 
 __all__ = (
+    "CachingDataStore",
+    "ChangeNotification",
     "IMSDataStore",
     "NoSuchIncidentError",
     "NoSuchIncidentReportError",
+    "SearchResult",
     "StorageError",
 )
@@ -19,13 +19,19 @@ Incident Management System data store abstract base classes.
 """
 
 from abc import ABC, abstractmethod
-from typing import Iterable, Mapping, Tuple
+from datetime import datetime as DateTime
+from typing import (
+    Any, AsyncIterator, Iterable, Mapping, Optional, Sequence, Tuple, Union,
+)
 
 from ims.model import (
     Event, Incident, IncidentPriority, IncidentReport, IncidentState,
-    ReportEntry,
+    IncidentSummary, ReportEntry,
 )
 
+from ._notification import ChangeNotification
+from ._search import SearchResult
+
 
 __all__ = ()
 
@@ -37,10 +43,41 @@ class IMSDataStore(ABC):
     """
 
     @abstractmethod
-    def validate(self) -> None:
+    def validate(self, incremental: bool = False) -> None:
         """
         Perform some data integrity checks and raise :exc:`StorageError` if
         there are any problems detected.
+
+        If ``incremental`` is true, the store may limit the checks to data
+        written since it was last validated, provided that it was shut down
+        cleanly since.
+        """
+
+
+    @abstractmethod
+    async def validateInBackground(self) -> bool:
+        """
+        Perform a full set of data integrity checks without blocking other
+        operations for the duration, logging any problems detected.
+
+        :return: Whether the store is valid.
+        """
+
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        """
+        Record a clean shutdown, so that the next validation may be
+        incremental.
+        """
+
+
+    @abstractmethod
+    def jsonBytes(self, obj: Union[Incident, IncidentReport]) -> bytes:
+        """
+        Serialize the given incident or incident report, as read from this
+        store, into UTF-8 encoded JSON text.
+        Stores which cache the objects they read may cache the result.
         """
 
 
@@ -96,6 +133,15 @@ class IMSDataStore(ABC):
     ###
 
 
+    @abstractmethod
+    async def incidentTypesRevision(self) -> int:
+        """
+        Look up the current incident types revision.
+        The revision changes every time an incident type is created, hidden
+        or shown, but only within a single run of the server.
+        """
+
+
     @abstractmethod
     async def incidentTypes(
         self, includeHidden: bool = False
@@ -162,6 +208,15 @@ class IMSDataStore(ABC):
         """
 
 
+    @abstractmethod
+    def iterIncidents(self, event: Event) -> AsyncIterator[Incident]:
+        """
+        Iterate over all incidents for the given event.
+        Incidents are looked up as they are needed, so that a caller streaming
+        them does not require all of them to be in memory at once.
+        """
+
+
     @abstractmethod
     async def incidentWithNumber(self, event: Event, number: int) -> Incident:
         """
@@ -169,6 +224,84 @@ class IMSDataStore(ABC):
         """
 
 
+    @abstractmethod
+    async def incidentsMatching(
+        self, event: Event,
+        states: Optional[Iterable[IncidentState]] = None,
+        priorities: Optional[Iterable[IncidentPriority]] = None,
+        incidentType: Optional[str] = None,
+        rangerHandle: Optional[str] = None,
+        createdAfter: Optional[DateTime] = None,
+        createdBefore: Optional[DateTime] = None,
+        text: Optional[str] = None,
+    ) -> Iterable[Incident]:
+        """
+        Look up the incidents in the given event that match all of the given
+        criteria.
+        Criteria that are :obj:`None` are ignored.
+
+        :param states: Match incidents in any of these states.
+        :param priorities: Match incidents with any of these priorities.
+        :param incidentType: Match incidents with this incident type.
+        :param rangerHandle: Match incidents with this Ranger attached.
+        :param createdAfter: Match incidents created at or after this time.
+        :param createdBefore: Match incidents created before this time.
+        :param text: Match incidents with this text (case-insensitive) in the
+            summary, location name or description, or report entries.
+        """
+
+
+    @abstractmethod
+    async def searchIncidents(
+        self, event: Event, query: str, limit: int = 100
+    ) -> Iterable[SearchResult]:
+        """
+        Search the summaries and report entries of the incidents in the given
+        event for the given words.
+        Results are ordered from best to worst match.
+        """
+
+
+    @abstractmethod
+    async def eventRevision(self, event: Event) -> int:
+        """
+        Look up the current incident revision for the given event.
+        The revision increases every time an incident in the event is created
+        or modified.
+        """
+
+
+    @abstractmethod
+    async def incidentRevision(self, event: Event, number: int) -> int:
+        """
+        Look up the revision of the incident with the given number in the
+        given event: the revision of its event as of when it was last created
+        or modified.
+        """
+
+
+    @abstractmethod
+    async def incidentsChangedSince(
+        self, event: Event, revision: int
+    ) -> Iterable[Incident]:
+        """
+        Look up the incidents in the given event that were created or modified
+        after the given revision.
+        """
+
+
+    @abstractmethod
+    async def incidentSummaries(
+        self, event: Event, changedSince: Optional[int] = None
+    ) -> Iterable[IncidentSummary]:
+        """
+        Look up summaries of the incidents in the given event, which omit
+        report entries.
+        If ``changedSince`` is not :obj:`None`, only the incidents created or
+        modified after that revision are included.
+        """
+
+
     @abstractmethod
     async def createIncident(
         self, incident: Incident, author: str
@@ -313,11 +446,40 @@ class IMSDataStore(ABC):
         """
 
 
+    @abstractmethod
+    async def applyIncidentEdits(
+        self, event: Event, incidentNumber: int, edits: Mapping[str, Any],
+        author: str,
+    ) -> None:
+        """
+        Apply the given edits to the incident with the given number in the
+        given event, all at once.
+
+        Keys in ``edits`` name the attributes to change, as do the
+        ``setIncident_*`` methods: ``priority``, ``state``, ``summary``,
+        ``locationName``, ``locationConcentricStreet``,
+        ``locationRadialHour``, ``locationRadialMinute``,
+        ``locationDescription``, ``rangers`` and ``incidentTypes``.
+        ``reportEntries`` adds report entries, as does
+        :meth:`addReportEntriesToIncident`.
+        """
+
+
     ###
     # Incident Reports
     ###
 
 
+    @abstractmethod
+    async def incidentReportsRevision(self) -> int:
+        """
+        Look up the current incident reports revision.
+        The revision changes every time an incident report is created,
+        modified, attached to an incident or detached from one, but only
+        within a single run of the server.
+        """
+
+
     @abstractmethod
     async def incidentReports(self) -> Iterable[IncidentReport]:
         """
@@ -325,6 +487,17 @@ class IMSDataStore(ABC):
         """
 
 
+    @abstractmethod
+    async def searchIncidentReports(
+        self, query: str, limit: int = 100
+    ) -> Iterable[SearchResult]:
+        """
+        Search the summaries and report entries of all incident reports for the
+        given words.
+        Results are ordered from best to worst match.
+        """
+
+
     @abstractmethod
     async def incidentReportWithNumber(self, number: int) -> IncidentReport:
         """
@@ -418,3 +591,28 @@ class IMSDataStore(ABC):
         Detach the incident report with the given number from the incident with
         the given number in the given event.
         """
+
+
+    ###
+    # Change Notifications
+    ###
+
+
+    @abstractmethod
+    async def changeNotifications(
+        self, limit: int
+    ) -> Sequence[ChangeNotification]:
+        """
+        Look up the latest stored change notifications, at most ``limit`` of
+        them, in the order they were sent.
+        """
+
+
+    @abstractmethod
+    async def addChangeNotification(
+        self, notification: ChangeNotification, keep: int
+    ) -> None:
+        """
+        Store the given change notification, discarding all but the latest
+        ``keep`` stored notifications.
+        """
@@ -0,0 +1,941 @@
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+Incident Management System data store cache.
+"""
+
+from collections import OrderedDict
+from datetime import datetime as DateTime
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Mapping,
+    Optional, Sequence, Tuple, Union,
+)
+
+from attr import Factory, attrib, attrs
+from attr.validators import instance_of
+
+from twisted.logger import Logger
+
+from ims.model import (
+    Event, Incident, IncidentPriority, IncidentReport, IncidentState,
+    IncidentSummary, ReportEntry,
+)
+
+from ._abc import IMSDataStore
+from ._exceptions import StorageError
+from ._notification import ChangeNotification
+from ._search import SearchResult
+
+
+__all__ = ()
+
+
+CachedObject = Union[Incident, IncidentReport]
+
+# Key for the bucket holding incident reports, which are not per-event.
+_incidentReportsKey = None
+
+
+
+@attrs(frozen=True)
+class CachingDataStore(IMSDataStore):
+    """
+    Write-through cache around another data store.
+
+    Hydrated incidents are cached per event, and incident reports are cached
+    together, along with their JSON serialization once requested.
+    Writes are passed through to the underlying store, after which the
+    affected objects are re-read from it.
+    When the estimated size of the cached objects exceeds ``maxSize`` bytes,
+    events are evicted from the cache, least recently used first.
+
+    Other data is not cached.
+    The cache assumes that all writes to the underlying store go through it.
+    """
+
+    _log = Logger()
+
+    @attrs(frozen=False)
+    class _Bucket(object):
+        """
+        Cached objects for an event, or for incident reports.
+        """
+
+        objects: Dict[int, CachedObject] = attrib(
+            default=Factory(dict), init=False
+        )
+        json: Dict[int, bytes] = attrib(default=Factory(dict), init=False)
+        sizes: Dict[int, int] = attrib(default=Factory(dict), init=False)
+        complete: bool = attrib(default=False, init=False)
+
+    @attrs(frozen=False)
+    class _State(object):
+        """
+        Internal mutable state for :class:`CachingDataStore`.
+        """
+
+        buckets: "OrderedDict[Optional[str], CachingDataStore._Bucket]" = (
+            attrib(default=Factory(OrderedDict), init=False)
+        )
+        size: int = attrib(default=0, init=False)
+
+        # Incremented on every write, so that reads which were in flight
+        # during a write do not cache data that may be stale.
+        generation: int = attrib(default=0, init=False)
+
+        hits: int = attrib(default=0, init=False)
+        misses: int = attrib(default=0, init=False)
+        evictions: int = attrib(default=0, init=False)
+
+    store: IMSDataStore = attrib(validator=instance_of(IMSDataStore))
+    maxSize: int = attrib(
+        validator=instance_of(int), default=64 * 1024 * 1024
+    )
+    _state: _State = attrib(default=Factory(_State), init=False)
+
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of reads served from the cache.
+        """
+        return self._state.hits
+
+
+    @property
+    def misses(self) -> int:
+        """
+        Number of reads passed through to the underlying store.
+        """
+        return self._state.misses
+
+
+    @property
+    def evictions(self) -> int:
+        """
+        Number of buckets evicted from the cache to stay within ``maxSize``.
+        """
+        return self._state.evictions
+
+
+    @property
+    def size(self) -> int:
+        """
+        Estimated size of the cached objects, in bytes.
+        """
+        return self._state.size
+
+
+    def _bucket(self, key: Optional[str]) -> _Bucket:
+        """
+        Look up the bucket for the given key, creating it if necessary, and
+        mark it as most recently used.
+        """
+        buckets = self._state.buckets
+
+        if key in buckets:
+            buckets.move_to_end(key)
+        else:
+            buckets[key] = CachingDataStore._Bucket()
+
+        return buckets[key]
+
+
+    def _put(self, bucket: _Bucket, number: int, obj: CachedObject) -> None:
+        """
+        Add the given object to the given bucket.
+        The caller is responsible for calling :meth:`_evict` afterwards.
+        """
+        self._remove(bucket, number)
+
+        size = approximateSize(obj)
+        bucket.objects[number] = obj
+        bucket.sizes[number] = size
+        self._state.size += size
+
+
+    def _remove(self, bucket: _Bucket, number: int) -> bool:
+        bucket.objects.pop(number, None)
+        bucket.json.pop(number, None)
+        size = bucket.sizes.pop(number, None)
+        if size is None:
+            return False
+        self._state.size -= size
+        return True
+
+
+    def _evict(self, keep: Optional[str]) -> None:
+        """
+        Evict least recently used buckets until the cache is within its size
+        bound, evicting the bucket with the given key only as a last resort.
+        """
+        state = self._state
+
+        while state.size > self.maxSize and state.buckets:
+            for key in state.buckets:
+                if key != keep or len(state.buckets) == 1:
+                    break
+
+            bucket = state.buckets.pop(key)
+            state.size -= sum(bucket.sizes.values())
+            state.evictions += 1
+
+            self._log.debug(
+                "Evicted {key} from data store cache", key=key
+            )
+
+
+    async def _loadAll(
+        self, key: Optional[str], load: Callable[[], Awaitable[Iterable[Any]]]
+    ) -> Iterable[Any]:
+        """
+        Look up all objects in the bucket with the given key, using the given
+        function to load them from the underlying store if they are not all
+        cached.
+        """
+        state = self._state
+        bucket = self._bucket(key)
+
+        if bucket.complete:
+            state.hits += 1
+            return tuple(
+                bucket.objects[number] for number in sorted(bucket.objects)
+            )
+
+        state.misses += 1
+
+        generation = state.generation
+        objects = tuple(await load())
+
+        if state.generation == generation:
+            bucket = self._bucket(key)
+            for obj in objects:
+                self._put(bucket, obj.number, obj)
+            bucket.complete = True
+            self._evict(key)
+
+        return objects
+
+
+    async def _load(
+        self, key: Optional[str], number: int,
+        load: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Look up the object with the given number in the bucket with the given
+        key, using the given function to load it from the underlying store if
+        it is not cached.
+        """
+        state = self._state
+        bucket = self._bucket(key)
+
+        cached = bucket.objects.get(number)
+        if cached is not None:
+            state.hits += 1
+            return cached
+
+        state.misses += 1
+
+        generation = state.generation
+        obj = await load()
+
+        if state.generation == generation:
+            self._put(self._bucket(key), number, obj)
+            self._evict(key)
+
+        return obj
+
+
+    async def _update(
+        self, key: Optional[str], number: int,
+        load: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """
+        Update the cached object with the given number in the bucket with the
+        given key after it has been written to the underlying store.
+        """
+        state = self._state
+        state.generation += 1
+
+        bucket = state.buckets.get(key)
+        if bucket is None:
+            return
+
+        wasCached = self._remove(bucket, number)
+        wasComplete = bucket.complete
+        bucket.complete = False
+
+        if not (wasCached or wasComplete):
+            return
+
+        generation = state.generation
+        try:
+            obj = await load()
+        except StorageError as e:
+            self._log.error(
+                "Unable to re-read {key}#{number} into data store cache: "
+                "{error}",
+                key=key, number=number, error=e,
+            )
+            return
+
+        if state.generation == generation and state.buckets.get(key) is bucket:
+            self._put(bucket, number, obj)
+            bucket.complete = wasComplete
+            self._evict(key)
+
+
+    def _updateIncident(
+        self, event: Event, incidentNumber: int
+    ) -> Awaitable[None]:
+        return self._update(
+            event.id, incidentNumber,
+            lambda: self.store.incidentWithNumber(event, incidentNumber),
+        )
+
+
+    def _updateIncidentReport(
+        self, incidentReportNumber: int
+    ) -> Awaitable[None]:
+        return self._update(
+            _incidentReportsKey, incidentReportNumber,
+            lambda: self.store.incidentReportWithNumber(incidentReportNumber),
+        )
+
+
+    def validate(self, incremental: bool = False) -> None:
+        """
+        See :meth:`IMSDataStore.validate`.
+        """
+        self.store.validate(incremental=incremental)
+
+
+    async def validateInBackground(self) -> bool:
+        """
+        See :meth:`IMSDataStore.validateInBackground`.
+        """
+        return await self.store.validateInBackground()
+
+
+    def shutdown(self) -> None:
+        """
+        See :meth:`IMSDataStore.shutdown`.
+        """
+        self.store.shutdown()
+
+
+    def jsonBytes(self, obj: CachedObject) -> bytes:
+        """
+        See :meth:`IMSDataStore.jsonBytes`.
+        """
+        if isinstance(obj, Incident):
+            key: Optional[str] = obj.event.id
+        else:
+            key = _incidentReportsKey
+
+        number = obj.number
+        bucket = self._state.buckets.get(key)
+
+        # The JSON is cached only for the current revision of a cached
+        # object.
+        # A write replaces the cached object, which drops its JSON, so stale
+        # objects held by a reader are serialized without being cached.
+        if bucket is None or bucket.objects.get(number) is not obj:
+            return self.store.jsonBytes(obj)
+
+        data = bucket.json.get(number)
+        if data is None:
+            data = bucket.json[number] = self.store.jsonBytes(obj)
+            bucket.sizes[number] += len(data)
+            self._state.size += len(data)
+            self._evict(key)
+
+        return data
+
+
+    ###
+    # Events
+    ###
+
+
+    async def events(self) -> Iterable[Event]:
+        """
+        See :meth:`IMSDataStore.events`.
+        """
+        return await self.store.events()
+
+
+    async def createEvent(self, event: Event) -> None:
+        """
+        See :meth:`IMSDataStore.createEvent`.
+        """
+        await self.store.createEvent(event)
+
+
+    async def readers(self, event: Event) -> Iterable[str]:
+        """
+        See :meth:`IMSDataStore.readers`.
+        """
+        return await self.store.readers(event)
+
+
+    async def setReaders(self, event: Event, readers: Iterable[str]) -> None:
+        """
+        See :meth:`IMSDataStore.setReaders`.
+        """
+        await self.store.setReaders(event, readers)
+
+
+    async def writers(self, event: Event) -> Iterable[str]:
+        """
+        See :meth:`IMSDataStore.writers`.
+        """
+        return await self.store.writers(event)
+
+
+    async def setWriters(self, event: Event, writers: Iterable[str]) -> None:
+        """
+        See :meth:`IMSDataStore.setWriters`.
+        """
+        await self.store.setWriters(event, writers)
+
+
+    ###
+    # Incident Types
+    ###
+
+
+    async def incidentTypesRevision(self) -> int:
+        """
+        See :meth:`IMSDataStore.incidentTypesRevision`.
+        """
+        return await self.store.incidentTypesRevision()
+
+
+    async def incidentTypes(
+        self, includeHidden: bool = False
+    ) -> Iterable[str]:
+        """
+        See :meth:`IMSDataStore.incidentTypes`.
+        """
+        return await self.store.incidentTypes(includeHidden=includeHidden)
+
+
+    async def createIncidentType(
+        self, incidentType: str, hidden: bool = False
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.createIncidentType`.
+        """
+        await self.store.createIncidentType(incidentType, hidden=hidden)
+
+
+    async def showIncidentTypes(self, incidentTypes: Iterable[str]) -> None:
+        """
+        See :meth:`IMSDataStore.showIncidentTypes`.
+        """
+        await self.store.showIncidentTypes(incidentTypes)
+
+
+    async def hideIncidentTypes(self, incidentTypes: Iterable[str]) -> None:
+        """
+        See :meth:`IMSDataStore.hideIncidentTypes`.
+        """
+        await self.store.hideIncidentTypes(incidentTypes)
+
+
+    ###
+    # Concentric Streets
+    ###
+
+
+    async def concentricStreets(self, event: Event) -> Mapping[str, str]:
+        """
+        See :meth:`IMSDataStore.concentricStreets`.
+        """
+        return await self.store.concentricStreets(event)
+
+
+    async def createConcentricStreet(
+        self, event: Event, id: str, name: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.createConcentricStreet`.
+        """
+        await self.store.createConcentricStreet(event, id, name)
+
+
+    ###
+    # Incidents
+    ###
+
+
+    async def incidents(self, event: Event) -> Iterable[Incident]:
+        """
+        See :meth:`IMSDataStore.incidents`.
+        """
+        return await self._loadAll(
+            event.id, lambda: self.store.incidents(event)
+        )
+
+
+    async def iterIncidents(self, event: Event) -> AsyncIterator[Incident]:
+        """
+        See :meth:`IMSDataStore.iterIncidents`.
+
+        All of the event's incidents are loaded into the cache, which is
+        bounded by ``maxSize``, and iterated over from there.
+        """
+        for incident in await self.incidents(event):
+            yield incident
+
+
+    async def incidentWithNumber(self, event: Event, number: int) -> Incident:
+        """
+        See :meth:`IMSDataStore.incidentWithNumber`.
+        """
+        return await self._load(
+            event.id, number,
+            lambda: self.store.incidentWithNumber(event, number),
+        )
+
+
+    async def incidentsMatching(
+        self, event: Event,
+        states: Optional[Iterable[IncidentState]] = None,
+        priorities: Optional[Iterable[IncidentPriority]] = None,
+        incidentType: Optional[str] = None,
+        rangerHandle: Optional[str] = None,
+        createdAfter: Optional[DateTime] = None,
+        createdBefore: Optional[DateTime] = None,
+        text: Optional[str] = None,
+    ) -> Iterable[Incident]:
+        """
+        See :meth:`IMSDataStore.incidentsMatching`.
+        """
+        return await self.store.incidentsMatching(
+            event,
+            states=states,
+            priorities=priorities,
+            incidentType=incidentType,
+            rangerHandle=rangerHandle,
+            createdAfter=createdAfter,
+            createdBefore=createdBefore,
+            text=text,
+        )
+
+
+    async def searchIncidents(
+        self, event: Event, query: str, limit: int = 100
+    ) -> Iterable[SearchResult]:
+        """
+        See :meth:`IMSDataStore.searchIncidents`.
+        """
+        return await self.store.searchIncidents(event, query, limit=limit)
+
+
+    async def eventRevision(self, event: Event) -> int:
+        """
+        See :meth:`IMSDataStore.eventRevision`.
+        """
+        return await self.store.eventRevision(event)
+
+
+    async def incidentRevision(self, event: Event, number: int) -> int:
+        """
+        See :meth:`IMSDataStore.incidentRevision`.
+        """
+        return await self.store.incidentRevision(event, number)
+
+
+    async def incidentsChangedSince(
+        self, event: Event, revision: int
+    ) -> Iterable[Incident]:
+        """
+        See :meth:`IMSDataStore.incidentsChangedSince`.
+        """
+        return await self.store.incidentsChangedSince(event, revision)
+
+
+    async def incidentSummaries(
+        self, event: Event, changedSince: Optional[int] = None
+    ) -> Iterable[IncidentSummary]:
+        """
+        See :meth:`IMSDataStore.incidentSummaries`.
+        """
+        return await self.store.incidentSummaries(event, changedSince)
+
+
+    async def createIncident(
+        self, incident: Incident, author: str
+    ) -> Incident:
+        """
+        See :meth:`IMSDataStore.createIncident`.
+        """
+        incident = await self.store.createIncident(incident, author)
+        await self._updateIncident(incident.event, incident.number)
+        return incident
+
+
+    async def importIncident(self, incident: Incident) -> None:
+        """
+        See :meth:`IMSDataStore.importIncident`.
+        """
+        await self.store.importIncident(incident)
+        await self._updateIncident(incident.event, incident.number)
+
+
+    async def setIncident_priority(
+        self, event: Event, incidentNumber: int, priority: IncidentPriority,
+        author: str,
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncident_priority`.
+        """
+        await self.store.setIncident_priority(
+            event, incidentNumber, priority, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def setIncident_state(
+        self, event: Event, incidentNumber: int, state: IncidentState,
+        author: str,
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncident_state`.
+        """
+        await self.store.setIncident_state(
+            event, incidentNumber, state, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def setIncident_summary(
+        self, event: Event, incidentNumber: int, summary: str, author: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncident_summary`.
+        """
+        await self.store.setIncident_summary(
+            event, incidentNumber, summary, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def setIncident_locationName(
+        self, event: Event, incidentNumber: int, name: str, author: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncident_locationName`.
+        """
+        await self.store.setIncident_locationName(
+            event, incidentNumber, name, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def setIncident_locationConcentricStreet(
+        self, event: Event, incidentNumber: int, streetID: str, author: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncident_locationConcentricStreet`.
+        """
+        await self.store.setIncident_locationConcentricStreet(
+            event, incidentNumber, streetID, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def setIncident_locationRadialHour(
+        self, event: Event, incidentNumber: int, hour: int, author: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncident_locationRadialHour`.
+        """
+        await self.store.setIncident_locationRadialHour(
+            event, incidentNumber, hour, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def setIncident_locationRadialMinute(
+        self, event: Event, incidentNumber: int, minute: int, author: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncident_locationRadialMinute`.
+        """
+        await self.store.setIncident_locationRadialMinute(
+            event, incidentNumber, minute, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def setIncident_locationDescription(
+        self, event: Event, incidentNumber: int, description: str, author: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncident_locationDescription`.
+        """
+        await self.store.setIncident_locationDescription(
+            event, incidentNumber, description, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def setIncident_rangers(
+        self, event: Event, incidentNumber: int, rangerHandles: Iterable[str],
+        author: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncident_rangers`.
+        """
+        await self.store.setIncident_rangers(
+            event, incidentNumber, rangerHandles, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def setIncident_incidentTypes(
+        self, event: Event, incidentNumber: int, incidentTypes: Iterable[str],
+        author: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncident_incidentTypes`.
+        """
+        await self.store.setIncident_incidentTypes(
+            event, incidentNumber, incidentTypes, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def addReportEntriesToIncident(
+        self, event: Event, incidentNumber: int,
+        reportEntries: Iterable[ReportEntry], author: str,
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.addReportEntriesToIncident`.
+        """
+        await self.store.addReportEntriesToIncident(
+            event, incidentNumber, reportEntries, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    async def applyIncidentEdits(
+        self, event: Event, incidentNumber: int, edits: Mapping[str, Any],
+        author: str,
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.applyIncidentEdits`.
+        """
+        await self.store.applyIncidentEdits(
+            event, incidentNumber, edits, author
+        )
+        await self._updateIncident(event, incidentNumber)
+
+
+    ###
+    # Incident Reports
+    ###
+
+
+    async def incidentReportsRevision(self) -> int:
+        """
+        See :meth:`IMSDataStore.incidentReportsRevision`.
+        """
+        return await self.store.incidentReportsRevision()
+
+
+    async def incidentReports(self) -> Iterable[IncidentReport]:
+        """
+        See :meth:`IMSDataStore.incidentReports`.
+        """
+        return await self._loadAll(
+            _incidentReportsKey, self.store.incidentReports
+        )
+
+
+    async def searchIncidentReports(
+        self, query: str, limit: int = 100
+    ) -> Iterable[SearchResult]:
+        """
+        See :meth:`IMSDataStore.searchIncidentReports`.
+        """
+        return await self.store.searchIncidentReports(query, limit=limit)
+
+
+    async def incidentReportWithNumber(self, number: int) -> IncidentReport:
+        """
+        See :meth:`IMSDataStore.incidentReportWithNumber`.
+        """
+        return await self._load(
+            _incidentReportsKey, number,
+            lambda: self.store.incidentReportWithNumber(number),
+        )
+
+
+    async def createIncidentReport(
+        self, incidentReport: IncidentReport, author: str
+    ) -> IncidentReport:
+        """
+        See :meth:`IMSDataStore.createIncidentReport`.
+        """
+        incidentReport = await self.store.createIncidentReport(
+            incidentReport, author
+        )
+        await self._updateIncidentReport(incidentReport.number)
+        return incidentReport
+
+
+    async def setIncidentReport_summary(
+        self, incidentReportNumber: int, summary: str, author: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.setIncidentReport_summary`.
+        """
+        await self.store.setIncidentReport_summary(
+            incidentReportNumber, summary, author
+        )
+        await self._updateIncidentReport(incidentReportNumber)
+
+
+    async def addReportEntriesToIncidentReport(
+        self, incidentReportNumber: int, reportEntries: Iterable[ReportEntry],
+        author: str,
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.addReportEntriesToIncidentReport`.
+        """
+        await self.store.addReportEntriesToIncidentReport(
+            incidentReportNumber, reportEntries, author
+        )
+        await self._updateIncidentReport(incidentReportNumber)
+
+
+    ###
+    # Incident to Incident Report Relationships
+    ###
+
+    # Attachments are not part of the cached incidents and incident reports,
+    # so these are not cached, and writing them does not affect the cache.
+
+
+    async def detachedIncidentReports(self) -> Iterable[IncidentReport]:
+        """
+        See :meth:`IMSDataStore.detachedIncidentReports`.
+        """
+        return await self.store.detachedIncidentReports()
+
+
+    async def incidentReportsAttachedToIncident(
+        self, event: Event, incidentNumber: int
+    ) -> Iterable[IncidentReport]:
+        """
+        See :meth:`IMSDataStore.incidentReportsAttachedToIncident`.
+        """
+        return await self.store.incidentReportsAttachedToIncident(
+            event, incidentNumber
+        )
+
+
+    async def incidentsAttachedToIncidentReport(
+        self, incidentReportNumber: int
+    ) -> Iterable[Tuple[Event, int]]:
+        """
+        See :meth:`IMSDataStore.incidentsAttachedToIncidentReport`.
+        """
+        return await self.store.incidentsAttachedToIncidentReport(
+            incidentReportNumber
+        )
+
+
+    async def attachIncidentReportToIncident(
+        self, incidentReportNumber: int, event: Event, incidentNumber: int
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.attachIncidentReportToIncident`.
+        """
+        await self.store.attachIncidentReportToIncident(
+            incidentReportNumber, event, incidentNumber
+        )
+
+
+    async def detachIncidentReportFromIncident(
+        self, incidentReportNumber: int, event: Event, incidentNumber: int
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.detachIncidentReportFromIncident`.
+        """
+        await self.store.detachIncidentReportFromIncident(
+            incidentReportNumber, event, incidentNumber
+        )
+
+
+    ###
+    # Change Notifications
+    ###
+
+
+    async def changeNotifications(
+        self, limit: int
+    ) -> Sequence[ChangeNotification]:
+        """
+        See :meth:`IMSDataStore.changeNotifications`.
+        """
+        return await self.store.changeNotifications(limit)
+
+
+    async def addChangeNotification(
+        self, notification: ChangeNotification, keep: int
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.addChangeNotification`.
+        """
+        await self.store.addChangeNotification(notification, keep)
+
+
+
+# Rough per-object overheads, in bytes, used to estimate the memory used by
+# cached objects.
+_objectOverhead = 1024
+_reportEntryOverhead = 256
+_stringOverhead = 64
+
+
+def approximateSize(obj: CachedObject) -> int:
+    """
+    Estimate the memory used by the given incident or incident report, in
+    bytes.
+    """
+    texts = [obj.summary]
+
+    if isinstance(obj, Incident):
+        texts.extend(obj.rangerHandles)
+        texts.extend(obj.incidentTypes)
+        texts.append(obj.location.name)
+        if obj.location.address is not None:
+            texts.append(obj.location.address.description)
+
+    size = _objectOverhead + sum(
+        _stringOverhead + len(text) for text in texts if text is not None
+    )
+
+    for reportEntry in obj.reportEntries:
+        size += _reportEntryOverhead + len(reportEntry.text)
+
+    return size
@@ -0,0 +1,48 @@
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+Incident Management System data store change notifications.
+"""
+
+from typing import Optional
+
+from attr import attrib, attrs
+from attr.validators import instance_of, optional
+
+
+__all__ = ()
+
+
+
+@attrs(frozen=True)
+class ChangeNotification(object):
+    """
+    Change notification.
+
+    A change notification records a message sent to clients about a change to
+    the data store, so that it can be sent again to clients that missed it.
+    Notifications are numbered in the order they were sent, and identify the
+    event and incident number that the change was made to, if any.
+    """
+
+    number: int = attrib(validator=instance_of(int))
+    eventID: Optional[str] = attrib(validator=optional(instance_of(str)))
+    incidentNumber: Optional[int] = attrib(
+        validator=optional(instance_of(int))
+    )
+    eventClass: str = attrib(validator=instance_of(str))
+    message: str = attrib(validator=instance_of(str))
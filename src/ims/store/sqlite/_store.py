@@ -18,36 +18,52 @@
 Incident Management System SQLite data store.
 """
 
+from collections import defaultdict
+from collections.abc import Generator as GeneratorABC
 from datetime import (
     datetime as DateTime, timedelta as TimeDelta, timezone as TimeZone
 )
+from functools import wraps
 from pathlib import Path
-from sys import stdout
+from sys import intern, stdout
 from textwrap import dedent
+from threading import local as ThreadLocal
+from time import monotonic
 from types import MappingProxyType
-from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Union, cast
+from typing import (
+    Any, AsyncIterator, Callable, Coroutine, Dict, FrozenSet, Iterable, List,
+    Mapping, Optional, Sequence, Set, Tuple, TypeVar, Union, cast,
+)
 from typing.io import TextIO
 
 from attr import Factory, attrib, attrs
 from attr.validators import instance_of, optional
 
+from twisted.internet.task import deferLater
+from twisted.internet.threads import deferToThreadPool
 from twisted.logger import Logger
+from twisted.python.threadpool import ThreadPool
 
-from ims.ext.json import objectFromJSONBytesIO
+from ims.ext.attr import trusted
+from ims.ext.json import objectsFromJSONArrayBytesIO
 from ims.ext.sqlite import (
-    Connection, Cursor, ParameterValue, Parameters, Row, SQLiteError,
-    createDB, explainQueryPlans, openDB, printSchema,
+    Connection, Cursor, IntegrityError, ParameterValue, Parameters, Row,
+    SQLiteError, createDB, explainQueryPlans, openDB, printSchema,
 )
 from ims.model import (
     Event, Incident, IncidentPriority, IncidentReport, IncidentState,
-    Location, ReportEntry, RodGarettAddress,
+    IncidentSummary, Location, ReportEntry, RodGarettAddress,
+)
+from ims.model.json import (
+    IncidentJSONKey, jsonBytesFromModelObject, modelObjectFromJSONObject
 )
-from ims.model.json import IncidentJSONKey, modelObjectFromJSONObject
 
 from .._abc import IMSDataStore
 from .._exceptions import (
     NoSuchIncidentError, NoSuchIncidentReportError, StorageError
 )
+from .._notification import ChangeNotification
+from .._search import SearchResult
 
 Parameters  # Silence linter
 
@@ -55,10 +71,51 @@ Parameters  # Silence linter
 __all__ = ()
 
 
+TStoreMethod = TypeVar("TStoreMethod", bound=Callable)
+
+
 def _query(query: str) -> str:
-    return dedent(query.format(
-        query_eventID="select ID from EVENT where NAME = :eventID",
-    ))
+    return dedent(query)
+
+
+def _runCoroutine(coroutine: Coroutine) -> Any:
+    """
+    Run the given coroutine, which must not suspend, to completion and return
+    its result.
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as e:
+        return e.value
+
+    coroutine.close()
+    raise AssertionError("Data store coroutine suspended in a worker thread")
+
+
+def _storeOperation(write: bool) -> Callable[[TStoreMethod], TStoreMethod]:
+    """
+    Decorator for :class:`DataStore` methods that access the database.
+
+    If the store is configured to use worker threads, the decorated method is
+    run in the writer thread if ``write`` is true, or in one of the reader
+    threads otherwise, and the result is delivered back to the reactor thread.
+    Otherwise, the method is run in the calling thread.
+    """
+    def decorator(f: TStoreMethod) -> TStoreMethod:
+        @wraps(f)
+        async def wrapper(self: "DataStore", *args: Any, **kwargs: Any) -> Any:
+            if self.readerThreads == 0 or self._inWorkerThread():
+                return await f(self, *args, **kwargs)
+
+            return await self._runInThread(write, f, self, *args, **kwargs)
+
+        return cast(TStoreMethod, wrapper)
+
+    return decorator
+
+
+_reads  = _storeOperation(write=False)
+_writes = _storeOperation(write=True)
 
 
 
@@ -69,7 +126,22 @@ class DataStore(IMSDataStore):
     """
 
     _log = Logger()
-    _schemaVersion = 2
+    _schemaVersion = 7
+
+    # Connection options for the writer connection and for the read-only
+    # connections used by reader threads.
+    # WAL journaling allows readers to proceed while a write is in progress,
+    # and synchronous=normal is durable enough in WAL mode.
+    # The statement cache holds all of our queries, including the variants
+    # generated from templates.
+    _writerOptions: Dict[str, Any] = dict(
+        journalMode="wal", synchronous="normal", busyTimeout=5000,
+        cachedStatements=256,
+    )
+    _readerOptions: Dict[str, Any] = dict(
+        readOnly=True, busyTimeout=5000,
+        cachedStatements=256,
+    )
 
     @attrs(frozen=False)
     class _State(object):
@@ -82,7 +154,27 @@ class DataStore(IMSDataStore):
             default=None, init=False,
         )
 
+        threadLocal: ThreadLocal = attrib(
+            default=Factory(ThreadLocal), init=False
+        )
+        readerPool: Optional[ThreadPool] = attrib(default=None, init=False)
+        writerPool: Optional[ThreadPool] = attrib(default=None, init=False)
+        pending: int = attrib(default=0, init=False)
+
+        # Event row IDs, keyed by event name
+        eventRowIDs: Dict[str, int] = attrib(
+            default=Factory(dict), init=False
+        )
+
+        # Incremented after every write to incident reports or incident
+        # types, respectively.
+        incidentReportsRevision: int = attrib(default=0, init=False)
+        incidentTypesRevision: int = attrib(default=0, init=False)
+
     dbPath: Path = attrib(validator=instance_of(Path))
+    readerThreads: int = attrib(validator=instance_of(int), default=0)
+    queueDepth: int = attrib(validator=instance_of(int), default=100)
+    incidentBatchSize: int = attrib(validator=instance_of(int), default=500)
     _state: _State = attrib(default=Factory(_State), init=False)
 
 
@@ -165,6 +257,26 @@ class DataStore(IMSDataStore):
             sqlUpgrade(1, 2)
             version = 2
 
+        if version == 2:
+            sqlUpgrade(2, 3)
+            version = 3
+
+        if version == 3:
+            sqlUpgrade(3, 4)
+            version = 4
+
+        if version == 4:
+            sqlUpgrade(4, 5)
+            version = 5
+
+        if version == 5:
+            sqlUpgrade(5, 6)
+            version = 6
+
+        if version == 6:
+            sqlUpgrade(6, 7)
+            version = 7
+
         if version == currentVersion:
             # Successfully upgraded to the current version
             return True
@@ -174,14 +286,23 @@ class DataStore(IMSDataStore):
 
     @property
     def _db(self) -> Connection:
+        if self._inWorkerThread():
+            return self._workerDB()
+
         if self._state.db is None:
             try:
-                db = openDB(self.dbPath, schema=self._loadSchema())
-                db.validateConstraints()
+                db = openDB(
+                    self.dbPath, schema=self._loadSchema(),
+                    **self._writerOptions,
+                )
+
+                # Foreign key constraints are enforced on every connection, so
+                # they are checked by validate() rather than on every open.
 
                 if self._upgradeSchema(db):
                     # Re-connect to get new schema
-                    db = openDB(self.dbPath)
+                    db.close()
+                    db = openDB(self.dbPath, **self._writerOptions)
 
                 self._state.db = db
 
@@ -197,6 +318,150 @@ class DataStore(IMSDataStore):
         return self._state.db
 
 
+    def _workerDB(self) -> Connection:
+        """
+        Look up the connection for the current worker thread.
+        Each worker thread uses its own connection, as SQLite connections may
+        not be shared between threads.
+        The writer thread's connection is opened for writing; reader threads
+        form a pool of read-only connections.
+        """
+        threadLocal = self._state.threadLocal
+
+        db = getattr(threadLocal, "db", None)
+        if db is None:
+            if threadLocal.write:
+                options = self._writerOptions
+            else:
+                options = self._readerOptions
+            try:
+                db = openDB(self.dbPath, **options)
+            except SQLiteError as e:
+                self._log.critical(
+                    "Unable to open SQLite database {dbPath} in worker "
+                    "thread: {error}",
+                    dbPath=self.dbPath, error=e,
+                )
+                raise StorageError(
+                    f"Unable to open SQLite database {self.dbPath}: {e}"
+                )
+            threadLocal.db = db
+
+        return db
+
+
+    def _checkWorkerDB(self) -> None:
+        """
+        Check the health of the connection for the current worker thread,
+        discarding it if it is no longer usable, so that it is replaced on
+        next use.
+        """
+        threadLocal = self._state.threadLocal
+
+        db = getattr(threadLocal, "db", None)
+        if db is None or db.isHealthy():
+            return
+
+        self._log.warn(
+            "Discarding unhealthy SQLite connection to {dbPath} in worker "
+            "thread",
+            dbPath=self.dbPath,
+        )
+        try:
+            db.close()
+        except SQLiteError:
+            pass
+        threadLocal.db = None
+
+
+    def _inWorkerThread(self) -> bool:
+        return getattr(self._state.threadLocal, "worker", False)
+
+
+    def _threadPool(self, write: bool) -> ThreadPool:
+        """
+        Look up the writer or reader thread pool, starting the pools if
+        necessary.
+        """
+        state = self._state
+
+        if state.writerPool is None:
+            # Open the database from this thread first, so that the schema is
+            # created or upgraded before any worker thread connects to it.
+            self._db
+
+            from twisted.internet import reactor
+
+            state.writerPool = ThreadPool(
+                minthreads=1, maxthreads=1, name="IMS data store writer"
+            )
+            state.readerPool = ThreadPool(
+                minthreads=1, maxthreads=self.readerThreads,
+                name="IMS data store reader",
+            )
+            for pool in (state.writerPool, state.readerPool):
+                pool.start()
+                reactor.addSystemEventTrigger("during", "shutdown", pool.stop)
+
+            self._log.info(
+                "Started data store worker threads: 1 writer, "
+                "{readerThreads} readers",
+                readerThreads=self.readerThreads,
+            )
+
+        if write:
+            pool = state.writerPool
+        else:
+            pool = state.readerPool
+
+        assert pool is not None
+        return pool
+
+
+    async def _runInThread(
+        self, write: bool, f: Callable, *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Run the given store coroutine function in a worker thread.
+        """
+        state = self._state
+
+        if state.pending >= self.queueDepth:
+            self._log.error(
+                "Data store queue is full ({pending} pending operations)",
+                pending=state.pending,
+            )
+            raise StorageError("Data store queue is full")
+
+        def run() -> Any:
+            threadLocal = self._state.threadLocal
+            threadLocal.worker = True
+            threadLocal.write = write
+
+            try:
+                result = _runCoroutine(f(*args, **kwargs))
+            except StorageError:
+                self._checkWorkerDB()
+                raise
+
+            # Generators must be consumed here, while we are in the thread
+            # that owns the connection.
+            if isinstance(result, GeneratorABC):
+                result = tuple(result)
+
+            return result
+
+        from twisted.internet import reactor
+
+        pool = self._threadPool(write)
+
+        state.pending += 1
+        try:
+            return await deferToThreadPool(reactor, pool, run)
+        finally:
+            state.pending -= 1
+
+
     def _execute(
         self, queries: Iterable[Tuple[str, Parameters]],
         errorLogFormat: str,
@@ -225,612 +490,1971 @@ class DataStore(IMSDataStore):
             raise StorageError(e)
 
 
-    def validate(self) -> None:
+    def validate(self, incremental: bool = False) -> None:
         """
         See :meth:`IMSDataStore.validate`.
+
+        A full validation checks foreign key constraints and all report
+        entries.
+        An incremental validation after a clean shutdown checks only report
+        entries written since the last validation checkpoint; foreign key
+        constraints are enforced on every connection, so they are left to
+        :meth:`validateInBackground`.
         """
-        self._log.info("Validating data store...")
+        checkpoint = self._validationCheckpoint()
 
-        valid = True
+        if incremental and checkpoint is not None:
+            scope = "incremental"
+        else:
+            scope = "full"
+            checkpoint = 0
 
-        # Check for detached report entries
-        for reportEntry in self.detachedReportEntries():
-            self._log.critical(
-                "Found detached report entry: {reportEntry}",
-                reportEntry=reportEntry,
-            )
+        self._log.info("Validating data store ({scope})...", scope=scope)
+
+        startTime = DateTime.now(TimeZone.utc)
+        start = monotonic()
+
+        highWater = self._validationHighWater()
+
+        valid = True
+        if scope == "full":
+            valid = self._checkForeignKeys()
+        if not self._checkReportEntries(checkpoint, highWater):
             valid = False
 
+        duration = monotonic() - start
+        self._recordValidation(
+            startTime, duration, scope, valid, highWater if valid else None
+        )
+
         if not valid:
             raise StorageError("Data store validation failed")
 
 
-    def loadFromEventJSON(
-        self, event: Event, path: Path, trialRun: bool = False
-    ) -> None:
+    async def validateInBackground(self, chunkSize: int = 10000) -> bool:
         """
-        Load event data from a file containing JSON.
-        """
-        with path.open() as fileHandle:
-            eventJSON = objectFromJSONBytesIO(fileHandle)
+        See :meth:`IMSDataStore.validateInBackground`.
 
-            self._log.info("Creating event: {event}", event=event)
-            self.createEvent(event)
-
-            # Load incidents
-            for incidentJSON in eventJSON:
-                try:
-                    eventID = incidentJSON.get(IncidentJSONKey.event.value)
-                    if eventID is None:
-                        incidentJSON[IncidentJSONKey.event.value] = event.id
-                    else:
-                        if eventID != event.id:
-                            raise ValueError(
-                                f"Event ID {eventID} != {event.id}"
-                            )
+        Foreign key constraints are checked one table at a time, and report
+        entries in ranges of ``chunkSize``, each as a separate read, so that
+        other operations may proceed in between.
+        """
+        self._log.info("Validating data store in the background...")
 
-                    incident = modelObjectFromJSONObject(
-                        incidentJSON, Incident
-                    )
-                except ValueError as e:
-                    if trialRun:
-                        number = incidentJSON.get(IncidentJSONKey.number.value)
-                        self._log.critical(
-                            "Unable to load incident #{number}: {error}",
-                            number=number, error=e,
-                        )
-                    else:
-                        raise
+        startTime = DateTime.now(TimeZone.utc)
+        start = monotonic()
 
-                for incidentType in incident.incidentTypes:
-                    self.createIncidentType(incidentType, hidden=True)
+        # Report entries written after this point are left to the next
+        # incremental validation.
+        highWater = await self._readStep(self._validationHighWater)
 
-                self._log.info(
-                    "Creating incident in {event}: {incident}",
-                    event=event, incident=incident
-                )
-                if not trialRun:
-                    self.importIncident(incident)
+        valid = True
 
+        for table in await self._readStep(self._foreignKeyTables):
+            if not await self._readStep(self._checkForeignKeys, table):
+                valid = False
+            await self._yieldToReactor()
+
+        after = 0
+        while after < highWater:
+            through = min(after + chunkSize, highWater)
+            if not await self._readStep(
+                self._checkReportEntries, after, through
+            ):
+                valid = False
+            after = through
+            await self._yieldToReactor()
+
+        duration = monotonic() - start
+        await self._writeStep(
+            self._recordValidation,
+            startTime, duration, "full", valid, highWater if valid else None,
+        )
 
-    ###
-    # Events
-    ###
+        return valid
 
 
-    async def events(self) -> Iterable[Event]:
+    def shutdown(self) -> None:
         """
-        See :meth:`IMSDataStore.events`.
+        See :meth:`IMSDataStore.shutdown`.
         """
-        return (
-            Event(id=row["name"]) for row in self._executeAndIterate(
-                self._query_events, {}, "Unable to look up events"
+        try:
+            with self._db as db:
+                db.execute(self._query_markValidationCheckpoint, dict(clean=1))
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to record clean shutdown: {error}", error=e
             )
-        )
+            raise StorageError(e)
 
-    _query_events = _query(
+        self._log.info("Recorded clean shutdown of data store")
+
+
+    def jsonBytes(self, obj: Union[Incident, IncidentReport]) -> bytes:
         """
-        select NAME from EVENT
+        See :meth:`IMSDataStore.jsonBytes`.
         """
-    )
+        return jsonBytesFromModelObject(obj)
 
 
-    async def createEvent(self, event: Event) -> None:
+    @_reads
+    async def _readStep(self, f: Callable, *args: Any) -> Any:
         """
-        See :meth:`IMSDataStore.createEvent`.
+        Call the given synchronous function as a read operation.
         """
-        self._execute(
-            (
-                (self._query_createEvent, dict(eventID=event.id)),
-            ),
-            "Unable to create event {eventID}"
-        )
+        return f(*args)
 
-        self._log.info(
-            "Created event: {event}", storeWriteClass=Event, event=event,
-        )
 
-    _query_createEvent = _query(
+    @_writes
+    async def _writeStep(self, f: Callable, *args: Any) -> Any:
         """
-        insert into EVENT (NAME) values (:eventID);
+        Call the given synchronous function as a write operation.
         """
-    )
+        return f(*args)
 
 
-    def _eventAccess(self, event: Event, mode: str) -> Iterable[str]:
-        return (
-            row["EXPRESSION"] for row in self._executeAndIterate(
-                self._query_eventAccess,
-                dict(eventID=event.id, mode=mode),
-                "Unable to look up {mode} access for event {eventID}",
-            )
-        )
-
-    _query_eventAccess = _query(
+    async def _yieldToReactor(self) -> None:
         """
-        select EXPRESSION from EVENT_ACCESS
-        where EVENT = ({query_eventID}) and MODE = :mode
+        Let the reactor run between the steps of a background operation.
+        This is only needed when the store does not use worker threads, as
+        otherwise the reactor runs while waiting for each step.
         """
-    )
+        if self.readerThreads == 0:
+            from twisted.internet import reactor
+            await deferLater(reactor, 0, lambda: None)
 
 
-    def _setEventAccess(
-        self, event: Event, mode: str, expressions: Iterable[str]
-    ) -> None:
-        expressions = tuple(expressions)
+    def _validationCheckpoint(self) -> Optional[int]:
+        """
+        Look up the highest report entry ID covered by a successful
+        validation, if the store was shut down cleanly since.
+        """
         try:
-            with self._db as db:
-                cursor = db.cursor()
-                try:
-                    cursor.execute(
-                        self._query_clearEventAccess,
-                        dict(eventID=event.id, mode=mode),
-                    )
-                    for expression in expressions:
-                        cursor.execute(
-                            self._query_addEventAccess, dict(
-                                eventID=event.id,
-                                expression=expression,
-                                mode=mode,
-                            )
-                        )
-                finally:
-                    cursor.close()
+            row = self._db.execute(
+                self._query_validationCheckpoint, {}
+            ).fetchone()
         except SQLiteError as e:
             self._log.critical(
-                "Unable to set {mode} access for {event}: {error}",
-                event=event, mode=mode, expressions=expressions, error=e,
+                "Unable to look up validation checkpoint: {error}", error=e
             )
             raise StorageError(e)
 
-        self._log.info(
-            "Set {mode} access for {event}: {expressions}",
-            storeWriteClass=Event,
-            event=event, mode=mode, expressions=expressions,
-        )
+        if row is None or not row["CLEAN"]:
+            return None
 
-    _query_clearEventAccess = _query(
-        """
-        delete from EVENT_ACCESS
-        where EVENT = ({query_eventID}) and MODE = :mode
-        """
-    )
+        return cast(int, row["REPORT_ENTRY"])
 
-    _query_addEventAccess = _query(
+    _query_validationCheckpoint = _query(
         """
-        insert into EVENT_ACCESS (EVENT, EXPRESSION, MODE)
-        values (({query_eventID}), :expression, :mode)
+        select REPORT_ENTRY, CLEAN from VALIDATION_CHECKPOINT
         """
     )
 
 
-    async def readers(self, event: Event) -> Iterable[str]:
+    def _validationHighWater(self) -> int:
         """
-        See :meth:`IMSDataStore.readers`.
+        Look up the highest report entry ID.
         """
-        assert type(event) is Event
+        try:
+            row = self._db.execute(self._query_maxReportEntryID, {}).fetchone()
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up highest report entry ID: {error}", error=e
+            )
+            raise StorageError(e)
 
-        return self._eventAccess(event, "read")
+        return cast(int, row["ID"])
 
 
-    async def setReaders(self, event: Event, readers: Iterable[str]) -> None:
+    def _foreignKeyTables(self) -> Tuple[str, ...]:
         """
-        See :meth:`IMSDataStore.setReaders`.
+        Look up the names of the tables with foreign key constraints.
         """
-        return self._setEventAccess(event, "read", readers)
-
+        try:
+            return tuple(
+                row["NAME"] for row in
+                self._db.execute(self._query_foreignKeyTables, {})
+            )
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up tables with foreign keys: {error}",
+                error=e,
+            )
+            raise StorageError(e)
 
-    async def writers(self, event: Event) -> Iterable[str]:
+    _query_foreignKeyTables = _query(
         """
-        See :meth:`IMSDataStore.writers`.
+        select m.NAME as NAME from SQLITE_MASTER m
+        where
+            m.TYPE = 'table' and
+            exists (select 1 from PRAGMA_FOREIGN_KEY_LIST(m.NAME))
+        order by m.NAME
         """
-        assert type(event) is Event
-
-        return self._eventAccess(event, "write")
+    )
 
 
-    async def setWriters(self, event: Event, writers: Iterable[str]) -> None:
+    def _checkForeignKeys(self, table: Optional[str] = None) -> bool:
         """
-        See :meth:`IMSDataStore.setWriters`.
+        Check foreign key constraints, for the given table or for all tables.
+        Violations are logged by the connection.
         """
-        return self._setEventAccess(event, "write", writers)
-
+        try:
+            self._db.validateForeignKeys(table)
+        except IntegrityError:
+            return False
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to check foreign key constraints: {error}", error=e
+            )
+            raise StorageError(e)
 
-    ###
-    # Incident Types
-    ###
+        return True
 
 
-    async def incidentTypes(
-        self, includeHidden: bool = False
-    ) -> Iterable[str]:
+    def _checkReportEntries(self, after: int, through: int) -> bool:
         """
-        See :meth:`IMSDataStore.incidentTypes`.
+        Check for detached report entries with IDs greater than ``after`` and
+        no greater than ``through``.
         """
-        if includeHidden:
-            query = self._query_incidentTypes
-        else:
-            query = self._query_incidentTypesNotHidden
+        valid = True
 
-        return (
-            row["name"] for row in self._executeAndIterate(
-                query, {}, "Unable to look up incident types"
+        try:
+            rows = tuple(self._db.execute(
+                self._query_detachedReportEntriesInRange,
+                dict(after=after, through=through),
+            ))
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up detached report entries: {error}",
+                error=e,
+            )
+            raise StorageError(e)
+
+        for row in rows:
+            if not row["TEXT"]:
+                continue
+            self._log.critical(
+                "Found detached report entry: {reportEntry}",
+                reportEntry=self._reportEntryFromRow(row),
+            )
+            valid = False
+
+        return valid
+
+    _query_detachedReportEntriesInRange = _query(
+        """
+        select re.AUTHOR, re.TEXT, re.CREATED, re.GENERATED
+        from REPORT_ENTRY re
+        where
+            re.ID > :after and re.ID <= :through and
+            not exists (
+                select 1 from INCIDENT__REPORT_ENTRY ire
+                where ire.REPORT_ENTRY = re.ID
+            ) and
+            not exists (
+                select 1 from INCIDENT_REPORT__REPORT_ENTRY irre
+                where irre.REPORT_ENTRY = re.ID
             )
+        """
+    )
+
+
+    def _recordValidation(
+        self, startTime: DateTime, duration: float, scope: str, valid: bool,
+        checkpoint: Optional[int],
+    ) -> None:
+        """
+        Record the outcome of a validation, and advance the validation
+        checkpoint to ``checkpoint`` if it is not :obj:`None`.
+        The checkpoint is marked as not clean until the next clean shutdown.
+        """
+        self._log.info(
+            "Data store validation ({scope}) {result} in {duration:.3f}s",
+            scope=scope, result="passed" if valid else "failed",
+            duration=duration,
         )
 
-    _query_incidentTypes = _query(
+        try:
+            with self._db as db:
+                db.execute(
+                    self._query_logValidation, dict(
+                        started=asTimeStamp(startTime), duration=duration,
+                        scope=scope, valid=valid,
+                    )
+                )
+                if checkpoint is not None:
+                    db.execute(self._query_clearValidationCheckpoint, {})
+                    db.execute(
+                        self._query_setValidationCheckpoint,
+                        dict(reportEntryID=checkpoint),
+                    )
+                else:
+                    db.execute(
+                        self._query_markValidationCheckpoint, dict(clean=0)
+                    )
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to record data store validation: {error}", error=e
+            )
+            raise StorageError(e)
+
+    _query_logValidation = _query(
         """
-        select NAME from INCIDENT_TYPE
+        insert into VALIDATION_LOG (STARTED, DURATION, SCOPE, VALID)
+        values (:started, :duration, :scope, :valid)
         """
     )
 
-    _query_incidentTypesNotHidden = _query(
+    _query_clearValidationCheckpoint = _query(
         """
-        select NAME from INCIDENT_TYPE where HIDDEN = 0
+        delete from VALIDATION_CHECKPOINT
         """
     )
 
+    _query_setValidationCheckpoint = _query(
+        """
+        insert into VALIDATION_CHECKPOINT (REPORT_ENTRY, CLEAN)
+        values (:reportEntryID, 0)
+        """
+    )
 
-    async def createIncidentType(
-        self, incidentType: str, hidden: bool = False
-    ) -> None:
+    _query_markValidationCheckpoint = _query(
         """
-        See :meth:`IMSDataStore.createIncidentType`.
+        update VALIDATION_CHECKPOINT set CLEAN = :clean
         """
-        self._execute(
-            ((
-                # FIXME: This casting shouldn't be necessary
-                cast(str, self._query_createIncidentType),
-                cast(
-                    Dict[str, ParameterValue],
-                    dict(incidentType=incidentType, hidden=hidden)
-                ),
-            ),),
-            "Unable to create incident type {name}"
+    )
+
+
+    @_writes
+    async def loadFromEventJSON(
+        self, event: Event, path: Path, trialRun: bool = False,
+        chunkSize: int = 1000,
+    ) -> int:
+        """
+        Load event data from a file containing JSON.
+
+        The event is created if it does not exist.
+        It may already exist, for example so that the concentric streets
+        referred to by the incidents can be created first.
+
+        The file is read incrementally, and incidents are written in chunks of
+        ``chunkSize`` within a single transaction, so that a failed load
+        leaves the store unchanged.
+        Foreign key constraints are checked once, at the end of the load.
+
+        If ``trialRun`` is true, incidents are validated but not written, and
+        invalid incidents are logged and skipped rather than raising.
+
+        :return: The number of incidents loaded (or validated).
+        """
+        started = monotonic()
+        count = 0
+
+        def progress() -> None:
+            elapsed = monotonic() - started
+            self._log.info(
+                "{verb} {count} incidents in {event} in {elapsed:.1f} seconds "
+                "({rate:.0f} incidents/second)",
+                verb=("Validated" if trialRun else "Loaded"),
+                count=count, event=event,
+                elapsed=elapsed, rate=(count / elapsed if elapsed else 0),
+            )
+
+        chunks = self._incidentChunksFromEventJSON(
+            event, path, trialRun, chunkSize
         )
 
+        if trialRun:
+            for chunk in chunks:
+                count += len(chunk)
+                progress()
+            return count
+
+        try:
+            with self._db as db:
+                # Start the transaction explicitly, as deferring foreign key
+                # constraints only lasts until the end of the current one.
+                db.execute("begin")
+                db.execute("pragma defer_foreign_keys = true")
+
+                cursor = db.cursor()
+                try:
+                    cursor.execute(
+                        self._query_loadEvent, dict(eventID=event.id)
+                    )
+                    cursor.execute(
+                        self._query_eventRowID, dict(eventID=event.id)
+                    )
+                    eventRowID = cursor.fetchone()["ID"]
+
+                    cursor.execute(
+                        self._query_eventRevision, dict(eventRowID=eventRowID)
+                    )
+                    revision = cursor.fetchone()["REVISION"]
+
+                    cursor.execute(self._query_maxReportEntryID, {})
+                    reportEntryID = cursor.fetchone()["ID"]
+
+                    for chunk in chunks:
+                        reportEntryID = self._loadIncidents(
+                            eventRowID, chunk, revision + count,
+                            reportEntryID, cursor,
+                        )
+                        count += len(chunk)
+                        progress()
+                finally:
+                    cursor.close()
+
+                db.validateForeignKeys()
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to load event {event} from {path}: {error}",
+                event=event, path=path, error=e,
+            )
+            raise StorageError(e)
+
+        self._state.incidentTypesRevision += 1
+
         self._log.info(
-            "Created incident type: {incidentType} (hidden={hidden})",
-            # storeWriteClass=IncidentType,
-            incidentType=incidentType, hidden=hidden,
+            "Loaded event {event} from {path}",
+            storeWriteClass=Event, event=event, path=path,
         )
 
-    _query_createIncidentType = _query(
+        return count
+
+    _query_loadEvent = _query(
         """
-        insert into INCIDENT_TYPE (NAME, HIDDEN)
-        values (:incidentType, :hidden)
+        insert or ignore into EVENT (NAME) values (:eventID)
+        """
+    )
+
+    _query_maxReportEntryID = _query(
+        """
+        select coalesce(max(ID), 0) as ID from REPORT_ENTRY
         """
     )
 
 
-    def _hideShowIncidentTypes(
-        self, incidentTypes: Iterable[str], hidden: bool
-    ) -> None:
-        incidentTypes = tuple(incidentTypes)
-        self._execute(
+    def _incidentChunksFromEventJSON(
+        self, event: Event, path: Path, trialRun: bool, chunkSize: int
+    ) -> Iterable[List[Incident]]:
+        """
+        Read incidents in the given event from a file containing JSON, in
+        lists of up to ``chunkSize`` incidents.
+        """
+        numbers: Set[int] = set()
+        chunk: List[Incident] = []
+
+        with path.open("rb") as fileHandle:
+            for incidentJSON in objectsFromJSONArrayBytesIO(fileHandle):
+                number = incidentJSON.get(IncidentJSONKey.number.value)
+
+                try:
+                    eventID = incidentJSON.get(IncidentJSONKey.event.value)
+                    if eventID is None:
+                        incidentJSON[IncidentJSONKey.event.value] = event.id
+                    else:
+                        if eventID != event.id:
+                            raise ValueError(
+                                f"Event ID {eventID} != {event.id}"
+                            )
+
+                    if number in numbers:
+                        raise ValueError(f"Duplicate incident #{number}")
+
+                    incident = modelObjectFromJSONObject(
+                        incidentJSON, Incident
+                    )
+                except ValueError as e:
+                    if trialRun:
+                        self._log.critical(
+                            "Unable to load incident #{number}: {error}",
+                            number=number, error=e,
+                        )
+                        continue
+                    else:
+                        raise
+
+                numbers.add(number)
+                chunk.append(incident)
+
+                if len(chunk) >= chunkSize:
+                    yield chunk
+                    chunk = []
+
+        if chunk:
+            yield chunk
+
+
+    def _loadIncidents(
+        self, eventRowID: int, incidents: List[Incident], revision: int,
+        reportEntryID: int, cursor: Cursor,
+    ) -> int:
+        """
+        Write the given incidents, which are numbered, as loaded from an event
+        archive, into the event with the given row ID.
+        Incident revisions follow the given revision, and report entry IDs
+        follow the given report entry ID.
+
+        :return: The last report entry ID used.
+        """
+        incidentRows = []
+        rangerRows = []
+        incidentTypeRows = []
+        reportEntryRows = []
+        incidentReportEntryRows = []
+        incidentTypes = set()
+
+        for incident in incidents:
+            revision += 1
+
+            incidentRows.append(dict(
+                self._incidentParameters(incident),
+                eventRowID=eventRowID, incidentVersion=revision,
+            ))
+
+            for rangerHandle in incident.rangerHandles:
+                rangerRows.append(dict(
+                    eventRowID=eventRowID,
+                    incidentNumber=incident.number,
+                    rangerHandle=rangerHandle,
+                ))
+
+            for incidentType in incident.incidentTypes:
+                incidentTypes.add(incidentType)
+                incidentTypeRows.append(dict(
+                    eventRowID=eventRowID,
+                    incidentNumber=incident.number,
+                    incidentType=incidentType,
+                ))
+
+            for reportEntry in incident.reportEntries:
+                reportEntryID += 1
+                reportEntryRows.append(dict(
+                    reportEntryID=reportEntryID,
+                    created=asTimeStamp(reportEntry.created),
+                    generated=reportEntry.automatic,
+                    author=reportEntry.author,
+                    text=reportEntry.text,
+                ))
+                incidentReportEntryRows.append(dict(
+                    eventRowID=eventRowID,
+                    incidentNumber=incident.number,
+                    reportEntryID=reportEntryID,
+                ))
+
+        for (query, rows) in (
             (
-                (
-                    self._query_hideShowIncidentType,
-                    dict(incidentType=incidentType, hidden=hidden),
-                )
-                for incidentType in incidentTypes
+                self._query_loadIncidentType,
+                [dict(incidentType=t) for t in sorted(incidentTypes)],
             ),
-            f"Unable to set hidden to {hidden} incident types "
-            f"{{incidentTypes}}"
-        )
+            (self._query_loadIncident, incidentRows),
+            (self._query_loadIncidentRanger, rangerRows),
+            (self._query_loadIncidentIncidentType, incidentTypeRows),
+            (self._query_loadReportEntry, reportEntryRows),
+            (self._query_loadIncidentReportEntry, incidentReportEntryRows),
+        ):
+            cursor.executemany(query, rows)
 
-        self._log.info(
-            "Set hidden to {hidden} for incident types: {incidentTypes}",
-            # storeWriteClass=IncidentType,
-            incidentTypes=incidentTypes, hidden=hidden,
-        )
+        return reportEntryID
 
-    _query_hideShowIncidentType = _query(
+    # Incident types used by loaded incidents are created hidden if they do
+    # not exist.
+    _query_loadIncidentType = _query(
         """
-        update INCIDENT_TYPE set HIDDEN = :hidden where NAME = :incidentType
+        insert or ignore into INCIDENT_TYPE (NAME, HIDDEN)
+        values (:incidentType, 1)
+        """
+    )
+
+    _query_loadIncident = _query(
+        """
+        insert into INCIDENT (
+            EVENT,
+            NUMBER,
+            VERSION,
+            CREATED,
+            PRIORITY,
+            STATE,
+            SUMMARY,
+            LOCATION_NAME,
+            LOCATION_CONCENTRIC,
+            LOCATION_RADIAL_HOUR,
+            LOCATION_RADIAL_MINUTE,
+            LOCATION_DESCRIPTION,
+            DISPLAY_SUMMARY,
+            LAST_MODIFIED
+        )
+        values (
+            :eventRowID,
+            :incidentNumber,
+            :incidentVersion,
+            :incidentCreated,
+            :incidentPriority,
+            :incidentState,
+            :incidentSummary,
+            :locationName,
+            :locationConcentric,
+            :locationRadialHour,
+            :locationRadialMinute,
+            :locationDescription,
+            :displaySummary,
+            :lastModified
+        )
         """
     )
 
+    _query_loadIncidentRanger = _query(
+        """
+        insert into INCIDENT__RANGER (EVENT, INCIDENT_NUMBER, RANGER_HANDLE)
+        values (:eventRowID, :incidentNumber, :rangerHandle)
+        """
+    )
 
-    async def showIncidentTypes(self, incidentTypes: Iterable[str]) -> None:
+    _query_loadIncidentIncidentType = _query(
         """
-        See :meth:`IMSDataStore.showIncidentTypes`.
+        insert into INCIDENT__INCIDENT_TYPE (
+            EVENT, INCIDENT_NUMBER, INCIDENT_TYPE
+        )
+        values (
+            :eventRowID,
+            :incidentNumber,
+            (select ID from INCIDENT_TYPE where NAME = :incidentType)
+        )
         """
-        return self._hideShowIncidentTypes(incidentTypes, False)
+    )
 
+    _query_loadReportEntry = _query(
+        """
+        insert into REPORT_ENTRY (ID, AUTHOR, TEXT, CREATED, GENERATED)
+        values (:reportEntryID, :author, :text, :created, :generated)
+        """
+    )
 
-    async def hideIncidentTypes(self, incidentTypes: Iterable[str]) -> None:
+    _query_loadIncidentReportEntry = _query(
         """
-        See :meth:`IMSDataStore.hideIncidentTypes`.
+        insert into INCIDENT__REPORT_ENTRY (
+            EVENT, INCIDENT_NUMBER, REPORT_ENTRY
+        )
+        values (:eventRowID, :incidentNumber, :reportEntryID)
         """
-        return self._hideShowIncidentTypes(incidentTypes, True)
+    )
 
 
     ###
-    # Concentric Streets
+    # Events
     ###
 
 
-    async def concentricStreets(self, event: Event) -> Mapping[str, str]:
+    @_reads
+    async def events(self) -> Iterable[Event]:
+        """
+        See :meth:`IMSDataStore.events`.
+        """
+        return (
+            Event(id=row["name"]) for row in self._executeAndIterate(
+                self._query_events, {}, "Unable to look up events"
+            )
+        )
+
+    _query_events = _query(
+        """
+        select NAME from EVENT
+        """
+    )
+
+
+    @_writes
+    async def createEvent(self, event: Event) -> None:
+        """
+        See :meth:`IMSDataStore.createEvent`.
+        """
+        self._execute(
+            (
+                (self._query_createEvent, dict(eventID=event.id)),
+            ),
+            "Unable to create event {eventID}"
+        )
+
+        self._log.info(
+            "Created event: {event}", storeWriteClass=Event, event=event,
+        )
+
+    _query_createEvent = _query(
+        """
+        insert into EVENT (NAME) values (:eventID);
+        """
+    )
+
+
+    def _eventRowID(self, event: Event) -> Optional[int]:
+        """
+        Look up the row ID for the given event, so that queries can refer to
+        the event by ID instead of looking it up by name every time.
+        Events are never renamed or removed, so row IDs are cached once found.
+
+        :return: The row ID, or :obj:`None` if there is no such event, in
+            which case queries using it will match nothing.
+        """
+        eventRowIDs = self._state.eventRowIDs
+
+        eventRowID = eventRowIDs.get(event.id)
+        if eventRowID is None:
+            try:
+                row = self._db.execute(
+                    self._query_eventRowID, dict(eventID=event.id)
+                ).fetchone()
+            except SQLiteError as e:
+                self._log.critical(
+                    "Unable to look up ID for event {event}: {error}",
+                    event=event, error=e,
+                )
+                raise StorageError(e)
+
+            if row is None:
+                return None
+
+            eventRowID = eventRowIDs[event.id] = row["ID"]
+
+        return eventRowID
+
+    _query_eventRowID = _query(
+        """
+        select ID from EVENT where NAME = :eventID
+        """
+    )
+
+
+    def _eventAccess(self, event: Event, mode: str) -> Iterable[str]:
+        return (
+            row["EXPRESSION"] for row in self._executeAndIterate(
+                self._query_eventAccess,
+                dict(
+                    eventID=event.id, eventRowID=self._eventRowID(event),
+                    mode=mode,
+                ),
+                "Unable to look up {mode} access for event {eventID}",
+            )
+        )
+
+    _query_eventAccess = _query(
+        """
+        select EXPRESSION from EVENT_ACCESS
+        where EVENT = :eventRowID and MODE = :mode
+        """
+    )
+
+
+    def _setEventAccess(
+        self, event: Event, mode: str, expressions: Iterable[str]
+    ) -> None:
+        expressions = tuple(expressions)
+        try:
+            with self._db as db:
+                cursor = db.cursor()
+                try:
+                    cursor.execute(
+                        self._query_clearEventAccess,
+                        dict(eventRowID=self._eventRowID(event), mode=mode),
+                    )
+                    for expression in expressions:
+                        cursor.execute(
+                            self._query_addEventAccess, dict(
+                                eventRowID=self._eventRowID(event),
+                                expression=expression,
+                                mode=mode,
+                            )
+                        )
+                finally:
+                    cursor.close()
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to set {mode} access for {event}: {error}",
+                event=event, mode=mode, expressions=expressions, error=e,
+            )
+            raise StorageError(e)
+
+        self._log.info(
+            "Set {mode} access for {event}: {expressions}",
+            storeWriteClass=Event,
+            event=event, mode=mode, expressions=expressions,
+        )
+
+    _query_clearEventAccess = _query(
+        """
+        delete from EVENT_ACCESS
+        where EVENT = :eventRowID and MODE = :mode
+        """
+    )
+
+    _query_addEventAccess = _query(
+        """
+        insert into EVENT_ACCESS (EVENT, EXPRESSION, MODE)
+        values (:eventRowID, :expression, :mode)
+        """
+    )
+
+
+    @_reads
+    async def readers(self, event: Event) -> Iterable[str]:
+        """
+        See :meth:`IMSDataStore.readers`.
+        """
+        assert type(event) is Event
+
+        return self._eventAccess(event, "read")
+
+
+    @_writes
+    async def setReaders(self, event: Event, readers: Iterable[str]) -> None:
+        """
+        See :meth:`IMSDataStore.setReaders`.
+        """
+        return self._setEventAccess(event, "read", readers)
+
+
+    @_reads
+    async def writers(self, event: Event) -> Iterable[str]:
+        """
+        See :meth:`IMSDataStore.writers`.
+        """
+        assert type(event) is Event
+
+        return self._eventAccess(event, "write")
+
+
+    @_writes
+    async def setWriters(self, event: Event, writers: Iterable[str]) -> None:
+        """
+        See :meth:`IMSDataStore.setWriters`.
+        """
+        return self._setEventAccess(event, "write", writers)
+
+
+    ###
+    # Incident Types
+    ###
+
+
+    async def incidentTypesRevision(self) -> int:
+        """
+        See :meth:`IMSDataStore.incidentTypesRevision`.
+        """
+        return self._state.incidentTypesRevision
+
+
+    @_reads
+    async def incidentTypes(
+        self, includeHidden: bool = False
+    ) -> Iterable[str]:
+        """
+        See :meth:`IMSDataStore.incidentTypes`.
+        """
+        if includeHidden:
+            query = self._query_incidentTypes
+        else:
+            query = self._query_incidentTypesNotHidden
+
+        return (
+            row["name"] for row in self._executeAndIterate(
+                query, {}, "Unable to look up incident types"
+            )
+        )
+
+    _query_incidentTypes = _query(
+        """
+        select NAME from INCIDENT_TYPE
+        """
+    )
+
+    _query_incidentTypesNotHidden = _query(
+        """
+        select NAME from INCIDENT_TYPE where HIDDEN = 0
+        """
+    )
+
+
+    @_writes
+    async def createIncidentType(
+        self, incidentType: str, hidden: bool = False
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.createIncidentType`.
+        """
+        self._execute(
+            ((
+                # FIXME: This casting shouldn't be necessary
+                cast(str, self._query_createIncidentType),
+                cast(
+                    Dict[str, ParameterValue],
+                    dict(incidentType=incidentType, hidden=hidden)
+                ),
+            ),),
+            "Unable to create incident type {name}"
+        )
+
+        self._state.incidentTypesRevision += 1
+
+        self._log.info(
+            "Created incident type: {incidentType} (hidden={hidden})",
+            # storeWriteClass=IncidentType,
+            incidentType=incidentType, hidden=hidden,
+        )
+
+    _query_createIncidentType = _query(
+        """
+        insert into INCIDENT_TYPE (NAME, HIDDEN)
+        values (:incidentType, :hidden)
+        """
+    )
+
+
+    def _hideShowIncidentTypes(
+        self, incidentTypes: Iterable[str], hidden: bool
+    ) -> None:
+        incidentTypes = tuple(incidentTypes)
+        self._execute(
+            (
+                (
+                    self._query_hideShowIncidentType,
+                    dict(incidentType=incidentType, hidden=hidden),
+                )
+                for incidentType in incidentTypes
+            ),
+            f"Unable to set hidden to {hidden} incident types "
+            f"{{incidentTypes}}"
+        )
+
+        self._state.incidentTypesRevision += 1
+
+        self._log.info(
+            "Set hidden to {hidden} for incident types: {incidentTypes}",
+            # storeWriteClass=IncidentType,
+            incidentTypes=incidentTypes, hidden=hidden,
+        )
+
+    _query_hideShowIncidentType = _query(
+        """
+        update INCIDENT_TYPE set HIDDEN = :hidden where NAME = :incidentType
+        """
+    )
+
+
+    @_writes
+    async def showIncidentTypes(self, incidentTypes: Iterable[str]) -> None:
+        """
+        See :meth:`IMSDataStore.showIncidentTypes`.
+        """
+        return self._hideShowIncidentTypes(incidentTypes, False)
+
+
+    @_writes
+    async def hideIncidentTypes(self, incidentTypes: Iterable[str]) -> None:
+        """
+        See :meth:`IMSDataStore.hideIncidentTypes`.
+        """
+        return self._hideShowIncidentTypes(incidentTypes, True)
+
+
+    ###
+    # Concentric Streets
+    ###
+
+
+    @_reads
+    async def concentricStreets(self, event: Event) -> Mapping[str, str]:
+        """
+        See :meth:`IMSDataStore.concentricStreets`.
+        """
+        return MappingProxyType(dict(
+            (row["ID"], row["NAME"]) for row in
+            self._executeAndIterate(
+                self._query_concentricStreets, dict(
+                    eventID=event.id, eventRowID=self._eventRowID(event)
+                ),
+                "Unable to look up concentric streets for event {eventID}"
+            )
+        ))
+
+
+    _query_concentricStreets = _query(
+        """
+        select ID, NAME from CONCENTRIC_STREET where EVENT = :eventRowID
+        """
+    )
+
+
+    @_writes
+    async def createConcentricStreet(
+        self, event: Event, id: str, name: str
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.createConcentricStreet`.
+        """
+        self._execute(
+            ((
+                self._query_createConcentricStreet,
+                dict(
+                    eventRowID=self._eventRowID(event),
+                    streetID=id, streetName=name,
+                )
+            ),),
+            "Unable to create concentric street ({streetID}){streetName} "
+            "for event {event}"
+        )
+
+        self._log.info(
+            "Created concentric street in {event}: {streetName}",
+            storeWriteClass=Event, event=event, concentricStreetName=name,
+        )
+
+    _query_createConcentricStreet = _query(
+        """
+        insert into CONCENTRIC_STREET (EVENT, ID, NAME)
+        values (:eventRowID, :streetID, :streetName)
+        """
+    )
+
+
+    ##
+    # Report Entries
+    ##
+
+    def detachedReportEntries(self) -> Iterable[ReportEntry]:
+        """
+        Look up all report entries that are not attached to either an incident
+        or an incident report.
+        There shouldn't be any of these; so if there are any, it's an
+        indication of a bug.
+        """
+        try:
+            with self._db as db:
+                cursor = db.cursor()
+                try:
+                    # FIXME: This should be an async generator
+                    return tuple(
+                        self._reportEntryFromRow(row)
+                        for row in cursor.execute(
+                            self._query_detachedReportEntries, {}
+                        ) if row["TEXT"]
+                    )
+                finally:
+                    cursor.close()
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up detached report entries: {error}",
+                error=e,
+            )
+            raise StorageError(e)
+
+    _query_detachedReportEntries = _query(
+        """
+        select re.AUTHOR, re.TEXT, re.CREATED, re.GENERATED
+        from REPORT_ENTRY re
+        where
+            not exists (
+                select 1 from INCIDENT__REPORT_ENTRY ire
+                where ire.REPORT_ENTRY = re.ID
+            ) and
+            not exists (
+                select 1 from INCIDENT_REPORT__REPORT_ENTRY irre
+                where irre.REPORT_ENTRY = re.ID
+            )
+        """
+    )
+
+
+    ###
+    # Incidents
+    ###
+
+
+    # Model objects are created from rows with trusted(), skipping
+    # validation, as the rows were written from valid objects.
+    # Strings that repeat across many objects (authors, Ranger handles,
+    # incident types, concentric streets) are interned so that loaded
+    # incidents share a single copy of each.
+    # Queries must select report entries in the order that ReportEntry sorts
+    # in (created, author, automatic entries first, text), as they are not
+    # sorted here.
+
+
+    def _reportEntryFromRow(self, row: Row) -> ReportEntry:
+        return trusted(
+            ReportEntry,
+            created=fromTimeStamp(row["CREATED"]),
+            author=intern(row["AUTHOR"]),
+            automatic=bool(row["GENERATED"]),
+            text=row["TEXT"],
+        )
+
+
+    def _locationFromRow(self, row: Row) -> Location:
+        # FIXME: This is because schema thinks concentric is an int
+        if row["LOCATION_CONCENTRIC"] is None:
+            concentric = None
+        else:
+            concentric = intern(str(row["LOCATION_CONCENTRIC"]))
+
+        return trusted(
+            Location,
+            name=row["LOCATION_NAME"],
+            address=trusted(
+                RodGarettAddress,
+                concentric=concentric,
+                radialHour=row["LOCATION_RADIAL_HOUR"],
+                radialMinute=row["LOCATION_RADIAL_MINUTE"],
+                description=row["LOCATION_DESCRIPTION"],
+            ),
+        )
+
+
+    def _incidentFromRow(
+        self, event: Event, row: Row, rangerHandles: Iterable[str],
+        incidentTypes: Iterable[str], reportEntries: Iterable[ReportEntry],
+    ) -> Incident:
+        return trusted(
+            Incident,
+            event=event,
+            number=row["NUMBER"],
+            created=fromTimeStamp(row["CREATED"]),
+            state=incidentStateFromID(row["STATE"]),
+            priority=priorityFromID(row["PRIORITY"]),
+            summary=row["SUMMARY"],
+            location=self._locationFromRow(row),
+            rangerHandles=frozenset(map(intern, rangerHandles)),
+            incidentTypes=frozenset(map(intern, incidentTypes)),
+            reportEntries=tuple(reportEntries),
+        )
+
+
+    def _incidentSummaryFromRow(
+        self, event: Event, row: Row, rangerHandles: Iterable[str],
+        incidentTypes: Iterable[str],
+    ) -> IncidentSummary:
+        return trusted(
+            IncidentSummary,
+            event=event,
+            number=row["NUMBER"],
+            created=fromTimeStamp(row["CREATED"]),
+            lastModified=fromTimeStamp(row["LAST_MODIFIED"]),
+            state=incidentStateFromID(row["STATE"]),
+            priority=priorityFromID(row["PRIORITY"]),
+            summary=row["SUMMARY"],
+            location=self._locationFromRow(row),
+            rangerHandles=frozenset(map(intern, rangerHandles)),
+            incidentTypes=frozenset(map(intern, incidentTypes)),
+            summaryFromReport=row["DISPLAY_SUMMARY"],
+        )
+
+
+    def _fetchIncident(
+        self, event: Event, incidentNumber: int, cursor: Cursor
+    ) -> Incident:
+        params: Parameters = dict(
+            eventRowID=self._eventRowID(event), incidentNumber=incidentNumber
+        )
+
+        def notFound() -> None:
+            raise NoSuchIncidentError(
+                f"No incident #{incidentNumber} in event {event}"
+            )
+
+        try:
+            cursor.execute(self._query_incident, params)
+        except OverflowError:
+            notFound()
+
+        row = cursor.fetchone()
+        if row is None:
+            notFound()
+
+        rangerHandles = tuple(
+            row["RANGER_HANDLE"]
+            for row in cursor.execute(self._query_incident_rangers, params)
+        )
+
+        incidentTypes = tuple(
+            row["NAME"]
+            for row in cursor.execute(self._query_incident_types, params)
+        )
+
+        reportEntries = tuple(
+            self._reportEntryFromRow(row)
+            for row in cursor.execute(
+                self._query_incident_reportEntries, params
+            ) if row["TEXT"]
+        )
+
+        return self._incidentFromRow(
+            event, row, rangerHandles, incidentTypes, reportEntries
+        )
+
+    _query_incident = _query(
+        """
+        select
+            NUMBER, CREATED, PRIORITY, STATE, SUMMARY,
+            LOCATION_NAME,
+            LOCATION_CONCENTRIC,
+            LOCATION_RADIAL_HOUR,
+            LOCATION_RADIAL_MINUTE,
+            LOCATION_DESCRIPTION
+        from INCIDENT i
+        where EVENT = :eventRowID and NUMBER = :incidentNumber
+        """
+    )
+
+    _query_incident_rangers = _query(
+        """
+        select RANGER_HANDLE from INCIDENT__RANGER
+        where EVENT = :eventRowID and INCIDENT_NUMBER = :incidentNumber
+        """
+    )
+
+    _query_incident_types = _query(
+        """
+        select NAME from INCIDENT_TYPE where ID in (
+            select INCIDENT_TYPE from INCIDENT__INCIDENT_TYPE
+            where
+                EVENT = :eventRowID and
+                INCIDENT_NUMBER = :incidentNumber
+        )
+        """
+    )
+
+    _query_incident_reportEntries = _query(
+        """
+        select AUTHOR, TEXT, CREATED, GENERATED from REPORT_ENTRY
+        where ID in (
+            select REPORT_ENTRY from INCIDENT__REPORT_ENTRY
+            where
+                EVENT = :eventRowID and
+                INCIDENT_NUMBER = :incidentNumber
+        )
+        order by CREATED, AUTHOR, GENERATED desc, TEXT
+        """
+    )
+
+
+    def _fetchIncidents(
+        self, event: Event, cursor: Cursor,
+        filters: str = "", parameters: Optional[Parameters] = None,
+    ) -> Iterable[Incident]:
+        """
+        Look up the incidents for the given event that match the given SQL
+        filter conditions, which may refer to the incident row as ``i``.
+
+        This runs a fixed number of queries regardless of the number of
+        incidents in the event, and then groups the joined rows by incident
+        number.
+        """
+        if filters:
+            (
+                queryIncidents, queryRangers, queryTypes, queryReportEntries
+            ) = (
+                template.format(filters=filters) for template in (
+                    self._template_incidents,
+                    self._template_incidents_rangers,
+                    self._template_incidents_types,
+                    self._template_incidents_reportEntries,
+                )
+            )
+        else:
+            queryIncidents     = self._query_incidents
+            queryRangers       = self._query_incidents_rangers
+            queryTypes         = self._query_incidents_types
+            queryReportEntries = self._query_incidents_reportEntries
+
+        params: Dict[str, ParameterValue] = dict(
+            eventRowID=self._eventRowID(event)
+        )
+        if parameters is not None:
+            params.update(parameters)
+
+        rangerHandles = self._fetchByIncidentNumber(
+            cursor, queryRangers, params, "RANGER_HANDLE"
+        )
+        incidentTypes = self._fetchByIncidentNumber(
+            cursor, queryTypes, params, "NAME"
+        )
+
+        reportEntries: Dict[int, List[ReportEntry]] = defaultdict(list)
+        for row in cursor.execute(queryReportEntries, params):
+            if row["TEXT"]:
+                reportEntries[row["INCIDENT_NUMBER"]].append(
+                    self._reportEntryFromRow(row)
+                )
+
+        return tuple(
+            self._incidentFromRow(
+                event, row,
+                rangerHandles.get(row["NUMBER"], ()),
+                incidentTypes.get(row["NUMBER"], ()),
+                reportEntries.get(row["NUMBER"], ()),
+            )
+            for row in cursor.execute(queryIncidents, params)
+        )
+
+    def _fetchByIncidentNumber(
+        self, cursor: Cursor, query: str, parameters: Parameters, column: str
+    ) -> Dict[int, List[str]]:
+        """
+        Look up the values of the given column in the rows returned by the
+        given query, grouped by the rows' ``INCIDENT_NUMBER`` column.
+        """
+        values: Dict[int, List[str]] = defaultdict(list)
+        for row in cursor.execute(query, parameters):
+            values[row["INCIDENT_NUMBER"]].append(row[column])
+        return values
+
+    _template_incidents = _query(
+        """
+        select
+            i.NUMBER as NUMBER,
+            i.CREATED as CREATED,
+            i.PRIORITY as PRIORITY,
+            i.STATE as STATE,
+            i.SUMMARY as SUMMARY,
+            i.LOCATION_NAME as LOCATION_NAME,
+            i.LOCATION_CONCENTRIC as LOCATION_CONCENTRIC,
+            i.LOCATION_RADIAL_HOUR as LOCATION_RADIAL_HOUR,
+            i.LOCATION_RADIAL_MINUTE as LOCATION_RADIAL_MINUTE,
+            i.LOCATION_DESCRIPTION as LOCATION_DESCRIPTION
+        from INCIDENT i
+        where i.EVENT = :eventRowID{filters}
+        """
+    )
+
+    _template_incidents_rangers = _query(
+        """
+        select ir.INCIDENT_NUMBER as INCIDENT_NUMBER,
+               ir.RANGER_HANDLE as RANGER_HANDLE
+        from INCIDENT__RANGER ir
+        join INCIDENT i on i.EVENT = ir.EVENT and i.NUMBER = ir.INCIDENT_NUMBER
+        where ir.EVENT = :eventRowID{filters}
+        """
+    )
+
+    _template_incidents_types = _query(
+        """
+        select iit.INCIDENT_NUMBER as INCIDENT_NUMBER, it.NAME as NAME
+        from INCIDENT__INCIDENT_TYPE iit
+        join INCIDENT_TYPE it on it.ID = iit.INCIDENT_TYPE
+        join INCIDENT i
+            on i.EVENT = iit.EVENT and i.NUMBER = iit.INCIDENT_NUMBER
+        where iit.EVENT = :eventRowID{filters}
+        """
+    )
+
+    _template_incidents_reportEntries = _query(
+        """
+        select
+            ire.INCIDENT_NUMBER as INCIDENT_NUMBER,
+            re.AUTHOR as AUTHOR,
+            re.TEXT as TEXT,
+            re.CREATED as CREATED,
+            re.GENERATED as GENERATED
+        from INCIDENT__REPORT_ENTRY ire
+        join REPORT_ENTRY re on re.ID = ire.REPORT_ENTRY
+        join INCIDENT i
+            on i.EVENT = ire.EVENT and i.NUMBER = ire.INCIDENT_NUMBER
+        where ire.EVENT = :eventRowID{filters}
+        order by re.CREATED, re.AUTHOR, re.GENERATED desc, re.TEXT
+        """
+    )
+
+    _query_incidents = _template_incidents.format(filters="")
+    _query_incidents_rangers = _template_incidents_rangers.format(filters="")
+    _query_incidents_types = _template_incidents_types.format(filters="")
+    _query_incidents_reportEntries = (
+        _template_incidents_reportEntries.format(filters="")
+    )
+
+
+    @_reads
+    async def incidents(self, event: Event) -> Iterable[Incident]:
+        """
+        See :meth:`IMSDataStore.incidents`.
+        """
+        try:
+            with self._db as db:
+                cursor = db.cursor()
+                try:
+                    return self._fetchIncidents(event, cursor)
+                finally:
+                    cursor.close()
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up incidents in {event}: {error}",
+                event=event, error=e,
+            )
+            raise StorageError(e)
+
+
+    async def iterIncidents(self, event: Event) -> AsyncIterator[Incident]:
+        """
+        See :meth:`IMSDataStore.iterIncidents`.
+
+        Incidents are read ``incidentBatchSize`` at a time, by ranges of
+        incident numbers, so that each batch is a separate read operation.
+        """
+        numbers = await self._incidentNumbers(event)
+        batchSize = self.incidentBatchSize
+
+        for index in range(0, len(numbers), batchSize):
+            batch = numbers[index:index + batchSize]
+            for incident in await self._incidentsInRange(
+                event, batch[0], batch[-1]
+            ):
+                yield incident
+
+
+    @_reads
+    async def _incidentNumbers(self, event: Event) -> Sequence[int]:
+        try:
+            return tuple(
+                row["NUMBER"] for row in self._db.execute(
+                    self._query_incidentNumbers,
+                    dict(eventRowID=self._eventRowID(event)),
+                )
+            )
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up incident numbers in {event}: {error}",
+                event=event, error=e,
+            )
+            raise StorageError(e)
+
+    _query_incidentNumbers = _query(
+        """
+        select NUMBER from INCIDENT where EVENT = :eventRowID order by NUMBER
+        """
+    )
+
+
+    @_reads
+    async def _incidentsInRange(
+        self, event: Event, first: int, last: int
+    ) -> Iterable[Incident]:
+        try:
+            with self._db as db:
+                cursor = db.cursor()
+                try:
+                    return self._fetchIncidents(
+                        event, cursor,
+                        self._filter_numberRange,
+                        dict(firstNumber=first, lastNumber=last),
+                    )
+                finally:
+                    cursor.close()
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up incidents #{first} to #{last} in {event}: "
+                "{error}",
+                first=first, last=last, event=event, error=e,
+            )
+            raise StorageError(e)
+
+    _filter_numberRange = " and i.NUMBER between :firstNumber and :lastNumber"
+
+
+    @_reads
+    async def incidentWithNumber(self, event: Event, number: int) -> Incident:
+        """
+        See :meth:`IMSDataStore.incidentWithNumber`.
+        """
+        try:
+            with self._db as db:
+                cursor = db.cursor()
+                try:
+                    return self._fetchIncident(event, number, cursor)
+                finally:
+                    cursor.close()
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up incident #{number} in {event}: {error}",
+                event=event, number=number, error=e,
+            )
+            raise StorageError(e)
+
+
+    @_reads
+    async def searchIncidents(
+        self, event: Event, query: str, limit: int = 100
+    ) -> Iterable[SearchResult]:
+        """
+        See :meth:`IMSDataStore.searchIncidents`.
+        """
+        return self._search(
+            self._query_searchIncidents,
+            dict(eventRowID=self._eventRowID(event)), query, limit,
+        )
+
+    # Ranks from different full-text indexes aren't comparable, so summary
+    # matches come first, then report entry matches, each in rank order.
+    # FTS5 ranks are negative, so 1 / (1 - rank) maps them into (0, 1) in the
+    # same order, and report entry matches add 1 to theirs.
+    _query_searchIncidents = _query(
+        """
+        select NUMBER, min(RANK) as RANK, SNIPPET from (
+            select
+                k.NUMBER as NUMBER,
+                1.0 / (1.0 - f.rank) as RANK,
+                snippet(INCIDENT_FTS, 0, '[', ']', '...', 16) as SNIPPET
+            from INCIDENT_FTS f
+            join INCIDENT_SEARCH_KEY k on k.ID = f.rowid
+            where INCIDENT_FTS match :query and k.EVENT = :eventRowID
+            union all
+            select
+                ire.INCIDENT_NUMBER as NUMBER,
+                1.0 + 1.0 / (1.0 - f.rank) as RANK,
+                snippet(REPORT_ENTRY_FTS, 0, '[', ']', '...', 16) as SNIPPET
+            from REPORT_ENTRY_FTS f
+            join INCIDENT__REPORT_ENTRY ire on ire.REPORT_ENTRY = f.rowid
+            where
+                REPORT_ENTRY_FTS match :query and
+                ire.EVENT = :eventRowID
+        )
+        group by NUMBER
+        order by RANK, NUMBER
+        limit :limit
+        """
+    )
+
+
+    def _search(
+        self, sql: str, parameters: Mapping[str, ParameterValue],
+        query: str, limit: int,
+    ) -> Iterable[SearchResult]:
+        ftsQuery = asFTSQuery(query)
+        if not ftsQuery:
+            return ()
+
+        params = dict(parameters, query=ftsQuery, limit=limit)
+
+        try:
+            return tuple(
+                SearchResult(number=row["NUMBER"], snippet=row["SNIPPET"])
+                for row in self._db.execute(sql, params)
+            )
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to search for {query}: {error}",
+                query=query, error=e,
+            )
+            raise StorageError(e)
+
+
+    @_reads
+    async def eventRevision(self, event: Event) -> int:
         """
-        See :meth:`IMSDataStore.concentricStreets`.
+        See :meth:`IMSDataStore.eventRevision`.
         """
-        return MappingProxyType(dict(
-            (row["ID"], row["NAME"]) for row in
-            self._executeAndIterate(
-                self._query_concentricStreets, dict(eventID=event.id),
-                "Unable to look up concentric streets for event {eventID}"
+        try:
+            for row in self._db.execute(
+                self._query_eventRevision,
+                dict(eventRowID=self._eventRowID(event)),
+            ):
+                return cast(int, row["REVISION"])
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up revision for {event}: {error}",
+                event=event, error=e,
             )
-        ))
+            raise StorageError(e)
 
+        return 0
 
-    _query_concentricStreets = _query(
+    _query_eventRevision = _query(
         """
-        select ID, NAME from CONCENTRIC_STREET where EVENT = ({query_eventID})
+        select coalesce(max(VERSION), 0) as REVISION from INCIDENT
+        where EVENT = :eventRowID
         """
     )
 
 
-    async def createConcentricStreet(
-        self, event: Event, id: str, name: str
-    ) -> None:
+    @_reads
+    async def incidentRevision(self, event: Event, number: int) -> int:
         """
-        See :meth:`IMSDataStore.createConcentricStreet`.
+        See :meth:`IMSDataStore.incidentRevision`.
         """
-        self._execute(
-            ((
-                self._query_createConcentricStreet,
-                dict(eventID=event.id, streetID=id, streetName=name)
-            ),),
-            "Unable to create concentric street ({streetID}){streetName} "
-            "for event {event}"
-        )
+        try:
+            for row in self._db.execute(
+                self._query_incidentRevision,
+                dict(
+                    eventRowID=self._eventRowID(event), incidentNumber=number
+                ),
+            ):
+                return cast(int, row["VERSION"])
+        except OverflowError:
+            pass
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up revision for incident #{number} in "
+                "{event}: {error}",
+                event=event, number=number, error=e,
+            )
+            raise StorageError(e)
 
-        self._log.info(
-            "Created concentric street in {event}: {streetName}",
-            storeWriteClass=Event, event=event, concentricStreetName=name,
-        )
+        raise NoSuchIncidentError(f"No incident #{number} in event {event}")
 
-    _query_createConcentricStreet = _query(
+    _query_incidentRevision = _query(
         """
-        insert into CONCENTRIC_STREET (EVENT, ID, NAME)
-        values (({query_eventID}), :streetID, :streetName)
+        select VERSION from INCIDENT
+        where EVENT = :eventRowID and NUMBER = :incidentNumber
         """
     )
 
 
-    ##
-    # Report Entries
-    ##
-
-    def detachedReportEntries(self) -> Iterable[ReportEntry]:
+    @_reads
+    async def incidentsChangedSince(
+        self, event: Event, revision: int
+    ) -> Iterable[Incident]:
         """
-        Look up all report entries that are not attached to either an incident
-        or an incident report.
-        There shouldn't be any of these; so if there are any, it's an
-        indication of a bug.
+        See :meth:`IMSDataStore.incidentsChangedSince`.
         """
         try:
             with self._db as db:
                 cursor = db.cursor()
                 try:
-                    # FIXME: This should be an async generator
-                    return tuple(
-                        ReportEntry(
-                            created=fromTimeStamp(row["CREATED"]),
-                            author=row["AUTHOR"],
-                            automatic=bool(row["GENERATED"]),
-                            text=row["TEXT"],
-                        )
-                        for row in cursor.execute(
-                            self._query_detachedReportEntries, {}
-                        ) if row["TEXT"]
+                    return self._fetchIncidents(
+                        event, cursor,
+                        self._filter_changedSince, dict(revision=revision),
                     )
                 finally:
                     cursor.close()
         except SQLiteError as e:
             self._log.critical(
-                "Unable to look up detached report entries: {error}",
-                error=e,
+                "Unable to look up incidents in {event} changed since "
+                "revision {revision}: {error}",
+                event=event, revision=revision, error=e,
             )
             raise StorageError(e)
 
-    _query_detachedReportEntries = _query(
-        """
-        select AUTHOR, TEXT, CREATED, GENERATED from REPORT_ENTRY
-        where
-            ID not in (select REPORT_ENTRY from INCIDENT__REPORT_ENTRY) and
-            ID not in (select REPORT_ENTRY from INCIDENT_REPORT__REPORT_ENTRY)
-        """
-    )
 
-
-    ###
-    # Incidents
-    ###
+    _filter_changedSince = " and i.VERSION > :revision"
 
 
-    def _fetchIncident(
-        self, event: Event, incidentNumber: int, cursor: Cursor
-    ) -> Incident:
-        params: Parameters = dict(
-            eventID=event.id, incidentNumber=incidentNumber
-        )
+    @_reads
+    async def incidentSummaries(
+        self, event: Event, changedSince: Optional[int] = None
+    ) -> Iterable[IncidentSummary]:
+        """
+        See :meth:`IMSDataStore.incidentSummaries`.
+        """
+        if changedSince is None:
+            filters = ""
+            parameters: Dict[str, ParameterValue] = {}
+        else:
+            filters = self._filter_changedSince
+            parameters = dict(revision=changedSince)
 
-        def notFound() -> None:
-            raise NoSuchIncidentError(
-                f"No incident #{incidentNumber} in event {event}"
+        try:
+            with self._db as db:
+                cursor = db.cursor()
+                try:
+                    return self._fetchIncidentSummaries(
+                        event, cursor, filters, parameters
+                    )
+                finally:
+                    cursor.close()
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up incident summaries in {event}: {error}",
+                event=event, error=e,
             )
+            raise StorageError(e)
 
-        try:
-            cursor.execute(self._query_incident, params)
-        except OverflowError:
-            notFound()
 
-        row = cursor.fetchone()
-        if row is None:
-            notFound()
+    def _fetchIncidentSummaries(
+        self, event: Event, cursor: Cursor,
+        filters: str, parameters: Parameters,
+    ) -> Iterable[IncidentSummary]:
+        """
+        Look up summaries of the incidents for the given event that match the
+        given SQL filter conditions, which may refer to the incident row as
+        ``i``.
 
-        rangerHandles = tuple(
-            row["RANGER_HANDLE"]
-            for row in cursor.execute(self._query_incident_rangers, params)
+        Report entries are not read; the summary and last modified time
+        derived from them are read from columns maintained by the store.
+        """
+        querySummaries, queryRangers, queryTypes = (
+            template.format(filters=filters) for template in (
+                self._template_incidentSummaries,
+                self._template_incidents_rangers,
+                self._template_incidents_types,
+            )
         )
 
-        incidentTypes = tuple(
-            row["NAME"]
-            for row in cursor.execute(self._query_incident_types, params)
+        params: Dict[str, ParameterValue] = dict(
+            eventRowID=self._eventRowID(event)
         )
+        params.update(parameters)
 
-        reportEntries = tuple(
-            ReportEntry(
-                created=fromTimeStamp(row["CREATED"]),
-                author=row["AUTHOR"],
-                automatic=bool(row["GENERATED"]),
-                text=row["TEXT"],
-            )
-            for row in cursor.execute(
-                self._query_incident_reportEntries, params
-            ) if row["TEXT"]
+        rangerHandles = self._fetchByIncidentNumber(
+            cursor, queryRangers, params, "RANGER_HANDLE"
+        )
+        incidentTypes = self._fetchByIncidentNumber(
+            cursor, queryTypes, params, "NAME"
         )
 
-        # FIXME: This is because schema thinks concentric is an int
-        if row["LOCATION_CONCENTRIC"] is None:
-            concentric = None
-        else:
-            concentric = str(row["LOCATION_CONCENTRIC"])
-
-        return Incident(
-            event=event,
-            number=incidentNumber,
-            created=fromTimeStamp(row["CREATED"]),
-            state=incidentStateFromID(row["STATE"]),
-            priority=priorityFromID(row["PRIORITY"]),
-            summary=row["SUMMARY"],
-            location=Location(
-                name=row["LOCATION_NAME"],
-                address=RodGarettAddress(
-                    concentric=concentric,
-                    radialHour=row["LOCATION_RADIAL_HOUR"],
-                    radialMinute=row["LOCATION_RADIAL_MINUTE"],
-                    description=row["LOCATION_DESCRIPTION"],
-                ),
-            ),
-            rangerHandles=rangerHandles,
-            incidentTypes=incidentTypes,
-            reportEntries=reportEntries,
+        return tuple(
+            self._incidentSummaryFromRow(
+                event, row,
+                rangerHandles.get(row["NUMBER"], ()),
+                incidentTypes.get(row["NUMBER"], ()),
+            )
+            for row in cursor.execute(querySummaries, params)
         )
 
-    _query_incident = _query(
+    _template_incidentSummaries = _query(
         """
         select
-            CREATED, PRIORITY, STATE, SUMMARY,
-            LOCATION_NAME,
-            LOCATION_CONCENTRIC,
-            LOCATION_RADIAL_HOUR,
-            LOCATION_RADIAL_MINUTE,
-            LOCATION_DESCRIPTION
+            i.NUMBER as NUMBER,
+            i.CREATED as CREATED,
+            i.PRIORITY as PRIORITY,
+            i.STATE as STATE,
+            i.SUMMARY as SUMMARY,
+            i.LOCATION_NAME as LOCATION_NAME,
+            i.LOCATION_CONCENTRIC as LOCATION_CONCENTRIC,
+            i.LOCATION_RADIAL_HOUR as LOCATION_RADIAL_HOUR,
+            i.LOCATION_RADIAL_MINUTE as LOCATION_RADIAL_MINUTE,
+            i.LOCATION_DESCRIPTION as LOCATION_DESCRIPTION,
+            i.DISPLAY_SUMMARY as DISPLAY_SUMMARY,
+            i.LAST_MODIFIED as LAST_MODIFIED
         from INCIDENT i
-        where EVENT = ({query_eventID}) and NUMBER = :incidentNumber
+        where i.EVENT = :eventRowID{filters}
         """
     )
 
-    _query_incident_rangers = _query(
+
+    @_reads
+    async def incidentsMatching(
+        self, event: Event,
+        states: Optional[Iterable[IncidentState]] = None,
+        priorities: Optional[Iterable[IncidentPriority]] = None,
+        incidentType: Optional[str] = None,
+        rangerHandle: Optional[str] = None,
+        createdAfter: Optional[DateTime] = None,
+        createdBefore: Optional[DateTime] = None,
+        text: Optional[str] = None,
+    ) -> Iterable[Incident]:
+        """
+        See :meth:`IMSDataStore.incidentsMatching`.
+        """
+        filters: List[str] = []
+        params: Dict[str, ParameterValue] = {}
+
+        def addIn(
+            column: str, name: str, values: Iterable[ParameterValue]
+        ) -> None:
+            names = []
+            for index, value in enumerate(values):
+                key = f"{name}{index}"
+                params[key] = value
+                names.append(f":{key}")
+
+            if names:
+                filters.append(f"i.{column} in ({', '.join(names)})")
+            else:
+                filters.append("0")
+
+        if states is not None:
+            addIn("STATE", "state", (incidentStateAsID(s) for s in states))
+
+        if priorities is not None:
+            addIn(
+                "PRIORITY", "priority", (priorityAsID(p) for p in priorities)
+            )
+
+        if incidentType is not None:
+            filters.append(self._filter_incidentType)
+            params["incidentType"] = incidentType
+
+        if rangerHandle is not None:
+            filters.append(self._filter_rangerHandle)
+            params["rangerHandle"] = rangerHandle
+
+        if createdAfter is not None:
+            filters.append("i.CREATED >= :createdAfter")
+            params["createdAfter"] = asTimeStamp(createdAfter)
+
+        if createdBefore is not None:
+            filters.append("i.CREATED < :createdBefore")
+            params["createdBefore"] = asTimeStamp(createdBefore)
+
+        if text:
+            filters.append(self._filter_text)
+            params["text"] = "%{}%".format(
+                text.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+
+        try:
+            with self._db as db:
+                cursor = db.cursor()
+                try:
+                    return self._fetchIncidents(
+                        event, cursor,
+                        "".join(f" and {f}" for f in filters), params,
+                    )
+                finally:
+                    cursor.close()
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up matching incidents in {event}: {error}",
+                event=event, error=e,
+            )
+            raise StorageError(e)
+
+    _filter_incidentType = _query(
         """
-        select RANGER_HANDLE from INCIDENT__RANGER
-        where EVENT = ({query_eventID}) and INCIDENT_NUMBER = :incidentNumber
+        exists (
+            select 1 from INCIDENT__INCIDENT_TYPE fiit
+            join INCIDENT_TYPE fit on fit.ID = fiit.INCIDENT_TYPE
+            where
+                fiit.EVENT = i.EVENT and
+                fiit.INCIDENT_NUMBER = i.NUMBER and
+                fit.NAME = :incidentType
+        )
         """
     )
 
-    _query_incident_types = _query(
+    _filter_rangerHandle = _query(
         """
-        select NAME from INCIDENT_TYPE where ID in (
-            select INCIDENT_TYPE from INCIDENT__INCIDENT_TYPE
+        exists (
+            select 1 from INCIDENT__RANGER fir
             where
-                EVENT = ({query_eventID}) and
-                INCIDENT_NUMBER = :incidentNumber
+                fir.EVENT = i.EVENT and
+                fir.INCIDENT_NUMBER = i.NUMBER and
+                fir.RANGER_HANDLE = :rangerHandle
         )
         """
     )
 
-    _query_incident_reportEntries = _query(
-        """
-        select AUTHOR, TEXT, CREATED, GENERATED from REPORT_ENTRY
-        where ID in (
-            select REPORT_ENTRY from INCIDENT__REPORT_ENTRY
-            where
-                EVENT = ({query_eventID}) and
-                INCIDENT_NUMBER = :incidentNumber
+    _filter_text = _query(
+        """
+        (
+            i.SUMMARY like :text escape '\\' or
+            i.LOCATION_NAME like :text escape '\\' or
+            i.LOCATION_DESCRIPTION like :text escape '\\' or
+            exists (
+                select 1 from INCIDENT__REPORT_ENTRY fire
+                join REPORT_ENTRY fre on fre.ID = fire.REPORT_ENTRY
+                where
+                    fire.EVENT = i.EVENT and
+                    fire.INCIDENT_NUMBER = i.NUMBER and
+                    fre.TEXT like :text escape '\\'
+            )
         )
         """
     )
 
 
-    def _fetchIncidentNumbers(
-        self, event: Event, cursor: Cursor
-    ) -> Iterable[int]:
+    def _bumpIncidentRevision(
+        self, event: Event, incidentNumber: int, cursor: Cursor
+    ) -> None:
         """
-        Look up all incident numbers for the given event.
+        Mark the given incident as modified by moving it to the next revision
+        of its event, and bring its display summary and last modified time up
+        to date.
         """
-        for row in cursor.execute(
-            self._query_incidentNumbers, dict(eventID=event.id)
-        ):
-            yield row["NUMBER"]
+        parameters = dict(
+            eventRowID=self._eventRowID(event),
+            incidentNumber=incidentNumber,
+        )
 
-    _query_incidentNumbers = _query(
+        cursor.execute(self._query_bumpIncidentRevision, parameters)
+
+        # The display summary is derived here rather than in SQL, so that it
+        # matches summaryFromReport() exactly.
+        row = cursor.execute(
+            self._query_incidentDisplayColumns, parameters
+        ).fetchone()
+        summary = row["SUMMARY"]
+        if summary:
+            displaySummary = summary
+        elif row["REPORT_TEXT"] is None:
+            displaySummary = ""
+        else:
+            displaySummary = row["REPORT_TEXT"].split("\n")[0]
+
+        cursor.execute(
+            self._query_setIncidentDisplayColumns,
+            dict(
+                parameters,
+                displaySummary=displaySummary,
+                lastModified=row["LAST_MODIFIED"],
+            ),
+        )
+
+    _query_bumpIncidentRevision = _query(
         """
-        select NUMBER from INCIDENT where EVENT = ({query_eventID})
+        update INCIDENT set VERSION = (
+            select max(VERSION) + 1 from INCIDENT
+            where EVENT = :eventRowID
+        )
+        where EVENT = :eventRowID and NUMBER = :incidentNumber
         """
     )
 
-
-    async def incidents(self, event: Event) -> Iterable[Incident]:
+    # REPORT_TEXT is the text of the first report entry that is not automatic,
+    # in the same order as Incident.summaryFromReport() sees them; it is only
+    # looked up for incidents without a summary.
+    _query_incidentDisplayColumns = _query(
         """
-        See :meth:`IMSDataStore.incidents`.
+        select
+            i.SUMMARY as SUMMARY,
+            case when i.SUMMARY is null or i.SUMMARY = '' then (
+                select re.TEXT
+                from INCIDENT__REPORT_ENTRY ire
+                join REPORT_ENTRY re on re.ID = ire.REPORT_ENTRY
+                where
+                    ire.EVENT = i.EVENT and
+                    ire.INCIDENT_NUMBER = i.NUMBER and
+                    not re.GENERATED and
+                    re.TEXT != ''
+                order by re.CREATED, re.AUTHOR, re.TEXT
+                limit 1
+            ) end as REPORT_TEXT,
+            max(
+                i.CREATED,
+                coalesce(
+                    (
+                        select max(re.CREATED)
+                        from INCIDENT__REPORT_ENTRY ire
+                        join REPORT_ENTRY re on re.ID = ire.REPORT_ENTRY
+                        where
+                            ire.EVENT = i.EVENT and
+                            ire.INCIDENT_NUMBER = i.NUMBER
+                    ),
+                    i.CREATED
+                )
+            ) as LAST_MODIFIED
+        from INCIDENT i
+        where i.EVENT = :eventRowID and i.NUMBER = :incidentNumber
         """
-        try:
-            with self._db as db:
-                cursor = db.cursor()
-                try:
-                    # FIXME: This should be an async generator
-                    return tuple(
-                        self._fetchIncident(event, number, cursor)
-                        for number in
-                        tuple(self._fetchIncidentNumbers(event, cursor))
-                    )
-                finally:
-                    cursor.close()
-        except SQLiteError as e:
-            self._log.critical(
-                "Unable to look up incidents in {event}: {error}",
-                event=event, error=e,
-            )
-            raise StorageError(e)
-
+    )
 
-    async def incidentWithNumber(self, event: Event, number: int) -> Incident:
+    _query_setIncidentDisplayColumns = _query(
         """
-        See :meth:`IMSDataStore.incidentWithNumber`.
+        update INCIDENT set
+            DISPLAY_SUMMARY = :displaySummary,
+            LAST_MODIFIED = :lastModified
+        where EVENT = :eventRowID and NUMBER = :incidentNumber
         """
-        try:
-            with self._db as db:
-                cursor = db.cursor()
-                try:
-                    return self._fetchIncident(event, number, cursor)
-                finally:
-                    cursor.close()
-        except SQLiteError as e:
-            self._log.critical(
-                "Unable to look up incident #{number} in {event}: {error}",
-                event=event, number=number, error=e,
-            )
-            raise StorageError(e)
+    )
 
 
     def _nextIncidentNumber(self, event: Event, cursor: Cursor) -> int:
         """
         Look up the next available incident number.
         """
-        cursor.execute(self._query_maxIncidentNumber, dict(eventID=event.id))
+        cursor.execute(
+            self._query_maxIncidentNumber,
+            dict(eventRowID=self._eventRowID(event)),
+        )
         number = cursor.fetchone()["max(NUMBER)"]
         if number is None:
             return 1
@@ -839,7 +2463,7 @@ class DataStore(IMSDataStore):
 
     _query_maxIncidentNumber = _query(
         """
-        select max(NUMBER) from INCIDENT where EVENT = ({query_eventID})
+        select max(NUMBER) from INCIDENT where EVENT = :eventRowID
         """
     )
 
@@ -853,7 +2477,7 @@ class DataStore(IMSDataStore):
         for rangerHandle in rangerHandles:
             cursor.execute(
                 self._query_attachRangeHandleToIncident, dict(
-                    eventID=event.id,
+                    eventRowID=self._eventRowID(event),
                     incidentNumber=incidentNumber,
                     rangerHandle=rangerHandle,
                 )
@@ -862,7 +2486,6 @@ class DataStore(IMSDataStore):
         self._log.info(
             "Attached Rangers {rangerHandles} to incident "
             "{event}#{incidentNumber}",
-            storeWriteClass=Incident,
             event=event,
             incidentNumber=incidentNumber,
             rangerHandles=rangerHandles,
@@ -871,7 +2494,7 @@ class DataStore(IMSDataStore):
     _query_attachRangeHandleToIncident = _query(
         """
         insert into INCIDENT__RANGER (EVENT, INCIDENT_NUMBER, RANGER_HANDLE)
-        values (({query_eventID}), :incidentNumber, :rangerHandle)
+        values (:eventRowID, :incidentNumber, :rangerHandle)
         """
     )
 
@@ -885,7 +2508,7 @@ class DataStore(IMSDataStore):
         for incidentType in incidentTypes:
             cursor.execute(
                 self._query_attachIncidentTypeToIncident, dict(
-                    eventID=event.id,
+                    eventRowID=self._eventRowID(event),
                     incidentNumber=incidentNumber,
                     incidentType=incidentType,
                 )
@@ -894,7 +2517,6 @@ class DataStore(IMSDataStore):
         self._log.info(
             "Attached incident types {incidentTypes} to incident "
             "{event}#{incidentNumber}",
-            storeWriteClass=Incident,
             event=event,
             incidentNumber=incidentNumber,
             incidentTypes=incidentTypes,
@@ -906,7 +2528,7 @@ class DataStore(IMSDataStore):
             EVENT, INCIDENT_NUMBER, INCIDENT_TYPE
         )
         values (
-            ({query_eventID}),
+            :eventRowID,
             :incidentNumber,
             (select ID from INCIDENT_TYPE where NAME = :incidentType)
         )
@@ -951,7 +2573,7 @@ class DataStore(IMSDataStore):
             # Join to incident
             cursor.execute(
                 self._query_attachReportEntryToIncident, dict(
-                    eventID=event.id,
+                    eventRowID=self._eventRowID(event),
                     incidentNumber=incidentNumber,
                     reportEntryID=cursor.lastrowid,
                 )
@@ -960,7 +2582,6 @@ class DataStore(IMSDataStore):
         self._log.info(
             "Attached report entries to incident {event}#{incidentNumber}: "
             "{reportEntries}",
-            storeWriteClass=Incident,
             event=event,
             incidentNumber=incidentNumber,
             reportEntries=reportEntries,
@@ -971,11 +2592,31 @@ class DataStore(IMSDataStore):
         insert into INCIDENT__REPORT_ENTRY (
             EVENT, INCIDENT_NUMBER, REPORT_ENTRY
         )
-        values (({query_eventID}), :incidentNumber, :reportEntryID)
+        values (:eventRowID, :incidentNumber, :reportEntryID)
         """
     )
 
 
+    def _checkUserReportEntries(
+        self, reportEntries: Iterable[ReportEntry], author: str
+    ) -> None:
+        """
+        Raise :exc:`ValueError` if the given report entries may not be added
+        by the given author.
+        """
+        for reportEntry in reportEntries:
+            if reportEntry.automatic:
+                raise ValueError(
+                    f"Automatic report entry {reportEntry} may not be created "
+                    f"by user {author}"
+                )
+
+            if reportEntry.author != author:
+                raise ValueError(
+                    f"Report entry {reportEntry} has author != {author}"
+                )
+
+
     def _automaticReportEntry(
         self, author: str, created: DateTime, attribute: str, value: Any
     ) -> ReportEntry:
@@ -1030,13 +2671,50 @@ class DataStore(IMSDataStore):
                             "location radial minute", address.radialMinute
                         )
 
-            if incident.rangerHandles:
-                addEntry("Rangers", ", ".join(incident.rangerHandles))
+            if incident.rangerHandles:
+                addEntry("Rangers", ", ".join(incident.rangerHandles))
+
+            if incident.incidentTypes:
+                addEntry("incident types", ", ".join(incident.incidentTypes))
+
+        return tuple(reportEntries)
+
+
+    def _incidentParameters(self, incident: Incident) -> Dict[str, Any]:
+        """
+        Look up the query parameters for the columns of an incident's row.
+        """
+        # Get normalized-to-Rod-Garett address fields
+        location = incident.location
+        address = location.address
+
+        assert address is not None
 
-            if incident.incidentTypes:
-                addEntry("incident types", ", ".join(incident.incidentTypes))
+        locationDescription = address.description
 
-        return tuple(reportEntries)
+        if isinstance(address, RodGarettAddress):
+            locationConcentric   = address.concentric
+            locationRadialHour   = address.radialHour
+            locationRadialMinute = address.radialMinute
+        else:
+            locationConcentric   = None
+            locationRadialHour   = None
+            locationRadialMinute = None
+
+        return dict(
+            incidentNumber=incident.number,
+            incidentCreated=asTimeStamp(incident.created),
+            incidentPriority=priorityAsID(incident.priority),
+            incidentState=incidentStateAsID(incident.state),
+            incidentSummary=incident.summary,
+            locationName=location.name,
+            locationConcentric=locationConcentric,
+            locationRadialHour=locationRadialHour,
+            locationRadialMinute=locationRadialMinute,
+            locationDescription=locationDescription,
+            displaySummary=incident.summaryFromReport(),
+            lastModified=asTimeStamp(incident.lastModified()),
+        )
 
 
     async def _createIncident(
@@ -1059,23 +2737,6 @@ class DataStore(IMSDataStore):
                 reportEntries=(reportEntries + incident.reportEntries)
             )
 
-        # Get normalized-to-Rod-Garett address fields
-        location = incident.location
-        address = location.address
-
-        assert address is not None
-
-        locationDescription = address.description
-
-        if isinstance(address, RodGarettAddress):
-            locationConcentric   = address.concentric
-            locationRadialHour   = address.radialHour
-            locationRadialMinute = address.radialMinute
-        else:
-            locationConcentric   = None
-            locationRadialHour   = None
-            locationRadialMinute = None
-
         try:
             with self._db as db:
                 cursor = db.cursor()
@@ -1090,17 +2751,8 @@ class DataStore(IMSDataStore):
                     # Write incident row
                     cursor.execute(
                         self._query_createIncident, dict(
-                            eventID=incident.event.id,
-                            incidentNumber=incident.number,
-                            incidentCreated=asTimeStamp(incident.created),
-                            incidentPriority=priorityAsID(incident.priority),
-                            incidentState=incidentStateAsID(incident.state),
-                            incidentSummary=incident.summary,
-                            locationName=location.name,
-                            locationConcentric=locationConcentric,
-                            locationRadialHour=locationRadialHour,
-                            locationRadialMinute=locationRadialMinute,
-                            locationDescription=locationDescription,
+                            self._incidentParameters(incident),
+                            eventRowID=self._eventRowID(incident.event),
                         )
                     )
 
@@ -1121,8 +2773,6 @@ class DataStore(IMSDataStore):
                         incident.event, incident.number,
                         incident.reportEntries, cursor,
                     )
-
-                    return incident
                 finally:
                     cursor.close()
         except SQLiteError as e:
@@ -1137,6 +2787,8 @@ class DataStore(IMSDataStore):
             storeWriteClass=Incident, incident=incident,
         )
 
+        return incident
+
 
     _query_createIncident = _query(
         """
@@ -1152,12 +2804,17 @@ class DataStore(IMSDataStore):
             LOCATION_CONCENTRIC,
             LOCATION_RADIAL_HOUR,
             LOCATION_RADIAL_MINUTE,
-            LOCATION_DESCRIPTION
+            LOCATION_DESCRIPTION,
+            DISPLAY_SUMMARY,
+            LAST_MODIFIED
         )
         values (
-            ({query_eventID}),
+            :eventRowID,
             :incidentNumber,
-            1,
+            (
+                select coalesce(max(VERSION), 0) + 1 from INCIDENT
+                where EVENT = :eventRowID
+            ),
             :incidentCreated,
             :incidentPriority,
             :incidentState,
@@ -1166,12 +2823,15 @@ class DataStore(IMSDataStore):
             :locationConcentric,
             :locationRadialHour,
             :locationRadialMinute,
-            :locationDescription
+            :locationDescription,
+            :displaySummary,
+            :lastModified
         )
         """
     )
 
 
+    @_writes
     async def createIncident(
         self, incident: Incident, author: str
     ) -> Incident:
@@ -1181,6 +2841,7 @@ class DataStore(IMSDataStore):
         return await self._createIncident(incident, author, False)
 
 
+    @_writes
     async def importIncident(self, incident: Incident) -> None:
         """
         See :meth:`IMSDataStore.importIncident`.
@@ -1201,7 +2862,7 @@ class DataStore(IMSDataStore):
                 cursor = db.cursor()
                 try:
                     cursor.execute(query, dict(
-                        eventID=event.id,
+                        eventRowID=self._eventRowID(event),
                         incidentNumber=incidentNumber,
                         column=attribute,
                         value=value,
@@ -1211,6 +2872,8 @@ class DataStore(IMSDataStore):
                     self._createAndAttachReportEntriesToIncident(
                         event, incidentNumber, (autoEntry,), cursor,
                     )
+
+                    self._bumpIncidentRevision(event, incidentNumber, cursor)
                 finally:
                     cursor.close()
         except SQLiteError as e:
@@ -1241,12 +2904,13 @@ class DataStore(IMSDataStore):
 
     _template_setIncidentAttribute = _query(
         """
-        update INCIDENT set {{column}} = :value
-        where EVENT = ({query_eventID}) and NUMBER = :incidentNumber
+        update INCIDENT set {column} = :value
+        where EVENT = :eventRowID and NUMBER = :incidentNumber
         """
     )
 
 
+    @_writes
     async def setIncident_priority(
         self, event: Event, incidentNumber: int, priority: IncidentPriority,
         author: str,
@@ -1264,6 +2928,7 @@ class DataStore(IMSDataStore):
     )
 
 
+    @_writes
     async def setIncident_state(
         self, event: Event, incidentNumber: int, state: IncidentState,
         author: str,
@@ -1281,6 +2946,7 @@ class DataStore(IMSDataStore):
     )
 
 
+    @_writes
     async def setIncident_summary(
         self, event: Event, incidentNumber: int, summary: str, author: str
     ) -> None:
@@ -1297,6 +2963,7 @@ class DataStore(IMSDataStore):
     )
 
 
+    @_writes
     async def setIncident_locationName(
         self, event: Event, incidentNumber: int, name: str, author: str
     ) -> None:
@@ -1313,6 +2980,7 @@ class DataStore(IMSDataStore):
     )
 
 
+    @_writes
     async def setIncident_locationConcentricStreet(
         self, event: Event, incidentNumber: int, streetID: str, author: str
     ) -> None:
@@ -1330,6 +2998,7 @@ class DataStore(IMSDataStore):
     )
 
 
+    @_writes
     async def setIncident_locationRadialHour(
         self, event: Event, incidentNumber: int, hour: int, author: str
     ) -> None:
@@ -1346,6 +3015,7 @@ class DataStore(IMSDataStore):
     )
 
 
+    @_writes
     async def setIncident_locationRadialMinute(
         self, event: Event, incidentNumber: int, minute: int, author: str
     ) -> None:
@@ -1362,6 +3032,7 @@ class DataStore(IMSDataStore):
     )
 
 
+    @_writes
     async def setIncident_locationDescription(
         self, event: Event, incidentNumber: int, description: str, author: str
     ) -> None:
@@ -1381,6 +3052,7 @@ class DataStore(IMSDataStore):
     )
 
 
+    @_writes
     async def setIncident_rangers(
         self, event: Event, incidentNumber: int, rangerHandles: Iterable[str],
         author: str
@@ -1400,7 +3072,10 @@ class DataStore(IMSDataStore):
                 try:
                     cursor.execute(
                         self._query_clearIncidentRangers,
-                        dict(eventID=event.id, incidentNumber=incidentNumber)
+                        dict(
+                            eventRowID=self._eventRowID(event),
+                            incidentNumber=incidentNumber,
+                        )
                     )
 
                     self._attachRangeHandlesToIncident(
@@ -1411,6 +3086,8 @@ class DataStore(IMSDataStore):
                     self._createAndAttachReportEntriesToIncident(
                         event, incidentNumber, (autoEntry,), cursor,
                     )
+
+                    self._bumpIncidentRevision(event, incidentNumber, cursor)
                 finally:
                     cursor.close()
         except SQLiteError as e:
@@ -1438,11 +3115,12 @@ class DataStore(IMSDataStore):
     _query_clearIncidentRangers = _query(
         """
         delete from INCIDENT__RANGER
-        where EVENT = ({query_eventID}) and INCIDENT_NUMBER = :incidentNumber
+        where EVENT = :eventRowID and INCIDENT_NUMBER = :incidentNumber
         """
     )
 
 
+    @_writes
     async def setIncident_incidentTypes(
         self, event: Event, incidentNumber: int, incidentTypes: Iterable[str],
         author: str
@@ -1462,7 +3140,10 @@ class DataStore(IMSDataStore):
                 try:
                     cursor.execute(
                         self._query_clearIncidentIncidentTypes,
-                        dict(eventID=event.id, incidentNumber=incidentNumber)
+                        dict(
+                            eventRowID=self._eventRowID(event),
+                            incidentNumber=incidentNumber,
+                        )
                     )
 
                     self._attachIncidentTypesToIncident(
@@ -1473,6 +3154,8 @@ class DataStore(IMSDataStore):
                     self._createAndAttachReportEntriesToIncident(
                         event, incidentNumber, (autoEntry,), cursor,
                     )
+
+                    self._bumpIncidentRevision(event, incidentNumber, cursor)
                 finally:
                     cursor.close()
         except SQLiteError as e:
@@ -1501,11 +3184,12 @@ class DataStore(IMSDataStore):
     _query_clearIncidentIncidentTypes = _query(
         """
         delete from INCIDENT__INCIDENT_TYPE
-        where EVENT = ({query_eventID}) and INCIDENT_NUMBER = :incidentNumber
+        where EVENT = :eventRowID and INCIDENT_NUMBER = :incidentNumber
         """
     )
 
 
+    @_writes
     async def addReportEntriesToIncident(
         self, event: Event, incidentNumber: int,
         reportEntries: Iterable[ReportEntry], author: str,
@@ -1515,17 +3199,7 @@ class DataStore(IMSDataStore):
         """
         reportEntries = tuple(reportEntries)
 
-        for reportEntry in reportEntries:
-            if reportEntry.automatic:
-                raise ValueError(
-                    f"Automatic report entry {reportEntry} may not be created "
-                    f"by user {author}"
-                )
-
-            if reportEntry.author != author:
-                raise ValueError(
-                    f"Report entry {reportEntry} has author != {author}"
-                )
+        self._checkUserReportEntries(reportEntries, author)
 
         try:
             with self._db as db:
@@ -1534,6 +3208,8 @@ class DataStore(IMSDataStore):
                     self._createAndAttachReportEntriesToIncident(
                         event, incidentNumber, reportEntries, cursor
                     )
+
+                    self._bumpIncidentRevision(event, incidentNumber, cursor)
                 finally:
                     cursor.close()
         except SQLiteError as e:
@@ -1549,12 +3225,192 @@ class DataStore(IMSDataStore):
             )
             raise StorageError(e)
 
+        self._log.info(
+            "{author} added report entries to incident "
+            "{event}#{incidentNumber}: {reportEntries}",
+            storeWriteClass=Incident,
+            author=author,
+            event=event,
+            incidentNumber=incidentNumber,
+            reportEntries=reportEntries,
+        )
+
+
+    # Incident columns which may be edited by applyIncidentEdits, keyed by
+    # edit name, with the attribute name used in automatic report entries and
+    # a function to convert the edited value into a column value.
+    _incidentEditColumns: Mapping[
+        str, Tuple[str, str, Callable[[Any], ParameterValue]]
+    ] = MappingProxyType(dict(
+        priority=(
+            "PRIORITY", "priority", lambda value: priorityAsID(value)
+        ),
+        state=("STATE", "state", lambda value: incidentStateAsID(value)),
+        summary=("SUMMARY", "summary", lambda value: value),
+        locationName=("LOCATION_NAME", "location name", lambda value: value),
+        locationConcentricStreet=(
+            "LOCATION_CONCENTRIC", "location concentric street",
+            lambda value: value,
+        ),
+        locationRadialHour=(
+            "LOCATION_RADIAL_HOUR", "location radial hour",
+            lambda value: value,
+        ),
+        locationRadialMinute=(
+            "LOCATION_RADIAL_MINUTE", "location radial minute",
+            lambda value: value,
+        ),
+        locationDescription=(
+            "LOCATION_DESCRIPTION", "location description",
+            lambda value: value,
+        ),
+    ))
+
+
+    @_writes
+    async def applyIncidentEdits(
+        self, event: Event, incidentNumber: int, edits: Mapping[str, Any],
+        author: str,
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.applyIncidentEdits`.
+        """
+        unknown = (
+            frozenset(edits) - frozenset(self._incidentEditColumns) -
+            frozenset(("rangers", "incidentTypes", "reportEntries"))
+        )
+        if unknown:
+            raise ValueError(
+                f"Unknown incident edits: {', '.join(sorted(unknown))}"
+            )
+
+        columns: Dict[str, ParameterValue] = {}
+        changes: List[Tuple[str, Any]] = []
+
+        for name, (column, attribute, asValue) in (
+            self._incidentEditColumns.items()
+        ):
+            if name in edits:
+                value = asValue(edits[name])
+                columns[column] = value
+                changes.append((attribute, value))
+
+        rangerHandles: Optional[FrozenSet[str]] = None
+        if "rangers" in edits:
+            rangerHandles = frozenset(edits["rangers"])
+            changes.append(("Rangers", ", ".join(rangerHandles)))
+
+        incidentTypes: Optional[FrozenSet[str]] = None
+        if "incidentTypes" in edits:
+            incidentTypes = frozenset(edits["incidentTypes"])
+            changes.append(("incident types", ", ".join(incidentTypes)))
+
+        reportEntries = tuple(edits.get("reportEntries", ()))
+        self._checkUserReportEntries(reportEntries, author)
+
+        if not (changes or reportEntries):
+            return
+
+        if changes:
+            # One automatic report entry covers all of the changes
+            reportEntries = (
+                ReportEntry(
+                    text="\n".join(
+                        f"Changed {attribute} to: {value}"
+                        for attribute, value in changes
+                    ),
+                    author=author, created=now(), automatic=True,
+                ),
+            ) + reportEntries
+
+        parameters = dict(
+            eventRowID=self._eventRowID(event), incidentNumber=incidentNumber
+        )
+
+        try:
+            with self._db as db:
+                cursor = db.cursor()
+                try:
+                    if columns:
+                        cursor.execute(
+                            self._template_setIncidentAttributes.format(
+                                assignments=", ".join(
+                                    f"{column} = :{column}"
+                                    for column in columns
+                                )
+                            ),
+                            dict(parameters, **columns),
+                        )
+
+                    if rangerHandles is not None:
+                        cursor.execute(
+                            self._query_clearIncidentRangers, parameters
+                        )
+                        self._attachRangeHandlesToIncident(
+                            event, incidentNumber, rangerHandles, cursor
+                        )
+
+                    if incidentTypes is not None:
+                        cursor.execute(
+                            self._query_clearIncidentIncidentTypes, parameters
+                        )
+                        self._attachIncidentTypesToIncident(
+                            event, incidentNumber, incidentTypes, cursor
+                        )
+
+                    self._createAndAttachReportEntriesToIncident(
+                        event, incidentNumber, reportEntries, cursor
+                    )
+
+                    self._bumpIncidentRevision(event, incidentNumber, cursor)
+                finally:
+                    cursor.close()
+        except SQLiteError as e:
+            self._log.critical(
+                "Author {author} unable to edit incident #{incidentNumber} in "
+                "event {event} ({edits}): {error}",
+                author=author,
+                incidentNumber=incidentNumber,
+                event=event,
+                edits=edits,
+                error=e,
+            )
+            raise StorageError(e)
+
+        self._log.info(
+            "{author} edited incident {event}#{incidentNumber}: {edits}",
+            storeWriteClass=Incident,
+            author=author,
+            event=event,
+            incidentNumber=incidentNumber,
+            edits=edits,
+        )
+
+    _template_setIncidentAttributes = _query(
+        """
+        update INCIDENT set {assignments}
+        where EVENT = :eventRowID and NUMBER = :incidentNumber
+        """
+    )
+
 
     ###
     # Incident Reports
     ###
 
 
+    def _incidentReportFromRow(
+        self, row: Row, reportEntries: Iterable[ReportEntry]
+    ) -> IncidentReport:
+        return trusted(
+            IncidentReport,
+            number=row["NUMBER"],
+            created=fromTimeStamp(row["CREATED"]),
+            summary=row["SUMMARY"],
+            reportEntries=tuple(reportEntries),
+        )
+
+
     def _fetchIncidentReport(
         self, incidentReportNumber: int, cursor: Cursor
     ) -> IncidentReport:
@@ -1574,29 +3430,18 @@ class DataStore(IMSDataStore):
         if row is None:
             notFound()
 
-
         reportEntries = tuple(
-            ReportEntry(
-                created=fromTimeStamp(row["CREATED"]),
-                author=row["AUTHOR"],
-                automatic=bool(row["GENERATED"]),
-                text=row["TEXT"],
-            )
+            self._reportEntryFromRow(row)
             for row in cursor.execute(
                 self._query_incidentReport_reportEntries, params
-            )
+            ) if row["TEXT"]
         )
 
-        return IncidentReport(
-            number=incidentReportNumber,
-            created=fromTimeStamp(row["CREATED"]),
-            summary=row["SUMMARY"],
-            reportEntries=reportEntries,
-        )
+        return self._incidentReportFromRow(row, reportEntries)
 
     _query_incidentReport = _query(
         """
-        select CREATED, SUMMARY from INCIDENT_REPORT
+        select NUMBER, CREATED, SUMMARY from INCIDENT_REPORT
         where NUMBER = :incidentReportNumber
         """
     )
@@ -1608,24 +3453,65 @@ class DataStore(IMSDataStore):
             select REPORT_ENTRY from INCIDENT_REPORT__REPORT_ENTRY
             where INCIDENT_REPORT_NUMBER = :incidentReportNumber
         )
+        order by CREATED, AUTHOR, GENERATED desc, TEXT
         """
     )
 
 
-    def _fetchIncidentReportNumbers(self, cursor: Cursor) -> Iterable[int]:
-        return (
-            row["NUMBER"] for row in cursor.execute(
-                self._query_incidentReportNumbers, {}
+    def _fetchIncidentReports(
+        self, reportsQuery: str, reportEntriesQuery: str,
+        params: Parameters, cursor: Cursor,
+    ) -> Iterable[IncidentReport]:
+        """
+        Look up the incident reports selected by the given pair of queries.
+
+        ``reportsQuery`` selects the incident report rows and
+        ``reportEntriesQuery`` selects the report entries for the same set of
+        incident reports, keyed by ``INCIDENT_REPORT_NUMBER``.
+        """
+        reportEntries: Dict[int, List[ReportEntry]] = defaultdict(list)
+        for row in cursor.execute(reportEntriesQuery, params):
+            if row["TEXT"]:
+                reportEntries[row["INCIDENT_REPORT_NUMBER"]].append(
+                    self._reportEntryFromRow(row)
+                )
+
+        return tuple(
+            self._incidentReportFromRow(
+                row, reportEntries.get(row["NUMBER"], ())
             )
+            for row in cursor.execute(reportsQuery, params)
         )
 
-    _query_incidentReportNumbers = _query(
+    _query_incidentReports = _query(
+        """
+        select NUMBER, CREATED, SUMMARY from INCIDENT_REPORT
+        """
+    )
+
+    _query_incidentReports_reportEntries = _query(
         """
-        select NUMBER from INCIDENT_REPORT
+        select
+            irre.INCIDENT_REPORT_NUMBER as INCIDENT_REPORT_NUMBER,
+            re.AUTHOR as AUTHOR,
+            re.TEXT as TEXT,
+            re.CREATED as CREATED,
+            re.GENERATED as GENERATED
+        from INCIDENT_REPORT__REPORT_ENTRY irre
+        join REPORT_ENTRY re on re.ID = irre.REPORT_ENTRY
+        order by re.CREATED, re.AUTHOR, re.GENERATED desc, re.TEXT
         """
     )
 
 
+    async def incidentReportsRevision(self) -> int:
+        """
+        See :meth:`IMSDataStore.incidentReportsRevision`.
+        """
+        return self._state.incidentReportsRevision
+
+
+    @_reads
     async def incidentReports(self) -> Iterable[IncidentReport]:
         """
         See :meth:`IMSDataStore.incidentReports`.
@@ -1635,10 +3521,10 @@ class DataStore(IMSDataStore):
                 cursor = db.cursor()
                 try:
                     # FIXME: This should be an async generator
-                    return tuple(
-                        self._fetchIncidentReport(number, cursor)
-                        for number
-                        in tuple(self._fetchIncidentReportNumbers(cursor))
+                    return self._fetchIncidentReports(
+                        self._query_incidentReports,
+                        self._query_incidentReports_reportEntries,
+                        {}, cursor,
                     )
                 finally:
                     cursor.close()
@@ -1649,6 +3535,45 @@ class DataStore(IMSDataStore):
             raise StorageError(e)
 
 
+    @_reads
+    async def searchIncidentReports(
+        self, query: str, limit: int = 100
+    ) -> Iterable[SearchResult]:
+        """
+        See :meth:`IMSDataStore.searchIncidentReports`.
+        """
+        return self._search(
+            self._query_searchIncidentReports, {}, query, limit
+        )
+
+    # As for _query_searchIncidents, summary matches come first.
+    _query_searchIncidentReports = _query(
+        """
+        select NUMBER, min(RANK) as RANK, SNIPPET from (
+            select
+                f.rowid as NUMBER,
+                1.0 / (1.0 - f.rank) as RANK,
+                snippet(INCIDENT_REPORT_FTS, 0, '[', ']', '...', 16) as SNIPPET
+            from INCIDENT_REPORT_FTS f
+            where INCIDENT_REPORT_FTS match :query
+            union all
+            select
+                irre.INCIDENT_REPORT_NUMBER as NUMBER,
+                1.0 + 1.0 / (1.0 - f.rank) as RANK,
+                snippet(REPORT_ENTRY_FTS, 0, '[', ']', '...', 16) as SNIPPET
+            from REPORT_ENTRY_FTS f
+            join INCIDENT_REPORT__REPORT_ENTRY irre
+                on irre.REPORT_ENTRY = f.rowid
+            where REPORT_ENTRY_FTS match :query
+        )
+        group by NUMBER
+        order by RANK, NUMBER
+        limit :limit
+        """
+    )
+
+
+    @_reads
     async def incidentReportWithNumber(self, number: int) -> IncidentReport:
         """
         See :meth:`IMSDataStore.incidentReportWithNumber`.
@@ -1792,13 +3717,18 @@ class DataStore(IMSDataStore):
     )
 
 
+    @_writes
     async def createIncidentReport(
         self, incidentReport: IncidentReport, author: str
     ) -> IncidentReport:
         """
         See :meth:`IMSDataStore.createIncidentReport`.
         """
-        return await self._createIncidentReport(incidentReport, author, False)
+        incidentReport = await self._createIncidentReport(
+            incidentReport, author, False
+        )
+        self._state.incidentReportsRevision += 1
+        return incidentReport
 
 
     def _setIncidentReportAttribute(
@@ -1851,12 +3781,13 @@ class DataStore(IMSDataStore):
 
     _template_setIncidentReportAttribute = _query(
         """
-        update INCIDENT_REPORT set {{column}} = :value
+        update INCIDENT_REPORT set {column} = :value
         where NUMBER = :incidentReportNumber
         """
     )
 
 
+    @_writes
     async def setIncidentReport_summary(
         self, incidentReportNumber: int, summary: str, author: str
     ) -> None:
@@ -1867,12 +3798,14 @@ class DataStore(IMSDataStore):
             self._query_setIncidentReport_summary,
             incidentReportNumber, "summary", summary, author,
         )
+        self._state.incidentReportsRevision += 1
 
     _query_setIncidentReport_summary = (
         _template_setIncidentReportAttribute.format(column="SUMMARY")
     )
 
 
+    @_writes
     async def addReportEntriesToIncidentReport(
         self, incidentReportNumber: int, reportEntries: Iterable[ReportEntry],
         author: str,
@@ -1882,17 +3815,7 @@ class DataStore(IMSDataStore):
         """
         reportEntries = tuple(reportEntries)
 
-        for reportEntry in reportEntries:
-            if reportEntry.automatic:
-                raise ValueError(
-                    f"Automatic report entry {reportEntry} may not be created "
-                    f"by user {author}"
-                )
-
-            if reportEntry.author != author:
-                raise ValueError(
-                    f"Report entry {reportEntry} has author != {author}"
-                )
+        self._checkUserReportEntries(reportEntries, author)
 
         try:
             with self._db as db:
@@ -1915,54 +3838,77 @@ class DataStore(IMSDataStore):
             )
             raise StorageError(e)
 
+        self._state.incidentReportsRevision += 1
+
 
     ###
     # Incident to Incident Report Relationships
     ###
 
 
-    def _fetchDetachedIncidentReportNumbers(
-        self, cursor: Cursor
-    ) -> Iterable[int]:
-        return (
-            row["NUMBER"] for row in cursor.execute(
-                self._query_detachedIncidentReportNumbers, {}
-            )
+    _query_detachedIncidentReports = _query(
+        """
+        select ir.NUMBER, ir.CREATED, ir.SUMMARY from INCIDENT_REPORT ir
+        where not exists (
+            select 1 from INCIDENT__INCIDENT_REPORT iir
+            where iir.INCIDENT_REPORT_NUMBER = ir.NUMBER
         )
+        """
+    )
 
-    _query_detachedIncidentReportNumbers = _query(
+    _query_detachedIncidentReports_reportEntries = _query(
         """
-        select NUMBER from INCIDENT_REPORT
-        where NUMBER not in (
-            select INCIDENT_REPORT_NUMBER from INCIDENT__INCIDENT_REPORT
+        select
+            irre.INCIDENT_REPORT_NUMBER as INCIDENT_REPORT_NUMBER,
+            re.AUTHOR as AUTHOR,
+            re.TEXT as TEXT,
+            re.CREATED as CREATED,
+            re.GENERATED as GENERATED
+        from INCIDENT_REPORT__REPORT_ENTRY irre
+        join REPORT_ENTRY re on re.ID = irre.REPORT_ENTRY
+        where not exists (
+            select 1 from INCIDENT__INCIDENT_REPORT iir
+            where iir.INCIDENT_REPORT_NUMBER = irre.INCIDENT_REPORT_NUMBER
         )
+        order by re.CREATED, re.AUTHOR, re.GENERATED desc, re.TEXT
         """
     )
 
 
-    def _fetchAttachedIncidentReportNumbers(
-        self, event: Event, incidentNumber: int, cursor: Cursor
-    ) -> Iterable[int]:
-        return (
-            row["NUMBER"] for row in cursor.execute(
-                self._query_attachedIncidentReportNumbers,
-                dict(eventID=event.id, incidentNumber=incidentNumber)
-            )
+    _query_attachedIncidentReports = _query(
+        """
+        select NUMBER, CREATED, SUMMARY from INCIDENT_REPORT
+        where NUMBER in (
+            select INCIDENT_REPORT_NUMBER from INCIDENT__INCIDENT_REPORT
+            where
+                EVENT = :eventRowID and
+                INCIDENT_NUMBER = :incidentNumber
         )
+        """
+    )
 
-    _query_attachedIncidentReportNumbers = _query(
+    _query_attachedIncidentReports_reportEntries = _query(
         """
-        select NUMBER from INCIDENT_REPORT
-        where NUMBER in (
+        select
+            irre.INCIDENT_REPORT_NUMBER as INCIDENT_REPORT_NUMBER,
+            re.AUTHOR as AUTHOR,
+            re.TEXT as TEXT,
+            re.CREATED as CREATED,
+            re.GENERATED as GENERATED
+        from INCIDENT_REPORT__REPORT_ENTRY irre
+        join REPORT_ENTRY re on re.ID = irre.REPORT_ENTRY
+        where irre.INCIDENT_REPORT_NUMBER in (
             select INCIDENT_REPORT_NUMBER from INCIDENT__INCIDENT_REPORT
             where
-                EVENT = ({query_eventID}) and
+                EVENT = :eventRowID and
                 INCIDENT_NUMBER = :incidentNumber
         )
+        order by re.CREATED, re.AUTHOR, re.GENERATED desc, re.TEXT
         """
     )
 
 
+    @_reads
     async def detachedIncidentReports(self) -> Iterable[IncidentReport]:
         """
         See :meth:`IMSDataStore.detachedIncidentReports`.
@@ -1972,11 +3918,10 @@ class DataStore(IMSDataStore):
                 cursor = db.cursor()
                 try:
                     # FIXME: This should be an async generator
-                    return tuple(
-                        self._fetchIncidentReport(number, cursor)
-                        for number in tuple(
-                            self._fetchDetachedIncidentReportNumbers(cursor)
-                        )
+                    return self._fetchIncidentReports(
+                        self._query_detachedIncidentReports,
+                        self._query_detachedIncidentReports_reportEntries,
+                        {}, cursor,
                     )
                 finally:
                     cursor.close()
@@ -1988,6 +3933,7 @@ class DataStore(IMSDataStore):
             raise StorageError(e)
 
 
+    @_reads
     async def incidentReportsAttachedToIncident(
         self, event: Event, incidentNumber: int
     ) -> Iterable[IncidentReport]:
@@ -1999,13 +3945,14 @@ class DataStore(IMSDataStore):
                 cursor = db.cursor()
                 try:
                     # FIXME: This should be an async generator
-                    return tuple(
-                        self._fetchIncidentReport(number, cursor)
-                        for number in tuple(
-                            self._fetchAttachedIncidentReportNumbers(
-                                event, incidentNumber, cursor
-                            )
-                        )
+                    return self._fetchIncidentReports(
+                        self._query_attachedIncidentReports,
+                        self._query_attachedIncidentReports_reportEntries,
+                        dict(
+                            eventRowID=self._eventRowID(event),
+                            incidentNumber=incidentNumber,
+                        ),
+                        cursor,
                     )
                 finally:
                     cursor.close()
@@ -2020,6 +3967,7 @@ class DataStore(IMSDataStore):
             raise StorageError(e)
 
 
+    @_reads
     async def incidentsAttachedToIncidentReport(
         self, incidentReportNumber: int
     ) -> Iterable[Tuple[Event, int]]:
@@ -2059,6 +4007,7 @@ class DataStore(IMSDataStore):
     )
 
 
+    @_writes
     async def attachIncidentReportToIncident(
         self, incidentReportNumber: int, event: Event, incidentNumber: int
     ) -> None:
@@ -2071,7 +4020,7 @@ class DataStore(IMSDataStore):
                 try:
                     cursor.execute(
                         self._query_attachIncidentReportToIncident, dict(
-                            eventID=event.id,
+                            eventRowID=self._eventRowID(event),
                             incidentNumber=incidentNumber,
                             incidentReportNumber=incidentReportNumber,
                         )
@@ -2089,6 +4038,8 @@ class DataStore(IMSDataStore):
             )
             raise StorageError(e)
 
+        self._state.incidentReportsRevision += 1
+
         self._log.info(
             "Attached incident report #{incidentReportNumber} to incident "
             "{event}#{incidentNumber}",
@@ -2103,11 +4054,12 @@ class DataStore(IMSDataStore):
         insert into INCIDENT__INCIDENT_REPORT (
             EVENT, INCIDENT_NUMBER, INCIDENT_REPORT_NUMBER
         )
-        values (({query_eventID}), :incidentNumber, :incidentReportNumber)
+        values (:eventRowID, :incidentNumber, :incidentReportNumber)
         """
     )
 
 
+    @_writes
     async def detachIncidentReportFromIncident(
         self, incidentReportNumber: int, event: Event, incidentNumber: int
     ) -> None:
@@ -2120,7 +4072,7 @@ class DataStore(IMSDataStore):
                 try:
                     cursor.execute(
                         self._query_detachIncidentReportFromIncident, dict(
-                            eventID=event.id,
+                            eventRowID=self._eventRowID(event),
                             incidentNumber=incidentNumber,
                             incidentReportNumber=incidentReportNumber,
                         )
@@ -2138,6 +4090,8 @@ class DataStore(IMSDataStore):
             )
             raise StorageError(e)
 
+        self._state.incidentReportsRevision += 1
+
         self._log.info(
             "Detached incident report #{incidentReportNumber} from incident "
             "{event}#{incidentNumber}",
@@ -2151,13 +4105,106 @@ class DataStore(IMSDataStore):
         """
         delete from INCIDENT__INCIDENT_REPORT
         where
-            EVENT = ({query_eventID}) and
+            EVENT = :eventRowID and
             INCIDENT_NUMBER = :incidentNumber and
             INCIDENT_REPORT_NUMBER = :incidentReportNumber
         """
     )
 
 
+    ###
+    # Change Notifications
+    ###
+
+
+    @_reads
+    async def changeNotifications(
+        self, limit: int
+    ) -> Sequence[ChangeNotification]:
+        """
+        See :meth:`IMSDataStore.changeNotifications`.
+        """
+        try:
+            rows = self._db.execute(
+                self._query_changeNotifications, dict(limit=limit)
+            ).fetchall()
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to look up change notifications: {error}", error=e
+            )
+            raise StorageError(e)
+
+        return tuple(
+            ChangeNotification(
+                number=row["NUMBER"],
+                eventID=row["EVENT"],
+                incidentNumber=row["INCIDENT_NUMBER"],
+                eventClass=row["CLASS"],
+                message=row["MESSAGE"],
+            )
+            for row in rows
+        )
+
+    # Notifications are numbered consecutively, so the latest are those within
+    # the limit of the highest number.
+    _query_changeNotifications = _query(
+        """
+        select NUMBER, EVENT, INCIDENT_NUMBER, CLASS, MESSAGE
+        from CHANGE_NOTIFICATION
+        where NUMBER > (select max(NUMBER) from CHANGE_NOTIFICATION) - :limit
+        order by NUMBER
+        """
+    )
+
+
+    @_writes
+    async def addChangeNotification(
+        self, notification: ChangeNotification, keep: int
+    ) -> None:
+        """
+        See :meth:`IMSDataStore.addChangeNotification`.
+        """
+        # Not logged with storeWriteClass, as change notifications are stored
+        # in response to those log events.
+        try:
+            with self._db as db:
+                db.execute(
+                    self._query_recordChangeNotification, dict(
+                        number=notification.number,
+                        eventID=notification.eventID,
+                        incidentNumber=notification.incidentNumber,
+                        eventClass=notification.eventClass,
+                        message=notification.message,
+                    )
+                )
+                db.execute(
+                    self._query_trimChangeNotifications,
+                    dict(number=notification.number - keep),
+                )
+        except SQLiteError as e:
+            self._log.critical(
+                "Unable to store change notification {notification}: "
+                "{error}",
+                notification=notification, error=e,
+            )
+            raise StorageError(e)
+
+    _query_recordChangeNotification = _query(
+        """
+        insert or replace into CHANGE_NOTIFICATION (
+            NUMBER, EVENT, INCIDENT_NUMBER, CLASS, MESSAGE
+        )
+        values (:number, :eventID, :incidentNumber, :eventClass, :message)
+        """
+    )
+
+    _query_trimChangeNotifications = _query(
+        """
+        delete from CHANGE_NOTIFICATION where NUMBER <= :number
+        """
+    )
+
+
 
 zeroTimeDelta = TimeDelta(0)
 
@@ -2216,3 +4263,16 @@ def priorityAsID(priority: IncidentPriority) -> int:
         IncidentPriority.normal: 3,
         IncidentPriority.low:    4,
     }[priority]
+
+
+def asFTSQuery(text: str) -> str:
+    """
+    Convert search text into an FTS5 query which matches all of the words in
+    the text, treating the last word as a prefix.
+    """
+    words = [
+        '"{}"'.format(word.replace('"', '""')) for word in text.split()
+    ]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
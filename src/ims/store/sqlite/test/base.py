@@ -58,6 +58,11 @@ class TestDataStore(DataStore):
         return cast(property, DataStore._db).fget(self)
 
 
+    async def _yieldToReactor(self) -> None:
+        # Tests don't run the reactor
+        pass
+
+
     def bringThePain(self) -> None:
         setattr(self._state, "broken", True)
         assert getattr(self._state, "broken")
@@ -245,6 +250,32 @@ class DataStoreTests(TestCase):
                 )
             )
 
+        # Columns maintained by the store, which older schemas don't have
+        columns = frozenset(
+            row["NAME"] for row in cursor.execute(
+                "select NAME from pragma_table_info('INCIDENT')"
+            )
+        )
+        if "DISPLAY_SUMMARY" in columns:
+            cursor.execute(
+                dedent(
+                    """
+                    update INCIDENT set
+                        DISPLAY_SUMMARY = :displaySummary,
+                        LAST_MODIFIED = :lastModified
+                    where
+                        EVENT = (select ID from EVENT where NAME = :eventID)
+                        and NUMBER = :incidentNumber
+                    """
+                ),
+                dict(
+                    eventID=incident.event.id,
+                    incidentNumber=incident.number,
+                    displaySummary=incident.summaryFromReport(),
+                    lastModified=asTimeStamp(incident.lastModified()),
+                )
+            )
+
 
     def storeIncidentReport(
         self, store: DataStore, incidentReport: IncidentReport
@@ -23,13 +23,29 @@ from datetime import (
 )
 from io import StringIO
 from pathlib import Path
+from queue import Queue
+from re import compile as re_compile
 from textwrap import dedent
-from typing import Dict, Optional, Set
+from threading import (
+    Barrier, Event as ThreadEvent, Lock, Thread, current_thread
+)
+from time import sleep
+from typing import (
+    Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+)
 
 from hypothesis import given
 from hypothesis.strategies import integers
 
-from ims.ext.sqlite import Connection, SQLiteError, createDB, printSchema
+import twisted.internet.reactor
+from twisted.internet.defer import Deferred, ensureDeferred, gatherResults
+
+from ims.ext.sqlite import (
+    Connection, SQLiteError, createDB, explainQueryPlans, printSchema
+)
+from ims.model import (
+    Event, Incident, IncidentPriority, IncidentState, Location, ReportEntry
+)
 
 from .base import DataStoreTests
 from .. import _store
@@ -42,6 +58,8 @@ Dict, Set  # silence linter
 __all__ = ()
 
 
+fullScan = re_compile(r"SCAN (?:TABLE )?(\S+)")
+
 
 class DataStoreCoreTests(DataStoreTests):
     """
@@ -71,9 +89,15 @@ class DataStoreCoreTests(DataStoreTests):
             schemaInfo,
             dedent(
                 """
-                Version: 2
+                Version: 7
                 ACCESS_MODE:
                   0: ID(text) not null *1
+                CHANGE_NOTIFICATION:
+                  0: NUMBER(integer) not null *1
+                  1: EVENT(text)
+                  2: INCIDENT_NUMBER(integer)
+                  3: CLASS(text) not null
+                  4: MESSAGE(text) not null
                 CONCENTRIC_STREET:
                   0: EVENT(integer) not null *1
                   1: ID(text) not null *2
@@ -98,13 +122,52 @@ class DataStoreCoreTests(DataStoreTests):
                   9: LOCATION_RADIAL_HOUR(integer)
                   10: LOCATION_RADIAL_MINUTE(integer)
                   11: LOCATION_DESCRIPTION(text)
+                  12: DISPLAY_SUMMARY(text) not null ['']
+                  13: LAST_MODIFIED(real) not null [0]
+                INCIDENT_FTS:
+                  0: SUMMARY()
+                INCIDENT_FTS_config:
+                  0: k() not null *1
+                  1: v()
+                INCIDENT_FTS_content:
+                  0: id(INTEGER) *1
+                  1: c0()
+                INCIDENT_FTS_data:
+                  0: id(INTEGER) *1
+                  1: block(BLOB)
+                INCIDENT_FTS_docsize:
+                  0: id(INTEGER) *1
+                  1: sz(BLOB)
+                INCIDENT_FTS_idx:
+                  0: segid() not null *1
+                  1: term() not null *2
+                  2: pgno()
                 INCIDENT_REPORT:
                   0: NUMBER(integer) not null *1
                   1: CREATED(real) not null
                   2: SUMMARY(text)
+                INCIDENT_REPORT_FTS:
+                  0: SUMMARY()
+                INCIDENT_REPORT_FTS_config:
+                  0: k() not null *1
+                  1: v()
+                INCIDENT_REPORT_FTS_data:
+                  0: id(INTEGER) *1
+                  1: block(BLOB)
+                INCIDENT_REPORT_FTS_docsize:
+                  0: id(INTEGER) *1
+                  1: sz(BLOB)
+                INCIDENT_REPORT_FTS_idx:
+                  0: segid() not null *1
+                  1: term() not null *2
+                  2: pgno()
                 INCIDENT_REPORT__REPORT_ENTRY:
                   0: INCIDENT_REPORT_NUMBER(integer) not null *1
                   1: REPORT_ENTRY(integer) not null *2
+                INCIDENT_SEARCH_KEY:
+                  0: ID(integer) not null *1
+                  1: EVENT(integer) not null
+                  2: NUMBER(integer) not null
                 INCIDENT_STATE:
                   0: ID(text) not null *1
                 INCIDENT_TYPE:
@@ -133,8 +196,31 @@ class DataStoreCoreTests(DataStoreTests):
                   2: TEXT(text) not null
                   3: CREATED(real) not null
                   4: GENERATED(numeric) not null
+                REPORT_ENTRY_FTS:
+                  0: TEXT()
+                REPORT_ENTRY_FTS_config:
+                  0: k() not null *1
+                  1: v()
+                REPORT_ENTRY_FTS_data:
+                  0: id(INTEGER) *1
+                  1: block(BLOB)
+                REPORT_ENTRY_FTS_docsize:
+                  0: id(INTEGER) *1
+                  1: sz(BLOB)
+                REPORT_ENTRY_FTS_idx:
+                  0: segid() not null *1
+                  1: term() not null *2
+                  2: pgno()
                 SCHEMA_INFO:
                   0: VERSION(integer) not null
+                VALIDATION_CHECKPOINT:
+                  0: REPORT_ENTRY(integer) not null
+                  1: CLEAN(numeric) not null
+                VALIDATION_LOG:
+                  0: STARTED(real) not null
+                  1: DURATION(real) not null
+                  2: SCOPE(text) not null
+                  3: VALID(numeric) not null
                 """[1:]
             )
         )
@@ -153,19 +239,83 @@ class DataStoreCoreTests(DataStoreTests):
             "addEventAccess:\n\n"
             "  -- query --\n\n"
             "    insert into EVENT_ACCESS (EVENT, EXPRESSION, MODE)\n"
-            "    values ((select ID from EVENT where NAME = :eventID), "
-            ":expression, :mode)\n\n"
-            "  -- query plan --\n\n"
-            "    [None,None] You did not supply a value for binding 1.\n\n"
+            "    values (:eventRowID, :expression, :mode)\n\n"
             "addReportEntry:\n\n"
             "  -- query --\n\n"
             "    insert into REPORT_ENTRY (AUTHOR, TEXT, CREATED, GENERATED)\n"
             "    values (:author, :text, :created, :generated)\n\n"
-            "  -- query plan --\n\n"
-            "    [None,None] You did not supply a value for binding 1.\n\n"
         )
 
 
+    def test_printQueries_eventRowID(self) -> None:
+        """
+        Queries refer to events by row ID rather than looking up the row ID
+        by name.
+        """
+        out = StringIO()
+        DataStore.printQueries(out)
+
+        self.assertEqual(
+            out.getvalue().count("from EVENT where NAME = :eventID"), 1
+        )
+
+
+    # Queries which read every row of a table by design, and the tables (or
+    # table aliases) which they are expected to scan.
+    fullScanQueries = dict(
+        events={"EVENT"},
+        incidentTypes={"INCIDENT_TYPE"},
+        incidentTypesNotHidden={"INCIDENT_TYPE"},
+        incidentReports={"INCIDENT_REPORT"},
+        incidentReports_reportEntries={"irre"},
+        detachedReportEntries={"re"},
+        detachedIncidentReports={"ir"},
+        detachedIncidentReports_reportEntries={"irre"},
+        foreignKeyTables={"m"},
+        validationCheckpoint={"VALIDATION_CHECKPOINT"},
+        markValidationCheckpoint={"VALIDATION_CHECKPOINT"},
+    )
+
+
+    def test_queryPlans_noFullScans(self) -> None:
+        """
+        No query plan includes a full table scan, other than the expected
+        scans for queries which read every row of a table.
+        """
+        queries = [
+            (getattr(DataStore, k), k[7:])
+            for k in sorted(vars(DataStore))
+            if k.startswith("_query_")
+        ]
+
+        scans = []
+
+        with createDB(None, DataStore._loadSchema()) as db:
+            for explanation in explainQueryPlans(db, queries):
+                expected = self.fullScanQueries.get(explanation.name, set())
+
+                for line in explanation.lines:
+                    self.assertIsNotNone(line.nestingOrder, line.details)
+
+                    match = fullScan.match(line.details)
+                    if match is None:
+                        continue
+
+                    table = match.group(1)
+                    if table.startswith("(subquery-"):
+                        # Scanning the result of a subquery
+                        continue
+                    if "VIRTUAL TABLE" in line.details:
+                        # Full-text search
+                        continue
+                    if table in expected:
+                        continue
+
+                    scans.append(f"{explanation.name}: {line.details}")
+
+        self.assertEqual(scans, [])
+
+
     def test_version(self) -> None:
         """
         :meth:`DataStore._version` returns the schema version for the given
@@ -193,7 +343,9 @@ class DataStoreCoreTests(DataStoreTests):
         """
         message = "Nyargh"
 
-        def oops(path: Path, schema: Optional[str] = None) -> Connection:
+        def oops(
+            path: Path, schema: Optional[str] = None, **options: Any
+        ) -> Connection:
             raise SQLiteError(message)
 
         self.patch(_store, "openDB", oops)
@@ -206,6 +358,167 @@ class DataStoreCoreTests(DataStoreTests):
         )
 
 
+    def test_eventRowID(self) -> None:
+        """
+        :meth:`DataStore._eventRowID` looks up the row ID for an event, and
+        caches it.
+        """
+        store = self.store()
+        for name in ("foo", "bar"):
+            self.successResultOf(store.createEvent(Event(id=name)))
+
+        eventRowID = store._eventRowID(Event(id="bar"))
+        self.assertEqual(
+            eventRowID,
+            store._db.execute(
+                "select ID from EVENT where NAME = 'bar'"
+            ).fetchone()["ID"],
+        )
+
+        store.bringThePain()
+
+        self.assertEqual(store._eventRowID(Event(id="bar")), eventRowID)
+
+
+    def test_eventRowID_noSuchEvent(self) -> None:
+        """
+        :meth:`DataStore._eventRowID` returns :obj:`None` for an event that
+        does not exist, and finds the event once it is created.
+        """
+        store = self.store()
+        event = Event(id="foo")
+
+        self.assertIsNone(store._eventRowID(event))
+
+        self.successResultOf(store.createEvent(event))
+
+        self.assertIsNotNone(store._eventRowID(event))
+
+
+    def test_eventRowID_error(self) -> None:
+        """
+        :meth:`DataStore._eventRowID` raises :exc:`StorageError` when SQLite
+        raises an exception.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(Event(id="foo")))
+        store.bringThePain()
+
+        self.assertRaises(StorageError, store._eventRowID, Event(id="foo"))
+
+
+    def test_queueFull(self) -> None:
+        """
+        A data store using worker threads raises :exc:`StorageError` when too
+        many operations are already pending.
+        """
+        store = DataStore(
+            dbPath=Path(self.mktemp()), readerThreads=1, queueDepth=2
+        )
+        store._state.pending = 2
+
+        f = self.failureResultOf(store.events())
+        self.assertEqual(f.type, StorageError)
+        self.assertEqual(str(f.value), "Data store queue is full")
+
+
+    def test_db_walMode(self) -> None:
+        """
+        The writer connection uses WAL journaling.
+        """
+        store = DataStore(dbPath=Path(self.mktemp()))
+
+        self.assertEqual(
+            store._db.execute("pragma journal_mode").fetchone()[0], "wal"
+        )
+
+
+    def workerThread(self, store: DataStore, write: bool) -> None:
+        """
+        Make the current thread act as a store worker thread.
+        """
+        threadLocal = store._state.threadLocal
+
+        # Create the database from the "reactor" thread first
+        store._db
+
+        threadLocal.worker = True
+        threadLocal.write = write
+
+        def cleanup() -> None:
+            threadLocal.worker = False
+            db = getattr(threadLocal, "db", None)
+            if db is not None:
+                db.close()
+                threadLocal.db = None
+
+        self.addCleanup(cleanup)
+
+
+    def test_workerDB_reader(self) -> None:
+        """
+        Reader threads use read-only connections that are separate from the
+        writer connection.
+        """
+        store = DataStore(dbPath=Path(self.mktemp()))
+        writerDB = store._db
+
+        self.workerThread(store, write=False)
+
+        readerDB = store._db
+
+        self.assertIsNot(readerDB, writerDB)
+        self.assertIs(store._db, readerDB)
+        self.assertRaises(
+            SQLiteError,
+            readerDB.execute, "insert into EVENT (NAME) values ('Foo')",
+        )
+
+
+    def test_workerDB_writer(self) -> None:
+        """
+        The writer thread uses a writable connection.
+        """
+        store = DataStore(dbPath=Path(self.mktemp()))
+
+        self.workerThread(store, write=True)
+
+        store._db.execute("insert into EVENT (NAME) values ('Foo')")
+
+
+    def test_checkWorkerDB_unhealthy(self) -> None:
+        """
+        An unhealthy worker connection is replaced on next use.
+        """
+        store = DataStore(dbPath=Path(self.mktemp()))
+
+        self.workerThread(store, write=False)
+
+        db = store._db
+        db.close()
+
+        store._checkWorkerDB()
+
+        newDB = store._db
+        self.assertIsNot(newDB, db)
+        self.assertTrue(newDB.isHealthy())
+
+
+    def test_checkWorkerDB_healthy(self) -> None:
+        """
+        A healthy worker connection is kept.
+        """
+        store = DataStore(dbPath=Path(self.mktemp()))
+
+        self.workerThread(store, write=False)
+
+        db = store._db
+
+        store._checkWorkerDB()
+
+        self.assertIs(store._db, db)
+
+
     def test_db_schemaUpgrade(self) -> None:
         """
         A database with an old schema is automatically upgraded to the current
@@ -216,12 +529,20 @@ class DataStoreCoreTests(DataStoreTests):
             printSchema(db, out)
             return out.getvalue()
 
+        def getIndexes(db: Connection) -> Set[str]:
+            return set(
+                row["name"] for row in db.execute(
+                    "select name from sqlite_master where type = 'index'"
+                )
+            )
+
         currentVersion = DataStore._schemaVersion
 
         with createDB(
             None, DataStore._loadSchema(version=currentVersion)
         ) as db:
             currentSchemaInfo = getSchemaInfo(db)
+            currentIndexes = getIndexes(db)
 
         for version in range(1, currentVersion):
             path = Path(self.mktemp())
@@ -235,6 +556,7 @@ class DataStoreCoreTests(DataStoreTests):
 
             self.maxDiff = None
             self.assertEqual(schemaInfo, currentSchemaInfo)
+            self.assertEqual(getIndexes(store._db), currentIndexes)
 
 
     def test_db_noSchemaInfo(self) -> None:
@@ -315,6 +637,429 @@ class DataStoreCoreTests(DataStoreTests):
         )
 
 
+    def validationLog(self, store: DataStore) -> List[Tuple[str, bool]]:
+        return [
+            (row["SCOPE"], bool(row["VALID"])) for row in store._db.execute(
+                "select SCOPE, VALID from VALIDATION_LOG order by ROWID"
+            )
+        ]
+
+
+    def addDetachedReportEntry(self, store: DataStore) -> None:
+        with store._db as db:
+            db.execute(
+                "insert into REPORT_ENTRY (AUTHOR, TEXT, CREATED, GENERATED) "
+                "values ('Hubcap', 'Lost', 0, 0)"
+            )
+
+
+    def addForeignKeyViolation(self, store: DataStore) -> None:
+        db = store._db
+        db.execute("pragma foreign_keys = off")
+        with db:
+            db.execute(
+                "insert into INCIDENT__RANGER "
+                "(EVENT, INCIDENT_NUMBER, RANGER_HANDLE) "
+                "values (999, 1, 'Hubcap')"
+            )
+        db.execute("pragma foreign_keys = on")
+
+
+    def test_validate(self) -> None:
+        """
+        :meth:`DataStore.validate` records a passing full validation and
+        checkpoints the highest report entry ID.
+        """
+        store = self.store()
+        event = Event(id="Foo")
+        self.successResultOf(store.createEvent(event))
+        self.successResultOf(store.createIncident(
+            Incident(
+                event=event, number=0, created=DateTime.now(TimeZone.utc),
+                state=IncidentState.new, priority=IncidentPriority.normal,
+                summary="A thing happened",
+                location=Location(name=None, address=None),
+                rangerHandles=(), incidentTypes=(),
+                reportEntries=(
+                    ReportEntry(
+                        created=DateTime.now(TimeZone.utc), author="Hubcap",
+                        automatic=False, text="Something",
+                    ),
+                ),
+            ),
+            "Hubcap",
+        ))
+
+        store.validate()
+
+        self.assertEqual(self.validationLog(store), [("full", True)])
+        self.assertEqual(store._validationCheckpoint(), None)
+
+        store.shutdown()
+
+        self.assertEqual(
+            store._validationCheckpoint(), store._validationHighWater()
+        )
+
+
+    def test_validate_detachedReportEntry(self) -> None:
+        """
+        :meth:`DataStore.validate` raises :exc:`StorageError` when there is a
+        detached report entry, and records the failure.
+        """
+        store = self.store()
+        self.addDetachedReportEntry(store)
+
+        e = self.assertRaises(StorageError, store.validate)
+        self.assertEqual(str(e), "Data store validation failed")
+        self.assertEqual(self.validationLog(store), [("full", False)])
+
+
+    def test_validate_foreignKeys(self) -> None:
+        """
+        A full :meth:`DataStore.validate` checks foreign key constraints.
+        """
+        store = self.store()
+        self.addForeignKeyViolation(store)
+
+        self.assertRaises(StorageError, store.validate)
+
+
+    def test_validate_incremental(self) -> None:
+        """
+        After a clean shutdown, an incremental :meth:`DataStore.validate` only
+        checks report entries written since the last validation.
+        """
+        store = self.store()
+        self.addDetachedReportEntry(store)
+        with store._db as db:
+            db.execute(
+                "insert into VALIDATION_CHECKPOINT (REPORT_ENTRY, CLEAN) "
+                "values (1, 1)"
+            )
+
+        store.validate(incremental=True)
+
+        self.assertEqual(self.validationLog(store), [("incremental", True)])
+
+        store.shutdown()
+        self.addDetachedReportEntry(store)
+
+        self.assertRaises(StorageError, store.validate, incremental=True)
+        self.assertEqual(
+            self.validationLog(store),
+            [("incremental", True), ("incremental", False)],
+        )
+
+
+    def test_validate_incrementalUncleanShutdown(self) -> None:
+        """
+        Without a clean shutdown since the last validation, an incremental
+        :meth:`DataStore.validate` checks everything.
+        """
+        store = self.store()
+        store.validate()
+        store.validate(incremental=True)
+
+        self.assertEqual(
+            self.validationLog(store), [("full", True), ("full", True)]
+        )
+
+
+    def test_validateInBackground(self) -> None:
+        """
+        :meth:`DataStore.validateInBackground` checks all report entries in
+        chunks and records the outcome.
+        """
+        store = self.store()
+        for _ in range(5):
+            self.addDetachedReportEntry(store)
+
+        self.assertFalse(
+            self.successResultOf(store.validateInBackground(chunkSize=2))
+        )
+        self.assertEqual(self.validationLog(store), [("full", False)])
+
+        with store._db as db:
+            db.execute("delete from REPORT_ENTRY")
+
+        self.assertTrue(
+            self.successResultOf(store.validateInBackground(chunkSize=2))
+        )
+        self.assertEqual(
+            self.validationLog(store), [("full", False), ("full", True)]
+        )
+
+
+    def test_validateInBackground_foreignKeys(self) -> None:
+        """
+        :meth:`DataStore.validateInBackground` checks foreign key constraints.
+        """
+        store = self.store()
+        self.addForeignKeyViolation(store)
+
+        self.assertFalse(self.successResultOf(store.validateInBackground()))
+
+
+    def test_shutdown_error(self) -> None:
+        """
+        :meth:`DataStore.shutdown` raises :exc:`StorageError` when SQLite
+        raises an exception.
+        """
+        store = self.store()
+        store._db
+        store.bringThePain()
+
+        self.assertRaises(StorageError, store.shutdown)
+
+
+
+class ThreadReactor(object):
+    """
+    Stand-in for the reactor for data stores that use worker threads.
+
+    Calls made from worker threads are queued until the test runs them from
+    its own thread, which plays the part of the reactor thread.
+    """
+
+    def __init__(self) -> None:
+        self.calls: "Queue[Tuple[Callable, Any, Any]]" = Queue()
+        self.triggers: List[Tuple[str, str, Callable]] = []
+
+
+    def callFromThread(self, f: Callable, *args: Any, **kwargs: Any) -> None:
+        self.calls.put((f, args, kwargs))
+
+
+    def addSystemEventTrigger(
+        self, phase: str, eventType: str, f: Callable
+    ) -> None:
+        self.triggers.append((phase, eventType, f))
+
+
+    def runUntil(self, deferred: Deferred) -> None:
+        """
+        Run calls from worker threads until the given deferred has fired.
+        """
+        fired: List[bool] = []
+
+        def done(result: Any) -> Any:
+            fired.append(True)
+            return result
+
+        deferred.addBoth(done)
+
+        while not fired:
+            f, args, kwargs = self.calls.get(timeout=10)
+            f(*args, **kwargs)
+
+
+    def shutdown(self) -> None:
+        """
+        Run the triggers for the shutdown event.
+        """
+        triggers, self.triggers = self.triggers, []
+        for _phase, eventType, f in triggers:
+            if eventType == "shutdown":
+                f()
+
+
+
+class DataStoreThreadTests(DataStoreTests):
+    """
+    Tests for :class:`DataStore` using worker threads.
+    """
+
+    def threadStore(self, readerThreads: int = 2) -> DataStore:
+        """
+        Create a data store that uses worker threads and the reactor in
+        :attr:`reactor`.
+        """
+        self.reactor = ThreadReactor()
+        self.patch(twisted.internet, "reactor", self.reactor)
+        self.addCleanup(self.reactor.shutdown)
+
+        return DataStore(
+            dbPath=Path(self.mktemp()), readerThreads=readerThreads
+        )
+
+
+    def resultOf(self, awaitable: Awaitable) -> Any:
+        """
+        Run the given store coroutine to completion and return its result.
+        """
+        d = ensureDeferred(awaitable)
+        self.reactor.runUntil(d)
+        return self.successResultOf(d)
+
+
+    def test_offReactorThread(self) -> None:
+        """
+        Reads and writes run in worker threads, not in the reactor thread.
+        """
+        store = self.threadStore()
+        threads: List[Tuple[Thread, bool]] = []
+
+        def record() -> None:
+            threads.append((current_thread(), store._inWorkerThread()))
+
+        self.resultOf(store._writeStep(record))
+        self.resultOf(store._readStep(record))
+
+        self.assertEqual(len(threads), 2)
+        for thread, inWorkerThread in threads:
+            self.assertIsNot(thread, current_thread())
+            self.assertTrue(inWorkerThread)
+
+        self.assertFalse(store._inWorkerThread())
+
+
+    def test_operations(self) -> None:
+        """
+        Store operations deliver their results back to the calling thread.
+        """
+        store = self.threadStore()
+        event = Event(id="Foo")
+
+        self.resultOf(store.createEvent(event))
+
+        self.assertEqual(self.resultOf(store.events()), (event,))
+
+
+    def test_writesSerialized(self) -> None:
+        """
+        Writes all run in the same thread, one at a time, in the order they
+        were made.
+        """
+        store = self.threadStore()
+        lock = Lock()
+        active: List[int] = []
+        order: List[int] = []
+        threads: Set[Thread] = set()
+        overlapped: List[bool] = []
+
+        def write(n: int) -> None:
+            with lock:
+                overlapped.append(len(active) > 0)
+                active.append(n)
+            sleep(0.01)
+            with lock:
+                active.remove(n)
+                order.append(n)
+                threads.add(current_thread())
+
+        self.resultOf(
+            gatherResults([
+                ensureDeferred(store._writeStep(write, n)) for n in range(5)
+            ])
+        )
+
+        self.assertEqual(order, list(range(5)))
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(True, overlapped)
+
+
+    def test_readsConcurrent(self) -> None:
+        """
+        Reads run concurrently in separate reader threads.
+        """
+        store = self.threadStore(readerThreads=2)
+        barrier = Barrier(2, timeout=10)
+        threads: Set[Thread] = set()
+
+        def read() -> None:
+            # Each read waits for the other, so both must run at once
+            barrier.wait()
+            threads.add(current_thread())
+
+        self.resultOf(
+            gatherResults([
+                ensureDeferred(store._readStep(read)),
+                ensureDeferred(store._readStep(read)),
+            ])
+        )
+
+        self.assertEqual(len(threads), 2)
+
+
+    def test_readsNotBlockedByWrite(self) -> None:
+        """
+        Reads proceed while a write is in progress.
+        """
+        store = self.threadStore()
+        writing = ThreadEvent()
+        readDone = ThreadEvent()
+
+        def write() -> None:
+            writing.set()
+            readDone.wait(timeout=10)
+
+        writeResult = ensureDeferred(store._writeStep(write))
+        writing.wait(timeout=10)
+
+        self.resultOf(store._readStep(lambda: None))
+        readDone.set()
+
+        self.reactor.runUntil(writeResult)
+        self.successResultOf(writeResult)
+
+
+    def test_pending(self) -> None:
+        """
+        Operations count as pending until their result is delivered.
+        """
+        store = self.threadStore()
+        release = ThreadEvent()
+
+        d = ensureDeferred(store._readStep(release.wait, 10))
+        self.assertEqual(store._state.pending, 1)
+
+        release.set()
+        self.reactor.runUntil(d)
+        self.successResultOf(d)
+        self.assertEqual(store._state.pending, 0)
+
+
+    def test_pending_error(self) -> None:
+        """
+        Operations that fail no longer count as pending.
+        """
+        store = self.threadStore()
+
+        def fail() -> None:
+            raise StorageError("Nope")
+
+        d = ensureDeferred(store._writeStep(fail))
+        self.assertEqual(store._state.pending, 1)
+
+        self.reactor.runUntil(d)
+        f = self.failureResultOf(d)
+        self.assertEqual(f.type, StorageError)
+        self.assertEqual(store._state.pending, 0)
+
+
+    def test_shutdown(self) -> None:
+        """
+        The reader and writer thread pools are stopped on reactor shutdown.
+        """
+        store = self.threadStore()
+
+        self.resultOf(store._writeStep(lambda: None))
+        self.resultOf(store._readStep(lambda: None))
+
+        pools = (store._threadPool(True), store._threadPool(False))
+        for pool in pools:
+            self.assertTrue(pool.started)
+
+        self.reactor.shutdown()
+
+        for pool in pools:
+            self.assertFalse(pool.started)
+            self.assertTrue(pool.joined)
+            for thread in pool.threads:
+                self.assertFalse(thread.is_alive())
+
+
 
 class DataStoreHelperTests(DataStoreTests):
     """
@@ -19,9 +19,12 @@ Tests for :mod:`ranger-ims-server.store.sqlite._store`
 """
 
 from collections import defaultdict
-from datetime import datetime as DateTime, timezone as TimeZone
+from datetime import (
+    datetime as DateTime, timedelta as TimeDelta, timezone as TimeZone
+)
+from pathlib import Path
 from typing import (
-    Any, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+    Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 )
 
 from attr import fields as attrFields
@@ -29,11 +32,15 @@ from attr import fields as attrFields
 from hypothesis import assume, given, settings
 from hypothesis.strategies import frozensets, lists, text, tuples
 
-from ims.ext.sqlite import SQLITE_MAX_INT
+from twisted.internet.defer import ensureDeferred
+
+from ims.ext.json import jsonTextFromObject
+from ims.ext.sqlite import SQLITE_MAX_INT, createDB
 from ims.model import (
-    Event, Incident, IncidentPriority, IncidentState,
+    Event, Incident, IncidentPriority, IncidentState, IncidentSummary,
     Location, ReportEntry, RodGarettAddress,
 )
+from ims.model.json import jsonBytesFromModelObject, jsonObjectFromModelObject
 from ims.model.strategies import (
     concentricStreetIDs, incidentLists, incidentPriorities, incidentStates,
     incidentSummaries, incidentTypesText, incidents, locationNames,
@@ -41,9 +48,10 @@ from ims.model.strategies import (
 )
 
 from .base import (
-    DataStoreTests, dateTimesEqualish, normalizeAddress, reportEntriesEqualish,
-    storeConcentricStreet,
+    DataStoreTests, TestDataStore, dateTimesEqualish, normalizeAddress,
+    reportEntriesEqualish, storeConcentricStreet,
 )
+from .._store import DataStore
 from ..._exceptions import NoSuchIncidentError, StorageError
 
 Dict, Event, Optional, Set  # silence linter
@@ -153,6 +161,802 @@ class DataStoreIncidentTests(DataStoreTests):
         self.assertEqual(f.type, StorageError)
 
 
+    def test_incidents_fixedQueryCount(self) -> None:
+        """
+        :meth:`DataStore.incidents` executes the same number of queries
+        regardless of the number of incidents in the event.
+        """
+        def queryCount(incidentCount: int) -> int:
+            store = self.store()
+            self.successResultOf(store.createEvent(anEvent))
+
+            for number in range(1, incidentCount + 1):
+                self.storeIncident(store, anIncident.replace(
+                    number=number,
+                    rangerHandles=("Tool", "Splinter"),
+                    incidentTypes=("Admin",),
+                    reportEntries=(aReportEntry,),
+                ))
+
+            statements: List[str] = []
+            store._db.set_trace_callback(
+                lambda statement: statements.append(statement)
+            )
+            try:
+                incidents = self.successResultOf(store.incidents(anEvent))
+            finally:
+                store._db.set_trace_callback(None)
+
+            self.assertEqual(len(tuple(incidents)), incidentCount)
+
+            return len(statements)
+
+        self.assertEqual(queryCount(1), queryCount(20))
+
+
+    def iterIncidents(self, store: DataStore, event: Event) -> List[Incident]:
+        async def collect() -> List[Incident]:
+            return [
+                incident async for incident in store.iterIncidents(event)
+            ]
+
+        return self.successResultOf(ensureDeferred(collect()))
+
+
+    def test_iterIncidents(self) -> None:
+        """
+        :meth:`DataStore.iterIncidents` iterates over all incidents, in
+        number order, in batches of ``incidentBatchSize``.
+        """
+        store = TestDataStore(Path(self.mktemp()), incidentBatchSize=3)
+        self.successResultOf(store.createEvent(anEvent))
+
+        for number in (5, 1, 7, 2, 3, 6, 4):
+            self.storeIncident(store, anIncident.replace(number=number))
+
+        statements: List[str] = []
+        store._db.set_trace_callback(
+            lambda statement: statements.append(statement)
+        )
+        try:
+            incidents = self.iterIncidents(store, anEvent)
+        finally:
+            store._db.set_trace_callback(None)
+
+        self.assertEqual(
+            [incident.number for incident in incidents], list(range(1, 8))
+        )
+        self.assertEqual(
+            sorted(incidents),
+            sorted(self.successResultOf(store.incidents(anEvent))),
+        )
+        self.assertEqual(
+            len([s for s in statements if "between" in s]), 3 * 4
+        )
+
+
+    @given(
+        incidentLists(
+            event=anEvent, maxNumber=SQLITE_MAX_INT,
+            minSize=1, averageSize=3,
+        ),
+    )
+    @settings(max_examples=100)
+    def test_incidentSummaries(self, incidents: Iterable[Incident]) -> None:
+        """
+        :meth:`DataStore.incidentSummaries` returns summaries of all
+        incidents, with the same summary from the report that the incidents
+        derive from their report entries.
+        """
+        store = self.store()
+
+        for incident in incidents:
+            self.storeIncident(store, incident)
+
+        expected = sorted(
+            (IncidentSummary.fromIncident(incident) for incident in
+                self.successResultOf(store.incidents(anEvent))),
+            key=lambda summary: summary.number,
+        )
+        summaries = sorted(
+            self.successResultOf(store.incidentSummaries(anEvent)),
+            key=lambda summary: summary.number,
+        )
+
+        self.assertEqual(summaries, expected)
+
+
+    def test_incidentSummaries_summaryFromReport(self) -> None:
+        """
+        :meth:`DataStore.incidentSummaries` derives the summary from the
+        first line of the first report entry that is not automatic if the
+        incident has no summary.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        entries = (
+            aReportEntry.replace(automatic=True, text="Changed state"),
+            aReportEntry.replace(
+                created=aReportEntry.created + TimeDelta(seconds=1),
+                text="Second\nline",
+            ),
+            aReportEntry.replace(
+                created=aReportEntry.created + TimeDelta(seconds=2),
+                text="Third",
+            ),
+        )
+        self.storeIncident(store, anIncident.replace(
+            number=1, summary=None, reportEntries=entries,
+        ))
+        self.storeIncident(store, anIncident.replace(
+            number=2, summary="", reportEntries=entries[:1],
+        ))
+        self.storeIncident(store, anIncident.replace(
+            number=3, summary="Summary", reportEntries=entries,
+        ))
+
+        summaries = self.successResultOf(store.incidentSummaries(anEvent))
+
+        self.assertEqual(
+            sorted(
+                (summary.number, summary.summaryFromReport)
+                for summary in summaries
+            ),
+            [(1, "Second"), (2, ""), (3, "Summary")],
+        )
+
+
+    def test_incidentSummaries_maintained(self) -> None:
+        """
+        :meth:`DataStore.incidentSummaries` returns the summary from the
+        report and last modified time as of the latest write to the incident.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        incident = self.successResultOf(store.createIncident(
+            anIncident.replace(number=0, summary=None, reportEntries=()),
+            "Hubcap",
+        ))
+        number = incident.number
+
+        def assertSummary(summaryFromReport: str) -> None:
+            incident = self.successResultOf(
+                store.incidentWithNumber(anEvent, number)
+            )
+            (summary,) = self.successResultOf(
+                store.incidentSummaries(anEvent)
+            )
+            self.assertEqual(summary.summaryFromReport, summaryFromReport)
+            self.assertEqual(summary, IncidentSummary.fromIncident(incident))
+
+        assertSummary("")
+
+        self.successResultOf(store.addReportEntriesToIncident(
+            anEvent, number,
+            (aReportEntry.replace(author="Hubcap", text="First\nline"),),
+            "Hubcap",
+        ))
+        assertSummary("First")
+
+        self.successResultOf(
+            store.setIncident_summary(anEvent, number, "Summary", "Hubcap")
+        )
+        assertSummary("Summary")
+
+        self.successResultOf(store.applyIncidentEdits(
+            anEvent, number, dict(summary=""), "Hubcap"
+        ))
+        assertSummary("First")
+
+
+    def test_incidentSummaries_upgrade(self) -> None:
+        """
+        Upgrading a database from schema version 5 fills in the summary from
+        the report and last modified time of existing incidents.
+        """
+        path = Path(self.mktemp())
+
+        incident = anIncident.replace(
+            number=1, summary=None,
+            reportEntries=(
+                aReportEntry.replace(text="Lost dog\nBrown"),
+                aReportEntry.replace(
+                    created=aReportEntry.created + TimeDelta(seconds=1),
+                    automatic=True, text="Changed state",
+                ),
+            ),
+        )
+
+        with createDB(path, DataStore._loadSchema(version=5)) as db:
+            cursor = db.cursor()
+            try:
+                self._storeIncident(cursor, incident)
+            finally:
+                cursor.close()
+        db.close()
+
+        store = self.store(path)
+
+        (summary,) = self.successResultOf(store.incidentSummaries(anEvent))
+        (incident,) = self.successResultOf(store.incidents(anEvent))
+
+        self.assertEqual(summary.summaryFromReport, "Lost dog")
+        self.assertEqual(summary, IncidentSummary.fromIncident(incident))
+
+
+    def test_incidentSummaries_changedSince(self) -> None:
+        """
+        :meth:`DataStore.incidentSummaries` returns summaries of only the
+        incidents changed since the given revision.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        for _ in (1, 2):
+            self.successResultOf(store.createIncident(
+                anIncident.replace(number=0), "Hubcap"
+            ))
+        revision = self.successResultOf(store.eventRevision(anEvent))
+
+        self.successResultOf(
+            store.setIncident_summary(anEvent, 1, "Changed", "Hubcap")
+        )
+
+        summaries = self.successResultOf(
+            store.incidentSummaries(anEvent, changedSince=revision)
+        )
+
+        self.assertEqual(
+            [(summary.number, summary.summary) for summary in summaries],
+            [(1, "Changed")],
+        )
+
+
+    def test_incidentSummaries_error(self) -> None:
+        """
+        :meth:`DataStore.incidentSummaries` raises :exc:`StorageError` when
+        SQLite raises an exception.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        store.bringThePain()
+
+        f = self.failureResultOf(store.incidentSummaries(anEvent))
+        self.assertEqual(f.type, StorageError)
+
+
+    def test_iterIncidents_empty(self) -> None:
+        """
+        :meth:`DataStore.iterIncidents` iterates over nothing for an event
+        with no incidents.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        self.assertEqual(self.iterIncidents(store, anEvent), [])
+
+
+    def matchingNumbers(self, **filters: Any) -> List[int]:
+        """
+        Store a fixed set of incidents and return the numbers of those that
+        :meth:`DataStore.incidentsMatching` finds with the given filters.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        created = DateTime(2017, 8, 27, 12, tzinfo=TimeZone.utc)
+
+        for incident in (
+            anIncident.replace(
+                number=1, created=created,
+                state=IncidentState.new, priority=IncidentPriority.high,
+                summary="Lost dog",
+                rangerHandles=("Tool",), incidentTypes=("Medical",),
+            ),
+            anIncident.replace(
+                number=2, created=created + TimeDelta(days=1),
+                state=IncidentState.closed, priority=IncidentPriority.normal,
+                summary="Found 100% of the dog",
+                rangerHandles=("Splinter",), incidentTypes=("Admin",),
+            ),
+            anIncident.replace(
+                number=3, created=created + TimeDelta(days=2),
+                state=IncidentState.onScene, priority=IncidentPriority.low,
+                summary=None,
+                rangerHandles=("Tool", "Splinter"), incidentTypes=(),
+                reportEntries=(aReportEntry.replace(text="Fire in camp"),),
+            ),
+        ):
+            self.storeIncident(store, incident)
+
+        incidents = self.successResultOf(
+            store.incidentsMatching(anEvent, **filters)
+        )
+        return sorted(incident.number for incident in incidents)
+
+
+    def test_incidentsMatching_all(self) -> None:
+        """
+        :meth:`DataStore.incidentsMatching` with no filters returns all
+        incidents.
+        """
+        self.assertEqual(self.matchingNumbers(), [1, 2, 3])
+
+
+    def test_incidentsMatching_states(self) -> None:
+        """
+        :meth:`DataStore.incidentsMatching` filters by state.
+        """
+        self.assertEqual(
+            self.matchingNumbers(
+                states=(IncidentState.new, IncidentState.onScene)
+            ),
+            [1, 3],
+        )
+        self.assertEqual(self.matchingNumbers(states=()), [])
+
+
+    def test_incidentsMatching_priorities(self) -> None:
+        """
+        :meth:`DataStore.incidentsMatching` filters by priority.
+        """
+        self.assertEqual(
+            self.matchingNumbers(priorities=(IncidentPriority.normal,)), [2]
+        )
+
+
+    def test_incidentsMatching_incidentType(self) -> None:
+        """
+        :meth:`DataStore.incidentsMatching` filters by incident type.
+        """
+        self.assertEqual(self.matchingNumbers(incidentType="Admin"), [2])
+
+
+    def test_incidentsMatching_rangerHandle(self) -> None:
+        """
+        :meth:`DataStore.incidentsMatching` filters by Ranger handle, and
+        returns all of the Rangers for matching incidents.
+        """
+        self.assertEqual(self.matchingNumbers(rangerHandle="Tool"), [1, 3])
+
+
+    def test_incidentsMatching_created(self) -> None:
+        """
+        :meth:`DataStore.incidentsMatching` filters by creation time.
+        """
+        self.assertEqual(
+            self.matchingNumbers(
+                createdAfter=DateTime(2017, 8, 28, tzinfo=TimeZone.utc),
+                createdBefore=DateTime(2017, 8, 29, 12, tzinfo=TimeZone.utc),
+            ),
+            [2],
+        )
+
+
+    def test_incidentsMatching_text(self) -> None:
+        """
+        :meth:`DataStore.incidentsMatching` filters by text in the summary or
+        report entries, ignoring case and treating wildcard characters
+        literally.
+        """
+        self.assertEqual(self.matchingNumbers(text="DOG"), [1, 2])
+        self.assertEqual(self.matchingNumbers(text="fire"), [3])
+        self.assertEqual(self.matchingNumbers(text="100%"), [2])
+        self.assertEqual(self.matchingNumbers(text="_"), [])
+
+
+    def test_incidentsMatching_combined(self) -> None:
+        """
+        :meth:`DataStore.incidentsMatching` returns incidents matching all of
+        the given filters, with all of their attributes.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        incident = anIncident.replace(
+            number=1, rangerHandles=("Tool", "Splinter"),
+            incidentTypes=("Admin",), reportEntries=(aReportEntry,),
+        )
+        self.storeIncident(store, incident)
+
+        matching = tuple(self.successResultOf(store.incidentsMatching(
+            anEvent, states=(incident.state,), rangerHandle="Tool",
+            text="hello",
+        )))
+
+        self.assertEqual(len(matching), 1)
+        self.assertIncidentsEqual(matching[0], incident)
+
+
+    def test_incidentsMatching_error(self) -> None:
+        """
+        :meth:`DataStore.incidentsMatching` raises :exc:`StorageError` when
+        SQLite raises an exception.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        store.bringThePain()
+
+        f = self.failureResultOf(store.incidentsMatching(anEvent, text="x"))
+        self.assertEqual(f.type, StorageError)
+
+
+    def searchStore(self) -> DataStore:
+        """
+        Create a store with some incidents to search.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        self.successResultOf(store.createEvent(Event(id="bar")))
+
+        for incident in (
+            anIncident.replace(summary="Lost dog near the Esplanade"),
+            anIncident.replace(
+                summary="Found property",
+                reportEntries=(aReportEntry.replace(
+                    text="Participant found a lost wallet"
+                ),),
+            ),
+            anIncident.replace(event=Event(id="bar"), summary="Lost dog"),
+        ):
+            self.successResultOf(store.createIncident(incident, "Hubcap"))
+
+        return store
+
+
+    def test_searchIncidents(self) -> None:
+        """
+        :meth:`DataStore.searchIncidents` finds incidents in the given event
+        with matching summaries or report entries, with snippets of the
+        matching text.
+        """
+        store = self.searchStore()
+
+        results = tuple(
+            self.successResultOf(store.searchIncidents(anEvent, "dog"))
+        )
+        self.assertEqual([r.number for r in results], [1])
+        self.assertEqual(results[0].snippet, "Lost [dog] near the Esplanade")
+
+        results = tuple(
+            self.successResultOf(store.searchIncidents(anEvent, "lost"))
+        )
+        self.assertEqual(sorted(r.number for r in results), [1, 2])
+        self.assertEqual(
+            {r.number: r.snippet for r in results}[2],
+            "Participant found a [lost] wallet",
+        )
+
+
+    def test_searchIncidents_summaryFirst(self) -> None:
+        """
+        :meth:`DataStore.searchIncidents` lists incidents with matching
+        summaries before those with only matching report entries, whatever
+        their ranks within each index, and gives the summary snippet for
+        incidents that match both.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        for incident in (
+            anIncident.replace(
+                summary="Found property",
+                reportEntries=(aReportEntry.replace(text="Lost, lost, lost"),),
+            ),
+            anIncident.replace(
+                summary="Bike lost somewhere out on the playa after the burn"
+            ),
+            anIncident.replace(
+                summary="Lost keys",
+                reportEntries=(aReportEntry.replace(text="Lost, lost, lost"),),
+            ),
+        ):
+            self.successResultOf(store.createIncident(incident, "Hubcap"))
+
+        results = tuple(
+            self.successResultOf(store.searchIncidents(anEvent, "lost"))
+        )
+        self.assertEqual([r.number for r in results], [3, 2, 1])
+        self.assertEqual(results[0].snippet, "[Lost] keys")
+
+
+    def test_searchIncidents_prefix(self) -> None:
+        """
+        :meth:`DataStore.searchIncidents` treats the last word of the query as
+        a prefix, and requires all words to match.
+        """
+        store = self.searchStore()
+
+        results = self.successResultOf(
+            store.searchIncidents(anEvent, "lost esplan")
+        )
+        self.assertEqual([r.number for r in results], [1])
+
+
+    def test_searchIncidents_syntax(self) -> None:
+        """
+        :meth:`DataStore.searchIncidents` does not interpret FTS query syntax
+        in the query, and finds nothing for an empty query.
+        """
+        store = self.searchStore()
+
+        for query in ('"', "dog OR", "NOT dog", "*", ""):
+            self.successResultOf(store.searchIncidents(anEvent, query))
+
+        self.assertEqual(
+            tuple(self.successResultOf(store.searchIncidents(anEvent, ""))),
+            (),
+        )
+
+
+    def test_searchIncidents_automatic(self) -> None:
+        """
+        :meth:`DataStore.searchIncidents` does not find text in automatic
+        report entries.
+        """
+        store = self.searchStore()
+
+        results = self.successResultOf(
+            store.searchIncidents(anEvent, "changed")
+        )
+        self.assertEqual(tuple(results), ())
+
+
+    def test_searchIncidents_edited(self) -> None:
+        """
+        :meth:`DataStore.searchIncidents` reflects changes to incident
+        summaries.
+        """
+        store = self.searchStore()
+
+        self.successResultOf(
+            store.setIncident_summary(anEvent, 1, "Lost cat", "Hubcap")
+        )
+
+        self.assertEqual(
+            tuple(self.successResultOf(store.searchIncidents(anEvent, "dog"))),
+            (),
+        )
+        self.assertEqual(
+            [
+                r.number for r in
+                self.successResultOf(store.searchIncidents(anEvent, "cat"))
+            ],
+            [1],
+        )
+
+
+    def test_searchIncidents_rowIDs(self) -> None:
+        """
+        :meth:`DataStore.searchIncidents` finds the right incidents after the
+        row IDs of ``INCIDENT`` change, as they may when the database is
+        vacuumed or the table is rebuilt.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        for incident in (
+            anIncident.replace(summary="Found property"),
+            anIncident.replace(summary="Lost dog"),
+        ):
+            self.successResultOf(store.createIncident(incident, "Hubcap"))
+
+        # Swap the row IDs of the two incidents
+        with store._db as db:
+            db.execute("update INCIDENT set ROWID = -ROWID")
+            db.execute("update INCIDENT set ROWID = 3 + ROWID")
+
+        results = tuple(
+            self.successResultOf(store.searchIncidents(anEvent, "dog"))
+        )
+        self.assertEqual([r.number for r in results], [2])
+        self.assertEqual(results[0].snippet, "Lost [dog]")
+
+        self.successResultOf(
+            store.setIncident_summary(anEvent, 1, "Lost cat", "Hubcap")
+        )
+
+        results = tuple(
+            self.successResultOf(store.searchIncidents(anEvent, "lost"))
+        )
+        self.assertEqual(sorted(r.number for r in results), [1, 2])
+
+
+    def test_searchIncidents_upgrade(self) -> None:
+        """
+        Upgrading a database from schema version 2 indexes existing incidents
+        for searching.
+        """
+        path = Path(self.mktemp())
+
+        with createDB(path, DataStore._loadSchema(version=2)) as db:
+            cursor = db.cursor()
+            try:
+                self._storeIncident(cursor, anIncident.replace(
+                    number=1, summary="Lost dog",
+                    reportEntries=(aReportEntry.replace(text="Found a cat"),),
+                ))
+            finally:
+                cursor.close()
+        db.close()
+
+        store = self.store(path)
+
+        for query in ("dog", "cat"):
+            self.assertEqual(
+                [
+                    r.number for r in
+                    self.successResultOf(store.searchIncidents(anEvent, query))
+                ],
+                [1],
+            )
+
+
+    def test_searchIncidents_error(self) -> None:
+        """
+        :meth:`DataStore.searchIncidents` raises :exc:`StorageError` when
+        SQLite raises an exception.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        store.bringThePain()
+
+        f = self.failureResultOf(store.searchIncidents(anEvent, "x"))
+        self.assertEqual(f.type, StorageError)
+
+
+    def test_eventRevision_empty(self) -> None:
+        """
+        :meth:`DataStore.eventRevision` returns ``0`` for an event with no
+        incidents.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        self.assertEqual(self.successResultOf(store.eventRevision(anEvent)), 0)
+
+
+    def test_eventRevision_create(self) -> None:
+        """
+        :meth:`DataStore.eventRevision` increases as incidents are created.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        revisions = []
+        for _ in range(3):
+            self.successResultOf(store.createIncident(anIncident, "Hubcap"))
+            revisions.append(
+                self.successResultOf(store.eventRevision(anEvent))
+            )
+
+        self.assertEqual(revisions, [1, 2, 3])
+
+
+    def test_eventRevision_error(self) -> None:
+        """
+        :meth:`DataStore.eventRevision` raises :exc:`StorageError` when SQLite
+        raises an exception.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        store.bringThePain()
+
+        f = self.failureResultOf(store.eventRevision(anEvent))
+        self.assertEqual(f.type, StorageError)
+
+
+    def test_incidentRevision(self) -> None:
+        """
+        :meth:`DataStore.incidentRevision` returns the revision of the event
+        as of the last change to the given incident.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        for _ in range(3):
+            self.successResultOf(store.createIncident(anIncident, "Hubcap"))
+
+        self.successResultOf(store.setIncident_summary(
+            anEvent, 1, "Something else happened", "Hubcap"
+        ))
+
+        self.assertEqual(
+            [
+                self.successResultOf(store.incidentRevision(anEvent, number))
+                for number in (1, 2, 3)
+            ],
+            [4, 2, 3],
+        )
+
+
+    def test_incidentRevision_notFound(self) -> None:
+        """
+        :meth:`DataStore.incidentRevision` raises
+        :exc:`NoSuchIncidentError` for an unknown incident.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        f = self.failureResultOf(store.incidentRevision(anEvent, 1))
+        self.assertEqual(f.type, NoSuchIncidentError)
+
+
+    def test_incidentRevision_error(self) -> None:
+        """
+        :meth:`DataStore.incidentRevision` raises :exc:`StorageError` when
+        SQLite raises an exception.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        self.successResultOf(store.createIncident(anIncident, "Hubcap"))
+        store.bringThePain()
+
+        f = self.failureResultOf(store.incidentRevision(anEvent, 1))
+        self.assertEqual(f.type, StorageError)
+
+
+    def test_incidentsChangedSince(self) -> None:
+        """
+        :meth:`DataStore.incidentsChangedSince` returns only the incidents that
+        were created or modified after the given revision.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        for _ in range(3):
+            self.successResultOf(store.createIncident(anIncident, "Hubcap"))
+
+        revision = self.successResultOf(store.eventRevision(anEvent))
+
+        self.successResultOf(store.setIncident_summary(
+            anEvent, 1, "Something else happened", "Hubcap"
+        ))
+        self.successResultOf(store.addReportEntriesToIncident(
+            anEvent, 3, (aReportEntry,), "Hubcap"
+        ))
+
+        changed = self.successResultOf(
+            store.incidentsChangedSince(anEvent, revision)
+        )
+        self.assertEqual(
+            sorted(incident.number for incident in changed), [1, 3]
+        )
+        self.assertEqual(
+            self.successResultOf(store.eventRevision(anEvent)), revision + 2
+        )
+
+        changed = self.successResultOf(
+            store.incidentsChangedSince(anEvent, 0)
+        )
+        self.assertEqual(
+            sorted(incident.number for incident in changed), [1, 2, 3]
+        )
+
+        for incident in changed:
+            self.assertIncidentsEqual(
+                incident,
+                self.successResultOf(
+                    store.incidentWithNumber(anEvent, incident.number)
+                ),
+            )
+
+
+    def test_incidentsChangedSince_error(self) -> None:
+        """
+        :meth:`DataStore.incidentsChangedSince` raises :exc:`StorageError` when
+        SQLite raises an exception.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        store.bringThePain()
+
+        f = self.failureResultOf(store.incidentsChangedSince(anEvent, 0))
+        self.assertEqual(f.type, StorageError)
+
+
     @given(incidents(maxNumber=SQLITE_MAX_INT))
     @settings(max_examples=200)
     def test_incidentWithNumber(self, incident: Incident) -> None:
@@ -170,6 +974,59 @@ class DataStoreIncidentTests(DataStoreTests):
         self.assertIncidentsEqual(retrieved, incident)
 
 
+    def test_jsonBytes(self) -> None:
+        """
+        :meth:`DataStore.jsonBytes` serializes the given incident.
+        """
+        store = self.store()
+        self.storeIncident(store, anIncident)
+
+        incident = self.successResultOf(
+            store.incidentWithNumber(anIncident.event, anIncident.number)
+        )
+
+        self.assertEqual(
+            store.jsonBytes(incident), jsonBytesFromModelObject(incident)
+        )
+
+
+    def test_incidentWithNumber_reportEntryOrder(self) -> None:
+        """
+        :meth:`DataStore.incidentWithNumber` and :meth:`DataStore.incidents`
+        return report entries in sorted order, including entries with the same
+        creation time.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        created = DateTime.now(TimeZone.utc)
+        reportEntries = tuple(
+            ReportEntry(
+                created=created, author=author, automatic=automatic,
+                text=text,
+            )
+            for author, automatic, text in (
+                ("Hubcap", False, "B"),
+                ("Hubcap", False, "A"),
+                ("Bucket", False, "C"),
+            )
+        )
+        incident = self.successResultOf(store.createIncident(
+            anIncident.replace(reportEntries=reportEntries), "Hubcap"
+        ))
+
+        retrieved = self.successResultOf(
+            store.incidentWithNumber(anEvent, incident.number)
+        )
+        (listed,) = self.successResultOf(store.incidents(anEvent))
+
+        for found in (retrieved, listed):
+            self.assertEqual(
+                found.reportEntries, tuple(sorted(found.reportEntries))
+            )
+            self.assertTrue(set(reportEntries) <= set(found.reportEntries))
+
+
     def test_incidentWithNumber_notFound(self) -> None:
         """
         :meth:`DataStore.incidentWithNumber` raises :exc:`NoSuchIncidentError`
@@ -688,6 +1545,308 @@ class DataStoreIncidentTests(DataStoreTests):
         self.assertEqual(f.type, StorageError)
 
 
+    def test_applyIncidentEdits(self) -> None:
+        """
+        :meth:`DataStore.applyIncidentEdits` applies all of the given edits,
+        with one automatic report entry, as one revision.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        with store._db as db:
+            storeConcentricStreet(db, anEvent, "1", "Street 1")
+        incident = self.successResultOf(
+            store.createIncident(anIncident, "Hubcap")
+        )
+        revision = self.successResultOf(store.eventRevision(anEvent))
+
+        self.successResultOf(
+            store.applyIncidentEdits(
+                anEvent, incident.number,
+                dict(
+                    priority=IncidentPriority.high,
+                    state=IncidentState.closed,
+                    summary="Something else",
+                    locationName="Here",
+                    locationConcentricStreet="1",
+                    locationRadialHour=9,
+                    locationRadialMinute=15,
+                    locationDescription="Over there",
+                    rangers=("Tool", "Bucket"),
+                    incidentTypes=("Admin",),
+                    reportEntries=(aReportEntry,),
+                ),
+                aReportEntry.author,
+            )
+        )
+
+        edited = self.successResultOf(
+            store.incidentWithNumber(anEvent, incident.number)
+        )
+
+        self.assertEqual(edited.priority, IncidentPriority.high)
+        self.assertEqual(edited.state, IncidentState.closed)
+        self.assertEqual(edited.summary, "Something else")
+        self.assertEqual(
+            edited.location,
+            Location(
+                name="Here",
+                address=RodGarettAddress(
+                    concentric="1", radialHour=9, radialMinute=15,
+                    description="Over there",
+                ),
+            ),
+        )
+        self.assertEqual(edited.rangerHandles, frozenset(("Tool", "Bucket")))
+        self.assertEqual(edited.incidentTypes, frozenset(("Admin",)))
+
+        newEntries = [
+            entry for entry in edited.reportEntries
+            if entry not in incident.reportEntries
+        ]
+        automaticEntries = [entry for entry in newEntries if entry.automatic]
+        userEntries = [entry for entry in newEntries if not entry.automatic]
+
+        self.assertEqual(len(automaticEntries), 1)
+        self.assertEqual(len(automaticEntries[0].text.split("\n")), 10)
+        self.assertTrue(reportEntriesEqualish(userEntries, (aReportEntry,)))
+
+        self.assertEqual(
+            self.successResultOf(store.eventRevision(anEvent)), revision + 1
+        )
+
+
+    def test_applyIncidentEdits_none(self) -> None:
+        """
+        :meth:`DataStore.applyIncidentEdits` does nothing given no edits.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        incident = self.successResultOf(
+            store.createIncident(anIncident, "Hubcap")
+        )
+        revision = self.successResultOf(store.eventRevision(anEvent))
+
+        self.successResultOf(
+            store.applyIncidentEdits(anEvent, incident.number, {}, "Hubcap")
+        )
+
+        self.assertEqual(
+            self.successResultOf(
+                store.incidentWithNumber(anEvent, incident.number)
+            ),
+            incident,
+        )
+        self.assertEqual(
+            self.successResultOf(store.eventRevision(anEvent)), revision
+        )
+
+
+    def test_applyIncidentEdits_unknown(self) -> None:
+        """
+        :meth:`DataStore.applyIncidentEdits` raises :exc:`ValueError` given an
+        unknown edit.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        incident = self.successResultOf(
+            store.createIncident(anIncident, "Hubcap")
+        )
+
+        f = self.failureResultOf(
+            store.applyIncidentEdits(
+                anEvent, incident.number,
+                dict(summary="Something else", number=2), "Hubcap",
+            )
+        )
+        self.assertEqual(f.type, ValueError)
+        self.assertEqual(
+            self.successResultOf(
+                store.incidentWithNumber(anEvent, incident.number)
+            ).summary,
+            incident.summary,
+        )
+
+
+    def test_applyIncidentEdits_error(self) -> None:
+        """
+        :meth:`DataStore.applyIncidentEdits` raises :exc:`StorageError` when
+        SQLite raises an exception.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+        incident = self.successResultOf(
+            store.createIncident(anIncident, "Hubcap")
+        )
+        store.bringThePain()
+
+        f = self.failureResultOf(
+            store.applyIncidentEdits(
+                anEvent, incident.number, dict(summary="Something else"),
+                "Hubcap",
+            )
+        )
+        self.assertEqual(f.type, StorageError)
+
+
+    def writeEventJSON(self, incidentsJSON: Iterable[Any]) -> Path:
+        path = Path(self.mktemp())
+        path.write_text(jsonTextFromObject(tuple(incidentsJSON)))
+        return path
+
+
+    @given(
+        incidentLists(
+            event=anEvent, maxNumber=SQLITE_MAX_INT,
+            averageSize=3, maxSize=10,
+        ),
+    )
+    @settings(max_examples=50)
+    def test_loadFromEventJSON(self, incidents: Iterable[Incident]) -> None:
+        """
+        :meth:`DataStore.loadFromEventJSON` loads the incidents in an event
+        archive.
+        """
+        incidents = tuple(incidents)
+
+        store = self.store()
+        self.successResultOf(store.createEvent(anEvent))
+
+        for incident in incidents:
+            address = incident.location.address
+            if (
+                isinstance(address, RodGarettAddress) and
+                address.concentric is not None
+            ):
+                with store._db as db:
+                    storeConcentricStreet(
+                        db, anEvent, address.concentric, "Some Street",
+                        ignoreDuplicates=True,
+                    )
+
+        path = self.writeEventJSON(
+            jsonObjectFromModelObject(incident) for incident in incidents
+        )
+
+        count = self.successResultOf(
+            store.loadFromEventJSON(anEvent, path, chunkSize=2)
+        )
+        self.assertEqual(count, len(incidents))
+
+        retrieved = self.successResultOf(store.incidents(anEvent))
+
+        self.assertEqual(len(tuple(retrieved)), len(incidents))
+        for r, i in zip(sorted(retrieved), sorted(incidents)):
+            self.assertIncidentsEqual(r, i)
+
+        self.assertEqual(
+            self.successResultOf(store.eventRevision(anEvent)), len(incidents)
+        )
+
+        incidentTypes = frozenset(
+            self.successResultOf(store.incidentTypes(includeHidden=True))
+        )
+        for incident in incidents:
+            self.assertTrue(incident.incidentTypes <= incidentTypes)
+
+
+    def test_loadFromEventJSON_newEvent(self) -> None:
+        """
+        :meth:`DataStore.loadFromEventJSON` creates the event if it does not
+        exist, and creates unknown incident types as hidden.
+        """
+        store = self.store()
+
+        incident = anIncident.replace(
+            number=7, incidentTypes=frozenset(("Archived",)),
+            reportEntries=(aReportEntry,),
+        )
+        path = self.writeEventJSON((jsonObjectFromModelObject(incident),))
+
+        self.successResultOf(store.loadFromEventJSON(anEvent, path))
+
+        self.assertEqual(
+            tuple(self.successResultOf(store.events())), (anEvent,)
+        )
+        self.assertIncidentsEqual(
+            self.successResultOf(store.incidentWithNumber(anEvent, 7)),
+            incident,
+        )
+        self.assertNotIn(
+            "Archived", tuple(self.successResultOf(store.incidentTypes()))
+        )
+        self.assertIn(
+            "Archived",
+            tuple(
+                self.successResultOf(store.incidentTypes(includeHidden=True))
+            ),
+        )
+
+
+    def test_loadFromEventJSON_trialRun(self) -> None:
+        """
+        :meth:`DataStore.loadFromEventJSON` validates incidents without writing
+        them when ``trialRun`` is true, skipping invalid incidents.
+        """
+        store = self.store()
+
+        path = self.writeEventJSON((
+            jsonObjectFromModelObject(anIncident.replace(number=1)),
+            dict(jsonObjectFromModelObject(anIncident.replace(number=2)),
+                 event="bar"),
+            jsonObjectFromModelObject(anIncident.replace(number=1)),
+            jsonObjectFromModelObject(anIncident.replace(number=3)),
+        ))
+
+        count = self.successResultOf(
+            store.loadFromEventJSON(anEvent, path, trialRun=True)
+        )
+        self.assertEqual(count, 2)
+        self.assertEqual(tuple(self.successResultOf(store.events())), ())
+
+
+    def test_loadFromEventJSON_invalid(self) -> None:
+        """
+        :meth:`DataStore.loadFromEventJSON` raises :exc:`ValueError` when an
+        incident is invalid, and writes nothing.
+        """
+        store = self.store()
+
+        path = self.writeEventJSON((
+            jsonObjectFromModelObject(anIncident.replace(number=1)),
+            jsonObjectFromModelObject(anIncident.replace(number=1)),
+        ))
+
+        f = self.failureResultOf(
+            store.loadFromEventJSON(anEvent, path, chunkSize=1)
+        )
+        self.assertEqual(f.type, ValueError)
+        self.assertEqual(tuple(self.successResultOf(store.events())), ())
+
+
+    def test_loadFromEventJSON_foreignKeys(self) -> None:
+        """
+        :meth:`DataStore.loadFromEventJSON` raises :exc:`StorageError` when the
+        loaded incidents violate foreign key constraints, and writes nothing.
+        """
+        store = self.store()
+
+        incident = anIncident.replace(
+            number=1,
+            location=Location(
+                name="There",
+                address=RodGarettAddress(
+                    concentric="X", radialHour=8, radialMinute=0,
+                    description=None,
+                ),
+            ),
+        )
+        path = self.writeEventJSON((jsonObjectFromModelObject(incident),))
+
+        f = self.failureResultOf(store.loadFromEventJSON(anEvent, path))
+        self.assertEqual(f.type, StorageError)
+        self.assertEqual(tuple(self.successResultOf(store.events())), ())
+
+
     def assertIncidentsEqual(
         self, incidentA: Incident, incidentB: Incident,
         ignoreAutomatic: bool = False,
@@ -0,0 +1,139 @@
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+Tests for :mod:`ranger-ims-server.store.sqlite._store`
+"""
+
+from pathlib import Path
+
+from .base import DataStoreTests
+from ..._exceptions import StorageError
+from ..._notification import ChangeNotification
+
+
+__all__ = ()
+
+
+def aNotification(number: int) -> ChangeNotification:
+    return ChangeNotification(
+        number=number,
+        eventID="foo",
+        incidentNumber=number * 10,
+        eventClass="Incident",
+        message=f'{{"event":"foo","incident_number":{number * 10}}}',
+    )
+
+
+
+class DataStoreChangeNotificationTests(DataStoreTests):
+    """
+    Tests for :class:`DataStore` change notification access.
+    """
+
+    def test_changeNotifications_empty(self) -> None:
+        """
+        :meth:`DataStore.changeNotifications` returns no notifications when
+        none are stored.
+        """
+        store = self.store()
+
+        self.assertEqual(
+            self.successResultOf(store.changeNotifications(10)), ()
+        )
+
+
+    def test_changeNotifications(self) -> None:
+        """
+        :meth:`DataStore.changeNotifications` returns the latest stored
+        notifications, up to the given limit, in the order they were sent.
+        """
+        store = self.store()
+
+        for number in range(1, 6):
+            self.successResultOf(
+                store.addChangeNotification(aNotification(number), keep=10)
+            )
+
+        self.assertEqual(
+            self.successResultOf(store.changeNotifications(3)),
+            tuple(aNotification(number) for number in (3, 4, 5)),
+        )
+
+
+    def test_addChangeNotification_keep(self) -> None:
+        """
+        :meth:`DataStore.addChangeNotification` discards all but the latest
+        ``keep`` stored notifications.
+        """
+        store = self.store()
+
+        for number in range(1, 6):
+            self.successResultOf(
+                store.addChangeNotification(aNotification(number), keep=2)
+            )
+
+        self.assertEqual(
+            self.successResultOf(store.changeNotifications(10)),
+            tuple(aNotification(number) for number in (4, 5)),
+        )
+
+
+    def test_changeNotifications_persisted(self) -> None:
+        """
+        Stored change notifications are read back by a new store using the
+        same database.
+        """
+        path = Path(self.mktemp())
+
+        store = self.store(path)
+        self.successResultOf(
+            store.addChangeNotification(aNotification(1), keep=10)
+        )
+        store._db.close()
+
+        store = self.store(path)
+
+        self.assertEqual(
+            self.successResultOf(store.changeNotifications(10)),
+            (aNotification(1),),
+        )
+
+
+    def test_changeNotifications_error(self) -> None:
+        """
+        :meth:`DataStore.changeNotifications` raises :exc:`StorageError` when
+        SQLite raises an exception.
+        """
+        store = self.store()
+        store.bringThePain()
+
+        f = self.failureResultOf(store.changeNotifications(10))
+        self.assertEqual(f.type, StorageError)
+
+
+    def test_addChangeNotification_error(self) -> None:
+        """
+        :meth:`DataStore.addChangeNotification` raises :exc:`StorageError`
+        when SQLite raises an exception.
+        """
+        store = self.store()
+        store.bringThePain()
+
+        f = self.failureResultOf(
+            store.addChangeNotification(aNotification(1), keep=10)
+        )
+        self.assertEqual(f.type, StorageError)
@@ -512,6 +512,48 @@ class DataStoreIncidentReportTests(DataStoreTests):
             self.assertEqual(len(storedAttached), 0)
 
 
+    def test_searchIncidentReports(self) -> None:
+        """
+        :meth:`DataStore.searchIncidentReports` finds incident reports with
+        matching summaries or report entries, with snippets of the matching
+        text.
+        """
+        store = self.store()
+
+        for incidentReport in (
+            anIncidentReport.replace(summary="Lost dog"),
+            anIncidentReport.replace(
+                summary="Found property",
+                reportEntries=(aReportEntry.replace(
+                    text="Participant found a lost wallet"
+                ),),
+            ),
+            anIncidentReport.replace(summary="Noise complaint"),
+        ):
+            self.successResultOf(
+                store.createIncidentReport(incidentReport, "Hubcap")
+            )
+
+        results = self.successResultOf(store.searchIncidentReports("lost"))
+
+        self.assertEqual(
+            sorted((r.number, r.snippet) for r in results),
+            [(1, "[Lost] dog"), (2, "Participant found a [lost] wallet")],
+        )
+
+
+    def test_searchIncidentReports_error(self) -> None:
+        """
+        :meth:`DataStore.searchIncidentReports` raises :exc:`StorageError` when
+        SQLite raises an exception.
+        """
+        store = self.store()
+        store.bringThePain()
+
+        f = self.failureResultOf(store.searchIncidentReports("x"))
+        self.assertEqual(f.type, StorageError)
+
+
     def test_detachedIncidentReports_error(self) -> None:
         """
         :meth:`DataStore.detachedIncidentReports` raises :exc:`StorageError`
@@ -584,6 +626,59 @@ class DataStoreIncidentReportTests(DataStoreTests):
         self.assertEqual(f.type, StorageError)
 
 
+    def test_incidentReportsRevision(self) -> None:
+        """
+        :meth:`DataStore.incidentReportsRevision` changes after every write
+        to incident reports, including attaching them to and detaching them
+        from incidents.
+        """
+        store = self.store()
+        self.successResultOf(store.createEvent(anIncident.event))
+        incident = self.successResultOf(
+            store.createIncident(anIncident, "Hubcap")
+        )
+
+        revisions = [self.successResultOf(store.incidentReportsRevision())]
+
+        def assertChanged() -> None:
+            revision = self.successResultOf(store.incidentReportsRevision())
+            self.assertNotIn(revision, revisions)
+            revisions.append(revision)
+
+        incidentReport = self.successResultOf(
+            store.createIncidentReport(anIncidentReport, "Hubcap")
+        )
+        assertChanged()
+
+        number = incidentReport.number
+
+        self.successResultOf(
+            store.setIncidentReport_summary(number, "Something", "Hubcap")
+        )
+        assertChanged()
+
+        self.successResultOf(
+            store.addReportEntriesToIncidentReport(
+                number, (aReportEntry,), aReportEntry.author
+            )
+        )
+        assertChanged()
+
+        self.successResultOf(
+            store.attachIncidentReportToIncident(
+                number, incident.event, incident.number
+            )
+        )
+        assertChanged()
+
+        self.successResultOf(
+            store.detachIncidentReportFromIncident(
+                number, incident.event, incident.number
+            )
+        )
+        assertChanged()
+
+
     def test_detachIncidentReportFromIncident_error(self) -> None:
         """
         :meth:`DataStore.detachIncidentReportFromIncident` raises
@@ -176,3 +176,28 @@ class DataStoreIncidentTypeTests(DataStoreTests):
         self.assertNotIn(
             incidentType, self.successResultOf(store.incidentTypes())
         )
+
+
+    def test_incidentTypesRevision(self) -> None:
+        """
+        :meth:`DataStore.incidentTypesRevision` changes after every write to
+        incident types.
+        """
+        incidentType = "foo"
+        store = self.store()
+
+        revisions = [self.successResultOf(store.incidentTypesRevision())]
+
+        def assertChanged() -> None:
+            revision = self.successResultOf(store.incidentTypesRevision())
+            self.assertNotIn(revision, revisions)
+            revisions.append(revision)
+
+        self.successResultOf(store.createIncidentType(incidentType))
+        assertChanged()
+
+        self.successResultOf(store.hideIncidentTypes((incidentType,)))
+        assertChanged()
+
+        self.successResultOf(store.showIncidentTypes((incidentType,)))
+        assertChanged()
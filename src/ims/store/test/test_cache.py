@@ -0,0 +1,338 @@
+##
+# See the file COPYRIGHT for copyright information.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##
+
+"""
+Tests for :mod:`ranger-ims-server.store._cache`
+"""
+
+from pathlib import Path
+from typing import Iterable, List
+
+from twisted.internet.defer import ensureDeferred
+
+from ims.ext.trial import TestCase
+from ims.model import Event, Incident, IncidentPriority, IncidentState
+from ims.model.json import jsonBytesFromModelObject
+
+from .._cache import CachingDataStore, approximateSize
+from ..sqlite.test.base import TestDataStore
+from ..sqlite.test.test_store_incident import aReportEntry, anIncident
+from ..sqlite.test.test_store_notification import aNotification
+from ..sqlite.test.test_store_report import anIncidentReport
+
+
+__all__ = ()
+
+
+
+class CachingDataStoreTests(TestCase):
+    """
+    Tests for :class:`CachingDataStore`.
+    """
+
+    def store(self, maxSize: int = 64 * 1024 * 1024) -> CachingDataStore:
+        store = CachingDataStore(
+            store=TestDataStore(Path(self.mktemp())), maxSize=maxSize
+        )
+        self.successResultOf(store.createEvent(anIncident.event))
+        return store
+
+
+    def bringThePain(self, store: CachingDataStore) -> None:
+        """
+        Break the underlying store of the given caching store, so that only
+        cached reads succeed.
+        """
+        underlying = store.store
+        assert isinstance(underlying, TestDataStore)
+        underlying.bringThePain()
+
+
+    def createIncidents(
+        self, store: CachingDataStore, event: Event, count: int
+    ) -> Iterable[Incident]:
+        return tuple(
+            self.successResultOf(
+                store.createIncident(
+                    anIncident.replace(event=event, summary=f"Thing {n}"),
+                    "Hubcap",
+                )
+            )
+            for n in range(count)
+        )
+
+
+    def test_incidents_hit(self) -> None:
+        """
+        :meth:`CachingDataStore.incidents` reads from the underlying store the
+        first time, and from the cache after that.
+        """
+        store = self.store()
+        self.createIncidents(store, anIncident.event, 3)
+
+        first = self.successResultOf(store.incidents(anIncident.event))
+        self.assertEqual(store.misses, 1)
+
+        # Break the underlying store so that only cached reads succeed.
+        self.bringThePain(store)
+
+        second = self.successResultOf(store.incidents(anIncident.event))
+        self.assertEqual(store.hits, 1)
+        self.assertEqual(second, first)
+        self.assertEqual(len(second), 3)
+
+
+    def test_iterIncidents_cached(self) -> None:
+        """
+        :meth:`CachingDataStore.iterIncidents` iterates over the incidents in
+        the cache.
+        """
+        store = self.store()
+        created = self.createIncidents(store, anIncident.event, 3)
+
+        async def collect() -> List[Incident]:
+            return [
+                incident async for incident
+                in store.iterIncidents(anIncident.event)
+            ]
+
+        first = self.successResultOf(ensureDeferred(collect()))
+        self.assertEqual(first, list(created))
+
+        self.bringThePain(store)
+
+        second = self.successResultOf(ensureDeferred(collect()))
+        self.assertEqual(second, first)
+
+
+    def test_incidentWithNumber_hit(self) -> None:
+        """
+        :meth:`CachingDataStore.incidentWithNumber` serves incidents loaded by
+        :meth:`CachingDataStore.incidents` from the cache.
+        """
+        store = self.store()
+        self.createIncidents(store, anIncident.event, 2)
+        self.successResultOf(store.incidents(anIncident.event))
+
+        self.bringThePain(store)
+
+        incident = self.successResultOf(
+            store.incidentWithNumber(anIncident.event, 2)
+        )
+        self.assertEqual(incident.summary, "Thing 1")
+        self.assertEqual(store.hits, 1)
+
+
+    def test_createIncident_complete(self) -> None:
+        """
+        :meth:`CachingDataStore.createIncident` adds the new incident to an
+        event with all incidents cached, so that the event remains cached.
+        """
+        store = self.store()
+        self.createIncidents(store, anIncident.event, 1)
+        self.successResultOf(store.incidents(anIncident.event))
+        self.createIncidents(store, anIncident.event, 1)
+
+        self.bringThePain(store)
+
+        incidents = self.successResultOf(store.incidents(anIncident.event))
+        self.assertEqual([i.number for i in incidents], [1, 2])
+
+
+    def test_setIncident_writeThrough(self) -> None:
+        """
+        Setting incident attributes updates the cached incident.
+        """
+        store = self.store()
+        event = anIncident.event
+        self.createIncidents(store, event, 1)
+        self.successResultOf(store.incidents(event))
+
+        self.successResultOf(
+            store.setIncident_state(event, 1, IncidentState.closed, "Hubcap")
+        )
+        self.successResultOf(
+            store.setIncident_priority(
+                event, 1, IncidentPriority.high, "Bucket"
+            )
+        )
+        self.successResultOf(
+            store.setIncident_rangers(event, 1, ("Tool",), "Hubcap")
+        )
+        self.successResultOf(
+            store.addReportEntriesToIncident(
+                event, 1, (aReportEntry,), aReportEntry.author
+            )
+        )
+
+        self.bringThePain(store)
+
+        incident = self.successResultOf(store.incidentWithNumber(event, 1))
+        self.assertEqual(incident.state, IncidentState.closed)
+        self.assertEqual(incident.priority, IncidentPriority.high)
+        self.assertEqual(incident.rangerHandles, frozenset(("Tool",)))
+        self.assertIn(
+            aReportEntry.text, [e.text for e in incident.reportEntries]
+        )
+
+        incidents = self.successResultOf(store.incidents(event))
+        self.assertEqual(incidents, (incident,))
+
+
+    def test_applyIncidentEdits_writeThrough(self) -> None:
+        """
+        Applying incident edits updates the cached incident.
+        """
+        store = self.store()
+        event = anIncident.event
+        self.createIncidents(store, event, 1)
+        self.successResultOf(store.incidents(event))
+
+        self.successResultOf(
+            store.applyIncidentEdits(
+                event, 1,
+                dict(state=IncidentState.closed, summary="Something else"),
+                "Hubcap",
+            )
+        )
+
+        self.bringThePain(store)
+
+        incident = self.successResultOf(store.incidentWithNumber(event, 1))
+        self.assertEqual(incident.state, IncidentState.closed)
+        self.assertEqual(incident.summary, "Something else")
+
+
+    def test_incidentReports_writeThrough(self) -> None:
+        """
+        Incident reports are cached, and writes to them update the cache.
+        """
+        store = self.store()
+        self.successResultOf(
+            store.createIncidentReport(anIncidentReport, "Hubcap")
+        )
+        self.successResultOf(store.incidentReports())
+
+        self.successResultOf(
+            store.setIncidentReport_summary(1, "Something else", "Hubcap")
+        )
+
+        self.bringThePain(store)
+
+        incidentReport = self.successResultOf(
+            store.incidentReportWithNumber(1)
+        )
+        self.assertEqual(incidentReport.summary, "Something else")
+        self.assertEqual(
+            self.successResultOf(store.incidentReports()), (incidentReport,)
+        )
+
+
+    def test_changeNotifications_passThrough(self) -> None:
+        """
+        Change notifications are stored in and read from the underlying store.
+        """
+        store = self.store()
+        self.successResultOf(
+            store.addChangeNotification(aNotification(1), keep=10)
+        )
+
+        self.assertEqual(
+            self.successResultOf(store.store.changeNotifications(10)),
+            (aNotification(1),),
+        )
+        self.assertEqual(
+            self.successResultOf(store.changeNotifications(10)),
+            (aNotification(1),),
+        )
+
+
+    def test_jsonBytes_cached(self) -> None:
+        """
+        :meth:`CachingDataStore.jsonBytes` caches the JSON for cached
+        incidents and incident reports.
+        """
+        store = self.store()
+        self.createIncidents(store, anIncident.event, 1)
+        self.successResultOf(
+            store.createIncidentReport(anIncidentReport, "Hubcap")
+        )
+
+        (incident,) = self.successResultOf(store.incidents(anIncident.event))
+        (incidentReport,) = self.successResultOf(store.incidentReports())
+
+        for obj in (incident, incidentReport):
+            size = store.size
+            data = store.jsonBytes(obj)
+
+            self.assertEqual(data, jsonBytesFromModelObject(obj))
+            self.assertIdentical(store.jsonBytes(obj), data)
+            self.assertEqual(store.size, size + len(data))
+
+
+    def test_jsonBytes_writeThrough(self) -> None:
+        """
+        Writing to an incident drops its cached JSON, and JSON for the
+        incident as it was before the write is not cached.
+        """
+        store = self.store()
+        event = anIncident.event
+        self.createIncidents(store, event, 1)
+
+        (before,) = self.successResultOf(store.incidents(event))
+        store.jsonBytes(before)
+
+        self.successResultOf(
+            store.setIncident_state(event, 1, IncidentState.closed, "Hubcap")
+        )
+
+        (after,) = self.successResultOf(store.incidents(event))
+        data = store.jsonBytes(after)
+
+        self.assertEqual(data, jsonBytesFromModelObject(after))
+        self.assertIn(b'"state":"closed"', data)
+
+        stale = store.jsonBytes(before)
+        self.assertEqual(stale, jsonBytesFromModelObject(before))
+        self.assertIdentical(store.jsonBytes(after), data)
+
+
+    def test_evict(self) -> None:
+        """
+        When the cache exceeds its size bound, the least recently used event
+        is evicted.
+        """
+        other = Event(id="bar")
+
+        store = self.store()
+        self.successResultOf(store.createEvent(other))
+        incidents = self.createIncidents(store, anIncident.event, 2)
+        self.createIncidents(store, other, 2)
+
+        # Room for one event's incidents, but not two.
+        size = sum(approximateSize(i) for i in incidents)
+        store = CachingDataStore(store=store.store, maxSize=size + size // 2)
+
+        self.successResultOf(store.incidents(anIncident.event))
+        self.successResultOf(store.incidents(other))
+
+        self.assertEqual(store.evictions, 1)
+        self.assertLessEqual(store.size, store.maxSize)
+
+        self.bringThePain(store)
+
+        self.successResultOf(store.incidents(other))
+        self.failureResultOf(store.incidents(anIncident.event))